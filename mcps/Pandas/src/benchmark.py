@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the condition evaluation behind filter_data.
+Compares the single combined mask of apply_filter_conditions with the
+earlier approach, which copied the frame and sliced it again after every
+condition, on a generated frame of 10 million rows by default. Reports the
+best time and the peak memory traced while filtering.
+
+Example:
+    pandas-mcp-bench --rows 10000000 --repeat 3
+"""
+import argparse
+import gc
+import json
+import sys
+import os
+import time
+import tracemalloc
+from typing import Optional, List, Any, Dict, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path for relative imports
+sys.path.insert(0, os.path.dirname(__file__))
+
+from implementation.filtering import apply_filter_conditions
+
+
+# Rows of the generated frame unless --rows is given
+DEFAULT_ROWS = 10_000_000
+
+# Conditions filtered in every run; each keeps part of the rows left by the previous ones
+BENCHMARK_CONDITIONS = {
+    "value": {"operator": "gt", "value": 0.2},
+    "quantity": {"operator": "between", "value": [5, 40]},
+    "region": {"operator": "in", "value": ["north", "east"]},
+    "active": True
+}
+
+
+def generate_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Frame of numeric, categorical and boolean columns to filter.
+    
+    Args:
+        rows: Number of rows
+        seed: Random seed
+    
+    Returns:
+        Generated dataframe
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows, dtype=np.int64),
+        "value": rng.random(rows),
+        "quantity": rng.integers(0, 50, rows, dtype=np.int32),
+        "region": pd.Categorical.from_codes(rng.integers(0, 4, rows), ["north", "south", "east", "west"]),
+        "active": rng.random(rows) < 0.7
+    })
+
+
+def sequential_filter(df: pd.DataFrame, filter_conditions: Dict[str, Any]) -> Tuple[pd.DataFrame, List[Any]]:
+    """
+    The earlier filter_data evaluation: copy the frame, then slice it after each condition.
+    
+    Only the operators of BENCHMARK_CONDITIONS are supported.
+    """
+    filtered_df = df.copy()
+    applied_filters = []
+    for column, condition in filter_conditions.items():
+        operator, value = ("eq", condition) if not isinstance(condition, dict) else (condition["operator"], condition["value"])
+        if operator == "eq":
+            mask = filtered_df[column] == value
+        elif operator == "gt":
+            mask = filtered_df[column] > value
+        elif operator == "in":
+            mask = filtered_df[column].isin(value)
+        elif operator == "between":
+            mask = filtered_df[column].between(value[0], value[1])
+        else:
+            raise ValueError(f"Unsupported benchmark operator: {operator}")
+        rows_before = len(filtered_df)
+        filtered_df = filtered_df[mask]
+        applied_filters.append({
+            "column": column,
+            "operator": operator,
+            "value": value,
+            "rows_before": rows_before,
+            "rows_after": len(filtered_df),
+            "rows_filtered": rows_before - len(filtered_df)
+        })
+    return filtered_df, applied_filters
+
+
+def measure(filter_function: Callable, df: pd.DataFrame, filter_conditions: Dict[str, Any],
+            repeat: int = 1) -> Dict[str, Any]:
+    """
+    Time a filter function and trace the memory it allocates.
+    
+    Args:
+        filter_function: apply_filter_conditions or sequential_filter
+        df: Data to filter
+        filter_conditions: Conditions to apply
+        repeat: Runs; the fastest time and the largest peak are kept
+    
+    Returns:
+        Dictionary with the seconds, peak bytes, kept rows and applied filters
+    """
+    best_seconds = None
+    peak_bytes = 0
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        filtered_df, applied_filters = filter_function(df, filter_conditions)
+        seconds = time.perf_counter() - start
+        peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+        rows = len(filtered_df)
+        del filtered_df
+    return {
+        "seconds": round(best_seconds, 4),
+        "peak_bytes": peak_bytes,
+        "peak_mb": round(peak_bytes / (1024 * 1024), 1),
+        "rows": rows,
+        "applied_filters": applied_filters
+    }
+
+
+def run_benchmark(rows: int = DEFAULT_ROWS, repeat: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """
+    Filter a generated frame both ways and compare.
+    
+    Args:
+        rows: Rows of the generated frame
+        repeat: Runs per approach
+        seed: Random seed of the frame
+    
+    Returns:
+        Dictionary with the frame size, the results of both approaches and
+        the speedup and peak memory ratio of the combined mask
+    
+    Raises:
+        AssertionError: If the approaches keep different rows
+    """
+    df = generate_frame(rows, seed)
+    sequential = measure(sequential_filter, df, BENCHMARK_CONDITIONS, repeat)
+    combined = measure(apply_filter_conditions, df, BENCHMARK_CONDITIONS, repeat)
+    assert combined["applied_filters"] == sequential["applied_filters"], "Filters disagree"
+    
+    return {
+        "rows": rows,
+        "frame_mb": round(df.memory_usage(deep=True).sum() / (1024 * 1024), 1),
+        "conditions": len(BENCHMARK_CONDITIONS),
+        "sequential": sequential,
+        "combined_mask": combined,
+        "speedup": round(sequential["seconds"] / max(combined["seconds"], 1e-9), 2),
+        "peak_memory_ratio": round(combined["peak_bytes"] / max(sequential["peak_bytes"], 1), 3)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark filter_data condition evaluation on a generated frame.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows of the generated frame")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per approach; the fastest is recorded")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the frame")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    result = run_benchmark(args.rows, args.repeat, args.seed)
+    for name in ("sequential", "combined_mask"):
+        result[name].pop("applied_filters")
+    
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,599 @@
+"""
+Chunked (out-of-core) execution of statistics, filtering, groupby and
+missing data detection.
+Files too large for the dataframe store are read in chunks of rows and
+each tool keeps only mergeable partial results: counts, sums, central
+moments, bounded value counts and a bounded uniform sample for quantiles.
+Memory therefore depends on the chunk size and the number of groups, not
+on the size of the file.
+"""
+import os
+from collections import Counter
+from typing import Optional, List, Any, Dict, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from scipy import stats
+
+from .dataframe_store import detect_file_format, get_store
+
+
+# Formats that can be read in chunks
+STREAMABLE_FORMATS = ("csv", "parquet")
+
+# Rows per chunk unless PANDAS_MCP_CHUNK_ROWS or the caller sets it
+DEFAULT_CHUNK_ROWS = 100000
+
+# Rows read to estimate the in-memory size of a file
+ESTIMATE_SAMPLE_ROWS = 1000
+
+# Values kept per numeric column for quantiles; exact below this many rows
+QUANTILE_SAMPLE_SIZE = 100000
+
+# Distinct values counted per categorical column before counts become approximate
+CATEGORY_LIMIT = 100000
+
+# Groupby operations whose partial results can be merged
+DECOMPOSABLE_OPERATIONS = ("count", "sum", "mean", "std", "min", "max")
+
+
+def chunk_rows(chunk_size: Optional[int] = None) -> int:
+    """Rows per chunk: chunk_size, PANDAS_MCP_CHUNK_ROWS or DEFAULT_CHUNK_ROWS."""
+    return int(chunk_size or os.getenv("PANDAS_MCP_CHUNK_ROWS", DEFAULT_CHUNK_ROWS))
+
+
+def iter_chunks(file_path: str, chunk_size: Optional[int] = None,
+                columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet file as consecutive dataframes.
+    
+    Args:
+        file_path: Path to the data file
+        chunk_size: Rows per chunk
+        columns: Specific columns to load
+    
+    Yields:
+        Dataframes of at most chunk_size rows
+    
+    Raises:
+        ValueError: If the format cannot be read in chunks
+    """
+    rows = chunk_rows(chunk_size)
+    file_format = detect_file_format(file_path)
+    if file_format == "csv":
+        with pd.read_csv(file_path, chunksize=rows, usecols=columns) as reader:
+            yield from reader
+    elif file_format == "parquet":
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Chunked processing supports {list(STREAMABLE_FORMATS)} files, not {file_format}")
+
+
+def estimate_memory_bytes(file_path: str) -> int:
+    """
+    Estimate the memory a file needs once loaded, from its first rows.
+    
+    Args:
+        file_path: Path to a CSV or Parquet file
+    
+    Returns:
+        Estimated dataframe size in bytes
+    """
+    if detect_file_format(file_path) == "parquet":
+        parquet_file = pq.ParquetFile(file_path)
+        total_rows = parquet_file.metadata.num_rows
+        sample = next(parquet_file.iter_batches(batch_size=ESTIMATE_SAMPLE_ROWS), None)
+        if sample is None or sample.num_rows == 0:
+            return 0
+        sample_bytes = sample.to_pandas().memory_usage(deep=True).sum()
+        return int(sample_bytes / sample.num_rows * total_rows)
+    
+    # Rows are estimated from the bytes per line of the sample
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        lines = [line for _, line in zip(range(ESTIMATE_SAMPLE_ROWS), f)]
+    if not lines:
+        return 0
+    sample = pd.read_csv(file_path, nrows=len(lines))
+    bytes_per_row = sample.memory_usage(deep=True).sum() / max(len(sample), 1)
+    line_bytes = sum(map(len, lines)) / len(lines)
+    total_rows = (os.path.getsize(file_path) - len(header)) / line_bytes
+    return int(bytes_per_row * total_rows)
+
+
+def should_stream(file_path: str, chunk_size: Optional[int] = None) -> bool:
+    """
+    Whether a tool should process a source in chunks.
+    
+    Chunks are used when requested with chunk_size, or when a CSV or Parquet
+    path would take more memory than the dataframe store may hold. Loaded
+    df_handles are always processed in memory.
+    
+    Args:
+        file_path: File path or df_handle passed to the tool
+        chunk_size: Rows per chunk requested by the caller
+    
+    Returns:
+        True to use chunked execution
+    """
+    store = get_store()
+    if store.is_handle(file_path) or detect_file_format(file_path) not in STREAMABLE_FORMATS:
+        return False
+    if chunk_size:
+        return True
+    return estimate_memory_bytes(file_path) > store.budget_bytes
+
+
+def check_output_path(file_path: str, output_file: str) -> None:
+    """Refuse output files that would overwrite the file being read."""
+    if os.path.abspath(output_file) == os.path.abspath(file_path):
+        raise ValueError(f"Output file would overwrite the input file: {output_file}")
+
+
+def read_columns(file_path: str) -> List[str]:
+    """Column names of a CSV or Parquet file, without reading its rows."""
+    if detect_file_format(file_path) == "parquet":
+        return pq.ParquetFile(file_path).schema_arrow.names
+    return pd.read_csv(file_path, nrows=0).columns.tolist()
+
+
+def execution_info(chunks: int, chunk_size: Optional[int]) -> Dict[str, Any]:
+    """Execution details added to the results of chunked tools."""
+    return {"mode": "chunked", "chunks": chunks, "chunk_size": chunk_rows(chunk_size)}
+
+
+class ColumnMoments:
+    """
+    Running count, mean, central moments, extremes and a bounded uniform
+    sample of one numeric column.
+    """
+    
+    def __init__(self, sample_size: int = QUANTILE_SAMPLE_SIZE, seed: int = 0):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.sample_size = sample_size
+        self.sample = np.empty(0)
+        self.sample_keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+    
+    def add(self, values: np.ndarray) -> None:
+        """
+        Merge a chunk of values, missing values excluded.
+        
+        Args:
+            values: Non-missing float values
+        """
+        nb = len(values)
+        if nb == 0:
+            return
+        mean_b = float(values.mean())
+        centered = values - mean_b
+        m2_b = float(np.dot(centered, centered))
+        m3_b = float((centered ** 3).sum())
+        m4_b = float((centered ** 4).sum())
+        
+        # Pairwise update of the central moment sums (Pebay, 2008)
+        na = self.n
+        n = na + nb
+        delta = mean_b - self.mean
+        self.m4 += (m4_b + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+                    + 6 * delta ** 2 * (na * na * m2_b + nb * nb * self.m2) / n ** 2
+                    + 4 * delta * (na * m3_b - nb * self.m3) / n)
+        self.m3 += (m3_b + delta ** 3 * na * nb * (na - nb) / n ** 2
+                    + 3 * delta * (na * m2_b - nb * self.m2) / n)
+        self.m2 += m2_b + delta ** 2 * na * nb / n
+        self.mean += delta * nb / n
+        self.n = n
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        
+        # Keep the values with the smallest random keys: a uniform sample
+        keys = np.concatenate([self.sample_keys, self._rng.random(nb)])
+        sample = np.concatenate([self.sample, values])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, sample = keys[keep], sample[keep]
+        self.sample_keys, self.sample = keys, sample
+    
+    @property
+    def exact_quantiles(self) -> bool:
+        """Whether the sample holds every value."""
+        return self.n <= self.sample_size
+    
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+    
+    def skewness(self) -> float:
+        """Bias-corrected skewness, as pandas Series.skew."""
+        if self.n < 3:
+            return np.nan
+        if self.m2 == 0:
+            return 0.0
+        n = self.n
+        return (n * (n - 1)) ** 0.5 / (n - 2) * (self.m3 / n) / (self.m2 / n) ** 1.5
+    
+    def kurtosis(self) -> float:
+        """Bias-corrected excess kurtosis, as pandas Series.kurtosis."""
+        if self.n < 4:
+            return np.nan
+        if self.m2 == 0:
+            return 0.0
+        n = self.n
+        return (n * (n + 1) * (n - 1) * self.m4 / ((n - 2) * (n - 3) * self.m2 ** 2)
+                - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+    
+    def quantile(self, q: float) -> float:
+        return float(np.quantile(self.sample, q)) if len(self.sample) else np.nan
+
+
+class ValueCounter:
+    """Value counts of one column, pruned to the most frequent values past a limit."""
+    
+    def __init__(self, limit: int = CATEGORY_LIMIT):
+        self.counts: Counter = Counter()
+        self.limit = limit
+        self.truncated = False
+        self.count = 0
+    
+    def add(self, values: pd.Series) -> None:
+        values = values.dropna()
+        self.count += len(values)
+        self.counts.update(values.value_counts().to_dict())
+        if len(self.counts) > self.limit:
+            self.counts = Counter(dict(self.counts.most_common(self.limit // 2)))
+            self.truncated = True
+    
+    def most_common(self, n: Optional[int] = None):
+        return self.counts.most_common(n)
+
+
+def chunked_statistical_summary(file_path: str, columns: Optional[List[str]] = None,
+                                include_distributions: bool = False,
+                                chunk_size: Optional[int] = None) -> dict:
+    """
+    get_statistical_summary computed over chunks of a file.
+    
+    Counts, means, deviations, extremes, skewness and kurtosis are exact.
+    Quantiles, the interquartile range and the median absolute deviation
+    come from a uniform sample of QUANTILE_SAMPLE_SIZE values per column and
+    are exact for smaller files. Column kinds follow the first chunk.
+    
+    Args:
+        file_path: Path to a CSV or Parquet file
+        columns: Specific columns to analyze
+        include_distributions: Whether to include distribution analysis
+        chunk_size: Rows per chunk
+    
+    Returns:
+        Dictionary with statistical summaries, as get_statistical_summary
+    """
+    numeric: Dict[str, ColumnMoments] = {}
+    counted: Dict[str, ValueCounter] = {}
+    categorical_cols: List[str] = []
+    missing = None
+    all_columns: List[str] = []
+    total_rows = 0
+    chunks = 0
+    
+    for chunk in iter_chunks(file_path, chunk_size, columns):
+        if chunks == 0:
+            all_columns = chunk.columns.tolist()
+            numeric_cols = chunk.select_dtypes(include=[np.number]).columns
+            categorical_cols = chunk.select_dtypes(include=['object', 'category']).columns.tolist()
+            numeric = {col: ColumnMoments() for col in numeric_cols}
+            counted = {col: ValueCounter() for col in all_columns if col not in numeric}
+            missing = pd.Series(0, index=chunk.columns, dtype='int64')
+        chunks += 1
+        total_rows += len(chunk)
+        missing = missing.add(chunk.isnull().sum(), fill_value=0)
+        for col, moments in numeric.items():
+            values = pd.to_numeric(chunk[col], errors='coerce').dropna().to_numpy(dtype=float)
+            moments.add(values)
+        for col, counter in counted.items():
+            counter.add(chunk[col])
+    
+    basic_stats = {}
+    additional_stats = {}
+    approximate = []
+    for col in all_columns:
+        if col in numeric:
+            moments = numeric[col]
+            basic_stats[col] = {
+                "count": float(moments.n),
+                "mean": moments.mean if moments.n else np.nan,
+                "std": float(np.sqrt(moments.variance())),
+                "min": moments.minimum if moments.n else np.nan,
+                "25%": moments.quantile(0.25),
+                "50%": moments.quantile(0.5),
+                "75%": moments.quantile(0.75),
+                "max": moments.maximum if moments.n else np.nan
+            }
+            if not moments.exact_quantiles:
+                approximate.append(col)
+            if moments.n > 0:
+                median = moments.quantile(0.5)
+                additional_stats[col] = {
+                    "variance": float(moments.variance()),
+                    "skewness": float(moments.skewness()),
+                    "kurtosis": float(moments.kurtosis()),
+                    "median_absolute_deviation": float(np.median(np.abs(moments.sample - median))),
+                    "interquartile_range": moments.quantile(0.75) - moments.quantile(0.25),
+                    "coefficient_of_variation": float(np.sqrt(moments.variance()) / moments.mean) if moments.mean != 0 else None
+                }
+                if include_distributions and len(moments.sample) >= 8:
+                    rng = np.random.default_rng(0)
+                    sample = rng.choice(moments.sample, min(5000, len(moments.sample)), replace=False)
+                    shapiro_stat, shapiro_p = stats.shapiro(sample)
+                    additional_stats[col]["normality_test"] = {
+                        "shapiro_wilk_statistic": float(shapiro_stat),
+                        "shapiro_wilk_p_value": float(shapiro_p),
+                        "is_normal": shapiro_p > 0.05
+                    }
+        else:
+            counter = counted[col]
+            top = counter.most_common(1)
+            basic_stats[col] = {
+                "count": counter.count,
+                "unique": len(counter.counts),
+                "top": top[0][0] if top else np.nan,
+                "freq": top[0][1] if top else np.nan
+            }
+            if counter.truncated:
+                approximate.append(col)
+    
+    if numeric and counted:
+        # describe(include='all') gives every column every statistic
+        names = ["count", "unique", "top", "freq", "mean", "std", "min", "25%", "50%", "75%", "max"]
+        basic_stats = {col: {name: col_stats.get(name, np.nan) for name in names}
+                       for col, col_stats in basic_stats.items()}
+    
+    categorical_stats = {}
+    for col in categorical_cols:
+        counter = counted[col]
+        if counter.count > 0:
+            top = counter.most_common(10)
+            categorical_stats[col] = {
+                "unique_values": len(counter.counts),
+                "most_frequent": str(top[0][0]),
+                "most_frequent_count": int(top[0][1]),
+                "value_counts": dict(top)
+            }
+    
+    missing = missing.astype('int64') if missing is not None else pd.Series(dtype='int64')
+    missing_data = {
+        "total_missing": int(missing.sum()),
+        "missing_by_column": missing.to_dict(),
+        "missing_percentage": (missing / total_rows * 100).to_dict() if total_rows else {}
+    }
+    
+    return {
+        "success": True,
+        "file_path": file_path,
+        "shape": (total_rows, len(all_columns)),
+        "basic_statistics": basic_stats,
+        "additional_statistics": additional_stats,
+        "categorical_statistics": categorical_stats,
+        "missing_data": missing_data,
+        "approximate_columns": approximate,
+        "execution": execution_info(chunks, chunk_size),
+        "message": f"Statistical summary generated for {len(all_columns)} columns in {chunks} chunks"
+    }
+
+
+def chunked_filter(file_path: str, apply_conditions, output_file: str,
+                   chunk_size: Optional[int] = None, preview_rows: int = 100) -> dict:
+    """
+    Filter a file chunk by chunk, appending matching rows to output_file.
+    
+    Args:
+        file_path: Path to a CSV or Parquet file
+        apply_conditions: Function taking a chunk and returning the filtered
+            chunk and its applied filter descriptions
+        output_file: CSV file the matching rows are written to
+        chunk_size: Rows per chunk
+        preview_rows: Matching rows returned in the result
+    
+    Returns:
+        Dictionary with the row counts, merged filter descriptions, the first
+        matching rows and the execution details
+    """
+    check_output_path(file_path, output_file)
+    total_rows = 0
+    kept_rows = 0
+    chunks = 0
+    columns = 0
+    applied_filters: List[Any] = []
+    preview = []
+    
+    for chunk in iter_chunks(file_path, chunk_size):
+        filtered, applied = apply_conditions(chunk)
+        filtered.to_csv(output_file, index=False, mode='w' if chunks == 0 else 'a', header=chunks == 0)
+        if chunks == 0:
+            applied_filters = applied
+            columns = len(chunk.columns)
+        else:
+            # Sum the per-chunk row counts of each filter
+            for merged, current in zip(applied_filters, applied):
+                if isinstance(merged, dict):
+                    for key in ("rows_before", "rows_after", "rows_filtered"):
+                        merged[key] += current[key]
+        if len(preview) < preview_rows:
+            preview.extend(filtered.head(preview_rows - len(preview)).to_dict('records'))
+        chunks += 1
+        total_rows += len(chunk)
+        kept_rows += len(filtered)
+    
+    return {
+        "original_shape": (total_rows, columns),
+        "final_shape": (kept_rows, columns),
+        "applied_filters": applied_filters,
+        "preview": preview,
+        "execution": execution_info(chunks, chunk_size)
+    }
+
+
+def chunked_groupby(file_path: str, group_by: List[str], agg_dict: Dict[str, str],
+                    filter_condition: Optional[str] = None,
+                    chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Group a file chunk by chunk, merging partial aggregates per group.
+    
+    Each chunk is reduced to per-group counts, sums, extremes, means and
+    squared deviation sums, which are merged exactly (Chan et al.), so only
+    one row per group is held at a time.
+    
+    Args:
+        file_path: Path to a CSV or Parquet file
+        group_by: Columns to group by
+        agg_dict: Column -> one of DECOMPOSABLE_OPERATIONS
+        filter_condition: Optional query applied to every chunk
+        chunk_size: Rows per chunk
+    
+    Returns:
+        Dictionary with the aggregated frame ("result"), the rows aggregated
+        ("rows") and the execution details
+    
+    Raises:
+        ValueError: If an operation is not decomposable or a column is missing
+    """
+    not_decomposable = {col: op for col, op in agg_dict.items() if op not in DECOMPOSABLE_OPERATIONS}
+    if not_decomposable:
+        raise ValueError(f"Operations {not_decomposable} cannot be merged across chunks; "
+                         f"chunked groupby supports {list(DECOMPOSABLE_OPERATIONS)}")
+    
+    partial = None
+    rows = 0
+    chunks = 0
+    for chunk in iter_chunks(file_path, chunk_size):
+        if filter_condition:
+            try:
+                chunk = chunk.query(filter_condition)
+            except Exception as e:
+                raise ValueError(f"Filter condition error: {str(e)}")
+        if chunks == 0:
+            missing_cols = [col for col in group_by if col not in chunk.columns]
+            if missing_cols:
+                raise ValueError(f"Group by columns not found: {missing_cols}")
+        chunks += 1
+        rows += len(chunk)
+        current = _partial_aggregates(chunk, group_by, agg_dict)
+        partial = current if partial is None else _merge_partials(partial, current, agg_dict)
+    
+    if partial is None:
+        result = pd.DataFrame(columns=group_by + list(agg_dict))
+    else:
+        result = pd.DataFrame(index=partial.index)
+        for col, op in agg_dict.items():
+            if op in ("count", "sum", "min", "max"):
+                result[col] = partial[(col, op)]
+            elif op == "mean":
+                result[col] = partial[(col, "total")] / partial[(col, "n")].where(partial[(col, "n")] > 0)
+            else:
+                n = partial[(col, "n")]
+                result[col] = np.sqrt(partial[(col, "m2")] / (n - 1).where(n > 1))
+        result = result.sort_index().reset_index()
+    
+    return {"result": result, "rows": rows, "execution": execution_info(chunks, chunk_size)}
+
+
+def _partial_aggregates(chunk: pd.DataFrame, group_by: List[str], agg_dict: Dict[str, str]) -> pd.DataFrame:
+    grouped = chunk.groupby(group_by)
+    parts = {}
+    for col, op in agg_dict.items():
+        if op in ("count", "sum", "min", "max"):
+            parts[(col, op)] = grouped[col].agg(op)
+        elif op == "mean":
+            parts[(col, "n")] = grouped[col].count()
+            parts[(col, "total")] = grouped[col].sum()
+        else:
+            parts[(col, "n")] = grouped[col].count()
+            parts[(col, "mean")] = grouped[col].mean()
+            parts[(col, "m2")] = grouped[col].var(ddof=0) * parts[(col, "n")]
+    return pd.DataFrame(parts)
+
+
+def _merge_partials(left: pd.DataFrame, right: pd.DataFrame, agg_dict: Dict[str, str]) -> pd.DataFrame:
+    index = left.index.union(right.index)
+    levels = list(range(index.nlevels))
+    merged = {}
+    for col, op in agg_dict.items():
+        if op in ("count", "sum", "min", "max"):
+            # Groups missing on one side keep the other side's value and dtype
+            both = pd.concat([left[(col, op)], right[(col, op)]])
+            merged[(col, op)] = both.groupby(level=levels).agg("sum" if op == "count" else op)
+    left = left.reindex(index)
+    right = right.reindex(index)
+    for col, op in agg_dict.items():
+        if op in ("count", "sum", "min", "max"):
+            continue
+        if op == "mean":
+            merged[(col, "n")] = left[(col, "n")].add(right[(col, "n")], fill_value=0)
+            merged[(col, "total")] = left[(col, "total")].add(right[(col, "total")], fill_value=0)
+        else:
+            na = left[(col, "n")].fillna(0)
+            nb = right[(col, "n")].fillna(0)
+            n = na + nb
+            mean_a = left[(col, "mean")].fillna(0)
+            mean_b = right[(col, "mean")].fillna(0)
+            delta = mean_b - mean_a
+            safe_n = n.where(n > 0, 1)
+            merged[(col, "n")] = n
+            merged[(col, "mean")] = (mean_a + delta * nb / safe_n).where(n > 0)
+            merged[(col, "m2")] = (left[(col, "m2")].fillna(0) + right[(col, "m2")].fillna(0)
+                                   + delta ** 2 * na * nb / safe_n)
+    return pd.DataFrame(merged, index=index)
+
+
+def chunked_missing_data(file_path: str, output_file: Optional[str] = None,
+                         chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Count missing values chunk by chunk, optionally writing the complete rows.
+    
+    Args:
+        file_path: Path to a CSV or Parquet file
+        output_file: CSV file the rows without missing values are written to,
+            for the remove strategy
+        chunk_size: Rows per chunk
+    
+    Returns:
+        Dictionary with the shape, missing data info, rows kept and the
+        execution details
+    """
+    if output_file is not None:
+        check_output_path(file_path, output_file)
+    missing = None
+    rows_with_missing = 0
+    total_rows = 0
+    chunks = 0
+    for chunk in iter_chunks(file_path, chunk_size):
+        is_missing = chunk.isnull()
+        counts = is_missing.sum()
+        missing = counts if missing is None else missing.add(counts, fill_value=0)
+        row_missing = is_missing.any(axis=1)
+        rows_with_missing += int(row_missing.sum())
+        if output_file is not None:
+            chunk[~row_missing].to_csv(output_file, index=False, mode='w' if chunks == 0 else 'a',
+                                       header=chunks == 0)
+        total_rows += len(chunk)
+        chunks += 1
+    
+    missing = missing.astype('int64') if missing is not None else pd.Series(dtype='int64')
+    missing_info = {
+        "total_missing": int(missing.sum()),
+        "missing_by_column": missing.to_dict(),
+        "missing_percentage": (missing / total_rows * 100).to_dict() if total_rows else {},
+        "rows_with_missing": rows_with_missing,
+        "complete_rows": total_rows - rows_with_missing
+    }
+    return {
+        "shape": (total_rows, len(missing)),
+        "missing_data_info": missing_info,
+        "execution": execution_info(chunks, chunk_size)
+    }
@@ -0,0 +1,217 @@
+"""
+Fast CSV ingestion with the multithreaded pyarrow reader.
+Full CSV loads are parsed by pyarrow with pandas-compatible type inference
+and written as an uncompressed Feather snapshot to a cache directory. Later
+loads of the unchanged file memory-map the snapshot instead of parsing text.
+"""
+import hashlib
+import os
+from typing import Optional, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pcsv
+import pyarrow.feather as feather
+
+
+# Text pandas reads as missing by default
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+             '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# Text pandas reads as booleans
+TRUE_VALUES = ['True', 'TRUE', 'true']
+FALSE_VALUES = ['False', 'FALSE', 'false']
+
+# Smallest CSV worth a snapshot
+SNAPSHOT_MIN_BYTES = 1024 * 1024
+
+# Bytes pyarrow parses per block and thread
+BLOCK_SIZE = 16 * 1024 * 1024
+
+# Smallest magnitude of integers that do not fit int64, which pyarrow reads as
+# floats but pandas keeps exact as uint64 or object
+INT64_OVERFLOW = 2 ** 63
+
+
+def snapshot_dir() -> Optional[str]:
+    """Snapshot cache directory, or None when PANDAS_MCP_SNAPSHOTS disables snapshots."""
+    if os.getenv("PANDAS_MCP_SNAPSHOTS", "1").lower() in ("0", "false", "no", "off"):
+        return None
+    return os.getenv("PANDAS_MCP_SNAPSHOT_DIR",
+                     os.path.join(os.path.expanduser("~"), ".cache", "pandas-mcp", "snapshots"))
+
+
+def snapshot_path(file_path: str, encoding: Optional[str] = None,
+                  columns: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Snapshot location of a CSV and its load options.
+    
+    The name holds a hash of the path, of its modification time and size, and
+    of the options, so a changed file never matches an old snapshot.
+    
+    Args:
+        file_path: Path to the CSV file
+        encoding: File encoding
+        columns: Specific columns to load
+    
+    Returns:
+        Snapshot path, or None when snapshots are disabled or the file is small
+    """
+    directory = snapshot_dir()
+    stat = os.stat(file_path)
+    if directory is None or stat.st_size < SNAPSHOT_MIN_BYTES:
+        return None
+    path_hash = _digest(os.path.abspath(file_path))
+    stat_hash = _digest((stat.st_mtime_ns, stat.st_size))
+    option_hash = _digest((encoding, tuple(columns) if columns else None))
+    return os.path.join(directory, f"{path_hash}-{stat_hash}-{option_hash}.feather")
+
+
+def read_csv_file(file_path: str, encoding: Optional[str] = None,
+                  columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Load a CSV file, from its snapshot when one is current.
+    
+    Row-limited loads read only the first rows with the pandas C parser.
+    Files pyarrow cannot read the way pandas would (duplicate or blank
+    headers, newlines inside values, ...) also fall back to the C parser.
+    
+    Args:
+        file_path: Path to the CSV file
+        encoding: File encoding
+        columns: Specific columns to load
+        nrows: Number of rows to load
+    
+    Returns:
+        Parsed dataframe
+    """
+    if nrows is not None:
+        return pd.read_csv(file_path, encoding=encoding, usecols=columns, nrows=nrows)
+    
+    snapshot = snapshot_path(file_path, encoding, columns)
+    if snapshot is not None and os.path.exists(snapshot):
+        try:
+            return table_to_frame(feather.read_table(snapshot, memory_map=True))
+        except (pa.ArrowException, OSError):
+            # Unreadable snapshot (e.g. a partial write); parse the CSV again
+            pass
+    
+    try:
+        table = read_csv_table(file_path, encoding, columns)
+    except (pa.ArrowException, ValueError):
+        return pd.read_csv(file_path, encoding=encoding, usecols=columns)
+    
+    if snapshot is not None:
+        write_snapshot(table, snapshot)
+    return table_to_frame(table)
+
+
+def read_csv_table(file_path: str, encoding: Optional[str] = None,
+                   columns: Optional[List[str]] = None) -> pa.Table:
+    """
+    Parse a CSV file into an Arrow table typed as pandas.read_csv would type it.
+    
+    pyarrow infers dates and times, which pandas leaves as text, so those
+    columns are found from the first block and read as strings. Floats are
+    parsed exactly, as pandas does with float_precision='round_trip'.
+    
+    Args:
+        file_path: Path to the CSV file
+        encoding: File encoding
+        columns: Specific columns to load, returned in file order
+    
+    Returns:
+        Arrow table of the file
+    
+    Raises:
+        ValueError: If the header has duplicate or blank names, or a column
+            holds integers beyond int64
+        pyarrow.ArrowException: If pyarrow cannot parse the file
+    """
+    read_options = pcsv.ReadOptions(use_threads=True, block_size=BLOCK_SIZE, encoding=encoding or 'utf8')
+    convert_options = pcsv.ConvertOptions(null_values=NA_VALUES, strings_can_be_null=True,
+                                          true_values=TRUE_VALUES, false_values=FALSE_VALUES)
+    
+    with pcsv.open_csv(file_path, read_options=read_options, convert_options=convert_options) as reader:
+        schema = reader.schema
+    if len(set(schema.names)) != len(schema.names) or '' in schema.names:
+        raise ValueError("Header has duplicate or blank column names")
+    
+    convert_options.column_types = {field.name: pa.string() for field in schema
+                                    if pa.types.is_temporal(field.type)}
+    if columns is not None:
+        missing = set(columns) - set(schema.names)
+        if missing:
+            raise ValueError(f"Columns not found: {sorted(missing)}")
+        convert_options.include_columns = [name for name in schema.names if name in columns]
+    table = pcsv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+    
+    # Columns without any value are float NaN columns in pandas
+    for index, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(index, field.name, table.column(index).cast(pa.float64()))
+    
+    # Float columns reaching past int64 may be integers pyarrow rounded; check their text
+    wide = [field.name for field in table.schema if pa.types.is_floating(field.type)
+            and (pc.max(pc.abs(table.column(field.name))).as_py() or 0) >= INT64_OVERFLOW]
+    if wide:
+        convert_options.include_columns = wide
+        convert_options.column_types = {name: pa.string() for name in wide}
+        text = pcsv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+        for column in text.columns:
+            if pc.any(pc.match_substring_regex(column, r'^\s*[+-]?\d+\s*$')).as_py():
+                raise ValueError("Integers beyond int64 are only kept exact by the C parser")
+    return table
+
+
+def table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """
+    Convert a table from read_csv_table to the dataframe pandas.read_csv gives.
+    
+    Args:
+        table: Parsed CSV
+    
+    Returns:
+        Dataframe of the table
+    """
+    df = table.to_pandas()
+    # Boolean columns with missing values are objects holding NaN, not None
+    for field in table.schema:
+        if pa.types.is_boolean(field.type) and table.column(field.name).null_count:
+            df[field.name] = df[field.name].where(df[field.name].notna(), np.nan)
+    return df
+
+
+def write_snapshot(table: pa.Table, snapshot: str) -> None:
+    """
+    Write a table as an uncompressed Feather file, which loads memory-mapped.
+    
+    Snapshots of earlier versions of the same file are removed. Failures are
+    ignored: a missing snapshot only costs a parse.
+    
+    Args:
+        table: Parsed CSV
+        snapshot: Path from snapshot_path
+    """
+    directory, name = os.path.split(snapshot)
+    path_hash, stat_hash, _ = name.split('-')
+    temp_path = f"{snapshot}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for other in os.listdir(directory):
+            if other.startswith(f"{path_hash}-") and not other.startswith(f"{path_hash}-{stat_hash}-"):
+                os.remove(os.path.join(directory, other))
+        feather.write_feather(table, temp_path, compression='uncompressed')
+        os.replace(temp_path, snapshot)
+    except OSError:
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def _digest(value) -> str:
+    return hashlib.sha1(repr(value).encode('utf-8')).hexdigest()[:16]
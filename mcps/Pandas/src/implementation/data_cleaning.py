@@ -8,31 +8,70 @@ from scipy import stats
 from typing import Optional, List, Any, Dict
 import traceback
 
+from .chunked_processing import check_output_path, chunked_missing_data, should_stream
+from .dataframe_store import load_dataframe, resolve_source
+
 
 def handle_missing_data(file_path: str, strategy: str = "detect",
-                       method: Optional[str] = None, columns: Optional[List[str]] = None) -> dict:
+                       method: Optional[str] = None, columns: Optional[List[str]] = None,
+                       chunk_size: Optional[int] = None) -> dict:
     """
     Handle missing data in various ways.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         strategy: Strategy to handle missing data (detect, remove, impute)
         method: Method for imputation (mean, median, mode, forward_fill, backward_fill)
         columns: Specific columns to process
+        chunk_size: Rows per chunk for the detect and remove strategies; forces
+            chunked processing, which is otherwise used for files too large for memory
     
     Returns:
         Dictionary with missing data handling results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
                 "error_type": "FileNotFoundError"
             }
         
+        # Count (and remove) missing values of files too large for memory chunk by chunk
+        if strategy in ("detect", "remove") and should_stream(file_path, chunk_size):
+            output_path = os.path.splitext(source_path)[0] + '_no_missing.csv' if strategy == "remove" else None
+            if output_path:
+                check_output_path(source_path, output_path)
+            streamed = chunked_missing_data(source_path, output_path, chunk_size)
+            missing_info = streamed["missing_data_info"]
+            original_shape = streamed["shape"]
+            
+            if strategy == "detect":
+                return {
+                    "success": True,
+                    "file_path": file_path,
+                    "original_shape": original_shape,
+                    "missing_data_info": missing_info,
+                    "execution": streamed["execution"],
+                    "message": f"Found {missing_info['total_missing']} missing values"
+                }
+            
+            removed_rows = missing_info["rows_with_missing"]
+            return {
+                "success": True,
+                "file_path": file_path,
+                "output_file": output_path,
+                "original_shape": original_shape,
+                "new_shape": (missing_info["complete_rows"], original_shape[1]),
+                "removed_rows": removed_rows,
+                "missing_data_info": missing_info,
+                "execution": streamed["execution"],
+                "message": f"Removed {removed_rows} rows with missing data"
+            }
+        
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         original_shape = df.shape
         
         if columns:
@@ -53,6 +92,7 @@ def handle_missing_data(file_path: str, strategy: str = "detect",
             return {
                 "success": True,
                 "file_path": file_path,
+                "df_handle": df_handle,
                 "original_shape": original_shape,
                 "missing_data_info": missing_info,
                 "message": f"Found {missing_info['total_missing']} missing values"
@@ -64,12 +104,14 @@ def handle_missing_data(file_path: str, strategy: str = "detect",
             removed_rows = len(df) - len(df_cleaned)
             
             # Save cleaned data
-            output_path = file_path.replace('.csv', '_no_missing.csv')
+            output_path = os.path.splitext(source_path)[0] + '_no_missing.csv'
+            check_output_path(source_path, output_path)
             df_cleaned.to_csv(output_path, index=False)
             
             return {
                 "success": True,
                 "file_path": file_path,
+                "df_handle": df_handle,
                 "output_file": output_path,
                 "original_shape": original_shape,
                 "new_shape": df_cleaned.shape,
@@ -98,7 +140,7 @@ def handle_missing_data(file_path: str, strategy: str = "detect",
                         else:
                             fill_value = df_imputed[col].mean()
                         
-                        df_imputed[col].fillna(fill_value, inplace=True)
+                        df_imputed[col] = df_imputed[col].fillna(fill_value)
                         imputation_info[col] = {
                             "method": method,
                             "fill_value": float(fill_value),
@@ -110,14 +152,14 @@ def handle_missing_data(file_path: str, strategy: str = "detect",
                         if method == "mode":
                             fill_value = df_imputed[col].mode()[0] if not df_imputed[col].mode().empty else "Unknown"
                         elif method == "forward_fill":
-                            df_imputed[col].fillna(method='ffill', inplace=True)
+                            df_imputed[col] = df_imputed[col].ffill()
                             fill_value = "forward_fill"
                         elif method == "backward_fill":
-                            df_imputed[col].fillna(method='bfill', inplace=True)
+                            df_imputed[col] = df_imputed[col].bfill()
                             fill_value = "backward_fill"
                         else:
                             fill_value = "Unknown"
-                            df_imputed[col].fillna(fill_value, inplace=True)
+                            df_imputed[col] = df_imputed[col].fillna(fill_value)
                         
                         imputation_info[col] = {
                             "method": method,
@@ -126,12 +168,14 @@ def handle_missing_data(file_path: str, strategy: str = "detect",
                         }
             
             # Save imputed data
-            output_path = file_path.replace('.csv', '_imputed.csv')
+            output_path = os.path.splitext(source_path)[0] + '_imputed.csv'
+            check_output_path(source_path, output_path)
             df_imputed.to_csv(output_path, index=False)
             
             return {
                 "success": True,
                 "file_path": file_path,
+                "df_handle": df_handle,
                 "output_file": output_path,
                 "original_shape": original_shape,
                 "imputation_method": method,
@@ -162,7 +206,7 @@ def clean_data(file_path: str, remove_duplicates: bool = False,
     Clean data by removing duplicates, detecting outliers, and converting types.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         remove_duplicates: Whether to remove duplicate rows
         detect_outliers: Whether to detect outliers
         convert_types: Whether to optimize data types
@@ -171,7 +215,8 @@ def clean_data(file_path: str, remove_duplicates: bool = False,
         Dictionary with data cleaning results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -179,7 +224,7 @@ def clean_data(file_path: str, remove_duplicates: bool = False,
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         original_shape = df.shape
         original_memory = df.memory_usage(deep=True).sum()
         
@@ -262,12 +307,14 @@ def clean_data(file_path: str, remove_duplicates: bool = False,
         })
         
         # Save cleaned data
-        output_path = file_path.replace('.csv', '_cleaned.csv')
+        output_path = os.path.splitext(source_path)[0] + '_cleaned.csv'
+        check_output_path(source_path, output_path)
         df.to_csv(output_path, index=False)
         
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "output_file": output_path,
             "cleaning_results": cleaning_results,
             "message": f"Data cleaned successfully. Shape: {original_shape} -> {final_shape}"
@@ -7,26 +7,40 @@ import os
 from typing import Optional, List, Any, Dict
 import traceback
 
+from .dataframe_store import FORMAT_MAP, detect_file_format, get_store, load_dataframe, resolve_source
+
+
+# Rows returned by load_data per page
+PAGE_ROWS = 100
+
 
 def load_data_file(file_path: str, file_format: Optional[str] = None,
                    sheet_name: Optional[str] = None, encoding: Optional[str] = None,
-                   columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> dict:
+                   columns: Optional[List[str]] = None, nrows: Optional[int] = None,
+                   skiprows: int = 0, page_size: int = PAGE_ROWS) -> dict:
     """
     Load data from various file formats.
     
+    The whole frame is loaded into the dataframe store, but only one page of
+    rows is converted for the response; later pages are slices of the cached
+    frame.
+    
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle
         file_format: File format (csv, excel, json, parquet, hdf5)
         sheet_name: Sheet name for Excel files
         encoding: File encoding
         columns: Specific columns to load
         nrows: Number of rows to load
+        skiprows: Rows to skip before the returned page
+        page_size: Number of rows to return
     
     Returns:
         Dictionary with loaded data and metadata
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -34,85 +48,41 @@ def load_data_file(file_path: str, file_format: Optional[str] = None,
             }
         
         # Auto-detect file format if not provided
-        if file_format is None:
-            file_extension = os.path.splitext(file_path)[1].lower()
-            format_map = {
-                '.csv': 'csv',
-                '.xlsx': 'excel',
-                '.xls': 'excel',
-                '.json': 'json',
-                '.parquet': 'parquet',
-                '.h5': 'hdf5',
-                '.hdf5': 'hdf5'
-            }
-            file_format = format_map.get(file_extension, 'csv')
-        
-        # Load data based on format
-        if file_format == 'csv':
-            df = pd.read_csv(file_path, encoding=encoding, usecols=columns, nrows=nrows)
-        elif file_format == 'excel':
-            df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=columns, nrows=nrows)
-            # Handle case where multiple sheets are read (returns dict)
-            if isinstance(df, dict):
-                # If no sheet_name specified, use the first sheet
-                if sheet_name is None:
-                    df = list(df.values())[0]
-                else:
-                    df = df[sheet_name]
-        elif file_format == 'json':
-            df = pd.read_json(file_path, encoding=encoding, nrows=nrows)
-            if columns:
-                df = df[columns]
-        elif file_format == 'parquet':
-            df = pd.read_parquet(file_path, columns=columns)
-            if nrows:
-                df = df.head(nrows)
-        elif file_format == 'hdf5':
-            df = pd.read_hdf(file_path, key='data', columns=columns)
-            if nrows:
-                df = df.head(nrows)
-        else:
+        file_format = file_format or detect_file_format(source_path)
+        if file_format not in FORMAT_MAP.values():
             return {
                 "success": False,
                 "error": f"Unsupported file format: {file_format}",
                 "error_type": "ValueError"
             }
         
-        # Convert data to JSON-serializable format
-        data_dict = df.to_dict('records')
+        # Load data once; later tools reuse the parsed frame through df_handle
+        df, df_handle = load_dataframe(file_path, file_format=file_format, sheet_name=sheet_name,
+                                       encoding=encoding, columns=columns, nrows=nrows)
         
-        # Convert numpy types to Python native types for JSON serialization
-        for record in data_dict:
-            for key, value in record.items():
-                if pd.isna(value):
-                    record[key] = None
-                elif hasattr(value, 'dtype'):
-                    if 'int' in str(value.dtype):
-                        record[key] = int(value)
-                    elif 'float' in str(value.dtype):
-                        record[key] = float(value)
-                    elif 'bool' in str(value.dtype):
-                        record[key] = bool(value)
-                    else:
-                        record[key] = str(value)
+        # Convert only the requested page to JSON-serializable records
+        total_rows = len(df)
+        skiprows = max(int(skiprows), 0)
+        data = frame_to_records(df.iloc[skiprows:skiprows + max(int(page_size), 0)])
+        next_skiprows = skiprows + len(data)
         
-        # Get basic info
-        info = {
-            "shape": df.shape,
-            "columns": df.columns.tolist(),
-            "dtypes": df.dtypes.astype(str).to_dict(),
-            "memory_usage": int(df.memory_usage(deep=True).sum()),
-            "missing_values": {k: int(v) for k, v in df.isnull().sum().to_dict().items()}
-        }
+        # Basic info walks the whole frame, so it is computed once per handle, not per page
+        info = get_store().derived(df_handle, "info", lambda: frame_info(df))
         
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "file_format": file_format,
-            "data": data_dict[:100] if len(data_dict) > 100 else data_dict,  # Limit to first 100 rows
-            "total_rows": len(data_dict),
+            "data": data,
+            "total_rows": total_rows,
+            "page": {
+                "skiprows": skiprows,
+                "rows": len(data),
+                "next_skiprows": next_skiprows if next_skiprows < total_rows else None
+            },
             "info": info,
-            "message": f"Successfully loaded {len(data_dict)} rows from {file_path}"
+            "message": f"Successfully loaded {total_rows} rows from {file_path}"
         }
         
     except Exception as e:
@@ -124,6 +94,36 @@ def load_data_file(file_path: str, file_format: Optional[str] = None,
         }
 
 
+def frame_info(df: pd.DataFrame) -> Dict[str, Any]:
+    """Shape, columns, dtypes, memory usage and missing values of a dataframe."""
+    return {
+        "shape": df.shape,
+        "columns": df.columns.tolist(),
+        "dtypes": df.dtypes.astype(str).to_dict(),
+        "memory_usage": int(df.memory_usage(deep=True).sum()),
+        "missing_values": {k: int(v) for k, v in df.isnull().sum().to_dict().items()}
+    }
+
+
+def frame_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a dataframe to JSON-serializable records.
+    
+    Values keep full precision: missing values become None, numpy scalars
+    become Python numbers and timestamps become strings, as str() writes them.
+    
+    Args:
+        df: Rows to convert
+    
+    Returns:
+        List of row dictionaries
+    """
+    page = df.astype(object)
+    for column in df.select_dtypes(include=['datetime', 'datetimetz', 'timedelta']).columns:
+        page[column] = df[column].astype(str).astype(object)
+    return page.where(df.notna(), None).to_dict('records')
+
+
 def save_data_file(data: dict, file_path: str, file_format: Optional[str] = None,
                    index: bool = True) -> dict:
     """
@@ -150,17 +150,7 @@ def save_data_file(data: dict, file_path: str, file_format: Optional[str] = None
         
         # Auto-detect file format if not provided
         if file_format is None:
-            file_extension = os.path.splitext(file_path)[1].lower()
-            format_map = {
-                '.csv': 'csv',
-                '.xlsx': 'excel',
-                '.xls': 'excel',
-                '.json': 'json',
-                '.parquet': 'parquet',
-                '.h5': 'hdf5',
-                '.hdf5': 'hdf5'
-            }
-            file_format = format_map.get(file_extension, 'csv')
+            file_format = detect_file_format(file_path)
         
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -229,17 +219,7 @@ def get_file_info(file_path: str) -> dict:
         file_size = file_stats.st_size
         
         # Auto-detect file format
-        file_extension = os.path.splitext(file_path)[1].lower()
-        format_map = {
-            '.csv': 'csv',
-            '.xlsx': 'excel',
-            '.xls': 'excel',
-            '.json': 'json',
-            '.parquet': 'parquet',
-            '.h5': 'hdf5',
-            '.hdf5': 'hdf5'
-        }
-        file_format = format_map.get(file_extension, 'unknown')
+        file_format = detect_file_format(file_path, default='unknown')
         
         # Try to get basic info without loading full file
         info = {
@@ -1,12 +1,13 @@
 """
 Data profiling capabilities for quick dataset analysis.
 """
-import pandas as pd
 import numpy as np
 import os
 from typing import Optional, List, Any, Dict
 import traceback
 
+from .dataframe_store import load_dataframe, resolve_source
+
 
 def profile_data(file_path: str, include_correlations: bool = False,
                 sample_size: Optional[int] = None) -> dict:
@@ -14,7 +15,7 @@ def profile_data(file_path: str, include_correlations: bool = False,
     Generate a comprehensive data profile.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         include_correlations: Whether to include correlation analysis
         sample_size: Number of rows to sample for analysis
     
@@ -22,7 +23,8 @@ def profile_data(file_path: str, include_correlations: bool = False,
         Dictionary with data profiling results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -30,7 +32,7 @@ def profile_data(file_path: str, include_correlations: bool = False,
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         
         # Sample data if requested
         if sample_size and len(df) > sample_size:
@@ -171,6 +173,7 @@ def profile_data(file_path: str, include_correlations: bool = False,
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "basic_info": basic_info,
             "summary": summary,
             "missing_data": missing_data,
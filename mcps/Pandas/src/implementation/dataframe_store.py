@@ -0,0 +1,379 @@
+"""
+Server-side store of parsed dataframes.
+Files are parsed once and kept in an LRU cache keyed by path, modification
+time, size and load options, within a memory budget. Loading returns a
+df_handle that tools accept in place of a file path, so chained operations
+on one dataset reuse the parsed frame instead of reading the file again.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Any, Callable, Dict, Tuple
+
+import pandas as pd
+import psutil
+
+from .csv_reader import read_csv_file
+
+
+# File extension -> file format
+FORMAT_MAP = {
+    '.csv': 'csv',
+    '.xlsx': 'excel',
+    '.xls': 'excel',
+    '.json': 'json',
+    '.parquet': 'parquet',
+    '.h5': 'hdf5',
+    '.hdf5': 'hdf5'
+}
+
+# Prefix of the handles returned for loaded frames
+HANDLE_PREFIX = "df_"
+
+_HANDLE_PATTERN = re.compile(HANDLE_PREFIX + r"[0-9a-f]{12}")
+
+# Share of available memory the store may use when PANDAS_MCP_CACHE_MB is unset
+DEFAULT_BUDGET_FRACTION = 0.25
+
+_PANDAS_MAJOR = int(pd.__version__.split('.')[0])
+
+
+def detect_file_format(file_path: str, default: str = 'csv') -> str:
+    """
+    Detect a file's format from its extension.
+    
+    Args:
+        file_path: Path to the data file
+        default: Format of unknown extensions
+    
+    Returns:
+        File format (csv, excel, json, parquet, hdf5)
+    """
+    return FORMAT_MAP.get(os.path.splitext(file_path)[1].lower(), default)
+
+
+def read_data_file(file_path: str, file_format: Optional[str] = None,
+                   sheet_name: Optional[str] = None, encoding: Optional[str] = None,
+                   columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Parse a data file into a dataframe.
+    
+    Args:
+        file_path: Path to the data file
+        file_format: File format (csv, excel, json, parquet, hdf5) - detected if None
+        sheet_name: Sheet name for Excel files
+        encoding: File encoding
+        columns: Specific columns to load
+        nrows: Number of rows to load
+    
+    Returns:
+        Parsed dataframe
+    
+    Raises:
+        ValueError: If the file format is not supported
+    """
+    file_format = file_format or detect_file_format(file_path)
+    
+    if file_format == 'csv':
+        return read_csv_file(file_path, encoding=encoding, columns=columns, nrows=nrows)
+    if file_format == 'excel':
+        df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=columns, nrows=nrows)
+        # Handle case where multiple sheets are read (returns dict)
+        if isinstance(df, dict):
+            df = list(df.values())[0] if sheet_name is None else df[sheet_name]
+        return df
+    if file_format == 'json':
+        df = pd.read_json(file_path, encoding=encoding, nrows=nrows)
+        return df[columns] if columns else df
+    if file_format == 'parquet':
+        df = pd.read_parquet(file_path, columns=columns)
+        return df.head(nrows) if nrows else df
+    if file_format == 'hdf5':
+        df = pd.read_hdf(file_path, key='data', columns=columns)
+        return df.head(nrows) if nrows else df
+    raise ValueError(f"Unsupported file format: {file_format}")
+
+
+def _select_columns(df: pd.DataFrame, columns: List[str], file_format: str) -> pd.DataFrame:
+    """Columns of a full frame, ordered as read_data_file orders a column selection."""
+    if file_format in ('csv', 'excel'):
+        # usecols keeps file order
+        return df[[col for col in df.columns if col in columns]]
+    return df[list(columns)]
+
+
+def _option_key(options: Dict[str, Any]) -> Tuple:
+    """Hashable form of load options."""
+    return tuple(sorted((name, tuple(value) if isinstance(value, list) else value)
+                        for name, value in options.items()))
+
+
+def default_budget_bytes() -> int:
+    """Memory budget from PANDAS_MCP_CACHE_MB, or a share of available memory."""
+    budget_mb = os.getenv("PANDAS_MCP_CACHE_MB")
+    if budget_mb:
+        return int(float(budget_mb) * 1024 * 1024)
+    return int(psutil.virtual_memory().available * DEFAULT_BUDGET_FRACTION)
+
+
+class DataFrameStore:
+    """
+    LRU cache of parsed dataframes within a memory budget.
+    
+    A handle names a file and its load options, not a snapshot: when the
+    file changes on disk, the next lookup parses it again. Handles of evicted
+    frames stay valid and reload the file on their next use.
+    """
+    
+    def __init__(self, budget_bytes: Optional[int] = None):
+        self.budget_bytes = default_budget_bytes() if budget_bytes is None else budget_bytes
+        self._frames: "OrderedDict[Tuple, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._handles: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._derived: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def is_handle(source: str) -> bool:
+        """Whether a tool argument is a df_handle rather than a file path."""
+        return isinstance(source, str) and _HANDLE_PATTERN.fullmatch(source) is not None
+    
+    def resolve(self, source: str) -> str:
+        """
+        File path behind a tool argument.
+        
+        Args:
+            source: File path or df_handle
+        
+        Returns:
+            The file path of a known handle, otherwise source unchanged
+        """
+        with self._lock:
+            entry = self._handles.get(source)
+        return entry[0] if entry else source
+    
+    def load(self, source: str, **options: Any) -> Tuple[pd.DataFrame, str]:
+        """
+        Dataframe of a file path or df_handle, parsing the file only when needed.
+        
+        Args:
+            source: File path or df_handle
+            **options: read_data_file options (file_format, sheet_name, encoding,
+                columns, nrows); ignored for handles, which keep their own
+        
+        Returns:
+            Tuple of the dataframe and its df_handle. The frame is a copy that
+            tools may modify without affecting the cache.
+        
+        Raises:
+            FileNotFoundError: If the file or the handle is unknown
+        """
+        with self._lock:
+            if source in self._handles:
+                file_path, options = self._handles[source]
+            elif self.is_handle(source):
+                raise FileNotFoundError(f"Unknown df_handle: {source}")
+            else:
+                file_path = os.path.abspath(source)
+                options = {name: value for name, value in options.items() if value is not None}
+                options.setdefault("file_format", detect_file_format(file_path))
+        
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        option_key = _option_key(options)
+        handle = HANDLE_PREFIX + hashlib.sha1(repr((file_path, option_key)).encode()).hexdigest()[:12]
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_mtime_ns, stat.st_size, option_key)
+        
+        with self._lock:
+            self._handles[handle] = (file_path, options)
+            cached = self._frames.get(key)
+            if cached is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return self._copy(cached[0]), handle
+            if options.get("columns"):
+                # A cached frame of every column holds the projection too
+                full_options = {name: value for name, value in options.items() if name != "columns"}
+                full_key = (file_path, stat.st_mtime_ns, stat.st_size, _option_key(full_options))
+                full = self._frames.get(full_key)
+                if full is not None and set(options["columns"]) <= set(full[0].columns):
+                    self._frames.move_to_end(full_key)
+                    self.hits += 1
+                    return _select_columns(full[0], options["columns"], options["file_format"]), handle
+            self.misses += 1
+        
+        df = read_data_file(file_path, **options)
+        size = int(df.memory_usage(deep=True).sum())
+        
+        with self._lock:
+            # Drop frames of earlier versions of the file
+            for stale in [k for k in self._frames if k[0] == file_path and k[3] == option_key]:
+                self._discard(stale)
+            if size <= self.budget_bytes:
+                self._frames[key] = (df, size)
+                self.memory_bytes += size
+                while self.memory_bytes > self.budget_bytes:
+                    self._discard(next(iter(self._frames)))
+                    self.evictions += 1
+        return self._copy(df), handle
+    
+    def derived(self, handle: str, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Value computed from a handle's frame, reused while the file is unchanged.
+        
+        Args:
+            handle: df_handle returned by load
+            name: Name of the value
+            compute: Computes the value when it is not stored yet
+        
+        Returns:
+            The stored or newly computed value
+        """
+        with self._lock:
+            entry = self._handles.get(handle)
+        if entry is None:
+            return compute()
+        stat = os.stat(entry[0])
+        version = (stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            stored = self._derived.get(handle)
+            if stored is not None and stored[0] == version and name in stored[1]:
+                return stored[1][name]
+        
+        value = compute()
+        with self._lock:
+            stored = self._derived.get(handle)
+            if stored is None or stored[0] != version:
+                # Values of an earlier version of the file are dropped
+                stored = self._derived[handle] = (version, {})
+            stored[1][name] = value
+        return value
+    
+    def release(self, handle: str) -> bool:
+        """
+        Forget a handle and drop its cached frames.
+        
+        Args:
+            handle: df_handle returned by load
+        
+        Returns:
+            Whether the handle was known
+        """
+        with self._lock:
+            entry = self._handles.pop(handle, None)
+            self._derived.pop(handle, None)
+            if entry is None:
+                return False
+            file_path, options = entry
+            option_key = _option_key(options)
+            for key in [k for k in self._frames if k[0] == file_path and k[3] == option_key]:
+                self._discard(key)
+            return True
+    
+    def clear(self) -> None:
+        """Drop every cached frame and handle."""
+        with self._lock:
+            self._frames.clear()
+            self._handles.clear()
+            self._derived.clear()
+            self.memory_bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit statistics."""
+        with self._lock:
+            return {
+                "cached_frames": len(self._frames),
+                "handles": len(self._handles),
+                "memory_mb": round(self.memory_bytes / (1024 * 1024), 2),
+                "budget_mb": round(self.budget_bytes / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+    
+    def _discard(self, key: Tuple) -> None:
+        _, size = self._frames.pop(key)
+        self.memory_bytes -= size
+    
+    @staticmethod
+    def _copy(df: pd.DataFrame) -> pd.DataFrame:
+        # Copy-on-Write (always on from pandas 3) keeps shallow copies from
+        # modifying the cache; without it tools need a deep copy
+        copy_on_write = _PANDAS_MAJOR >= 3 or pd.get_option("mode.copy_on_write") is True
+        return df.copy(deep=not copy_on_write)
+
+
+_STORE: Optional[DataFrameStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> DataFrameStore:
+    """Shared store of the server process, created on first use."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = DataFrameStore()
+        return _STORE
+
+
+def resolve_source(source: str) -> str:
+    """File path behind a file path or df_handle argument."""
+    return get_store().resolve(source)
+
+
+def load_dataframe(source: str, **options: Any) -> Tuple[pd.DataFrame, str]:
+    """
+    Dataframe and df_handle of a file path or df_handle, from the shared store.
+    
+    Args:
+        source: File path or df_handle
+        **options: read_data_file options for file paths
+    
+    Returns:
+        Tuple of the dataframe and its df_handle
+    """
+    return get_store().load(source, **options)
+
+
+def manage_dataframe_store(action: str = "stats", df_handle: Optional[str] = None) -> dict:
+    """
+    Inspect or free the shared dataframe store.
+    
+    Args:
+        action: "stats" for cache statistics, "release" to forget df_handle,
+            "clear" to drop every cached frame
+        df_handle: Handle to release
+    
+    Returns:
+        Dictionary with the store statistics after the action
+    """
+    store = get_store()
+    if action == "release":
+        if not df_handle or not store.release(df_handle):
+            return {
+                "success": False,
+                "error": f"Unknown df_handle: {df_handle}",
+                "error_type": "KeyError"
+            }
+    elif action == "clear":
+        store.clear()
+    elif action != "stats":
+        return {
+            "success": False,
+            "error": f"Unknown action: {action}. Use stats, release or clear",
+            "error_type": "ValueError"
+        }
+    
+    return {
+        "success": True,
+        "action": action,
+        "store": store.stats()
+    }
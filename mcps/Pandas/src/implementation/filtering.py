@@ -4,154 +4,83 @@ Data filtering capabilities using boolean indexing.
 import pandas as pd
 import numpy as np
 import os
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Tuple
 import traceback
 
+from .chunked_processing import check_output_path, chunked_filter, should_stream
+from .dataframe_store import load_dataframe, resolve_source
+from .projection import pushdown_filter
+
 
 def filter_data(file_path: str, filter_conditions: Dict[str, Any],
-                output_file: Optional[str] = None) -> dict:
+                output_file: Optional[str] = None, chunk_size: Optional[int] = None) -> dict:
     """
     Filter data using boolean indexing.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         filter_conditions: Dictionary of column: condition pairs
         output_file: Optional output file path
+        chunk_size: Rows per chunk; forces chunked processing, which is otherwise
+            used for files too large for memory
     
     Returns:
         Dictionary with filtering results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
                 "error_type": "FileNotFoundError"
             }
         
-        # Load data
-        df = pd.read_csv(file_path)
-        original_shape = df.shape
-        
-        # Apply filters
-        filtered_df = df.copy()
-        applied_filters = []
+        if output_file is None:
+            output_file = os.path.splitext(source_path)[0] + '_filtered.csv'
         
-        for column, condition in filter_conditions.items():
-            if column not in df.columns:
-                return {
-                    "success": False,
-                    "error": f"Column '{column}' not found",
-                    "error_type": "ValueError"
-                }
-            
-            # Apply different types of filters
-            if isinstance(condition, dict):
-                # Handle validation-style conditions
-                if "min_value" in condition:
-                    mask = filtered_df[column] >= condition["min_value"]
-                    applied_filters.append(f"{column} >= {condition['min_value']}")
-                    filtered_df = filtered_df[mask]
-                elif "max_value" in condition:
-                    mask = filtered_df[column] <= condition["max_value"]
-                    applied_filters.append(f"{column} <= {condition['max_value']}")
-                    filtered_df = filtered_df[mask]
-                elif "operator" in condition and "value" in condition:
-                    # Complex condition with operator
-                    operator = condition["operator"]
-                    value = condition["value"]
-                    
-                    if operator == "eq":
-                        mask = filtered_df[column] == value
-                    elif operator == "ne":
-                        mask = filtered_df[column] != value
-                    elif operator == "gt":
-                        mask = filtered_df[column] > value
-                    elif operator == "ge":
-                        mask = filtered_df[column] >= value
-                    elif operator == "lt":
-                        mask = filtered_df[column] < value
-                    elif operator == "le":
-                        mask = filtered_df[column] <= value
-                    elif operator == "in":
-                        mask = filtered_df[column].isin(value)
-                    elif operator == "not_in":
-                        mask = ~filtered_df[column].isin(value)
-                    elif operator == "contains":
-                        mask = filtered_df[column].str.contains(str(value), na=False)
-                    elif operator == "startswith":
-                        mask = filtered_df[column].str.startswith(str(value), na=False)
-                    elif operator == "endswith":
-                        mask = filtered_df[column].str.endswith(str(value), na=False)
-                    elif operator == "between":
-                        if isinstance(value, list) and len(value) == 2:
-                            mask = filtered_df[column].between(value[0], value[1])
-                        else:
-                            return {
-                                "success": False,
-                                "error": f"Between operator requires list of 2 values",
-                                "error_type": "ValueError"
-                            }
-                    elif operator == "isnull":
-                        mask = filtered_df[column].isnull()
-                    elif operator == "notnull":
-                        mask = filtered_df[column].notnull()
-                    else:
-                        return {
-                            "success": False,
-                            "error": f"Unknown operator: {operator}",
-                            "error_type": "ValueError"
-                        }
-                    
-                    rows_before = len(filtered_df)
-                    filtered_df = filtered_df[mask]
-                    rows_after = len(filtered_df)
+        try:
+            check_output_path(source_path, output_file)
+            if should_stream(file_path, chunk_size):
+                # Filter chunk by chunk, appending matches to the output file
+                streamed = chunked_filter(source_path, lambda chunk: apply_filter_conditions(chunk, filter_conditions),
+                                          output_file, chunk_size)
+                original_shape = streamed["original_shape"]
+                final_shape = streamed["final_shape"]
+                applied_filters = streamed["applied_filters"]
+                filtered_data = streamed["preview"]
+                source_info = {"execution": streamed["execution"]}
+            else:
+                # Parquet files skip row groups and rows that fail simple conditions
+                pushed = pushdown_filter(file_path, filter_conditions)
+                if pushed is not None:
+                    original_shape = pushed["original_shape"]
+                    filtered_df, remaining_filters = apply_filter_conditions(pushed["df"], pushed["remaining_conditions"])
+                    applied_filters = pushed["applied_filters"] + remaining_filters
+                    source_info = {"execution": pushed["execution"]}
+                else:
+                    # Load data
+                    df, df_handle = load_dataframe(file_path)
+                    original_shape = df.shape
                     
-                    applied_filters.append({
-                        "column": column,
-                        "operator": operator,
-                        "value": value,
-                        "rows_before": rows_before,
-                        "rows_after": rows_after,
-                        "rows_filtered": rows_before - rows_after
-                    })
+                    # Apply filters
+                    filtered_df, applied_filters = apply_filter_conditions(df, filter_conditions)
+                    source_info = {"df_handle": df_handle}
+                final_shape = filtered_df.shape
                 
-                elif "range" in condition:
-                    # Range filter
-                    range_values = condition["range"]
-                    if isinstance(range_values, list) and len(range_values) == 2:
-                        mask = filtered_df[column].between(range_values[0], range_values[1])
-                        rows_before = len(filtered_df)
-                        filtered_df = filtered_df[mask]
-                        rows_after = len(filtered_df)
-                        
-                        applied_filters.append({
-                            "column": column,
-                            "operator": "range",
-                            "value": range_values,
-                            "rows_before": rows_before,
-                            "rows_after": rows_after,
-                            "rows_filtered": rows_before - rows_after
-                        })
-            
-            else:
-                # Simple equality filter
-                mask = filtered_df[column] == condition
-                rows_before = len(filtered_df)
-                filtered_df = filtered_df[mask]
-                rows_after = len(filtered_df)
+                # Save filtered data
+                filtered_df.to_csv(output_file, index=False)
                 
-                applied_filters.append({
-                    "column": column,
-                    "operator": "eq",
-                    "value": condition,
-                    "rows_before": rows_before,
-                    "rows_after": rows_after,
-                    "rows_filtered": rows_before - rows_after
-                })
+                # Convert to JSON-serializable format (limit to first 100 rows)
+                filtered_data = filtered_df.head(100).to_dict('records')
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "error_type": "ValueError"
+            }
         
         # Filter statistics
-        final_shape = filtered_df.shape
         total_rows_filtered = original_shape[0] - final_shape[0]
         filter_percentage = (total_rows_filtered / original_shape[0]) * 100
         
@@ -163,18 +92,10 @@ def filter_data(file_path: str, filter_conditions: Dict[str, Any],
             "applied_filters": applied_filters
         }
         
-        # Save filtered data
-        if output_file is None:
-            output_file = file_path.replace('.csv', '_filtered.csv')
-        
-        filtered_df.to_csv(output_file, index=False)
-        
-        # Convert to JSON-serializable format (limit to first 100 rows)
-        filtered_data = filtered_df.head(100).to_dict('records')
-        
         return {
             "success": True,
             "file_path": file_path,
+            **source_info,
             "output_file": output_file,
             "filter_stats": filter_stats,
             "filtered_data": filtered_data,
@@ -190,12 +111,137 @@ def filter_data(file_path: str, filter_conditions: Dict[str, Any],
         }
 
 
+def apply_filter_conditions(df: pd.DataFrame, filter_conditions: Dict[str, Any]) -> Tuple[pd.DataFrame, List[Any]]:
+    """
+    Apply filter_data conditions to a dataframe.
+    
+    Each condition's mask is computed on the whole frame and combined into
+    one boolean array, which selects the rows once at the end. The running
+    count of the combined mask gives each condition's rows before and after,
+    as if the conditions had been applied one after another.
+    
+    Args:
+        df: Data to filter
+        filter_conditions: Dictionary of column: condition pairs
+    
+    Returns:
+        Tuple of the filtered rows and a description of each applied filter
+    
+    Raises:
+        ValueError: If a column is missing or a condition is invalid
+    """
+    keep = np.ones(len(df), dtype=bool)
+    rows_before = len(df)
+    applied_filters = []
+    
+    for column, condition in filter_conditions.items():
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found")
+        
+        parsed = _parse_condition(condition)
+        if parsed is None:
+            # Conditions without a known form are ignored
+            continue
+        operator, value = parsed
+        
+        np.logical_and(keep, _condition_mask(df[column], operator, value), out=keep)
+        rows_after = int(np.count_nonzero(keep))
+        
+        if isinstance(condition, dict) and "min_value" in condition:
+            applied_filters.append(f"{column} >= {condition['min_value']}")
+        elif isinstance(condition, dict) and "max_value" in condition:
+            applied_filters.append(f"{column} <= {condition['max_value']}")
+        else:
+            applied_filters.append({
+                "column": column,
+                "operator": operator,
+                "value": value,
+                "rows_before": rows_before,
+                "rows_after": rows_after,
+                "rows_filtered": rows_before - rows_after
+            })
+        rows_before = rows_after
+    
+    # Select the rows once; a filter that keeps everything returns the frame itself
+    filtered_df = df if rows_before == len(df) else df[keep]
+    return filtered_df, applied_filters
+
+
+def _parse_condition(condition: Any) -> Optional[Tuple[str, Any]]:
+    """Operator and value of a filter_data condition, or None to ignore it."""
+    if not isinstance(condition, dict):
+        # Simple equality filter
+        return "eq", condition
+    if "min_value" in condition:
+        return "ge", condition["min_value"]
+    if "max_value" in condition:
+        return "le", condition["max_value"]
+    if "operator" in condition and "value" in condition:
+        return condition["operator"], condition["value"]
+    if "range" in condition:
+        range_values = condition["range"]
+        if isinstance(range_values, list) and len(range_values) == 2:
+            return "range", range_values
+    return None
+
+
+def _condition_mask(series: pd.Series, operator: str, value: Any) -> np.ndarray:
+    """
+    Boolean array of the rows of a column that satisfy one condition.
+    
+    Args:
+        series: Column to test
+        operator: filter_data operator
+        value: Operand of the operator
+    
+    Returns:
+        Boolean array; missing results of nullable types count as False
+    
+    Raises:
+        ValueError: If the operator is unknown or its value is invalid
+    """
+    if operator == "eq":
+        mask = series == value
+    elif operator == "ne":
+        mask = series != value
+    elif operator == "gt":
+        mask = series > value
+    elif operator == "ge":
+        mask = series >= value
+    elif operator == "lt":
+        mask = series < value
+    elif operator == "le":
+        mask = series <= value
+    elif operator == "in":
+        mask = series.isin(value)
+    elif operator == "not_in":
+        mask = ~series.isin(value)
+    elif operator == "contains":
+        mask = series.str.contains(str(value), na=False)
+    elif operator == "startswith":
+        mask = series.str.startswith(str(value), na=False)
+    elif operator == "endswith":
+        mask = series.str.endswith(str(value), na=False)
+    elif operator in ("between", "range"):
+        if isinstance(value, list) and len(value) == 2:
+            mask = series.between(value[0], value[1])
+        else:
+            raise ValueError("Between operator requires list of 2 values")
+    elif operator == "isnull":
+        mask = series.isnull()
+    elif operator == "notnull":
+        mask = series.notnull()
+    else:
+        raise ValueError(f"Unknown operator: {operator}")
+    return mask.to_numpy(dtype=bool, na_value=False)
+
+
 def advanced_filter(file_path: str, query_string: str, output_file: Optional[str] = None) -> dict:
     """
     Filter data using pandas query string.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         query_string: Pandas query string
         output_file: Optional output file path
     
@@ -203,7 +249,8 @@ def advanced_filter(file_path: str, query_string: str, output_file: Optional[str
         Dictionary with filtering results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -211,7 +258,7 @@ def advanced_filter(file_path: str, query_string: str, output_file: Optional[str
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         original_shape = df.shape
         
         # Apply query filter
@@ -239,7 +286,8 @@ def advanced_filter(file_path: str, query_string: str, output_file: Optional[str
         
         # Save filtered data
         if output_file is None:
-            output_file = file_path.replace('.csv', '_query_filtered.csv')
+            output_file = os.path.splitext(source_path)[0] + '_query_filtered.csv'
+        check_output_path(source_path, output_file)
         
         filtered_df.to_csv(output_file, index=False)
         
@@ -249,6 +297,7 @@ def advanced_filter(file_path: str, query_string: str, output_file: Optional[str
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "output_file": output_file,
             "filter_stats": filter_stats,
             "filtered_data": filtered_data,
@@ -270,7 +319,7 @@ def sample_data(file_path: str, sample_size: int, method: str = "random",
     Sample data from a dataset.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         sample_size: Number of samples to extract
         method: Sampling method (random, first, last, systematic)
         output_file: Optional output file path
@@ -279,7 +328,8 @@ def sample_data(file_path: str, sample_size: int, method: str = "random",
         Dictionary with sampling results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -287,7 +337,7 @@ def sample_data(file_path: str, sample_size: int, method: str = "random",
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         original_shape = df.shape
         
         if sample_size > len(df):
@@ -334,7 +384,8 @@ def sample_data(file_path: str, sample_size: int, method: str = "random",
         
         # Save sampled data
         if output_file is None:
-            output_file = file_path.replace('.csv', f'_sample_{method}.csv')
+            output_file = os.path.splitext(source_path)[0] + f'_sample_{method}.csv'
+        check_output_path(source_path, output_file)
         
         sampled_df.to_csv(output_file, index=False)
         
@@ -344,6 +395,7 @@ def sample_data(file_path: str, sample_size: int, method: str = "random",
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "output_file": output_file,
             "sample_stats": sample_stats,
             "sampled_data": sampled_data,
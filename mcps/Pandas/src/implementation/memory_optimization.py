@@ -8,6 +8,9 @@ import psutil
 from typing import Optional, List, Any, Dict
 import traceback
 
+from .chunked_processing import check_output_path
+from .dataframe_store import load_dataframe, resolve_source
+
 
 def optimize_memory_usage(file_path: str, optimize_dtypes: bool = True,
                          chunk_size: Optional[int] = None) -> dict:
@@ -15,7 +18,7 @@ def optimize_memory_usage(file_path: str, optimize_dtypes: bool = True,
     Optimize memory usage through efficient dtypes and chunking.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         optimize_dtypes: Whether to optimize data types
         chunk_size: Size for chunked processing
     
@@ -23,7 +26,8 @@ def optimize_memory_usage(file_path: str, optimize_dtypes: bool = True,
         Dictionary with optimization results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -39,7 +43,7 @@ def optimize_memory_usage(file_path: str, optimize_dtypes: bool = True,
         }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         
         # Get initial memory usage
         initial_memory = df.memory_usage(deep=True).sum()
@@ -133,13 +137,14 @@ def optimize_memory_usage(file_path: str, optimize_dtypes: bool = True,
         memory_reduction = ((initial_memory - final_memory) / initial_memory) * 100
         
         # Save optimized data
-        output_path = file_path.replace('.csv', '_optimized.csv')
+        output_path = os.path.splitext(source_path)[0] + '_optimized.csv'
+        check_output_path(source_path, output_path)
         optimized_df.to_csv(output_path, index=False)
         
         # Chunked processing analysis
         chunked_info = None
         if chunk_size:
-            chunked_info = analyze_chunked_processing(file_path, chunk_size)
+            chunked_info = analyze_chunked_processing(source_path, chunk_size)
         
         # Memory usage by column
         column_memory = {}
@@ -172,6 +177,7 @@ def optimize_memory_usage(file_path: str, optimize_dtypes: bool = True,
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "output_file": output_path,
             "system_memory": system_memory,
             "optimization_results": {
@@ -247,13 +253,14 @@ def get_memory_recommendations(file_path: str) -> dict:
     Get memory optimization recommendations for a dataset.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
     
     Returns:
         Dictionary with memory recommendations
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -261,7 +268,7 @@ def get_memory_recommendations(file_path: str) -> dict:
             }
         
         # Load a sample to analyze
-        df_sample = pd.read_csv(file_path, nrows=1000)
+        df_sample = pd.read_csv(source_path, nrows=1000)
         
         recommendations = []
         potential_savings = 0
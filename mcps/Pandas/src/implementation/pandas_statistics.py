@@ -1,37 +1,47 @@
 """
 Statistical analysis capabilities for comprehensive data analysis.
 """
-import pandas as pd
 import numpy as np
 import os
 from scipy import stats
 from typing import Optional, List, Any, Dict
 import traceback
 
+from .chunked_processing import chunked_statistical_summary, should_stream
+from .dataframe_store import load_dataframe, resolve_source
+from .projection import project_columns
+
 
 def get_statistical_summary(file_path: str, columns: Optional[List[str]] = None,
-                           include_distributions: bool = False) -> dict:
+                           include_distributions: bool = False, chunk_size: Optional[int] = None) -> dict:
     """
     Generate comprehensive statistical summaries.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         columns: Specific columns to analyze
         include_distributions: Whether to include distribution analysis
+        chunk_size: Rows per chunk; forces chunked processing, which is otherwise
+            used for files too large for memory
     
     Returns:
         Dictionary with statistical summaries
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
                 "error_type": "FileNotFoundError"
             }
         
-        # Load data
-        df = pd.read_csv(file_path)
+        # Summarize files too large for memory chunk by chunk
+        if should_stream(file_path, chunk_size):
+            return chunked_statistical_summary(source_path, columns, include_distributions, chunk_size)
+        
+        # Load data, only the requested columns when given
+        df, df_handle = load_dataframe(file_path, columns=project_columns(file_path, columns or []))
         
         if columns:
             df = df[columns]
@@ -90,6 +100,7 @@ def get_statistical_summary(file_path: str, columns: Optional[List[str]] = None,
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "shape": df.shape,
             "basic_statistics": basic_stats,
             "additional_statistics": additional_stats,
@@ -113,7 +124,7 @@ def get_correlation_analysis(file_path: str, method: str = "pearson",
     Perform correlation analysis.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         method: Correlation method (pearson, spearman, kendall)
         columns: Specific columns to analyze
     
@@ -121,15 +132,16 @@ def get_correlation_analysis(file_path: str, method: str = "pearson",
         Dictionary with correlation results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
                 "error_type": "FileNotFoundError"
             }
         
-        # Load data
-        df = pd.read_csv(file_path)
+        # Load data, only the requested columns when given
+        df, df_handle = load_dataframe(file_path, columns=project_columns(file_path, columns or []))
         
         # Select numeric columns
         numeric_df = df.select_dtypes(include=[np.number])
@@ -166,6 +178,7 @@ def get_correlation_analysis(file_path: str, method: str = "pearson",
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "method": method,
             "correlation_matrix": correlation_dict,
             "high_correlations": high_correlations,
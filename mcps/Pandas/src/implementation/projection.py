@@ -0,0 +1,196 @@
+"""
+Column projection and Parquet predicate pushdown.
+Tools given a file path read only the columns they use. filter_data turns
+simple conditions on Parquet files into a pyarrow dataset filter, so row
+groups whose statistics cannot match are skipped and only matching rows
+are decoded.
+"""
+import re
+from typing import Optional, List, Any, Dict, Iterable
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from .chunked_processing import read_columns
+from .dataframe_store import detect_file_format, get_store
+
+
+# Formats whose readers skip unread columns
+PROJECTABLE_FORMATS = ("csv", "parquet")
+
+# filter_data operators that have a pyarrow equivalent
+PUSHABLE_OPERATORS = ("eq", "ne", "gt", "ge", "lt", "le", "in", "not_in", "between", "isnull", "notnull")
+
+
+def project_columns(file_path: str, needed: Iterable[str],
+                    query_string: Optional[str] = None) -> Optional[List[str]]:
+    """
+    Columns a tool should load from a file.
+    
+    Args:
+        file_path: File path or df_handle passed to the tool
+        needed: Columns the tool uses
+        query_string: DataFrame.query string the tool applies; the columns it
+            names are needed too
+    
+    Returns:
+        The needed columns present in the file, in file order, or None to load
+        every column (handles, formats read whole, or all columns needed)
+    """
+    if get_store().is_handle(file_path) or detect_file_format(file_path) not in PROJECTABLE_FORMATS:
+        return None
+    needed = set(needed)
+    file_columns = read_columns(file_path)
+    columns = [col for col in file_columns if col in needed or _in_query(col, query_string)]
+    if not columns or len(columns) == len(file_columns):
+        return None
+    return columns
+
+
+def pushdown_filter(file_path: str, filter_conditions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Read the rows of a Parquet file that match the leading pushable conditions.
+    
+    Conditions are pushed in order until the first one pyarrow cannot
+    evaluate as pandas would (string matching, unknown columns, lists with
+    missing values, ...); that one and the rest are left for pandas. The
+    per-condition row counts are taken from the file, as filter_data reports
+    them.
+    
+    Args:
+        file_path: File path or df_handle passed to filter_data
+        filter_conditions: Dictionary of column: condition pairs
+    
+    Returns:
+        Dictionary with the matching rows ("df"), the file shape, the applied
+        filters, the conditions left to apply and execution details, or None
+        when nothing can be pushed down
+    """
+    if get_store().is_handle(file_path) or detect_file_format(file_path) != "parquet":
+        return None
+    
+    dataset = ds.dataset(file_path, format="parquet")
+    pushed = []
+    for column, condition in filter_conditions.items():
+        if column not in dataset.schema.names:
+            break
+        expression = _condition_expression(column, condition)
+        if expression is None:
+            break
+        pushed.append((column, condition, expression))
+    if not pushed:
+        return None
+    
+    try:
+        total_rows = dataset.count_rows()
+        applied_filters = []
+        combined = None
+        rows_before = total_rows
+        for column, condition, expression in pushed:
+            combined = expression if combined is None else combined & expression
+            rows_after = dataset.count_rows(filter=combined)
+            applied_filters.append(_describe_condition(column, condition, rows_before, rows_after))
+            rows_before = rows_after
+        df = pd.read_parquet(file_path, filters=combined)
+    except (pa.ArrowException, TypeError):
+        # Types pyarrow cannot compare (e.g. dates against strings); let pandas filter
+        return None
+    
+    row_groups = sum(fragment.metadata.num_row_groups for fragment in dataset.get_fragments())
+    row_groups_read = sum(len(fragment.split_by_row_group(combined)) for fragment in dataset.get_fragments())
+    return {
+        "df": df,
+        "original_shape": (total_rows, len(dataset.schema.names)),
+        "applied_filters": applied_filters,
+        "remaining_conditions": dict(list(filter_conditions.items())[len(pushed):]),
+        "execution": {
+            "mode": "pushdown",
+            "pushed_conditions": [column for column, _, _ in pushed],
+            "row_groups": row_groups,
+            "row_groups_read": row_groups_read,
+            "rows_read": len(df)
+        }
+    }
+
+
+def _condition_expression(column: str, condition: Any) -> Optional[ds.Expression]:
+    """pyarrow expression selecting the rows filter_data keeps, or None."""
+    field = pc.field(column)
+    if not isinstance(condition, dict):
+        operator, value = "eq", condition
+    elif "min_value" in condition:
+        operator, value = "ge", condition["min_value"]
+    elif "max_value" in condition:
+        operator, value = "le", condition["max_value"]
+    elif "operator" in condition and "value" in condition:
+        operator, value = condition["operator"], condition["value"]
+    elif "range" in condition:
+        operator, value = "between", condition["range"]
+    else:
+        return None
+    
+    if operator not in PUSHABLE_OPERATORS:
+        return None
+    if operator in ("in", "not_in"):
+        if not isinstance(value, (list, tuple)) or any(pd.isna(item) for item in value):
+            return None
+    elif operator == "between":
+        if not isinstance(value, list) or len(value) != 2 or any(pd.isna(item) for item in value):
+            return None
+    elif operator not in ("isnull", "notnull") and (isinstance(value, (list, dict)) or pd.isna(value)):
+        return None
+    
+    missing = field.is_null(nan_is_null=True)
+    if operator == "eq":
+        return field == value
+    if operator == "ne":
+        # pandas keeps missing values for !=
+        return (field != value) | missing
+    if operator == "gt":
+        return field > value
+    if operator == "ge":
+        return field >= value
+    if operator == "lt":
+        return field < value
+    if operator == "le":
+        return field <= value
+    if operator == "in":
+        return field.isin(list(value))
+    if operator == "not_in":
+        return ~field.isin(list(value)) | missing
+    if operator == "between":
+        return (field >= value[0]) & (field <= value[1])
+    if operator == "isnull":
+        return missing
+    return ~missing
+
+
+def _describe_condition(column: str, condition: Any, rows_before: int, rows_after: int) -> Any:
+    """applied_filters entry of a pushed condition, as apply_filter_conditions writes it."""
+    if not isinstance(condition, dict):
+        operator, value = "eq", condition
+    elif "min_value" in condition:
+        return f"{column} >= {condition['min_value']}"
+    elif "max_value" in condition:
+        return f"{column} <= {condition['max_value']}"
+    elif "operator" in condition:
+        operator, value = condition["operator"], condition["value"]
+    else:
+        operator, value = "range", condition["range"]
+    return {
+        "column": column,
+        "operator": operator,
+        "value": value,
+        "rows_before": rows_before,
+        "rows_after": rows_after,
+        "rows_filtered": rows_before - rows_after
+    }
+
+
+def _in_query(column: str, query_string: Optional[str]) -> bool:
+    """Whether a query string may refer to a column, as a word or in backticks."""
+    if not query_string:
+        return False
+    return f"`{column}`" in query_string or re.search(rf"(?<!\w){re.escape(str(column))}(?!\w)", query_string) is not None
@@ -7,6 +7,9 @@ import os
 from typing import Optional, List, Any, Dict
 import traceback
 
+from .chunked_processing import check_output_path
+from .dataframe_store import load_dataframe, resolve_source
+
 
 def time_series_operations(file_path: str, date_column: str, operation: str,
                           window_size: Optional[int] = None, frequency: Optional[str] = None) -> dict:
@@ -14,7 +17,7 @@ def time_series_operations(file_path: str, date_column: str, operation: str,
     Perform time series operations on data.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         date_column: Column containing date/time information
         operation: Type of operation (resample, rolling, lag, diff)
         window_size: Window size for rolling operations
@@ -24,7 +27,8 @@ def time_series_operations(file_path: str, date_column: str, operation: str,
         Dictionary with time series results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -32,7 +36,7 @@ def time_series_operations(file_path: str, date_column: str, operation: str,
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         
         # Check if date column exists
         if date_column not in df.columns:
@@ -164,7 +168,8 @@ def time_series_operations(file_path: str, date_column: str, operation: str,
             }
         
         # Save result
-        output_path = file_path.replace('.csv', f'_{operation}.csv')
+        output_path = os.path.splitext(source_path)[0] + f'_{operation}.csv'
+        check_output_path(source_path, output_path)
         result_df.to_csv(output_path, index=False)
         
         # Convert to JSON-serializable format (limit to first 100 rows)
@@ -173,6 +178,7 @@ def time_series_operations(file_path: str, date_column: str, operation: str,
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "output_file": output_path,
             "operation_info": operation_info,
             "results": result_dict,
@@ -194,7 +200,7 @@ def detect_seasonality(file_path: str, date_column: str, value_column: str,
     Detect seasonality in time series data.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         date_column: Column containing date/time information
         value_column: Column containing values to analyze
         period: Expected period length (e.g., 12 for monthly data)
@@ -203,7 +209,8 @@ def detect_seasonality(file_path: str, date_column: str, value_column: str,
         Dictionary with seasonality detection results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -211,7 +218,7 @@ def detect_seasonality(file_path: str, date_column: str, value_column: str,
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         
         # Check if columns exist
         if date_column not in df.columns:
@@ -287,6 +294,7 @@ def detect_seasonality(file_path: str, date_column: str, value_column: str,
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "value_column": value_column,
             "seasonality_results": seasonality_results,
             "message": f"Seasonality analysis completed for {value_column}"
@@ -7,85 +7,91 @@ import os
 from typing import Optional, List, Any, Dict
 import traceback
 
+from .chunked_processing import DECOMPOSABLE_OPERATIONS, check_output_path, chunked_groupby, read_columns, should_stream
+from .dataframe_store import load_dataframe, resolve_source
+from .projection import project_columns
+
 
 def groupby_operations(file_path: str, group_by: List[str], operations: Dict[str, str],
-                      filter_condition: Optional[str] = None) -> dict:
+                      filter_condition: Optional[str] = None, chunk_size: Optional[int] = None) -> dict:
     """
     Perform groupby operations on data.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         group_by: Columns to group by
         operations: Dictionary of column: operation pairs
         filter_condition: Optional filter condition
+        chunk_size: Rows per chunk; forces chunked processing, which is otherwise
+            used for files too large for memory when every operation is decomposable
     
     Returns:
         Dictionary with groupby results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
                 "error_type": "FileNotFoundError"
             }
         
-        # Load data
-        df = pd.read_csv(file_path)
+        streaming = should_stream(file_path, chunk_size)
+        if streaming:
+            agg_dict = build_agg_dict(operations, read_columns(source_path))
+            # Large files fall back to memory for median and nunique unless chunks were requested
+            streaming = bool(chunk_size) or all(op in DECOMPOSABLE_OPERATIONS for op in agg_dict.values())
         
-        # Apply filter if provided
-        if filter_condition:
+        if streaming:
+            # Merge per-group partial aggregates chunk by chunk
             try:
-                df = df.query(filter_condition)
-            except Exception as e:
+                grouped = chunked_groupby(source_path, group_by, agg_dict, filter_condition, chunk_size)
+            except ValueError as e:
                 return {
                     "success": False,
-                    "error": f"Filter condition error: {str(e)}",
+                    "error": str(e),
                     "error_type": "ValueError"
                 }
-        
-        # Check if group_by columns exist
-        missing_cols = [col for col in group_by if col not in df.columns]
-        if missing_cols:
-            return {
-                "success": False,
-                "error": f"Group by columns not found: {missing_cols}",
-                "error_type": "ValueError"
-            }
-        
-        # Group by operations
-        grouped = df.groupby(group_by)
-        
-        # Apply aggregations
-        agg_dict = {}
-        for col, operation in operations.items():
-            if col not in df.columns:
-                continue
+            result = grouped["result"]
+            original_rows = grouped["rows"]
+            source_info = {"execution": grouped["execution"]}
+        else:
+            # Load only the grouped, aggregated and filtered columns
+            columns = project_columns(file_path, [*group_by, *operations], filter_condition)
+            df, df_handle = load_dataframe(file_path, columns=columns)
             
-            if operation == "count":
-                agg_dict[col] = "count"
-            elif operation == "sum":
-                agg_dict[col] = "sum"
-            elif operation == "mean":
-                agg_dict[col] = "mean"
-            elif operation == "median":
-                agg_dict[col] = "median"
-            elif operation == "std":
-                agg_dict[col] = "std"
-            elif operation == "min":
-                agg_dict[col] = "min"
-            elif operation == "max":
-                agg_dict[col] = "max"
-            elif operation == "nunique":
-                agg_dict[col] = "nunique"
-            else:
-                agg_dict[col] = "mean"  # Default to mean
-        
-        # Perform aggregation
-        result = grouped.agg(agg_dict)
-        
-        # Reset index to make group columns regular columns
-        result = result.reset_index()
+            # Apply filter if provided
+            if filter_condition:
+                try:
+                    df = df.query(filter_condition)
+                except Exception as e:
+                    return {
+                        "success": False,
+                        "error": f"Filter condition error: {str(e)}",
+                        "error_type": "ValueError"
+                    }
+            
+            # Check if group_by columns exist
+            missing_cols = [col for col in group_by if col not in df.columns]
+            if missing_cols:
+                return {
+                    "success": False,
+                    "error": f"Group by columns not found: {missing_cols}",
+                    "error_type": "ValueError"
+                }
+            
+            # Group by operations
+            grouped = df.groupby(group_by)
+            agg_dict = build_agg_dict(operations, df.columns)
+            
+            # Perform aggregation
+            result = grouped.agg(agg_dict)
+            
+            # Reset index to make group columns regular columns
+            result = result.reset_index()
+            original_rows = len(df)
+            source_info = {"df_handle": df_handle}
         
         # Convert to JSON-serializable format
         result_dict = result.to_dict('records')
@@ -96,17 +102,19 @@ def groupby_operations(file_path: str, group_by: List[str], operations: Dict[str
             "operations": operations,
             "filter_condition": filter_condition,
             "number_of_groups": len(result),
-            "original_rows": len(df),
+            "original_rows": original_rows,
             "aggregated_columns": list(agg_dict.keys())
         }
         
         # Save result
-        output_path = file_path.replace('.csv', '_grouped.csv')
+        output_path = os.path.splitext(source_path)[0] + '_grouped.csv'
+        check_output_path(source_path, output_path)
         result.to_csv(output_path, index=False)
         
         return {
             "success": True,
             "file_path": file_path,
+            **source_info,
             "output_file": output_path,
             "group_info": group_info,
             "results": result_dict,
@@ -122,6 +130,29 @@ def groupby_operations(file_path: str, group_by: List[str], operations: Dict[str
         }
 
 
+def build_agg_dict(operations: Dict[str, str], columns) -> Dict[str, str]:
+    """
+    Map requested operations to pandas aggregations, skipping unknown columns.
+    
+    Args:
+        operations: Dictionary of column: operation pairs
+        columns: Columns of the data
+    
+    Returns:
+        Dictionary of column: aggregation; unknown operations become mean
+    """
+    agg_dict = {}
+    for col, operation in operations.items():
+        if col not in columns:
+            continue
+        
+        if operation in ("count", "sum", "mean", "median", "std", "min", "max", "nunique"):
+            agg_dict[col] = operation
+        else:
+            agg_dict[col] = "mean"  # Default to mean
+    return agg_dict
+
+
 def merge_datasets(left_file: str, right_file: str, join_type: str = "inner",
                   left_on: Optional[str] = None, right_on: Optional[str] = None,
                   on: Optional[str] = None) -> dict:
@@ -129,8 +160,8 @@ def merge_datasets(left_file: str, right_file: str, join_type: str = "inner",
     Merge two datasets.
     
     Args:
-        left_file: Path to the left dataset
-        right_file: Path to the right dataset
+        left_file: Path to the left dataset or its df_handle
+        right_file: Path to the right dataset or its df_handle
         join_type: Type of join (inner, outer, left, right)
         left_on: Column to join on in left dataset
         right_on: Column to join on in right dataset
@@ -140,14 +171,15 @@ def merge_datasets(left_file: str, right_file: str, join_type: str = "inner",
         Dictionary with merge results
     """
     try:
-        if not os.path.exists(left_file):
+        left_path = resolve_source(left_file)
+        if not os.path.exists(left_path):
             return {
                 "success": False,
                 "error": f"Left file not found: {left_file}",
                 "error_type": "FileNotFoundError"
             }
         
-        if not os.path.exists(right_file):
+        if not os.path.exists(resolve_source(right_file)):
             return {
                 "success": False,
                 "error": f"Right file not found: {right_file}",
@@ -155,8 +187,8 @@ def merge_datasets(left_file: str, right_file: str, join_type: str = "inner",
             }
         
         # Load datasets
-        left_df = pd.read_csv(left_file)
-        right_df = pd.read_csv(right_file)
+        left_df, left_handle = load_dataframe(left_file)
+        right_df, right_handle = load_dataframe(right_file)
         
         # Determine join keys
         if on:
@@ -203,7 +235,8 @@ def merge_datasets(left_file: str, right_file: str, join_type: str = "inner",
         }
         
         # Save merged dataset
-        output_path = left_file.replace('.csv', '_merged.csv')
+        output_path = os.path.splitext(left_path)[0] + '_merged.csv'
+        check_output_path(resolve_source(right_file), output_path)
         merged_df.to_csv(output_path, index=False)
         
         # Convert to JSON-serializable format (limit to first 100 rows)
@@ -213,6 +246,8 @@ def merge_datasets(left_file: str, right_file: str, join_type: str = "inner",
             "success": True,
             "left_file": left_file,
             "right_file": right_file,
+            "left_handle": left_handle,
+            "right_handle": right_handle,
             "output_file": output_path,
             "merge_stats": merge_stats,
             "merged_data": merged_dict,
@@ -234,7 +269,7 @@ def create_pivot_table(file_path: str, index: List[str], columns: Optional[List[
     Create a pivot table from data.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         index: Columns to use as row index
         columns: Columns to use as column headers
         values: Columns to aggregate
@@ -244,7 +279,8 @@ def create_pivot_table(file_path: str, index: List[str], columns: Optional[List[
         Dictionary with pivot table results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -252,7 +288,7 @@ def create_pivot_table(file_path: str, index: List[str], columns: Optional[List[
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         
         # Check if index columns exist
         missing_cols = [col for col in index if col not in df.columns]
@@ -313,12 +349,14 @@ def create_pivot_table(file_path: str, index: List[str], columns: Optional[List[
         }
         
         # Save pivot table
-        output_path = file_path.replace('.csv', '_pivot.csv')
+        output_path = os.path.splitext(source_path)[0] + '_pivot.csv'
+        check_output_path(source_path, output_path)
         pivot_table.to_csv(output_path, index=False)
         
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "output_file": output_path,
             "pivot_info": pivot_info,
             "pivot_table": pivot_dict,
@@ -8,20 +8,23 @@ from scipy import stats
 from typing import Optional, List, Any, Dict
 import traceback
 
+from .dataframe_store import load_dataframe, resolve_source
+
 
 def validate_data(file_path: str, validation_rules: Dict[str, Dict[str, Any]]) -> dict:
     """
     Validate data against specified rules.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         validation_rules: Dictionary of column: rules pairs
     
     Returns:
         Dictionary with validation results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -29,7 +32,7 @@ def validate_data(file_path: str, validation_rules: Dict[str, Dict[str, Any]]) -
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         
         validation_results = {}
         overall_valid = True
@@ -177,6 +180,7 @@ def validate_data(file_path: str, validation_rules: Dict[str, Dict[str, Any]]) -
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "validation_summary": summary,
             "validation_results": validation_results,
             "message": f"Validation completed: {valid_columns}/{total_columns} columns valid"
@@ -197,7 +201,7 @@ def hypothesis_testing(file_path: str, test_type: str, column1: str,
     Perform hypothesis testing on data.
     
     Args:
-        file_path: Path to the data file
+        file_path: Path to the data file or a df_handle from load_data
         test_type: Type of test (t_test, chi_square, anova, correlation)
         column1: First column for testing
         column2: Second column for testing (if needed)
@@ -207,7 +211,8 @@ def hypothesis_testing(file_path: str, test_type: str, column1: str,
         Dictionary with hypothesis test results
     """
     try:
-        if not os.path.exists(file_path):
+        source_path = resolve_source(file_path)
+        if not os.path.exists(source_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
@@ -215,7 +220,7 @@ def hypothesis_testing(file_path: str, test_type: str, column1: str,
             }
         
         # Load data
-        df = pd.read_csv(file_path)
+        df, df_handle = load_dataframe(file_path)
         
         # Check if columns exist
         if column1 not in df.columns:
@@ -349,6 +354,7 @@ def hypothesis_testing(file_path: str, test_type: str, column1: str,
         return {
             "success": True,
             "file_path": file_path,
+            "df_handle": df_handle,
             "test_info": test_info,
             "results": interpretation,
             "message": f"{test_type} test completed: {'significant' if is_significant else 'not significant'} (p={p_value:.4f})"
@@ -33,6 +33,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 # Import implementation modules directly
 from implementation.data_io import load_data_file, save_data_file, get_file_info
+from implementation.dataframe_store import manage_dataframe_store
 from implementation.pandas_statistics import get_statistical_summary, get_correlation_analysis
 from implementation.data_cleaning import handle_missing_data, clean_data
 from implementation.transformations import groupby_operations, merge_datasets, create_pivot_table
@@ -86,6 +87,13 @@ and efficient data processing for optimal performance.
 - Automatic data type inference and optimization
 - Memory usage reporting and recommendations
 
+**Dataframe Store**:
+- The parsed frame is kept on the server and identified by the returned df_handle
+- Pass df_handle instead of file_path to any analysis tool to skip re-parsing the file
+- Unchanged files loaded with the same options are parsed only once
+- CSVs are parsed by the multithreaded pyarrow reader and cached as Feather snapshots, so reloads of unchanged files are memory-mapped
+- Only one page of rows is returned; page through the data with skiprows and page_size on the df_handle
+
 **Prerequisites**: File must exist and be readable
 **Tools to use after this**: profile_data() for initial analysis, clean_data() for quality improvement
 
@@ -102,29 +110,35 @@ async def load_data_tool(
     sheet_name: Optional[str] = None,
     encoding: Optional[str] = None,
     columns: Optional[List[str]] = None,
-    nrows: Optional[int] = None
+    nrows: Optional[int] = None,
+    skiprows: int = 0,
+    page_size: int = 100
 ) -> dict:
     """
     Load data from various file formats with comprehensive parsing options.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         file_format: File format (csv, excel, json, parquet, hdf5) - auto-detected if None
         sheet_name: Excel sheet name or index (for Excel files)
         encoding: Character encoding (utf-8, latin-1, etc.) - auto-detected if None
         columns: List of specific columns to load (None loads all columns)
         nrows: Maximum number of rows to load (None loads all rows)
+        skiprows: Rows to skip before the returned page of data
+        page_size: Number of rows to return in data
     
     Returns:
         Dictionary containing:
-        - data: Loaded dataset in structured format
+        - df_handle: Handle of the parsed frame, accepted by the other tools in place of file_path
+        - data: One page of the loaded dataset in structured format
+        - page: skiprows of the page, its row count and the skiprows of the next page
         - metadata: File information, data types, and loading statistics
         - data_info: Shape, columns, and data quality metrics
         - loading_stats: Performance metrics and parsing information
     """
     try:
         logger.info(f"Loading data from: {file_path}")
-        return load_data_file(file_path, file_format, sheet_name, encoding, columns, nrows)
+        return load_data_file(file_path, file_format, sheet_name, encoding, columns, nrows, skiprows, page_size)
     except Exception as e:
         logger.error(f"Data loading error: {e}")
         return {
@@ -204,6 +218,56 @@ async def save_data_tool(
             "isError": True
         }
 
+@mcp.tool(
+    name="manage_dataframe_store",
+    description="""Inspect or free the server-side store of parsed dataframes.
+
+load_data and every analysis tool keep the frames they parse in an LRU cache,
+keyed by file path, modification time and load options, so chained operations
+on one dataset parse it only once. The cache stays within a memory budget
+(PANDAS_MCP_CACHE_MB, default a quarter of available memory) and evicts the
+least recently used frames first.
+
+**Actions**:
+- **stats**: Cached frames, memory used, budget, hits, misses and evictions
+- **release**: Forget one df_handle and drop its cached frame
+- **clear**: Drop every cached frame and handle
+
+**Prerequisites**: None
+**Tools to use before this**: load_data() to obtain a df_handle
+
+Use this tool when:
+- Checking whether repeated analyses reuse the parsed data
+- Freeing memory after finishing with a large dataset
+- Forcing a fresh parse of every file"""
+)
+async def manage_dataframe_store_tool(
+    action: str = "stats",
+    df_handle: Optional[str] = None
+) -> dict:
+    """
+    Inspect or free the dataframe store.
+    
+    Args:
+        action: Store action (stats, release, clear)
+        df_handle: Handle to release (for the release action)
+    
+    Returns:
+        Dictionary containing:
+        - action: The action performed
+        - store: Cached frames, memory usage, budget and hit statistics
+    """
+    try:
+        logger.info(f"Dataframe store action: {action}")
+        return manage_dataframe_store(action, df_handle)
+    except Exception as e:
+        logger.error(f"Dataframe store error: {e}")
+        return {
+            "content": [{"text": f'{{"success": false, "error": "{str(e)}", "error_type": "DataFrameStoreError"}}'}],
+            "_meta": {"tool": "manage_dataframe_store", "error": "DataFrameStoreError"},
+            "isError": True
+        }
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # STATISTICAL ANALYSIS TOOLS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -250,15 +314,17 @@ Use this tool when:
 async def statistical_summary_tool(
     file_path: str,
     columns: Optional[List[str]] = None,
-    include_distributions: bool = False
+    include_distributions: bool = False,
+    chunk_size: Optional[int] = None
 ) -> dict:
     """
     Generate comprehensive statistical summary with advanced analytics.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         columns: List of specific columns to analyze (None analyzes all numerical columns)
         include_distributions: Whether to include distribution analysis and normality tests
+        chunk_size: Rows per chunk to process the file out of core (None chunks only files too large for memory)
     
     Returns:
         Dictionary containing:
@@ -269,7 +335,7 @@ async def statistical_summary_tool(
     """
     try:
         logger.info(f"Generating statistical summary for: {file_path}")
-        return get_statistical_summary(file_path, columns, include_distributions)
+        return get_statistical_summary(file_path, columns, include_distributions, chunk_size)
     except Exception as e:
         logger.error(f"Statistical analysis error: {e}")
         return {
@@ -331,7 +397,7 @@ async def correlation_analysis_tool(
     Perform comprehensive correlation analysis with statistical significance testing.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         method: Correlation method (pearson, spearman, kendall) for different data types
         columns: List of specific columns to analyze (None analyzes all numerical columns)
     
@@ -411,7 +477,7 @@ async def hypothesis_testing_tool(
     Perform comprehensive statistical hypothesis testing with multiple test types and advanced analysis.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         test_type: Type of hypothesis test (t_test, chi_square, anova, normality, mann_whitney)
         column1: Primary column for testing (numerical or categorical based on test type)
         column2: Secondary column for two-sample tests (None for single-sample tests)
@@ -488,16 +554,18 @@ async def handle_missing_data_tool(
     file_path: str,
     strategy: str = "detect",
     method: Optional[str] = None,
-    columns: Optional[List[str]] = None
+    columns: Optional[List[str]] = None,
+    chunk_size: Optional[int] = None
 ) -> dict:
     """
     Handle missing data with comprehensive strategies and statistical methods.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         strategy: Missing data strategy (detect, impute, remove, analyze)
         method: Imputation method (mean, median, mode, forward_fill, backward_fill, interpolate)
         columns: List of specific columns to process (None processes all columns)
+        chunk_size: Rows per chunk for detect and remove (None chunks only files too large for memory)
     
     Returns:
         Dictionary containing:
@@ -508,7 +576,7 @@ async def handle_missing_data_tool(
     """
     try:
         logger.info(f"Handling missing data in: {file_path}")
-        return handle_missing_data(file_path, strategy, method, columns)
+        return handle_missing_data(file_path, strategy, method, columns, chunk_size)
     except Exception as e:
         logger.error(f"Missing data handling error: {e}")
         return {
@@ -573,7 +641,7 @@ async def clean_data_tool(
     Perform comprehensive data cleaning with advanced quality improvement techniques.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         remove_duplicates: Whether to identify and remove duplicate records
         detect_outliers: Whether to detect outliers using statistical methods (IQR, Z-score)
         convert_types: Whether to automatically convert data types for optimization
@@ -651,16 +719,19 @@ async def groupby_operations_tool(
     file_path: str,
     group_by: List[str],
     operations: Dict[str, str],
-    filter_condition: Optional[str] = None
+    filter_condition: Optional[str] = None,
+    chunk_size: Optional[int] = None
 ) -> dict:
     """
     Perform sophisticated groupby operations with comprehensive aggregation options.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         group_by: List of columns to group by
         operations: Dictionary of column:operation pairs (sum, mean, count, min, max, std)
         filter_condition: Optional filter condition to apply before grouping
+        chunk_size: Rows per chunk to process the file out of core; chunked groupby supports
+                    count, sum, mean, std, min and max (None chunks only files too large for memory)
     
     Returns:
         Dictionary containing:
@@ -671,7 +742,7 @@ async def groupby_operations_tool(
     """
     try:
         logger.info(f"Performing groupby operations on: {file_path}")
-        return groupby_operations(file_path, group_by, operations, filter_condition)
+        return groupby_operations(file_path, group_by, operations, filter_condition, chunk_size)
     except Exception as e:
         logger.error(f"Groupby operations error: {e}")
         return {
@@ -745,8 +816,8 @@ async def merge_datasets_tool(
     Merge and join datasets with comprehensive integration capabilities.
     
     Args:
-        left_file: Absolute path to the left dataset file
-        right_file: Absolute path to the right dataset file
+        left_file: Absolute path to the left dataset file, or its df_handle
+        right_file: Absolute path to the right dataset file, or its df_handle
         join_type: Type of join operation (inner, outer, left, right)
         left_on: Column name in left dataset for joining
         right_on: Column name in right dataset for joining
@@ -836,7 +907,7 @@ async def pivot_table_tool(
     Create sophisticated pivot tables with comprehensive aggregation options.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         index: List of columns to use as row index
         columns: List of columns to use as column headers (None for simple aggregation)
         values: List of columns to aggregate (None uses all numerical columns)
@@ -929,7 +1000,7 @@ async def time_series_operations_tool(
     Perform comprehensive time series operations with advanced temporal analysis.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         date_column: Column name containing datetime information
         operation: Time series operation (resample, rolling_mean, lag, trend, seasonality)
         window_size: Window size for rolling operations (required for rolling operations)
@@ -1028,7 +1099,7 @@ async def validate_data_tool(
     Perform comprehensive data validation with advanced constraint checking and quality assessment.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         validation_rules: Dictionary of validation rules with structure:
                          {column_name: {rule_type: rule_value}}
                          Supported rules: min, max, type, regex, not_null, unique, in_list
@@ -1095,6 +1166,7 @@ It provides powerful data subsetting capabilities for analysis and reporting.
 - Efficient indexing for large datasets
 - Query optimization and execution planning
 - Memory-efficient filtering for large files
+- Parquet files skip row groups that cannot match the leading simple conditions
 - Parallel processing for complex filters
 - Progress tracking for long-running operations
 
@@ -1119,17 +1191,19 @@ Use this tool when:
 async def filter_data_tool(
     file_path: str,
     filter_conditions: Dict[str, Any],
-    output_file: Optional[str] = None
+    output_file: Optional[str] = None,
+    chunk_size: Optional[int] = None
 ) -> dict:
     """
     Perform advanced data filtering with sophisticated boolean indexing and conditional expressions.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         filter_conditions: Dictionary of filtering conditions with structure:
                           {column_name: {operator: value}} or {column_name: value}
                           Supported operators: eq, ne, gt, lt, ge, le, in, not_in, contains, regex
         output_file: Optional absolute path to save filtered data (None returns in memory)
+        chunk_size: Rows per chunk to process the file out of core (None chunks only files too large for memory)
     
     Returns:
         Dictionary containing:
@@ -1140,7 +1214,7 @@ async def filter_data_tool(
     """
     try:
         logger.info(f"Filtering data in: {file_path}")
-        return filter_data(file_path, filter_conditions, output_file)
+        return filter_data(file_path, filter_conditions, output_file, chunk_size)
     except Exception as e:
         logger.error(f"Data filtering error: {e}")
         return {
@@ -1216,7 +1290,7 @@ async def optimize_memory_tool(
     Perform advanced memory optimization for large datasets with intelligent strategies.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         optimize_dtypes: Whether to automatically optimize data types for memory efficiency
         chunk_size: Chunk size for processing large files (None for automatic sizing)
     
@@ -1305,7 +1379,7 @@ async def profile_data_tool(
     Perform comprehensive data profiling with detailed statistical analysis and quality assessment.
     
     Args:
-        file_path: Absolute path to the data file
+        file_path: Absolute path to the data file, or a df_handle returned by load_data
         include_correlations: Whether to include correlation analysis between variables
         sample_size: Number of rows to sample for large datasets (None uses full dataset)
     
@@ -0,0 +1,38 @@
+"""
+Fixtures shared by the dataframe store, chunked execution and projection tests.
+Each test class provides its own sample_data.
+"""
+
+import pytest
+import tempfile
+import os
+import sys
+
+# Add the parent directory to Python path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.implementation import dataframe_store
+from src.implementation.dataframe_store import DataFrameStore
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing"""
+    with tempfile.TemporaryDirectory() as directory:
+        yield directory
+
+
+@pytest.fixture
+def temp_csv_file(sample_data, temp_dir):
+    """Create a temporary CSV file for testing"""
+    file_path = os.path.join(temp_dir, 'data.csv')
+    sample_data.to_csv(file_path, index=False)
+    return file_path
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Replace the shared store with an empty one"""
+    store = DataFrameStore(budget_bytes=64 * 1024 * 1024)
+    monkeypatch.setattr(dataframe_store, '_STORE', store)
+    return store
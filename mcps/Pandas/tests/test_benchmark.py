@@ -0,0 +1,54 @@
+"""
+Tests for the filter benchmark.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Add the parent directory to Python path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.benchmark import run_benchmark, sequential_filter, main
+from src.implementation.filtering import apply_filter_conditions
+
+
+class TestBenchmark:
+    """Test suite for the filter benchmark"""
+    
+    def test_run_benchmark(self):
+        """Test both approaches keep the same rows and the combined mask uses less memory"""
+        result = run_benchmark(rows=200000, repeat=1)
+        
+        assert result['sequential']['rows'] == result['combined_mask']['rows'] > 0
+        assert result['combined_mask']['peak_bytes'] < result['sequential']['peak_bytes']
+    
+    def test_combined_mask_matches_sequential_filtering(self):
+        """Test the combined mask keeps the rows and counts of condition-by-condition slicing"""
+        rng = np.random.default_rng(5)
+        df = pd.DataFrame({
+            'value': np.where(rng.random(1000) < 0.2, np.nan, rng.random(1000)),
+            'quantity': pd.array(np.where(rng.random(1000) < 0.1, None, rng.integers(0, 50, 1000)), dtype='Int64'),
+            'region': rng.choice(['north', 'south', 'east'], 1000),
+            'active': rng.random(1000) < 0.5
+        })
+        conditions = {
+            'value': {'operator': 'gt', 'value': 0.3},
+            'quantity': {'operator': 'between', 'value': [5, 40]},
+            'region': {'operator': 'in', 'value': ['north', 'east']},
+            'active': True
+        }
+        
+        filtered_df, applied_filters = apply_filter_conditions(df, conditions)
+        expected_df, expected_filters = sequential_filter(df, conditions)
+        
+        assert applied_filters == expected_filters
+        pd.testing.assert_frame_equal(filtered_df, expected_df)
+    
+    def test_main_writes_output(self, tmp_path):
+        """Test the command line writes its results"""
+        output = tmp_path / 'result.json'
+        
+        assert main(['--rows', '10000', '--repeat', '1', '--output', str(output)]) == 0
+        assert output.exists()
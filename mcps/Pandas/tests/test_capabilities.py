@@ -63,6 +63,36 @@ class TestPandasMCPCapabilities:
         assert 'name' in result['data'][0]
         assert 'age' in result['data'][0]
     
+    def test_load_data_file_pages(self, temp_csv_file, sample_data):
+        """Test paging through loaded data with skiprows and page_size"""
+        first = load_data_file(temp_csv_file, page_size=40)
+        last = load_data_file(first['df_handle'], skiprows=80, page_size=40)
+        
+        assert first['total_rows'] == 100
+        assert first['page'] == {'skiprows': 0, 'rows': 40, 'next_skiprows': 40}
+        assert last['page'] == {'skiprows': 80, 'rows': 20, 'next_skiprows': None}
+        assert last['data'][0]['id'] == sample_data['id'].iloc[80]
+        assert isinstance(last['data'][0]['salary'], int)
+    
+    def test_load_data_file_values_exact(self):
+        """Test returned values keep full precision and missing values become None"""
+        df = pd.DataFrame({
+            'value': [0.1 + 0.2, 1 / 3, np.nan],
+            'when': [pd.Timestamp('2024-01-02 03:04:05'), pd.Timestamp('2024-05-06'), pd.NaT],
+            'label': ['a', None, 'c']
+        })
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'values.parquet')
+            df.to_parquet(file_path, index=False)
+            result = load_data_file(file_path)
+        
+        assert result['success'] == True
+        assert result['data'] == [
+            {'value': 0.1 + 0.2, 'when': '2024-01-02 03:04:05', 'label': 'a'},
+            {'value': 1 / 3, 'when': '2024-05-06 00:00:00', 'label': None},
+            {'value': None, 'when': None, 'label': 'c'}
+        ]
+    
     def test_load_data_file_not_found(self):
         """Test loading non-existent file"""
         result = load_data_file('nonexistent.csv')
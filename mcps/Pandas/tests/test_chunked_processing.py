@@ -0,0 +1,145 @@
+"""
+Test cases for chunked (out-of-core) execution of the pandas tools.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Add the parent directory to Python path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.implementation.chunked_processing import ColumnMoments, iter_chunks, should_stream
+from src.implementation.filtering import filter_data
+from src.implementation.pandas_statistics import get_statistical_summary
+from src.implementation.transformations import groupby_operations
+from src.implementation.data_cleaning import handle_missing_data
+
+
+class TestChunkedProcessing:
+    """Test suite for chunked execution"""
+    
+    @pytest.fixture
+    def sample_data(self):
+        """Create sample data with missing values and a large offset"""
+        n = 2003
+        rng = np.random.default_rng(1)
+        return pd.DataFrame({
+            'region': rng.choice(['north', 'south', 'east', None], n),
+            'tier': rng.integers(0, 3, n),
+            'amount': rng.normal(1e6, 5, n),
+            'score': np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 100, n)),
+            'status': rng.choice(['open', 'closed'], n)
+        })
+    
+    def test_iter_chunks(self, temp_csv_file, temp_dir, sample_data):
+        """Test CSV and Parquet files are read in chunks of the requested size"""
+        parquet_file = os.path.join(temp_dir, 'data.parquet')
+        sample_data.to_parquet(parquet_file, index=False)
+        
+        for path in (temp_csv_file, parquet_file):
+            sizes = [len(chunk) for chunk in iter_chunks(path, 500)]
+            assert sizes == [500, 500, 500, 500, 3]
+    
+    def test_should_stream(self, store, temp_csv_file):
+        """Test chunks are used when requested or when the file exceeds the budget"""
+        assert should_stream(temp_csv_file) == False
+        assert should_stream(temp_csv_file, 500) == True
+        
+        store.budget_bytes = 1
+        assert should_stream(temp_csv_file) == True
+        # Loaded handles stay in memory
+        _, handle = store.load(temp_csv_file)
+        assert should_stream(handle, 500) == False
+    
+    def test_column_moments_merge(self):
+        """Test moments merged across chunks match the whole column"""
+        values = np.random.default_rng(2).normal(50, 10, 1000)
+        moments = ColumnMoments()
+        for part in np.array_split(values, 7):
+            moments.add(part)
+        series = pd.Series(values)
+        
+        assert moments.n == 1000
+        assert moments.mean == pytest.approx(series.mean())
+        assert moments.variance() == pytest.approx(series.var())
+        assert moments.skewness() == pytest.approx(series.skew())
+        assert moments.kurtosis() == pytest.approx(series.kurtosis())
+        assert moments.quantile(0.5) == pytest.approx(series.median())
+    
+    def test_statistical_summary_matches_in_memory(self, store, temp_csv_file):
+        """Test the chunked summary gives the in-memory statistics"""
+        expected = get_statistical_summary(temp_csv_file)
+        result = get_statistical_summary(temp_csv_file, chunk_size=300)
+        
+        assert result['success'] == True
+        assert result['execution']['mode'] == 'chunked'
+        assert result['execution']['chunks'] == 7
+        assert result['approximate_columns'] == []
+        assert result['shape'] == expected['shape']
+        assert result['categorical_statistics'] == expected['categorical_statistics']
+        assert result['missing_data'] == expected['missing_data']
+        for key in ('basic_statistics', 'additional_statistics'):
+            for column, stats in expected[key].items():
+                assert result[key][column].keys() == stats.keys()
+                for name, value in stats.items():
+                    if isinstance(value, str):
+                        assert result[key][column][name] == value
+                    else:
+                        assert result[key][column][name] == pytest.approx(value, rel=1e-6, nan_ok=True)
+    
+    def test_filter_matches_in_memory(self, store, temp_csv_file, temp_dir):
+        """Test chunked filtering writes the rows the in-memory filter writes"""
+        conditions = {'tier': {'operator': 'ge', 'value': 1}, 'status': 'open'}
+        expected = filter_data(temp_csv_file, conditions)
+        result = filter_data(temp_csv_file, conditions, os.path.join(temp_dir, 'chunked.csv'), chunk_size=300)
+        
+        assert result['success'] == True
+        assert result['filter_stats'] == expected['filter_stats']
+        pd.testing.assert_frame_equal(pd.read_csv(result['output_file']), pd.read_csv(expected['output_file']))
+        pd.testing.assert_frame_equal(pd.DataFrame(result['filtered_data']), pd.DataFrame(expected['filtered_data']))
+    
+    def test_filter_refuses_to_overwrite_input(self, store, temp_csv_file):
+        """Test chunked filtering cannot write over the file it reads"""
+        result = filter_data(temp_csv_file, {'status': 'open'}, temp_csv_file, chunk_size=300)
+        
+        assert result['success'] == False
+        assert len(pd.read_csv(temp_csv_file)) == 2003
+    
+    @pytest.mark.parametrize("filter_condition", [None, 'amount > 1000000'])
+    def test_groupby_matches_in_memory(self, store, temp_csv_file, filter_condition):
+        """Test partial aggregates merged across chunks match the in-memory groupby"""
+        operations = {'amount': 'mean', 'score': 'std', 'status': 'min', 'tier': 'count'}
+        expected = groupby_operations(temp_csv_file, ['region'], operations, filter_condition)
+        result = groupby_operations(temp_csv_file, ['region'], operations, filter_condition, chunk_size=300)
+        
+        assert result['success'] == True
+        assert result['group_info'] == expected['group_info']
+        pd.testing.assert_frame_equal(pd.DataFrame(result['results']), pd.DataFrame(expected['results']),
+                                      check_exact=False, rtol=1e-9)
+    
+    def test_groupby_rejects_non_decomposable_operations(self, store, temp_csv_file):
+        """Test operations that cannot be merged need in-memory execution"""
+        result = groupby_operations(temp_csv_file, ['region'], {'amount': 'median'}, chunk_size=300)
+        
+        assert result['success'] == False
+        assert result['error_type'] == 'ValueError'
+        
+        # Without chunk_size, oversized files fall back to in-memory execution
+        store.budget_bytes = 1
+        assert groupby_operations(temp_csv_file, ['region'], {'amount': 'median'})['success'] == True
+    
+    def test_missing_data_matches_in_memory(self, store, temp_csv_file):
+        """Test chunked missing data detection and removal"""
+        detected = handle_missing_data(temp_csv_file, 'detect', chunk_size=300)
+        assert detected['missing_data_info'] == handle_missing_data(temp_csv_file, 'detect')['missing_data_info']
+        
+        expected = handle_missing_data(temp_csv_file, 'remove')
+        expected_rows = pd.read_csv(expected['output_file'])
+        result = handle_missing_data(temp_csv_file, 'remove', chunk_size=300)
+        assert result['success'] == True
+        assert result['removed_rows'] == expected['removed_rows']
+        assert result['new_shape'] == expected['new_shape']
+        pd.testing.assert_frame_equal(pd.read_csv(result['output_file']), expected_rows)
@@ -0,0 +1,153 @@
+"""
+Test cases for pyarrow CSV ingestion and Feather snapshots.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import tempfile
+import os
+import sys
+
+# Add the parent directory to Python path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.implementation import csv_reader
+from src.implementation.csv_reader import read_csv_file, read_csv_table, snapshot_path
+
+
+class TestCSVReader:
+    """Test suite for CSV ingestion"""
+    
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for testing"""
+        with tempfile.TemporaryDirectory() as directory:
+            yield directory
+    
+    @pytest.fixture
+    def snapshots(self, temp_dir, monkeypatch):
+        """Snapshot every CSV into a temporary cache directory"""
+        directory = os.path.join(temp_dir, 'snapshots')
+        monkeypatch.setenv('PANDAS_MCP_SNAPSHOT_DIR', directory)
+        monkeypatch.delenv('PANDAS_MCP_SNAPSHOTS', raising=False)
+        monkeypatch.setattr(csv_reader, 'SNAPSHOT_MIN_BYTES', 0)
+        return directory
+    
+    @pytest.fixture
+    def mixed_csv_file(self, temp_dir):
+        """Create a CSV with the column kinds pandas and pyarrow infer differently"""
+        n = 200
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'id': range(n),
+            'score': rng.uniform(0, 100, n).round(3),
+            'name': rng.choice(['alpha', 'beta', None, 'NA'], n),
+            'day': pd.date_range('2024-01-01', periods=n, freq='D').strftime('%Y-%m-%d'),
+            'stamp': pd.date_range('2024-01-01', periods=n, freq='h').strftime('%Y-%m-%d %H:%M:%S'),
+            'clock': '10:30:00',
+            'active': rng.choice([True, False], n),
+            'flag': rng.choice(['True', 'False', ''], n),
+            'count': rng.choice(['1', '2', ''], n),
+            'empty': np.nan
+        })
+        file_path = os.path.join(temp_dir, 'mixed.csv')
+        df.to_csv(file_path, index=False)
+        return file_path
+    
+    def test_matches_pandas_read_csv(self, mixed_csv_file, snapshots):
+        """Test pyarrow ingestion gives the frame pandas.read_csv gives"""
+        expected = pd.read_csv(mixed_csv_file)
+        
+        pd.testing.assert_frame_equal(read_csv_file(mixed_csv_file), expected)
+        # The second load comes from the snapshot
+        pd.testing.assert_frame_equal(read_csv_file(mixed_csv_file), expected)
+    
+    def test_dates_stay_text(self, mixed_csv_file):
+        """Test date and time columns are not converted"""
+        table = read_csv_table(mixed_csv_file)
+        
+        for name in ('day', 'stamp', 'clock'):
+            assert table.schema.field(name).type == 'string'
+    
+    def test_columns_in_file_order(self, mixed_csv_file, snapshots):
+        """Test column selection matches usecols"""
+        expected = pd.read_csv(mixed_csv_file, usecols=['score', 'id'])
+        
+        pd.testing.assert_frame_equal(read_csv_file(mixed_csv_file, columns=['score', 'id']), expected)
+    
+    def test_nrows_uses_pandas(self, mixed_csv_file, snapshots):
+        """Test row-limited loads do not write snapshots"""
+        df = read_csv_file(mixed_csv_file, nrows=10)
+        
+        assert len(df) == 10
+        assert not os.path.exists(snapshots)
+    
+    def test_snapshot_written_and_reused(self, mixed_csv_file, snapshots, monkeypatch):
+        """Test later loads read the snapshot instead of the CSV"""
+        read_csv_file(mixed_csv_file)
+        snapshot = snapshot_path(mixed_csv_file)
+        assert os.path.exists(snapshot)
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("CSV parsed again")
+        monkeypatch.setattr(csv_reader, 'read_csv_table', fail)
+        
+        assert len(read_csv_file(mixed_csv_file)) == 200
+    
+    def test_modified_file_replaces_snapshot(self, mixed_csv_file, snapshots):
+        """Test a changed CSV is parsed again and its old snapshot removed"""
+        read_csv_file(mixed_csv_file)
+        old_snapshot = snapshot_path(mixed_csv_file)
+        
+        pd.DataFrame({'id': [1, 2, 3]}).to_csv(mixed_csv_file, index=False)
+        os.utime(mixed_csv_file, ns=(0, 10 ** 9))
+        df = read_csv_file(mixed_csv_file)
+        
+        assert df.shape == (3, 1)
+        assert not os.path.exists(old_snapshot)
+        assert os.listdir(snapshots) == [os.path.basename(snapshot_path(mixed_csv_file))]
+    
+    def test_corrupt_snapshot_is_ignored(self, mixed_csv_file, snapshots):
+        """Test an unreadable snapshot falls back to parsing"""
+        read_csv_file(mixed_csv_file)
+        with open(snapshot_path(mixed_csv_file), 'wb') as f:
+            f.write(b'not a feather file')
+        
+        assert len(read_csv_file(mixed_csv_file)) == 200
+    
+    def test_small_files_and_disabled_snapshots(self, mixed_csv_file, snapshots, monkeypatch):
+        """Test snapshots are skipped for small files and when disabled"""
+        monkeypatch.setattr(csv_reader, 'SNAPSHOT_MIN_BYTES', 10 ** 9)
+        assert snapshot_path(mixed_csv_file) is None
+        
+        monkeypatch.setattr(csv_reader, 'SNAPSHOT_MIN_BYTES', 0)
+        monkeypatch.setenv('PANDAS_MCP_SNAPSHOTS', '0')
+        assert snapshot_path(mixed_csv_file) is None
+    
+    @pytest.mark.parametrize("content", [
+        'a,a,b\n1,2,3\n',
+        'a,,b\n1,2,3\n',
+        'a,b\n1,"two\nlines"\n2,x\n',
+        'a\n99999999999999999999\n1\n',
+        'a,b\n10000000000000000000,x\n1,y\n',
+        'a\n-9999999999999999999\n\n3\n'
+    ])
+    def test_falls_back_to_pandas(self, temp_dir, snapshots, content):
+        """Test headers and values pyarrow reads differently use the C parser"""
+        file_path = os.path.join(temp_dir, 'odd.csv')
+        with open(file_path, 'w') as f:
+            f.write(content)
+        
+        pd.testing.assert_frame_equal(read_csv_file(file_path), pd.read_csv(file_path))
+    
+    def test_large_floats_stay_on_pyarrow(self, temp_dir):
+        """Test floats past int64 written with an exponent or point are not treated as integers"""
+        file_path = os.path.join(temp_dir, 'wide.csv')
+        with open(file_path, 'w') as f:
+            f.write('a,b\n1e20,1\n-3.5e19,2\n')
+        
+        table = read_csv_table(file_path)
+        
+        assert table.column('a').to_pylist() == [1e20, -3.5e19]
+        pd.testing.assert_frame_equal(read_csv_file(file_path), pd.read_csv(file_path))
@@ -0,0 +1,223 @@
+"""
+Test cases for the dataframe store shared by the pandas tools.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Add the parent directory to Python path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.implementation.dataframe_store import manage_dataframe_store
+from src.implementation import data_io
+from src.implementation.data_io import load_data_file
+from src.implementation.filtering import filter_data
+from src.implementation.pandas_statistics import get_statistical_summary
+from src.implementation.transformations import groupby_operations, merge_datasets
+from src.implementation.data_cleaning import handle_missing_data
+
+
+class TestDataFrameStore:
+    """Test suite for the dataframe store"""
+    
+    @pytest.fixture
+    def sample_data(self):
+        """Create sample data for testing"""
+        return pd.DataFrame({
+            'id': range(1, 101),
+            'department': np.random.choice(['Engineering', 'Sales', 'Marketing', 'HR'], 100),
+            'salary': np.random.randint(30000, 100000, 100),
+            'score': np.random.uniform(0, 100, 100)
+        })
+    
+    def test_load_parses_file_once(self, store, temp_csv_file):
+        """Test repeated loads reuse the parsed frame"""
+        first, handle = store.load(temp_csv_file)
+        second, second_handle = store.load(temp_csv_file)
+        
+        assert handle == second_handle
+        assert handle.startswith('df_')
+        assert store.misses == 1
+        assert store.hits == 1
+        pd.testing.assert_frame_equal(first, second)
+    
+    def test_load_by_handle(self, store, temp_csv_file):
+        """Test a handle loads the frame with its own options"""
+        _, handle = store.load(temp_csv_file, columns=['id', 'salary'], nrows=10)
+        df, same_handle = store.load(handle)
+        
+        assert same_handle == handle
+        assert df.shape == (10, 2)
+        assert store.resolve(handle) == os.path.abspath(temp_csv_file)
+    
+    def test_load_options_are_part_of_key(self, store, temp_csv_file):
+        """Test different load options give different frames"""
+        full, full_handle = store.load(temp_csv_file)
+        head, head_handle = store.load(temp_csv_file, nrows=5)
+        
+        assert full_handle != head_handle
+        assert len(full) == 100
+        assert len(head) == 5
+    
+    def test_modified_file_is_reloaded(self, store, temp_csv_file):
+        """Test a handle sees the current contents of its file"""
+        _, handle = store.load(temp_csv_file)
+        pd.DataFrame({'id': [1, 2]}).to_csv(temp_csv_file, index=False)
+        os.utime(temp_csv_file, ns=(0, 10 ** 9))
+        
+        df, _ = store.load(handle)
+        
+        assert df.shape == (2, 1)
+        assert store.stats()['cached_frames'] == 1
+    
+    def test_load_info_computed_once_per_handle(self, store, temp_csv_file, monkeypatch):
+        """Test paging reuses the info of a handle until its file changes"""
+        calls = []
+        frame_info = data_io.frame_info
+        monkeypatch.setattr(data_io, 'frame_info', lambda df: calls.append(len(df)) or frame_info(df))
+        
+        first = load_data_file(temp_csv_file, page_size=40)
+        second = load_data_file(first['df_handle'], skiprows=40, page_size=40)
+        assert second['info'] == first['info']
+        assert first['info']['shape'] == (100, 4)
+        assert calls == [100]
+        
+        pd.DataFrame({'id': [1, 2]}).to_csv(temp_csv_file, index=False)
+        os.utime(temp_csv_file, ns=(0, 10 ** 9))
+        changed = load_data_file(first['df_handle'])
+        assert changed['info']['shape'] == (2, 1)
+        assert calls == [100, 2]
+    
+    def test_modifying_returned_frame_keeps_cache(self, store, temp_csv_file):
+        """Test tools cannot change the cached frame"""
+        df, _ = store.load(temp_csv_file)
+        df['salary'] = 0
+        df.drop(columns=['score'], inplace=True)
+        
+        cached, _ = store.load(temp_csv_file)
+        
+        assert 'score' in cached.columns
+        assert (cached['salary'] > 0).all()
+    
+    def test_lru_eviction_within_budget(self, store, temp_dir, sample_data):
+        """Test least recently used frames are evicted past the budget"""
+        paths = []
+        for i in range(3):
+            path = os.path.join(temp_dir, f'part_{i}.csv')
+            sample_data.to_csv(path, index=False)
+            paths.append(path)
+        frame_size = int(store.load(paths[0])[0].memory_usage(deep=True).sum())
+        store.budget_bytes = frame_size * 2
+        
+        store.load(paths[1])
+        store.load(paths[0])
+        store.load(paths[2])
+        _, handle = store.load(paths[1])
+        
+        assert store.evictions >= 1
+        assert store.memory_bytes <= store.budget_bytes
+        # Handles of evicted frames reload their file
+        assert len(store.load(handle)[0]) == 100
+    
+    def test_frame_over_budget_is_not_cached(self, store, temp_csv_file):
+        """Test frames larger than the budget are returned uncached"""
+        store.budget_bytes = 1
+        df, handle = store.load(temp_csv_file)
+        
+        assert len(df) == 100
+        assert store.stats()['cached_frames'] == 0
+        assert store.resolve(handle) == os.path.abspath(temp_csv_file)
+    
+    def test_unknown_handle(self, store):
+        """Test unknown handles raise FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            store.load('df_0123456789ab')
+    
+    def test_tools_chain_on_handle(self, store, temp_csv_file):
+        """Test tools accept the handle returned by load_data"""
+        loaded = load_data_file(temp_csv_file)
+        handle = loaded['df_handle']
+        
+        summary = get_statistical_summary(handle)
+        grouped = groupby_operations(handle, ['department'], {'salary': 'mean'})
+        filtered = filter_data(handle, {'salary': {'operator': 'gt', 'value': 50000}})
+        
+        assert summary['success'] == True
+        assert grouped['success'] == True
+        assert filtered['success'] == True
+        assert grouped['df_handle'] == handle
+        assert grouped['output_file'] == os.path.join(os.path.dirname(temp_csv_file), 'data_grouped.csv')
+        assert store.misses == 1
+        assert store.hits == 3
+    
+    def test_tools_accept_path_and_cache_it(self, store, temp_csv_file):
+        """Test tools given a path share the frame with later calls"""
+        first = handle_missing_data(temp_csv_file)
+        second = get_statistical_summary(temp_csv_file)
+        
+        assert first['success'] == True
+        assert first['df_handle'] == second['df_handle']
+        assert store.misses == 1
+    
+    @pytest.mark.parametrize("method, expected", [
+        ('mean', [1.0, 2.0, 3.0, 2.0]),
+        ('forward_fill', ['a', 'a', 'b', 'b'])
+    ])
+    def test_impute_writes_filled_values_and_keeps_cache(self, store, temp_dir, method, expected):
+        """Test imputation fills its copy of a cached frame and leaves the cache as loaded"""
+        file_path = os.path.join(temp_dir, 'gaps.csv')
+        pd.DataFrame({'value': [1.0, np.nan, 3.0, 2.0], 'label': ['a', None, 'b', None]}).to_csv(file_path, index=False)
+        handle = load_data_file(file_path)['df_handle']
+        column = 'value' if method == 'mean' else 'label'
+        
+        result = handle_missing_data(handle, strategy='impute', method=method)
+        
+        assert result['success'] == True
+        assert pd.read_csv(result['output_file'])[column].tolist() == expected
+        cached, _ = store.load(handle)
+        assert cached.isnull().sum().tolist() == [1, 2]
+    
+    def test_merge_with_handles(self, store, temp_dir, sample_data):
+        """Test merge_datasets accepts handles for both sides"""
+        left = os.path.join(temp_dir, 'left.csv')
+        right = os.path.join(temp_dir, 'right.csv')
+        sample_data[['id', 'salary']].to_csv(left, index=False)
+        sample_data[['id', 'score']].to_csv(right, index=False)
+        left_handle = load_data_file(left)['df_handle']
+        right_handle = load_data_file(right)['df_handle']
+        
+        result = merge_datasets(left_handle, right_handle, on='id')
+        
+        assert result['success'] == True
+        assert result['left_handle'] == left_handle
+        assert result['output_file'] == os.path.join(temp_dir, 'left_merged.csv')
+    
+    def test_missing_file_and_unknown_handle_errors(self, store):
+        """Test tools report missing files and unknown handles"""
+        missing = get_statistical_summary('/nonexistent/data.csv')
+        unknown = get_statistical_summary('df_0123456789ab')
+        
+        assert missing['success'] == False
+        assert missing['error_type'] == 'FileNotFoundError'
+        assert unknown['success'] == False
+        assert unknown['error_type'] == 'FileNotFoundError'
+    
+    def test_manage_dataframe_store(self, store, temp_csv_file):
+        """Test the store management actions"""
+        handle = load_data_file(temp_csv_file)['df_handle']
+        
+        stats = manage_dataframe_store('stats')
+        assert stats['success'] == True
+        assert stats['store']['cached_frames'] == 1
+        
+        released = manage_dataframe_store('release', handle)
+        assert released['store']['cached_frames'] == 0
+        assert manage_dataframe_store('release', handle)['success'] == False
+        
+        load_data_file(temp_csv_file)
+        cleared = manage_dataframe_store('clear')
+        assert cleared['store']['handles'] == 0
+        assert manage_dataframe_store('bogus')['error_type'] == 'ValueError'
@@ -0,0 +1,147 @@
+"""
+Test cases for column projection and Parquet predicate pushdown.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Add the parent directory to Python path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.implementation.data_cleaning import clean_data, handle_missing_data
+from src.implementation.data_io import load_data_file
+from src.implementation.filtering import advanced_filter, filter_data, sample_data as sample_rows
+from src.implementation.memory_optimization import optimize_memory_usage
+from src.implementation.pandas_statistics import get_statistical_summary
+from src.implementation.projection import project_columns, pushdown_filter
+from src.implementation.time_series import time_series_operations
+from src.implementation.transformations import groupby_operations
+
+
+class TestProjection:
+    """Test suite for column projection and predicate pushdown"""
+    
+    @pytest.fixture
+    def sample_data(self):
+        """Create sample data with missing values"""
+        n = 5000
+        rng = np.random.default_rng(3)
+        return pd.DataFrame({
+            'id': np.arange(n),
+            'region': rng.choice(['north', 'south', 'east', None], n),
+            'amount': np.where(rng.random(n) < 0.1, np.nan, rng.uniform(0, 1000, n)),
+            'quantity': rng.integers(1, 50, n),
+            'note': rng.choice(['ok', 'late', 'damaged'], n)
+        })
+    
+    @pytest.fixture
+    def temp_parquet_file(self, sample_data, temp_dir):
+        """Create a Parquet file sorted by id with small row groups"""
+        file_path = os.path.join(temp_dir, 'data.parquet')
+        sample_data.to_parquet(file_path, index=False, row_group_size=500)
+        return file_path
+    
+    def test_project_columns(self, store, temp_csv_file):
+        """Test the projection keeps needed and queried columns in file order"""
+        assert project_columns(temp_csv_file, ['quantity', 'region']) == ['region', 'quantity']
+        assert project_columns(temp_csv_file, ['region'], 'amount > 5 and `note` == "ok"') == ['region', 'amount', 'note']
+        assert project_columns(temp_csv_file, ['id', 'region', 'amount', 'quantity', 'note']) is None
+        _, handle = store.load(temp_csv_file)
+        assert project_columns(handle, ['region']) is None
+    
+    def test_groupby_reads_needed_columns(self, store, temp_csv_file):
+        """Test groupby on a path loads only its columns and matches the full frame"""
+        operations = {'amount': 'sum', 'quantity': 'mean'}
+        result = groupby_operations(temp_csv_file, ['region'], operations, 'note == "ok"')
+        full_handle = load_data_file(temp_csv_file)['df_handle']
+        expected = groupby_operations(full_handle, ['region'], operations, 'note == "ok"')
+        
+        assert result['success'] == True
+        projected, _ = store.load(result['df_handle'])
+        assert projected.columns.tolist() == ['region', 'amount', 'quantity', 'note']
+        pd.testing.assert_frame_equal(pd.DataFrame(result['results']), pd.DataFrame(expected['results']))
+    
+    def test_outputs_keep_parquet_input(self, store, temp_parquet_file, temp_dir):
+        """Test outputs of Parquet inputs get CSV names and never replace the input"""
+        grouped = groupby_operations(temp_parquet_file, ['region'], {'amount': 'sum'})
+        refused = filter_data(temp_parquet_file, {'id': 5}, temp_parquet_file)
+        
+        assert grouped['output_file'] == os.path.join(temp_dir, 'data_grouped.csv')
+        assert refused['success'] == False
+        assert refused['error_type'] == 'ValueError'
+        assert len(pd.read_parquet(temp_parquet_file)) == 5000
+    
+    @pytest.mark.parametrize("tool, suffix", [
+        (lambda path: handle_missing_data(path, strategy='remove'), '_no_missing'),
+        (lambda path: handle_missing_data(path, strategy='remove', chunk_size=1000), '_no_missing'),
+        (lambda path: handle_missing_data(path, strategy='impute'), '_imputed'),
+        (lambda path: clean_data(path, remove_duplicates=True), '_cleaned'),
+        (lambda path: advanced_filter(path, 'quantity > 10'), '_query_filtered'),
+        (lambda path: sample_rows(path, 10), '_sample_random'),
+        (lambda path: optimize_memory_usage(path), '_optimized'),
+        (lambda path: time_series_operations(path, 'day', 'lag'), '_lag')
+    ])
+    def test_tool_outputs_keep_parquet_input(self, store, sample_data, temp_dir, tool, suffix):
+        """Test every tool writing a CSV names it after a Parquet input instead of replacing it"""
+        file_path = os.path.join(temp_dir, 'dated.parquet')
+        sample_data.assign(day=pd.date_range('2024-01-01', periods=len(sample_data), freq='h')).to_parquet(file_path, index=False)
+        result = tool(file_path)
+        
+        assert result['success'] == True
+        assert result['output_file'] == os.path.join(temp_dir, f'dated{suffix}.csv')
+        assert len(pd.read_parquet(file_path)) == 5000
+    
+    def test_statistics_read_requested_columns(self, store, temp_csv_file):
+        """Test statistics on a path load only the requested columns"""
+        result = get_statistical_summary(temp_csv_file, columns=['amount', 'quantity'])
+        
+        assert result['success'] == True
+        assert list(result['basic_statistics']) == ['amount', 'quantity']
+        projected, _ = store.load(result['df_handle'])
+        assert projected.columns.tolist() == ['amount', 'quantity']
+    
+    def test_projection_served_from_cached_frame(self, store, temp_csv_file):
+        """Test a cached frame of every column answers projected loads"""
+        store.load(temp_csv_file)
+        df, _ = store.load(temp_csv_file, columns=['quantity', 'id'])
+        
+        assert df.columns.tolist() == ['id', 'quantity']
+        assert store.misses == 1
+        assert store.hits == 1
+    
+    @pytest.mark.parametrize("conditions", [
+        {'id': {'operator': 'ge', 'value': 4200}, 'quantity': {'min_value': 10}},
+        {'id': {'range': [1000, 1999]}, 'region': {'operator': 'ne', 'value': 'north'}},
+        {'amount': {'operator': 'isnull', 'value': None}, 'region': {'operator': 'not_in', 'value': ['east']}},
+        {'region': 'south', 'note': {'operator': 'contains', 'value': 'da'}, 'quantity': {'operator': 'lt', 'value': 5}}
+    ])
+    def test_pushdown_matches_in_memory(self, store, temp_parquet_file, temp_dir, conditions):
+        """Test pushed-down filters keep the rows and statistics of pandas filtering"""
+        handle = load_data_file(temp_parquet_file)['df_handle']
+        expected = filter_data(handle, conditions, os.path.join(temp_dir, 'expected.csv'))
+        result = filter_data(temp_parquet_file, conditions, os.path.join(temp_dir, 'pushed.csv'))
+        
+        assert result['success'] == True
+        assert result['execution']['mode'] == 'pushdown'
+        assert result['filter_stats'] == expected['filter_stats']
+        pd.testing.assert_frame_equal(pd.read_csv(result['output_file']), pd.read_csv(expected['output_file']))
+    
+    def test_pushdown_skips_row_groups(self, store, temp_parquet_file):
+        """Test row groups outside the predicate are not read"""
+        pushed = pushdown_filter(temp_parquet_file, {'id': {'operator': 'lt', 'value': 700}})
+        
+        assert pushed['execution']['row_groups'] == 10
+        assert pushed['execution']['row_groups_read'] == 2
+        assert len(pushed['df']) == 700
+    
+    def test_pushdown_not_used(self, store, temp_parquet_file, temp_csv_file):
+        """Test CSV files, unknown columns and leading string matches are filtered by pandas"""
+        contains = {'note': {'operator': 'contains', 'value': 'ok'}, 'id': {'operator': 'lt', 'value': 10}}
+        
+        assert pushdown_filter(temp_parquet_file, contains) is None
+        assert pushdown_filter(temp_csv_file, {'id': 5}) is None
+        assert pushdown_filter(temp_parquet_file, {'missing': 5}) is None
+        assert 'df_handle' in filter_data(temp_parquet_file, contains)
@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite for the Parallel Sort MCP server.
+Times every log handler on generated logs of the requested sizes, the
+parallel ones once per worker count, and appends lines/s, peak resident
+memory and peak temporary disk usage to a JSON history. Each run is
+compared with the latest earlier run of the same cases and settings.
+
+Example:
+    parallel-sort-bench --sizes 10MB,1GB --workers 1,2,4 --history bench.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Awaitable, Callable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Add current directory to path for relative imports
+sys.path.insert(0, os.path.dirname(__file__))
+
+from implementation.auto_tuner import (
+    available_memory, CHUNKS_PER_WORKER, LINE_MEMORY_FACTOR, MAX_CHUNK_BYTES, MEMORY_BUDGET_FRACTION, MB
+)
+from implementation.export_handler import export_log_file
+from implementation.filter_handler import filter_logs, filter_by_time_range
+from implementation.log_generator import generate_log, generate_rank_logs, DEFAULT_LEVEL_MIX
+from implementation.log_index import clear_index
+from implementation.merge_handler import merge_logs
+from implementation.parallel_processor import (
+    parallel_sort_large_file, parallel_filter_large_file, parallel_analyze_large_file
+)
+from implementation.pattern_detection import detect_patterns
+from implementation.sort_handler import sort_log_by_timestamp
+from implementation.statistics_handler import analyze_log_statistics
+from implementation.worker_pool import available_cpus, cgroup_cpu_limit, configure_worker_pool
+
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+# Timestamp of the first generated line and generated lines per second
+LOG_START = "2024-01-01T00:00:00"
+LINES_PER_SECOND = 10.0
+
+# Conditions of the filter cases
+BENCHMARK_FILTER = [{"field": "level", "operator": "equals", "value": "ERROR"}]
+
+# Share of the log's time span selected by the time range case
+TIME_RANGE_FRACTION = 0.1
+
+# Interval between resident memory and temporary disk samples
+SAMPLE_INTERVAL_SECONDS = 0.05
+
+# Slowdown over the previous run reported as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+
+class CaseContext(NamedTuple):
+    """Inputs of one timed case."""
+    log_file: str
+    rank_dir: str
+    output_path: str
+    workers: int
+    chunk_size_mb: int
+    time_range: Tuple[str, str]
+
+
+class BenchmarkCase(NamedTuple):
+    """A handler call timed by the suite."""
+    parallel: bool
+    loads_file: bool
+    run: Callable[[CaseContext], Awaitable[Dict[str, Any]]]
+
+
+async def run_sort(ctx: CaseContext) -> Dict[str, Any]:
+    """Serial sort to an output file."""
+    return await sort_log_by_timestamp(ctx.log_file, ctx.output_path)
+
+
+async def run_analyze(ctx: CaseContext) -> Dict[str, Any]:
+    """Serial statistics."""
+    return await analyze_log_statistics(ctx.log_file)
+
+
+async def run_patterns(ctx: CaseContext) -> Dict[str, Any]:
+    """Serial pattern detection."""
+    return await detect_patterns(ctx.log_file)
+
+
+async def run_filter(ctx: CaseContext) -> Dict[str, Any]:
+    """Serial level filter."""
+    return await filter_logs(ctx.log_file, BENCHMARK_FILTER)
+
+
+async def run_time_range(ctx: CaseContext) -> Dict[str, Any]:
+    """Time range query over the middle of the log."""
+    return await filter_by_time_range(ctx.log_file, *ctx.time_range)
+
+
+async def run_export(ctx: CaseContext) -> Dict[str, Any]:
+    """Streaming JSON-lines export."""
+    return await export_log_file(ctx.log_file, ctx.output_path, "jsonl")
+
+
+async def run_parallel_sort(ctx: CaseContext) -> Dict[str, Any]:
+    """Chunked parallel sort to an output file."""
+    return await parallel_sort_large_file(ctx.log_file, ctx.chunk_size_mb, ctx.workers, ctx.output_path)
+
+
+async def run_parallel_filter(ctx: CaseContext) -> Dict[str, Any]:
+    """Chunked parallel level filter to an output file."""
+    return await parallel_filter_large_file(ctx.log_file, BENCHMARK_FILTER, "and", ctx.output_path,
+                                            ctx.chunk_size_mb, ctx.workers)
+
+
+async def run_parallel_analyze(ctx: CaseContext) -> Dict[str, Any]:
+    """Chunked parallel statistics."""
+    return await parallel_analyze_large_file(ctx.log_file, ctx.chunk_size_mb, ctx.workers)
+
+
+async def run_merge(ctx: CaseContext) -> Dict[str, Any]:
+    """Merge of the per-rank logs."""
+    return await merge_logs(ctx.rank_dir, ctx.output_path, ctx.workers)
+
+
+# Cases in the order they run; serial cases run once per size
+CASES: Dict[str, BenchmarkCase] = {
+    "sort": BenchmarkCase(False, True, run_sort),
+    "analyze": BenchmarkCase(False, False, run_analyze),
+    "patterns": BenchmarkCase(False, True, run_patterns),
+    "filter": BenchmarkCase(False, False, run_filter),
+    "time_range": BenchmarkCase(False, False, run_time_range),
+    "export": BenchmarkCase(False, False, run_export),
+    "parallel_sort": BenchmarkCase(True, False, run_parallel_sort),
+    "parallel_filter": BenchmarkCase(True, False, run_parallel_filter),
+    "parallel_analyze": BenchmarkCase(True, False, run_parallel_analyze),
+    "merge": BenchmarkCase(True, False, run_merge),
+}
+
+
+class ResourceSampler:
+    """
+    Background thread recording peak resident memory and temporary disk usage.
+    
+    Memory is the resident set of this process and its worker processes when
+    psutil is installed, and of this process alone otherwise.
+    """
+    
+    def __init__(self, temp_dir: str):
+        self.temp_dir = temp_dir
+        self.peak_rss = 0
+        self.peak_temp = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        try:
+            import psutil
+            self._process = psutil.Process()
+        except ImportError:
+            self._process = None
+    
+    def __enter__(self) -> "ResourceSampler":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(SAMPLE_INTERVAL_SECONDS)
+    
+    def sample(self) -> None:
+        """Take one reading of memory and temporary disk usage."""
+        self.peak_rss = max(self.peak_rss, self.resident_bytes())
+        self.peak_temp = max(self.peak_temp, directory_bytes(self.temp_dir))
+    
+    def resident_bytes(self) -> int:
+        """Resident memory of this process and its children."""
+        if self._process is None:
+            try:
+                with open("/proc/self/statm") as f:
+                    return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            except (OSError, ValueError):
+                return 0
+        
+        total = 0
+        for process in [self._process] + self._process.children(recursive=True):
+            try:
+                total += process.memory_info().rss
+            except Exception:
+                # Worker exited between listing and reading
+                continue
+        return total
+
+
+def directory_bytes(path: str) -> int:
+    """Total size of the files below a directory."""
+    total = 0
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                total += directory_bytes(entry.path)
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            # Temporary file removed while scanning
+            continue
+    return total
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as 10MB, 1.5GB or 4096 into bytes."""
+    text = text.strip().upper()
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(text)
+
+
+def format_size(size_bytes: int) -> str:
+    """Shortest exact unit for a size, as used in data file names."""
+    for unit in ("TB", "GB", "MB", "KB"):
+        if size_bytes % SIZE_UNITS[unit] == 0:
+            return f"{size_bytes // SIZE_UNITS[unit]}{unit}"
+    return f"{size_bytes}B"
+
+
+def parse_level_mix(text: Optional[str]) -> Dict[str, float]:
+    """Parse a level mix such as INFO=0.8,ERROR=0.2."""
+    if not text:
+        return dict(DEFAULT_LEVEL_MIX)
+    mix = {}
+    for part in text.split(","):
+        level, _, weight = part.partition("=")
+        mix[level.strip().upper()] = float(weight)
+    return mix
+
+
+def chunk_size_for(size_bytes: int, workers: int) -> int:
+    """Chunk size in MB giving each worker CHUNKS_PER_WORKER chunks."""
+    chunk_bytes = min(math.ceil(size_bytes / (workers * CHUNKS_PER_WORKER)), MAX_CHUNK_BYTES)
+    return max(1, math.ceil(chunk_bytes / MB))
+
+
+def prepare_log(data_dir: str, size_bytes: int, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate a benchmark log, or reuse one generated earlier with the same settings.
+    
+    Args:
+        data_dir: Directory holding generated logs and their descriptions
+        size_bytes: Size of the log
+        settings: generate_log settings
+    
+    Returns:
+        generate_log result of the log
+    """
+    name = f"{settings['log_format']}-{format_size(size_bytes)}-{settings_digest(settings)}"
+    log_path = os.path.join(data_dir, f"{name}.log")
+    info_path = os.path.join(data_dir, f"{name}.json")
+    
+    if os.path.isfile(info_path) and os.path.isfile(log_path):
+        with open(info_path) as f:
+            info = json.load(f)
+        if info.get("bytes_written") == os.path.getsize(log_path):
+            return info
+    
+    os.makedirs(data_dir, exist_ok=True)
+    info = generate_log(log_path, size_bytes, start=LOG_START, lines_per_second=LINES_PER_SECOND, **settings)
+    with open(info_path, 'w') as f:
+        json.dump(info, f)
+    return info
+
+
+def prepare_rank_logs(data_dir: str, size_bytes: int, ranks: int, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate per-rank logs totalling size_bytes for the merge case, or reuse earlier ones.
+    
+    Returns:
+        Dictionary with the rank directory and the lines of all ranks
+    """
+    name = f"ranks-{settings['log_format']}-{format_size(size_bytes)}-{ranks}-{settings_digest(settings)}"
+    rank_dir = os.path.join(data_dir, name)
+    info_path = f"{rank_dir}.json"
+    
+    if os.path.isfile(info_path) and os.path.isdir(rank_dir):
+        with open(info_path) as f:
+            return json.load(f)
+    
+    shutil.rmtree(rank_dir, ignore_errors=True)
+    results = generate_rank_logs(rank_dir, ranks, max(1, size_bytes // ranks), start=LOG_START,
+                                 lines_per_second=LINES_PER_SECOND / ranks, **settings)
+    info = {"rank_dir": rank_dir, "lines_written": sum(result["lines_written"] for result in results)}
+    with open(info_path, 'w') as f:
+        json.dump(info, f)
+    return info
+
+
+def settings_digest(settings: Dict[str, Any]) -> str:
+    """Short stable digest of generator settings."""
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:10]
+
+
+def time_range_for(info: Dict[str, Any]) -> Tuple[str, str]:
+    """Window in the middle of a generated log covering TIME_RANGE_FRACTION of its span."""
+    span_ms = int(info["timestamped_lines"] / LINES_PER_SECOND * 1000)
+    start = np.datetime64(LOG_START, 'ms') + np.timedelta64(int(span_ms * (1 - TIME_RANGE_FRACTION) / 2), 'ms')
+    end = start + np.timedelta64(max(1000, int(span_ms * TIME_RANGE_FRACTION)), 'ms')
+    return tuple(str(stamp.astype('datetime64[s]')).replace("T", " ") for stamp in (start, end))
+
+
+async def time_case(name: str, ctx: CaseContext, work_dir: str, repeat: int) -> Dict[str, Any]:
+    """
+    Time one case, keeping the fastest of `repeat` cold runs.
+    
+    Every run starts without a persisted index and with freshly started
+    workers, so earlier cases do not warm it up.
+    
+    Returns:
+        Timing, peak memory, peak temporary disk and output size of the case
+    """
+    case = CASES[name]
+    measurements = []
+    for _ in range(repeat):
+        clear_index(ctx.log_file)
+        pool = configure_worker_pool(ctx.workers)
+        if case.parallel:
+            # Start the workers outside the timed region
+            await pool.map(abs, [(0,)] * ctx.workers)
+        
+        error = None
+        with ResourceSampler(work_dir) as sampler:
+            started = time.perf_counter()
+            try:
+                result = await case.run(ctx)
+                error = result.get("error") if isinstance(result, dict) else None
+            except Exception as e:
+                error = str(e)
+            elapsed = time.perf_counter() - started
+        
+        output_bytes = os.path.getsize(ctx.output_path) if os.path.isfile(ctx.output_path) else 0
+        if os.path.isfile(ctx.output_path):
+            os.unlink(ctx.output_path)
+        measurements.append((elapsed, sampler.peak_rss, sampler.peak_temp, output_bytes, error))
+    
+    elapsed = min(measurement[0] for measurement in measurements)
+    return {
+        "seconds": round(elapsed, 4),
+        "peak_rss_bytes": max(measurement[1] for measurement in measurements),
+        "peak_temp_bytes": max(measurement[2] for measurement in measurements),
+        "output_bytes": measurements[-1][3],
+        "error": next((measurement[4] for measurement in measurements if measurement[4]), None)
+    }
+
+
+async def run_benchmark(sizes: List[int],
+                        workers: List[int],
+                        cases: Optional[List[str]] = None,
+                        log_format: str = "standard",
+                        disorder: float = 0.3,
+                        level_mix: Optional[Dict[str, float]] = None,
+                        invalid_ratio: float = 0.001,
+                        seed: int = 0,
+                        ranks: int = 16,
+                        repeat: int = 1,
+                        data_dir: Optional[str] = None,
+                        history_path: Optional[str] = None,
+                        label: Optional[str] = None,
+                        threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> Dict[str, Any]:
+    """
+    Run the benchmark suite and append the run to the history.
+    
+    Serial cases run once per size and parallel cases once per size and
+    worker count. Serial cases holding the whole file in memory are skipped
+    when it would not fit.
+    
+    Args:
+        sizes: Log sizes in bytes
+        workers: Worker counts of the parallel cases
+        cases: Names from CASES to run (default: all)
+        log_format: Format of the generated logs
+        disorder: Share of lines with a displaced timestamp
+        level_mix: Relative weight of each level
+        invalid_ratio: Share of lines followed by a line without a timestamp
+        seed: Generator seed
+        ranks: Number of per-rank logs the merge case merges
+        repeat: Runs per case; the fastest is recorded
+        data_dir: Directory caching generated logs (default: under the system temp directory)
+        history_path: JSON history the run is appended to (default: not saved)
+        label: Free-form name of the run
+        threshold: Slowdown over the previous run reported as a regression
+    
+    Returns:
+        The run record with its results and the comparison with the previous run
+    """
+    cases = cases or list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {unknown}. Available cases: {list(CASES)}")
+    
+    settings = {
+        "log_format": log_format,
+        "disorder": disorder,
+        "level_mix": level_mix or dict(DEFAULT_LEVEL_MIX),
+        "invalid_ratio": invalid_ratio,
+        "seed": seed
+    }
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), "parallel-sort-bench")
+    work_dir = tempfile.mkdtemp(prefix="parallel-sort-bench-")
+    temp_dir = os.path.join(work_dir, "tmp")
+    os.makedirs(temp_dir)
+    
+    # Worker temporary files and indexes land where the sampler measures them
+    saved_environment = {key: os.environ.get(key) for key in ("TMPDIR", "PARALLEL_SORT_INDEX_DIR")}
+    saved_tempdir = tempfile.tempdir
+    os.environ["TMPDIR"] = temp_dir
+    os.environ["PARALLEL_SORT_INDEX_DIR"] = os.path.join(temp_dir, "index")
+    tempfile.tempdir = temp_dir
+    
+    results = []
+    try:
+        memory_budget = available_memory() * MEMORY_BUDGET_FRACTION
+        for size in sizes:
+            info = prepare_log(data_dir, size, settings)
+            rank_info = prepare_rank_logs(data_dir, size, ranks, settings) if "merge" in cases else None
+            for name in cases:
+                case = CASES[name]
+                if case.loads_file and info["bytes_written"] * LINE_MEMORY_FACTOR > memory_budget:
+                    results.append({"case": name, "size_bytes": size, "workers": 1,
+                                    "skipped": "log does not fit in memory"})
+                    continue
+                
+                for worker_count in (workers if case.parallel else [1]):
+                    ctx = CaseContext(info["file_path"], rank_info["rank_dir"] if rank_info else "",
+                                      os.path.join(work_dir, f"{name}.out"), worker_count,
+                                      chunk_size_for(size, worker_count), time_range_for(info))
+                    timing = await time_case(name, ctx, temp_dir, repeat)
+                    lines = rank_info["lines_written"] if name == "merge" else info["lines_written"]
+                    results.append({
+                        "case": name,
+                        "size_bytes": size,
+                        "workers": worker_count,
+                        "chunk_size_mb": ctx.chunk_size_mb if case.parallel else None,
+                        "lines": lines,
+                        "lines_per_second": round(lines / max(timing["seconds"], 1e-9)),
+                        "mb_per_second": round(info["bytes_written"] / MB / max(timing["seconds"], 1e-9), 2),
+                        **timing
+                    })
+    finally:
+        configure_worker_pool()
+        tempfile.tempdir = saved_tempdir
+        for key, value in saved_environment.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    run = {
+        "label": label,
+        "started_at": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "host": host_info(),
+        "config": {**settings, "sizes": sizes, "workers": workers, "ranks": ranks, "repeat": repeat},
+        "results": results
+    }
+    history = load_history(history_path) if history_path else {"runs": []}
+    run["comparison"] = compare_runs(run, history["runs"], threshold)
+    if history_path:
+        history["runs"].append(run)
+        with open(history_path, 'w') as f:
+            json.dump(history, f, indent=2)
+    return run
+
+
+def host_info() -> Dict[str, Any]:
+    """Machine and library versions a run was measured on."""
+    return {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "cpus": available_cpus(),
+        "cgroup_cpu_limit": cgroup_cpu_limit(),
+        "available_memory_bytes": available_memory()
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the checked-out source, or None outside a git work tree."""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def load_history(history_path: str) -> Dict[str, Any]:
+    """Read a benchmark history, or start an empty one."""
+    if not os.path.isfile(history_path):
+        return {"runs": []}
+    with open(history_path) as f:
+        return json.load(f)
+
+
+def compare_runs(run: Dict[str, Any], previous_runs: List[Dict[str, Any]], threshold: float) -> Dict[str, Any]:
+    """
+    Compare each result with the latest earlier measurement of the same case.
+    
+    Only runs on logs generated with the same settings are compared.
+    
+    Args:
+        run: The new run
+        previous_runs: Earlier runs, oldest first
+        threshold: Slowdown reported as a regression, as a fraction
+    
+    Returns:
+        Dictionary with the per-case speed ratios and the regressions found
+    """
+    generator_keys = ("log_format", "disorder", "level_mix", "invalid_ratio", "seed", "ranks")
+    baseline = {}
+    for previous in previous_runs:
+        if any(previous["config"].get(key) != run["config"].get(key) for key in generator_keys):
+            continue
+        for result in previous["results"]:
+            if "seconds" in result and not result.get("error"):
+                baseline[(result["case"], result["size_bytes"], result["workers"])] = result["seconds"]
+    
+    changes = []
+    for result in run["results"]:
+        key = (result["case"], result["size_bytes"], result["workers"])
+        if "seconds" not in result or result.get("error") or key not in baseline:
+            continue
+        ratio = result["seconds"] / max(baseline[key], 1e-9)
+        changes.append({
+            "case": result["case"],
+            "size_bytes": result["size_bytes"],
+            "workers": result["workers"],
+            "previous_seconds": baseline[key],
+            "seconds": result["seconds"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold
+        })
+    return {
+        "threshold": threshold,
+        "compared": len(changes),
+        "changes": changes,
+        "regressions": [change for change in changes if change["regression"]]
+    }
+
+
+def print_report(run: Dict[str, Any]) -> None:
+    """Print a run's results and regressions as a table."""
+    print(f"{'case':<18}{'size':>8}{'workers':>9}{'seconds':>10}{'lines/s':>12}{'MB/s':>9}"
+          f"{'peak RSS MB':>13}{'peak tmp MB':>13}")
+    for result in run["results"]:
+        prefix = f"{result['case']:<18}{format_size(result['size_bytes']):>8}{result['workers']:>9}"
+        if "skipped" in result:
+            print(f"{prefix}  skipped: {result['skipped']}")
+        elif result.get("error"):
+            print(f"{prefix}  error: {result['error']}")
+        else:
+            print(f"{prefix}{result['seconds']:>10.3f}{result['lines_per_second']:>12}{result['mb_per_second']:>9}"
+                  f"{result['peak_rss_bytes'] / MB:>13.1f}{result['peak_temp_bytes'] / MB:>13.1f}")
+    
+    comparison = run["comparison"]
+    if comparison["compared"]:
+        print(f"\nCompared {comparison['compared']} results with the previous run; "
+              f"{len(comparison['regressions'])} slower by more than {comparison['threshold']:.0%}")
+        for change in comparison["regressions"]:
+            print(f"  {change['case']} {format_size(change['size_bytes'])} x{change['workers']}: "
+                  f"{change['previous_seconds']:.3f}s -> {change['seconds']:.3f}s ({change['ratio']:.2f}x)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point of the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark the Parallel Sort MCP handlers on generated logs.")
+    parser.add_argument("--sizes", default="10MB", help="Comma-separated log sizes, e.g. 10MB,1GB,10GB")
+    parser.add_argument("--workers", default=None,
+                        help="Comma-separated worker counts of the parallel cases (default: 1 and all CPUs)")
+    parser.add_argument("--cases", default=None, help=f"Comma-separated cases (default: all of {','.join(CASES)})")
+    parser.add_argument("--format", default="standard", help="Generated log format")
+    parser.add_argument("--disorder", type=float, default=0.3, help="Share of lines with a displaced timestamp")
+    parser.add_argument("--level-mix", default=None, help="Level weights, e.g. INFO=0.8,ERROR=0.2")
+    parser.add_argument("--invalid-ratio", type=float, default=0.001,
+                        help="Share of lines followed by a line without a timestamp")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--ranks", type=int, default=16, help="Per-rank logs merged by the merge case")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest is recorded")
+    parser.add_argument("--data-dir", default=None, help="Directory caching generated logs")
+    parser.add_argument("--history", default="benchmark_history.json", help="JSON history to append the run to")
+    parser.add_argument("--label", default=None, help="Name of this run in the history")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Slowdown over the previous run reported as a regression (default: 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on a regression")
+    args = parser.parse_args(argv)
+    
+    workers = [int(count) for count in args.workers.split(",")] if args.workers else sorted({1, available_cpus()})
+    run = asyncio.run(run_benchmark(
+        sizes=[parse_size(size) for size in args.sizes.split(",")],
+        workers=workers,
+        cases=args.cases.split(",") if args.cases else None,
+        log_format=args.format,
+        disorder=args.disorder,
+        level_mix=parse_level_mix(args.level_mix),
+        invalid_ratio=args.invalid_ratio,
+        seed=args.seed,
+        ranks=args.ranks,
+        repeat=args.repeat,
+        data_dir=args.data_dir,
+        history_path=args.history,
+        label=args.label,
+        threshold=args.threshold
+    ))
+    print_report(run)
+    
+    if args.fail_on_regression and run["comparison"]["regressions"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
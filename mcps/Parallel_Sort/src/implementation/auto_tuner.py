@@ -0,0 +1,206 @@
+"""
+Automatic parallelism selection for log processing.
+Chooses between the serial and the chunked parallel implementation of an
+operation, and the chunk size and worker count of the parallel one, from the
+file size, available memory, the shared worker pool and the throughput of
+the operation measured on a sample of the file.
+"""
+import math
+import os
+import time
+from typing import Dict, Any, Callable, NamedTuple, Optional
+
+from .worker_pool import get_worker_pool
+
+
+MB = 1024 * 1024
+
+# Files smaller than this are processed serially without sampling
+MIN_PARALLEL_BYTES = 16 * MB
+
+# Bytes from the start of the file the operation is timed on
+SAMPLE_BYTES = 1 * MB
+
+# Parallel mode must be estimated at least this much faster than serial mode
+PARALLEL_SPEEDUP_MARGIN = 1.25
+
+# Chunks per worker, so uneven chunks still keep every worker busy to the end
+CHUNKS_PER_WORKER = 2
+
+# Chunk size bounds before the memory limit is applied
+MIN_CHUNK_BYTES = 8 * MB
+MAX_CHUNK_BYTES = 256 * MB
+
+# Resident memory per byte of log held as Python lines with their sort keys
+LINE_MEMORY_FACTOR = 4
+
+# Share of the available memory one operation plans to use
+MEMORY_BUDGET_FRACTION = 0.5
+
+# Start-up cost of one worker process, paid while the shared pool is not running
+WORKER_START_SECONDS = 0.1
+
+# Throughput of the parent's k-way merge of sorted runs
+SORT_MERGE_BYTES_PER_SECOND = 40 * MB
+
+
+class ExecutionPlan(NamedTuple):
+    """Serial or parallel execution of one operation, with the estimates behind it."""
+    parallel: bool
+    chunk_size_mb: int
+    workers: int
+    reason: str
+    file_size_bytes: int
+    available_memory_bytes: int
+    throughput_mb_per_second: Optional[float] = None
+    serial_seconds: Optional[float] = None
+    parallel_seconds: Optional[float] = None
+    
+    def describe(self) -> Dict[str, Any]:
+        """Plan details reported with each result."""
+        return {
+            "mode": "parallel" if self.parallel else "serial",
+            "chunk_size_mb": self.chunk_size_mb if self.parallel else None,
+            "workers": self.workers if self.parallel else 1,
+            "reason": self.reason,
+            "available_memory_mb": round(self.available_memory_bytes / MB),
+            "measured_throughput_mb_per_second": self.throughput_mb_per_second,
+            "estimated_serial_seconds": self.serial_seconds,
+            "estimated_parallel_seconds": self.parallel_seconds
+        }
+
+
+def available_memory() -> int:
+    """
+    Bytes of memory available to this process.
+    
+    Uses psutil when installed and /proc/meminfo otherwise, lowered to the
+    headroom left under a cgroup v2 memory limit.
+    
+    Returns:
+        Available memory in bytes
+    """
+    try:
+        import psutil
+        available = psutil.virtual_memory().available
+    except ImportError:
+        available = _meminfo_available()
+    
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open("/sys/fs/cgroup/memory.current") as f:
+                used = int(f.read())
+            available = min(available, max(0, int(limit) - used))
+    except (OSError, ValueError):
+        pass
+    return available
+
+
+def _meminfo_available() -> int:
+    """MemAvailable from /proc/meminfo, or free physical pages where that is missing."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure_throughput(file_path: str, sample_task: Callable[[int, int], Any]) -> float:
+    """
+    Time an operation's chunk task on the first lines of a file.
+    
+    Temporary files written by the task are removed.
+    
+    Args:
+        file_path: Path to the log file
+        sample_task: Chunk task called with the (start, end) byte range of the sample
+    
+    Returns:
+        Bytes processed per second by one worker
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(SAMPLE_BYTES)
+        f.readline()
+        end = f.tell()
+    
+    started = time.perf_counter()
+    result = sample_task(0, end)
+    elapsed = time.perf_counter() - started
+    
+    if isinstance(result, dict) and result.get("temp_file"):
+        os.unlink(result["temp_file"])
+    return end / max(elapsed, 1e-6)
+
+
+def plan_execution(file_path: str, operation: str, sample_task: Callable[[int, int], Any],
+                   max_workers: Optional[int] = None, serial_loads_file: bool = False,
+                   serial_is_indexed: bool = False) -> ExecutionPlan:
+    """
+    Choose serial or parallel execution of an operation on a log file.
+    
+    Serial mode is chosen for small files, when only one worker is available
+    or when the log already has a current index. Otherwise the operation's
+    chunk task is timed on a sample, and parallel mode is chosen when
+    size / (throughput * workers), plus worker start-up and the merge of
+    sorted runs, beats size / throughput by PARALLEL_SPEEDUP_MARGIN. Parallel
+    mode is forced when a serial operation that loads the whole file would
+    not fit in memory. Chunks are sized to give each worker CHUNKS_PER_WORKER
+    chunks while all workers' chunks fit in memory.
+    
+    Args:
+        file_path: Path to the log file
+        operation: "sort", "filter" or "analyze"; sorting pays a serial merge of runs
+        sample_task: Chunk task called with a (start, end) byte range, as run by workers
+        max_workers: Most workers the call may occupy (default: the whole shared pool)
+        serial_loads_file: Whether serial mode holds every line in memory
+        serial_is_indexed: Whether serial mode can reuse a current persisted index
+    
+    Returns:
+        ExecutionPlan for the operation
+    """
+    file_size = os.path.getsize(file_path)
+    memory = available_memory()
+    pool = get_worker_pool()
+    workers = pool.worker_limit(max_workers)
+    
+    budget = memory * MEMORY_BUDGET_FRACTION
+    fits_serially = not serial_loads_file or file_size * LINE_MEMORY_FACTOR <= budget
+    
+    def plan(parallel: bool, reason: str, **estimates: Any) -> ExecutionPlan:
+        chunk_bytes = math.ceil(file_size / (workers * CHUNKS_PER_WORKER))
+        chunk_bytes = min(max(chunk_bytes, MIN_CHUNK_BYTES), MAX_CHUNK_BYTES)
+        chunk_bytes = min(chunk_bytes, budget / (workers * LINE_MEMORY_FACTOR))
+        chunk_size_mb = max(1, math.floor(chunk_bytes / MB))
+        return ExecutionPlan(parallel, chunk_size_mb, workers, reason, file_size, memory, **estimates)
+    
+    if not fits_serially:
+        return plan(True, "file does not fit in memory for a serial pass")
+    if file_size < MIN_PARALLEL_BYTES:
+        return plan(False, f"file is smaller than {MIN_PARALLEL_BYTES // MB} MB")
+    if serial_is_indexed:
+        return plan(False, "log has a current index")
+    if workers == 1:
+        return plan(False, "only one worker is available")
+    
+    throughput = measure_throughput(file_path, sample_task)
+    serial_seconds = file_size / throughput
+    parallel_seconds = file_size / (throughput * workers)
+    if not pool.started:
+        parallel_seconds += workers * WORKER_START_SECONDS
+    if operation == "sort":
+        parallel_seconds += file_size / SORT_MERGE_BYTES_PER_SECOND
+    
+    estimates = {
+        "throughput_mb_per_second": round(throughput / MB, 1),
+        "serial_seconds": round(serial_seconds, 2),
+        "parallel_seconds": round(parallel_seconds, 2)
+    }
+    if serial_seconds >= parallel_seconds * PARALLEL_SPEEDUP_MARGIN:
+        return plan(True, f"estimated {serial_seconds / parallel_seconds:.1f}x faster with {workers} workers",
+                    **estimates)
+    return plan(False, "parallel speedup would not cover worker and merge overhead", **estimates)
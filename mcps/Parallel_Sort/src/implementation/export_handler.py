@@ -1,13 +1,46 @@
 """
 Export handler capability for log processing results.
-Supports multiple export formats: JSON, CSV, plain text, and summary reports.
+Supports multiple export formats: JSON, CSV, plain text, and summary reports,
+and streams log files to JSON-lines, CSV, Parquet or compressed text on disk.
 """
+import bz2
+import gzip
 import json
 import csv
 import io
+import lzma
+import os
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import partial
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+from .filter_engine import compile_filter
+from .log_formats import NS_PER_SECOND
+from .log_index import LogIndex, get_log_index
+from .log_parser import INVALID_KEY, ns_to_datetime
+from .record_batch import RecordBatch
+
+
+# Formats written by export_log_file
+STREAM_FORMATS = ("jsonl", "csv", "parquet", "text")
+
+# Compressed writers for the line-based stream formats; gzip and xz use fast
+# levels (maximum levels are 5-25x slower for a few percent on log text)
+STREAM_COMPRESSION = {
+    "gzip": partial(gzip.open, compresslevel=6),
+    "bz2": bz2.open,
+    "xz": partial(lzma.open, preset=1)
+}
+
+# Time window covered by each Parquet row group of a time-sorted log
+PARQUET_ROW_GROUP_SECONDS = 3600
+
+# Rows buffered per Parquet row group at most, and per row group of unsorted logs
+PARQUET_ROW_GROUP_ROWS = 1000000
+
+# Columns of structured exports, as in export_to_csv
+EXPORT_COLUMNS = ["line_number", "timestamp", "level", "message", "original_line"]
 
 
 async def export_to_json(data: Dict[str, Any], include_metadata: bool = True) -> Dict[str, Any]:
@@ -300,4 +333,211 @@ async def export_summary_report(data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "error": f"Summary report generation failed: {str(e)}",
             "format": "summary_report"
-        }
\ No newline at end of file
+        }
+
+
+async def export_log_file(file_path: str, output_path: str, export_format: str = "jsonl",
+                          conditions: List[Dict[str, Any]] = None, logical_operator: str = "and",
+                          compression: Optional[str] = None, include_headers: bool = True,
+                          row_group_seconds: int = PARQUET_ROW_GROUP_SECONDS) -> Dict[str, Any]:
+    """
+    Stream the entries of a log file, optionally filtered, to an export file.
+    
+    Entries are read from the log index one batch at a time and written in
+    file order, so memory does not grow with the log; pass a sorted log (e.g.
+    the output of sort_log_by_timestamp) for time-ordered exports. Only the
+    output path and export statistics are returned.
+    
+    Args:
+        file_path: Path to the log file to export
+        output_path: Path of the export file to write
+        export_format: "jsonl", "csv", "parquet" or "text" (original lines)
+        conditions: Filter conditions as accepted by filter_logs, every line if omitted
+        logical_operator: How to combine conditions ("and", "or")
+        compression: "gzip", "bz2" or "xz" for jsonl, csv and text; a Parquet
+            codec ("snappy", "zstd", "gzip", ...) for parquet, snappy if omitted
+        include_headers: Whether to write the CSV header row
+        row_group_seconds: Time window of each Parquet row group when the log
+            is time-sorted
+        
+    Returns:
+        Dictionary with the output path and export statistics
+    """
+    export_format = str(export_format).lower()
+    try:
+        if export_format not in STREAM_FORMATS:
+            return {
+                "error": f"Unsupported export format: {export_format}. Supported formats: {', '.join(STREAM_FORMATS)}",
+                "format": export_format
+            }
+        if export_format != "parquet" and compression is not None and compression not in STREAM_COMPRESSION:
+            return {
+                "error": f"Unsupported compression: {compression}. Supported compression: {', '.join(STREAM_COMPRESSION)}",
+                "format": export_format
+            }
+        if os.path.abspath(output_path) == os.path.abspath(file_path):
+            return {
+                "error": "Output path must differ from the exported log file",
+                "format": export_format
+            }
+        
+        index = get_log_index(file_path)
+        batches = compile_filter(conditions, logical_operator).select_batches(index)
+        
+        if export_format == "parquet":
+            details = write_parquet_export(index, batches, output_path, compression or "snappy", row_group_seconds)
+        else:
+            details = write_line_export(index, batches, output_path, export_format, compression, include_headers)
+        
+        rows_exported = details.pop("rows_exported")
+        return {
+            "format": export_format,
+            "output_path": os.path.abspath(output_path),
+            "rows_exported": rows_exported,
+            "total_lines": index.rows,
+            "size_bytes": os.path.getsize(output_path),
+            "compression": compression or ("snappy" if export_format == "parquet" else None),
+            **details,
+            "exported_at": datetime.now().isoformat(),
+            "message": f"Successfully exported {rows_exported} entries to {export_format} file {output_path}"
+        }
+        
+    except FileNotFoundError:
+        return {
+            "error": f"File not found: {file_path}",
+            "format": export_format
+        }
+    except ImportError:
+        return {
+            "error": "Parquet export requires pyarrow (pip install pyarrow)",
+            "format": export_format
+        }
+    except Exception as e:
+        return {
+            "error": f"Export failed: {str(e)}",
+            "format": export_format
+        }
+
+
+def export_records(index: LogIndex, rows: np.ndarray, lines: List[str]) -> Iterator[List[Any]]:
+    """Rows of EXPORT_COLUMNS for index rows; lines without a timestamp have no timestamp or level."""
+    batch = RecordBatch.from_index(index, rows, lines)
+    levels = batch.levels
+    for line_number, epoch_ns, level_code, message, line in zip(
+            batch.line_numbers.tolist(), batch.timestamps.tolist(), batch.level_codes.tolist(),
+            batch.messages(), lines):
+        if epoch_ns == INVALID_KEY:
+            yield [line_number, None, "", message, line]
+        else:
+            yield [line_number, ns_to_datetime(epoch_ns).isoformat(), levels[level_code], message, line]
+
+
+def write_line_export(index: LogIndex, batches: Iterator[Tuple[np.ndarray, List[str]]], output_path: str,
+                      export_format: str, compression: Optional[str], include_headers: bool) -> Dict[str, Any]:
+    """
+    Write matching rows as JSON lines, CSV rows or original lines.
+    
+    Returns:
+        Dictionary with rows_exported
+    """
+    opener = STREAM_COMPRESSION.get(compression, open)
+    rows_exported = 0
+    with opener(output_path, 'wt', encoding='utf-8', newline='') as f:
+        csv_writer = csv.writer(f) if export_format == "csv" else None
+        if csv_writer is not None and include_headers:
+            csv_writer.writerow(EXPORT_COLUMNS)
+        
+        for rows, lines in batches:
+            if export_format == "text":
+                f.write("\n".join(lines) + "\n")
+            elif csv_writer is not None:
+                csv_writer.writerows(export_records(index, rows, lines))
+            else:
+                f.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, record)), ensure_ascii=False) + "\n"
+                             for record in export_records(index, rows, lines))
+            rows_exported += len(rows)
+    
+    return {"rows_exported": rows_exported}
+
+
+def write_parquet_export(index: LogIndex, batches: Iterator[Tuple[np.ndarray, List[str]]], output_path: str,
+                         compression: str, row_group_seconds: int) -> Dict[str, Any]:
+    """
+    Write matching rows to Parquet, one row group per time window.
+    
+    When the log is time-sorted a row group holds the rows of one
+    row_group_seconds window (lines without a timestamp stay with the
+    preceding entry), so readers can skip row groups by their timestamp
+    statistics. Row groups are capped at PARQUET_ROW_GROUP_ROWS rows, which
+    is also their size for unsorted logs.
+    
+    Returns:
+        Dictionary with rows_exported, row_groups and time_sorted
+    
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([
+        ("line_number", pa.int64()),
+        ("timestamp", pa.timestamp("ns", tz="UTC")),
+        ("level", pa.dictionary(pa.int32(), pa.string())),
+        ("message", pa.string()),
+        ("original_line", pa.string())
+    ])
+    window_ns = max(1, int(row_group_seconds * NS_PER_SECOND))
+    no_window = np.iinfo(np.int64).min
+    levels = pa.array(index.levels, type=pa.string())
+    
+    pending: List[Any] = []
+    pending_rows = 0
+    group_window = None
+    row_groups = 0
+    rows_exported = 0
+    
+    with pq.ParquetWriter(output_path, schema, compression=compression) as writer:
+        def flush():
+            nonlocal pending, pending_rows, row_groups
+            if pending_rows:
+                writer.write_table(pa.concat_tables(pending), row_group_size=pending_rows)
+                row_groups += 1
+            pending, pending_rows = [], 0
+        
+        for rows, lines in batches:
+            timestamps = np.asarray(index.timestamps[rows])
+            invalid = timestamps == INVALID_KEY
+            table = pa.table([
+                pa.array(rows + 1, type=pa.int64()),
+                pa.array(timestamps, type=pa.int64(), mask=invalid).cast(schema.field("timestamp").type),
+                pa.DictionaryArray.from_arrays(
+                    pa.array(np.asarray(index.columns["level"][rows], dtype=np.int32), mask=invalid), levels
+                ),
+                pa.array(RecordBatch.from_index(index, rows, lines).messages(), type=pa.string()),
+                pa.array(lines, type=pa.string())
+            ], schema=schema)
+            rows_exported += len(rows)
+            
+            if not index.time_sorted:
+                pieces = [(0, len(rows), group_window)]
+            else:
+                windows = np.where(invalid, no_window, timestamps // window_ns)
+                windows = np.maximum.accumulate(windows)
+                starts = np.concatenate(([0], np.flatnonzero(np.diff(windows)) + 1))
+                ends = np.append(starts[1:], len(rows))
+                pieces = [(int(start), int(end), int(windows[start])) for start, end in zip(starts, ends)]
+            
+            for start, end, window in pieces:
+                if window == no_window:
+                    window = group_window
+                if window != group_window:
+                    flush()
+                    group_window = window
+                pending.append(table.slice(start, end - start))
+                pending_rows += end - start
+                if pending_rows >= PARQUET_ROW_GROUP_ROWS:
+                    flush()
+        flush()
+    
+    return {"rows_exported": rows_exported, "row_groups": row_groups, "time_sorted": index.time_sorted}
@@ -0,0 +1,497 @@
+"""
+Compiled filter expressions for log processing.
+Turns filter condition dictionaries into picklable predicate trees that are
+evaluated per entry or as NumPy masks over a log index or record batch.
+"""
+import operator
+import re
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .log_parser import INVALID_KEY, datetime_to_ns
+from .record_batch import RecordBatch
+
+
+class FilterOperator(Enum):
+    """Supported filter operators."""
+    EQUALS = "equals"
+    NOT_EQUALS = "not_equals"
+    CONTAINS = "contains"
+    NOT_CONTAINS = "not_contains"
+    STARTS_WITH = "starts_with"
+    ENDS_WITH = "ends_with"
+    REGEX = "regex"
+    GREATER_THAN = "greater_than"
+    LESS_THAN = "less_than"
+    BETWEEN = "between"
+    IN = "in"
+    NOT_IN = "not_in"
+
+
+class LogicalOperator(Enum):
+    """Logical operators for combining conditions."""
+    AND = "and"
+    OR = "or"
+    NOT = "not"
+
+
+# Entry key and default for each filterable field
+FIELD_KEYS = {
+    "timestamp": ("timestamp", None),
+    "level": ("level", ""),
+    "message": ("message", ""),
+    "line": ("original_line", ""),
+    "line_number": ("line_number", 0),
+}
+
+# Rows evaluated per batch when residual conditions need parsed entries
+FILTER_BATCH_ROWS = 65536
+
+_STRING_TESTS = {
+    FilterOperator.EQUALS.value: (operator.eq, False),
+    FilterOperator.NOT_EQUALS.value: (operator.ne, False),
+    FilterOperator.CONTAINS.value: (operator.contains, False),
+    FilterOperator.NOT_CONTAINS.value: (operator.contains, True),
+    FilterOperator.STARTS_WITH.value: (str.startswith, False),
+    FilterOperator.ENDS_WITH.value: (str.endswith, False),
+}
+
+_COMPARISONS = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+
+def field_string(value: Any) -> str:
+    """Case-folded string form of a field or filter value used by string operators."""
+    return value.lower() if isinstance(value, str) else str(value)
+
+
+class Predicate:
+    """
+    Single compiled condition on one entry field.
+    
+    Subclasses implement test() on the field value; evaluation errors count
+    as a non-match.
+    """
+    cost = 1
+    
+    def __init__(self, field: str):
+        self.field = field
+        self.key, self.default = FIELD_KEYS.get(field, (None, ""))
+    
+    def value(self, entry: Dict[str, Any]) -> Any:
+        """Field value of an entry, with missing values as an empty string."""
+        if self.key is None:
+            return ""
+        value = entry.get(self.key, self.default)
+        return "" if value is None else value
+    
+    def test(self, value: Any) -> bool:
+        raise NotImplementedError
+    
+    def __call__(self, entry: Dict[str, Any]) -> bool:
+        try:
+            return self.test(self.value(entry))
+        except Exception:
+            return False
+    
+    def column_mask(self, index) -> Optional[np.ndarray]:
+        """
+        Evaluate the predicate for every row of a log index at once.
+        
+        Level conditions are evaluated once per distinct level and mapped
+        through the level column; other fields return None.
+        """
+        if self.field != "level":
+            return None
+        return self.level_table(index.levels)[index.columns["level"]]
+    
+    def batch_mask(self, batch: RecordBatch, rows: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the predicate for some rows of a record batch.
+        
+        Level conditions go through the level vocabulary; other fields are
+        tested on an entry built for each row.
+        
+        Args:
+            batch: RecordBatch holding the rows
+            rows: Rows of the batch to evaluate
+        
+        Returns:
+            Boolean result per row
+        """
+        if self.field == "level":
+            return self.level_table(batch.levels)[batch.level_codes[rows]]
+        with_timestamp = self.key == "timestamp"
+        return np.fromiter((self(batch.entry(row, with_timestamp)) for row in rows.tolist()),
+                           dtype=bool, count=len(rows))
+    
+    def level_table(self, levels: List[str]) -> np.ndarray:
+        """Result for each level of a level vocabulary."""
+        return np.array([self({"level": name}) for name in levels], dtype=bool)
+
+
+class ConstantPredicate(Predicate):
+    """Condition with a fixed outcome, e.g. an unknown operator or invalid regex."""
+    cost = 0
+    
+    def __init__(self, field: str, result: bool):
+        super().__init__(field)
+        self.result = result
+    
+    def test(self, value: Any) -> bool:
+        return self.result
+    
+    def column_mask(self, index) -> Optional[np.ndarray]:
+        return np.full(index.rows, self.result, dtype=bool)
+    
+    def batch_mask(self, batch: RecordBatch, rows: np.ndarray) -> np.ndarray:
+        return np.full(len(rows), self.result, dtype=bool)
+
+
+class StringPredicate(Predicate):
+    """equals, not_equals, contains, not_contains, starts_with and ends_with."""
+    cost = 2
+    
+    def __init__(self, field: str, operator_name: str, filter_value: Any):
+        super().__init__(field)
+        self.compare, self.negate = _STRING_TESTS[operator_name]
+        self.match = operator_name.replace("not_", "")
+        self.filter_str = field_string(filter_value)
+    
+    def test(self, value: Any) -> bool:
+        return self.compare(field_string(value), self.filter_str) != self.negate
+    
+    def batch_mask(self, batch: RecordBatch, rows: np.ndarray) -> np.ndarray:
+        # Message and line tests run as substring searches over the batch buffer
+        if self.field in ("message", "line"):
+            mask = batch.text_mask(self.field, self.filter_str, self.match, rows)
+            if mask is not None:
+                return mask != self.negate
+        return super().batch_mask(batch, rows)
+
+
+class MembershipPredicate(Predicate):
+    """in and not_in against a list of values."""
+    cost = 1
+    
+    def __init__(self, field: str, filter_values: List[Any], negate: bool):
+        super().__init__(field)
+        self.values = frozenset(str(value).lower() for value in filter_values)
+        self.negate = negate
+    
+    def test(self, value: Any) -> bool:
+        return (field_string(value) in self.values) != self.negate
+
+
+class RegexPredicate(Predicate):
+    """Case-insensitive regex search, compiled once."""
+    cost = 4
+    
+    def __init__(self, field: str, pattern: re.Pattern):
+        super().__init__(field)
+        self.pattern = pattern
+    
+    def test(self, value: Any) -> bool:
+        return self.pattern.search(str(value)) is not None
+
+
+class Bound:
+    """One side of a comparison with the filter value pre-converted."""
+    
+    def __init__(self, comparison: str, filter_value: Any):
+        self.compare = _COMPARISONS[comparison]
+        self.filter_str = str(filter_value)
+        self.filter_datetime = _coerce_datetime(filter_value)
+        try:
+            self.filter_number = float(filter_value)
+        except (ValueError, TypeError):
+            self.filter_number = None
+    
+    def test(self, value: Any) -> bool:
+        if isinstance(value, datetime):
+            if self.filter_datetime is None:
+                return False
+            return self.compare(value, self.filter_datetime)
+        
+        if self.filter_number is not None:
+            try:
+                return self.compare(float(value), self.filter_number)
+            except (ValueError, TypeError):
+                pass
+        # Fall back to string comparison
+        return self.compare(str(value), self.filter_str)
+
+
+class ComparisonPredicate(Predicate):
+    """greater_than, less_than and between, on datetimes, numbers or strings."""
+    cost = 2
+    
+    def __init__(self, field: str, bounds: List[Bound]):
+        super().__init__(field)
+        self.bounds = bounds
+    
+    def test(self, value: Any) -> bool:
+        for bound in self.bounds:
+            if not bound.test(value):
+                return False
+        return True
+    
+    def column_mask(self, index) -> Optional[np.ndarray]:
+        if self.field != "timestamp":
+            return super().column_mask(index)
+        return self.timestamp_mask(index.columns["timestamp"])
+    
+    def timestamp_mask(self, timestamps: np.ndarray) -> Optional[np.ndarray]:
+        """Result for each epoch ns timestamp, None when a bound is not a naive datetime."""
+        if any(bound.filter_datetime is None or bound.filter_datetime.tzinfo is not None for bound in self.bounds):
+            return None
+        
+        # Entries carry microsecond datetimes, so compare at that resolution
+        micros = (timestamps // 1000) * 1000
+        mask = np.ones(len(timestamps), dtype=bool)
+        for bound in self.bounds:
+            mask &= bound.compare(micros, datetime_to_ns(bound.filter_datetime))
+        
+        # Lines without a timestamp all behave like an entry with no timestamp
+        return np.where(timestamps != INVALID_KEY, mask, self({"timestamp": None}))
+    
+    def batch_mask(self, batch: RecordBatch, rows: np.ndarray) -> np.ndarray:
+        if self.field == "line_number" and all(bound.filter_number is not None for bound in self.bounds):
+            line_numbers = batch.line_numbers[rows].astype(float)
+            mask = np.ones(len(rows), dtype=bool)
+            for bound in self.bounds:
+                mask &= bound.compare(line_numbers, bound.filter_number)
+            return mask
+        if self.field == "timestamp":
+            mask = self.timestamp_mask(batch.timestamps[rows])
+            if mask is not None:
+                return mask
+        return super().batch_mask(batch, rows)
+
+
+def _coerce_datetime(filter_value: Any) -> Optional[datetime]:
+    """Datetime a filter value compares as against datetime fields, None if it cannot."""
+    if isinstance(filter_value, datetime):
+        return filter_value
+    if not isinstance(filter_value, str):
+        return None
+    try:
+        return datetime.fromisoformat(filter_value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            return datetime.strptime(filter_value, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return None
+
+
+def compile_condition(condition: Dict[str, Any]) -> Predicate:
+    """
+    Compile a single filter condition.
+    
+    Args:
+        condition: Dictionary with field, operator and value keys
+    
+    Returns:
+        Predicate evaluating the condition; malformed conditions never match
+    """
+    try:
+        field = condition.get("field", "").lower()
+        operator_name = condition.get("operator", "").lower()
+        value = condition.get("value")
+    except Exception:
+        return ConstantPredicate("", False)
+    
+    if operator_name in _STRING_TESTS:
+        return StringPredicate(field, operator_name, value)
+    
+    if operator_name == FilterOperator.REGEX.value:
+        try:
+            return RegexPredicate(field, re.compile(str(value), re.IGNORECASE))
+        except re.error:
+            return ConstantPredicate(field, False)
+    
+    if operator_name in (FilterOperator.IN.value, FilterOperator.NOT_IN.value):
+        negate = operator_name == FilterOperator.NOT_IN.value
+        if not isinstance(value, list):
+            # A non-list value matches nothing for "in" and everything for "not_in"
+            return ConstantPredicate(field, negate)
+        return MembershipPredicate(field, value, negate)
+    
+    if operator_name == FilterOperator.GREATER_THAN.value:
+        return ComparisonPredicate(field, [Bound(">", value)])
+    
+    if operator_name == FilterOperator.LESS_THAN.value:
+        return ComparisonPredicate(field, [Bound("<", value)])
+    
+    if operator_name == FilterOperator.BETWEEN.value:
+        if isinstance(value, list) and len(value) == 2:
+            return ComparisonPredicate(field, [Bound(">=", value[0]), Bound("<=", value[1])])
+        return ConstantPredicate(field, False)
+    
+    return ConstantPredicate(field, False)
+
+
+class CompiledFilter:
+    """
+    Filter conditions compiled once and combined with AND or OR.
+    
+    Predicates are ordered cheapest first so evaluation short-circuits early.
+    Instances are picklable and can be shipped to worker processes.
+    """
+    
+    def __init__(self, predicates: List[Predicate], logical_operator: str = "and"):
+        self.predicates = sorted(predicates, key=lambda predicate: predicate.cost)
+        # Anything other than "or" combines with AND
+        self.match_any = str(logical_operator).lower() == LogicalOperator.OR.value
+    
+    @property
+    def fields(self) -> Set[str]:
+        """Entry keys the filter reads."""
+        return {predicate.key for predicate in self.predicates if predicate.key is not None}
+    
+    def __call__(self, entry: Dict[str, Any]) -> bool:
+        if self.match_any:
+            for predicate in self.predicates:
+                if predicate(entry):
+                    return True
+            return not self.predicates
+        
+        for predicate in self.predicates:
+            if not predicate(entry):
+                return False
+        return True
+    
+    def filter(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Entries that match the filter."""
+        if not self.predicates:
+            return entries
+        return [entry for entry in entries if self(entry)]
+    
+    def batch_mask(self, batch: RecordBatch) -> np.ndarray:
+        """
+        Evaluate the filter on every row of a record batch.
+        
+        Predicates run cheapest first, each on the rows the earlier ones left
+        undecided: the rows still matching for AND, the unmatched ones for OR.
+        
+        Args:
+            batch: RecordBatch to filter
+        
+        Returns:
+            Boolean mask of matching rows
+        """
+        if not self.predicates:
+            return np.ones(len(batch), dtype=bool)
+        
+        mask = np.full(len(batch), not self.match_any, dtype=bool)
+        for predicate in self.predicates:
+            undecided = np.flatnonzero(~mask if self.match_any else mask)
+            if not len(undecided):
+                break
+            mask[undecided] = predicate.batch_mask(batch, undecided)
+        return mask
+    
+    def select(self, index) -> Tuple[np.ndarray, List[str]]:
+        """
+        Matching rows of a log index.
+        
+        Args:
+            index: LogIndex of the file
+        
+        Returns:
+            Tuple of (ascending matching rows, their stripped lines)
+        """
+        rows = []
+        lines = []
+        for batch_rows, batch_lines in self.select_batches(index):
+            rows.append(batch_rows)
+            lines.extend(batch_lines)
+        return (np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)), lines
+    
+    def select_batches(self, index, batch_rows: int = FILTER_BATCH_ROWS) -> Iterator[Tuple[np.ndarray, List[str]]]:
+        """
+        Matching rows of a log index, one window of index rows at a time.
+        
+        Conditions with a column mask are evaluated on the whole index at once;
+        the remaining conditions are evaluated on a record batch built from the
+        index for the rows the masks leave undecided. Only one window of lines is held
+        at a time, so matches can be streamed to disk in constant memory.
+        
+        Args:
+            index: LogIndex of the file
+            batch_rows: Index rows per window
+        
+        Yields:
+            Tuples of (ascending matching rows, their stripped lines), in file order
+        """
+        masks = []
+        residual = []
+        for predicate in self.predicates:
+            mask = predicate.column_mask(index)
+            if mask is None:
+                residual.append(predicate)
+            else:
+                masks.append(mask)
+        
+        if self.match_any:
+            decided = np.zeros(index.rows, dtype=bool)
+            for mask in masks:
+                decided |= mask
+            if not self.predicates:
+                decided[:] = True
+        else:
+            decided = np.ones(index.rows, dtype=bool)
+            for mask in masks:
+                decided &= mask
+        
+        residual_filter = CompiledFilter(residual, "or" if self.match_any else "and")
+        for start in range(0, index.rows, batch_rows):
+            window = decided[start:start + batch_rows]
+            if not residual:
+                rows = start + np.flatnonzero(window)
+                if len(rows):
+                    yield rows, index.read_lines(rows)
+                continue
+            
+            # Rows the masks leave undecided: unmatched ones for OR, matched ones for AND
+            candidates = start + np.flatnonzero(~window if self.match_any else window)
+            matched_rows = np.empty(0, dtype=np.int64)
+            matched_lines = []
+            if len(candidates):
+                lines = index.read_lines(candidates)
+                matched = np.flatnonzero(residual_filter.batch_mask(RecordBatch.from_index(index, candidates, lines)))
+                matched_rows = candidates[matched]
+                matched_lines = [lines[position] for position in matched.tolist()]
+            
+            if not self.match_any:
+                # Every match came from the residual pass, which already read the lines
+                if len(matched_rows):
+                    yield matched_rows, matched_lines
+                continue
+            
+            window = window.copy()
+            window[matched_rows - start] = True
+            rows = start + np.flatnonzero(window)
+            if len(rows):
+                yield rows, index.read_lines(rows)
+
+
+def compile_filter(conditions: List[Dict[str, Any]], logical_operator: str = "and") -> CompiledFilter:
+    """
+    Compile filter conditions into a reusable filter.
+    
+    Args:
+        conditions: List of filter condition dictionaries
+        logical_operator: How to combine conditions ("and", "or")
+    
+    Returns:
+        CompiledFilter for the conditions
+    """
+    return CompiledFilter([compile_condition(condition) for condition in conditions or []], logical_operator)
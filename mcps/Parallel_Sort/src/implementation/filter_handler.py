@@ -2,33 +2,19 @@
 Multi-condition filtering capability for log processing.
 Supports complex filtering operations with multiple criteria and logical operators.
 """
-import re
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Union, Callable
-from enum import Enum
+from .log_parser import ns_to_datetime, datetime_to_ns
+from .log_formats import LogFormat, get_format
+from .filter_engine import FilterOperator, LogicalOperator, compile_filter
+from .log_index import get_log_index
 
-
-class FilterOperator(Enum):
-    """Supported filter operators."""
-    EQUALS = "equals"
-    NOT_EQUALS = "not_equals"
-    CONTAINS = "contains"
-    NOT_CONTAINS = "not_contains"
-    STARTS_WITH = "starts_with"
-    ENDS_WITH = "ends_with"
-    REGEX = "regex"
-    GREATER_THAN = "greater_than"
-    LESS_THAN = "less_than"
-    BETWEEN = "between"
-    IN = "in"
-    NOT_IN = "not_in"
-
-
-class LogicalOperator(Enum):
-    """Logical operators for combining conditions."""
-    AND = "and"
-    OR = "or"
-    NOT = "not"
+# FilterOperator and LogicalOperator live in filter_engine and are re-exported for existing imports
+__all__ = [
+    "FilterOperator", "LogicalOperator", "FILTER_PRESETS",
+    "filter_logs", "parse_log_entry", "apply_filters", "filter_by_time_range", "time_range_result",
+    "filter_by_log_level", "filter_by_keyword", "parse_time_string", "apply_filter_preset"
+]
 
 
 async def filter_logs(file_path: str, 
@@ -46,10 +32,10 @@ async def filter_logs(file_path: str,
         Dictionary containing filtered results
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        index = get_log_index(file_path)
+        total_lines = index.rows
         
-        if not lines:
+        if total_lines == 0:
             return {
                 "message": "File is empty",
                 "filtered_lines": [],
@@ -57,39 +43,21 @@ async def filter_logs(file_path: str,
                 "matched_lines": 0
             }
         
-        # Parse log entries
-        parsed_entries = []
-        for i, line in enumerate(lines, 1):
-            try:
-                entry = parse_log_entry(line.strip())
-                entry["line_number"] = i
-                parsed_entries.append(entry)
-            except ValueError:
-                # For filtering, we include invalid entries as-is
-                parsed_entries.append({
-                    "line_number": i,
-                    "timestamp": None,
-                    "level": "",
-                    "message": line.strip(),
-                    "original_line": line.strip(),
-                    "is_valid": False
-                })
-        
-        # Apply filters
-        filtered_entries = apply_filters(parsed_entries, filter_conditions, logical_operator)
-        
-        # Extract filtered lines
-        filtered_lines = [entry["original_line"] for entry in filtered_entries]
+        # Conditions are compiled once; level and time conditions run as masks over the index
+        compiled_filter = compile_filter(filter_conditions, logical_operator)
+        _, filtered_lines = compiled_filter.select(index)
+        log_format = index.log_format
         
         return {
             "filtered_lines": filtered_lines,
-            "total_lines": len(lines),
-            "matched_lines": len(filtered_entries),
+            "total_lines": total_lines,
+            "matched_lines": len(filtered_lines),
             "filter_conditions": filter_conditions,
             "logical_operator": logical_operator,
-            "match_percentage": round((len(filtered_entries) / len(lines) * 100), 2) if lines else 0,
+            "log_format": log_format.name,
+            "match_percentage": round((len(filtered_lines) / total_lines * 100), 2),
             "filtered_at": datetime.now().isoformat(),
-            "message": f"Successfully filtered {len(lines)} lines, {len(filtered_entries)} matches found"
+            "message": f"Successfully filtered {total_lines} lines, {len(filtered_lines)} matches found"
         }
         
     except FileNotFoundError:
@@ -104,27 +72,16 @@ async def filter_logs(file_path: str,
         }
 
 
-def parse_log_entry(line: str) -> Dict[str, Any]:
+def parse_log_entry(line: str, log_format: LogFormat = None) -> Dict[str, Any]:
     """Parse a single log line into structured components."""
-    timestamp_pattern = r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})'
-    match = re.search(timestamp_pattern, line)
-    
-    if not match:
+    parsed = (log_format or get_format()).parse_entry(line)
+    if parsed is None:
         raise ValueError("No valid timestamp found")
     
-    timestamp_str = match.group(1)
-    timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-    
-    remainder = line[match.end():].strip()
-    parts = remainder.split(' ', 1)
-    
-    level = parts[0] if parts else ""
-    message = parts[1] if len(parts) > 1 else ""
-    
     return {
-        "timestamp": timestamp,
-        "level": level.upper(),
-        "message": message,
+        "timestamp": ns_to_datetime(parsed.epoch_ns),
+        "level": parsed.level,
+        "message": parsed.message,
         "original_line": line,
         "is_valid": True
     }
@@ -144,234 +101,7 @@ def apply_filters(entries: List[Dict[str, Any]],
     Returns:
         List of entries that match the filter criteria
     """
-    if not conditions:
-        return entries
-    
-    filtered_entries = []
-    
-    for entry in entries:
-        if evaluate_entry_conditions(entry, conditions, logical_op):
-            filtered_entries.append(entry)
-    
-    return filtered_entries
-
-
-def evaluate_entry_conditions(entry: Dict[str, Any], 
-                            conditions: List[Dict[str, Any]], 
-                            logical_op: str) -> bool:
-    """
-    Evaluate whether an entry matches the filter conditions.
-    
-    Args:
-        entry: Log entry to evaluate
-        conditions: List of filter conditions
-        logical_op: Logical operator for combining conditions
-        
-    Returns:
-        True if entry matches conditions, False otherwise
-    """
-    if not conditions:
-        return True
-    
-    results = []
-    for condition in conditions:
-        result = evaluate_single_condition(entry, condition)
-        results.append(result)
-    
-    # Apply logical operator
-    if logical_op.lower() == "and":
-        return all(results)
-    elif logical_op.lower() == "or":
-        return any(results)
-    else:
-        # Default to AND
-        return all(results)
-
-
-def evaluate_single_condition(entry: Dict[str, Any], condition: Dict[str, Any]) -> bool:
-    """
-    Evaluate a single filter condition against a log entry.
-    
-    Args:
-        entry: Log entry to evaluate
-        condition: Single filter condition
-        
-    Returns:
-        True if condition matches, False otherwise
-    """
-    try:
-        field = condition.get("field", "").lower()
-        operator = condition.get("operator", "").lower()
-        value = condition.get("value")
-        
-        # Get the field value from the entry
-        field_value = get_field_value(entry, field)
-        
-        # Apply the operator
-        return apply_operator(field_value, operator, value)
-        
-    except Exception:
-        # If condition evaluation fails, return False
-        return False
-
-
-def get_field_value(entry: Dict[str, Any], field: str) -> Any:
-    """
-    Extract field value from log entry.
-    
-    Args:
-        entry: Log entry
-        field: Field name to extract
-        
-    Returns:
-        Field value or empty string if field doesn't exist
-    """
-    field_mapping = {
-        "timestamp": entry.get("timestamp"),
-        "level": entry.get("level", ""),
-        "message": entry.get("message", ""),
-        "line": entry.get("original_line", ""),
-        "line_number": entry.get("line_number", 0)
-    }
-    
-    return field_mapping.get(field, "")
-
-
-def apply_operator(field_value: Any, operator: str, filter_value: Any) -> bool:
-    """
-    Apply a filter operator to compare field value with filter value.
-    
-    Args:
-        field_value: Value from log entry field
-        operator: Filter operator to apply
-        filter_value: Value to compare against
-        
-    Returns:
-        True if comparison matches, False otherwise
-    """
-    if field_value is None:
-        field_value = ""
-    
-    # Convert to string for most operations
-    field_str = str(field_value).lower() if isinstance(field_value, str) else str(field_value)
-    filter_str = str(filter_value).lower() if isinstance(filter_value, str) else str(filter_value)
-    
-    if operator == FilterOperator.EQUALS.value:
-        return field_str == filter_str
-    
-    elif operator == FilterOperator.NOT_EQUALS.value:
-        return field_str != filter_str
-    
-    elif operator == FilterOperator.CONTAINS.value:
-        return filter_str in field_str
-    
-    elif operator == FilterOperator.NOT_CONTAINS.value:
-        return filter_str not in field_str
-    
-    elif operator == FilterOperator.STARTS_WITH.value:
-        return field_str.startswith(filter_str)
-    
-    elif operator == FilterOperator.ENDS_WITH.value:
-        return field_str.endswith(filter_str)
-    
-    elif operator == FilterOperator.REGEX.value:
-        try:
-            return bool(re.search(str(filter_value), str(field_value), re.IGNORECASE))
-        except re.error:
-            return False
-    
-    elif operator == FilterOperator.GREATER_THAN.value:
-        return compare_values(field_value, filter_value, ">")
-    
-    elif operator == FilterOperator.LESS_THAN.value:
-        return compare_values(field_value, filter_value, "<")
-    
-    elif operator == FilterOperator.BETWEEN.value:
-        if isinstance(filter_value, list) and len(filter_value) == 2:
-            return (compare_values(field_value, filter_value[0], ">=") and 
-                   compare_values(field_value, filter_value[1], "<="))
-        return False
-    
-    elif operator == FilterOperator.IN.value:
-        if isinstance(filter_value, list):
-            return field_str in [str(v).lower() for v in filter_value]
-        return False
-    
-    elif operator == FilterOperator.NOT_IN.value:
-        if isinstance(filter_value, list):
-            return field_str not in [str(v).lower() for v in filter_value]
-        return True
-    
-    return False
-
-
-def compare_values(field_value: Any, filter_value: Any, operator: str) -> bool:
-    """
-    Compare two values with numeric or datetime comparison.
-    
-    Args:
-        field_value: Value from log entry
-        filter_value: Value to compare against
-        operator: Comparison operator (>, <, >=, <=)
-        
-    Returns:
-        True if comparison is true, False otherwise
-    """
-    try:
-        # Handle datetime comparison
-        if isinstance(field_value, datetime):
-            if isinstance(filter_value, str):
-                try:
-                    filter_dt = datetime.fromisoformat(filter_value.replace('Z', '+00:00'))
-                except ValueError:
-                    try:
-                        filter_dt = datetime.strptime(filter_value, '%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        return False
-            else:
-                filter_dt = filter_value
-            
-            if operator == ">":
-                return field_value > filter_dt
-            elif operator == "<":
-                return field_value < filter_dt
-            elif operator == ">=":
-                return field_value >= filter_dt
-            elif operator == "<=":
-                return field_value <= filter_dt
-        
-        # Handle numeric comparison
-        else:
-            try:
-                field_num = float(field_value)
-                filter_num = float(filter_value)
-                
-                if operator == ">":
-                    return field_num > filter_num
-                elif operator == "<":
-                    return field_num < filter_num
-                elif operator == ">=":
-                    return field_num >= filter_num
-                elif operator == "<=":
-                    return field_num <= filter_num
-            except (ValueError, TypeError):
-                # Fall back to string comparison
-                field_str = str(field_value)
-                filter_str = str(filter_value)
-                
-                if operator == ">":
-                    return field_str > filter_str
-                elif operator == "<":
-                    return field_str < filter_str
-                elif operator == ">=":
-                    return field_str >= filter_str
-                elif operator == "<=":
-                    return field_str <= filter_str
-    
-    except Exception:
-        return False
-    
-    return False
+    return compile_filter(conditions, logical_op).filter(entries)
 
 
 async def filter_by_time_range(file_path: str, 
@@ -392,20 +122,75 @@ async def filter_by_time_range(file_path: str,
         # Parse time strings
         start_dt = parse_time_string(start_time)
         end_dt = parse_time_string(end_time)
+    except ValueError as e:
+        return {
+            "error": f"Invalid time format: {str(e)}",
+            "filtered_lines": []
+        }
+    
+    filter_conditions = [{
+        "field": "timestamp",
+        "operator": "between",
+        "value": [start_dt, end_dt]
+    }]
+    
+    try:
+        start_ns = datetime_to_ns(start_dt)
+        end_ns = datetime_to_ns(end_dt)
         
-        filter_conditions = [{
-            "field": "timestamp",
-            "operator": "between",
-            "value": [start_dt, end_dt]
-        }]
+        # Sampled offsets cannot show that the lines between them are in order,
+        # so the range is always located in the full (persisted when large) index
+        index = get_log_index(file_path)
         
-        return await filter_logs(file_path, filter_conditions, "and")
+        rows = index.time_range_rows(start_ns, end_ns)
+        return time_range_result(
+            index.read_lines(rows), index.rows, len(rows), index.log_format.name,
+            "index_bisect" if index.time_sorted else "index_scan", filter_conditions
+        )
         
-    except ValueError as e:
+    except FileNotFoundError:
         return {
-            "error": f"Invalid time format: {str(e)}",
+            "error": f"File not found: {file_path}",
             "filtered_lines": []
         }
+    except Exception as e:
+        return {
+            "error": f"Filtering failed: {str(e)}",
+            "filtered_lines": []
+        }
+
+
+def time_range_result(filtered_lines: List[str], total_lines: int, scanned_lines: int,
+                      format_name: str, search_method: str,
+                      filter_conditions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build a filter result for a time-range query.
+    
+    Args:
+        filtered_lines: Lines inside the time range
+        total_lines: Lines in the file
+        scanned_lines: Lines read to answer the query
+        format_name: Detected log format
+        search_method: How the range was located (index_bisect or index_scan)
+        filter_conditions: Equivalent filter conditions
+        
+    Returns:
+        Dictionary in the shape returned by filter_logs
+    """
+    matched = len(filtered_lines)
+    return {
+        "filtered_lines": filtered_lines,
+        "total_lines": total_lines,
+        "matched_lines": matched,
+        "scanned_lines": scanned_lines,
+        "filter_conditions": filter_conditions,
+        "logical_operator": "and",
+        "log_format": format_name,
+        "search_method": search_method,
+        "match_percentage": round((matched / total_lines * 100), 2) if total_lines else 0.0,
+        "filtered_at": datetime.now().isoformat(),
+        "message": f"Successfully filtered {total_lines} lines, {matched} matches found"
+    }
 
 
 async def filter_by_log_level(file_path: str, 
@@ -0,0 +1,133 @@
+"""
+Follow sessions for live, append-only logs.
+Remember how far each log has been read along with the aggregate state built
+from it, so repeated analyses only parse the lines appended since the last call.
+"""
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional, Tuple
+
+from .log_formats import LogFormat, detect_file_format
+from .log_index import LogIndex, build_index
+
+
+# Sessions kept before the least recently polled one is dropped
+FOLLOW_SESSION_LIMIT = 64
+
+_SESSIONS: "OrderedDict[Tuple[str, str], FollowSession]" = OrderedDict()
+
+
+class FollowSession:
+    """
+    Read position and aggregate state of one followed log.
+    
+    The position is the byte offset just past the last complete line consumed.
+    A log whose inode changed, or which is now shorter than that offset, has
+    been rotated or truncated; its state is then rebuilt from the new file.
+    """
+    
+    def __init__(self, file_path: str, kind: str, new_state: Callable[[], Any], settings: Any = None):
+        self.file_path = file_path
+        self.kind = kind
+        self.new_state = new_state
+        self.settings = settings
+        self.rotations = 0
+        self.reset()
+    
+    def reset(self, inode: Optional[int] = None) -> None:
+        """Start over from the beginning of the log."""
+        self.inode = inode
+        self.offset = 0
+        self.lines = 0
+        self.log_format: Optional[LogFormat] = None
+        self.state = self.new_state()
+    
+    def poll(self) -> Tuple[Optional[LogIndex], int, bool]:
+        """
+        Index the complete lines appended since the previous poll.
+        
+        A trailing line without a newline is left for a later poll, since the
+        writer may still be appending to it.
+        
+        Returns:
+            Tuple of (index, rows, rotated): an in-memory index starting at the
+            previous offset (None if nothing was appended), how many of its rows
+            are complete lines, and whether the log was rotated or truncated
+        
+        Raises:
+            FileNotFoundError: If the log file does not exist
+        """
+        stat = os.stat(self.file_path)
+        rotated = self.inode is not None and (stat.st_ino != self.inode or stat.st_size < self.offset)
+        if rotated:
+            self.rotations += 1
+            self.reset(stat.st_ino)
+        self.inode = stat.st_ino
+        
+        if stat.st_size == self.offset:
+            return None, 0, rotated
+        
+        if self.log_format is None:
+            self.log_format = detect_file_format(self.file_path)
+        
+        index = build_index(self.file_path, self.log_format, self.offset, stat.st_size, with_templates=False)
+        rows = index.rows - 1 if index.partial_tail else index.rows
+        if rows:
+            self.offset = index.line_end(rows - 1)
+            self.lines += rows
+        return index, rows, rotated
+    
+    def describe(self, new_lines: int, rotated: bool) -> Dict[str, Any]:
+        """Follow details reported with each result."""
+        return {
+            "new_lines": new_lines,
+            "lines_followed": self.lines,
+            "offset": self.offset,
+            "rotated": rotated,
+            "rotations": self.rotations,
+            "polled_at": datetime.now().isoformat()
+        }
+
+
+def get_follow_session(file_path: str, kind: str, new_state: Callable[[], Any],
+                       settings: Any = None) -> FollowSession:
+    """
+    Return the follow session of a log, creating it on first use.
+    
+    Args:
+        file_path: Path to the followed log
+        kind: Analysis the session aggregates (e.g. "statistics")
+        new_state: Factory for an empty aggregate state
+        settings: Analysis settings; a session created with other settings is replaced
+    
+    Returns:
+        FollowSession for the log and analysis
+    """
+    key = (os.path.realpath(file_path), kind)
+    session = _SESSIONS.get(key)
+    if session is None or session.settings != settings:
+        session = FollowSession(file_path, kind, new_state, settings)
+        _SESSIONS[key] = session
+    
+    _SESSIONS.move_to_end(key)
+    while len(_SESSIONS) > FOLLOW_SESSION_LIMIT:
+        _SESSIONS.popitem(last=False)
+    return session
+
+
+def end_follow_sessions(file_path: str) -> int:
+    """
+    Forget every follow session of a log.
+    
+    Args:
+        file_path: Path to the followed log
+    
+    Returns:
+        Number of sessions removed
+    """
+    path = os.path.realpath(file_path)
+    keys = [key for key in _SESSIONS if key[0] == path]
+    for key in keys:
+        del _SESSIONS[key]
+    return len(keys)
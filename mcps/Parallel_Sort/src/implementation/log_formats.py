@@ -0,0 +1,508 @@
+"""
+Log format registry for log processing.
+Parses standard, ISO8601, bracketed, syslog, epoch and JSON-lines logs into a
+common compact record and auto-detects the format of a file from a sample.
+"""
+import json
+import re
+from datetime import datetime
+from typing import Dict, Any, List, Optional, NamedTuple, Callable, Pattern
+from .log_parser import scan_timestamp, timestamp_key
+
+
+NS_PER_SECOND = 1_000_000_000
+
+# Compact level codes shared by every format; unknown level tokens map to LEVEL_OTHER
+LEVEL_NAMES = (
+    "", "TRACE", "DEBUG", "INFO", "NOTICE", "WARN", "WARNING",
+    "ERROR", "CRITICAL", "FATAL", "ALERT", "EMERGENCY"
+)
+LEVEL_CODES = {name: code for code, name in enumerate(LEVEL_NAMES)}
+LEVEL_OTHER = 255
+
+# Syslog PRI severities (RFC 3164/5424)
+SYSLOG_SEVERITIES = ("EMERGENCY", "ALERT", "CRITICAL", "ERROR", "WARNING", "NOTICE", "INFO", "DEBUG")
+
+# Numeric levels used by JSON loggers such as pino and bunyan
+NUMERIC_LEVELS = {10: "TRACE", 20: "DEBUG", 30: "INFO", 40: "WARN", 50: "ERROR", 60: "FATAL"}
+
+# Lines inspected when detecting the format of a file
+FORMAT_SAMPLE_LINES = 200
+FORMAT_SAMPLE_BYTES = 64 * 1024
+
+DEFAULT_FORMAT = "standard"
+
+_MONTHS = {name: index for index, name in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+
+_ISO_TIMESTAMP = (r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}'
+                  r'(?:[.,]\d{1,9})?(?:Z|[+-]\d{2}:?\d{2})?')
+
+
+class LogRecord(NamedTuple):
+    """Compact parse result shared by all formats."""
+    epoch_ns: int
+    level_code: int
+    message_offset: int
+
+
+class ParsedEntry(NamedTuple):
+    """Full-fidelity parse result with the level and message text."""
+    epoch_ns: int
+    level: str
+    message: str
+    timestamp_text: str
+
+
+def level_code(level: str) -> int:
+    """
+    Map a level name to its compact code.
+    
+    Args:
+        level: Level name (case-insensitive)
+    
+    Returns:
+        Level code, LEVEL_OTHER for unrecognized names
+    """
+    return LEVEL_CODES.get(level.upper(), LEVEL_OTHER)
+
+
+def parse_iso8601_ns(text: str) -> int:
+    """
+    Convert an ISO8601-style timestamp to nanoseconds since the epoch (UTC).
+    
+    Accepts a 'T' or space separator, '.' or ',' fractional seconds and an
+    optional 'Z' or +HH:MM/-HHMM zone. Timestamps without a zone are treated as UTC.
+    
+    Args:
+        text: Timestamp text
+    
+    Returns:
+        Nanoseconds since the epoch
+    
+    Raises:
+        ValueError: If the text is not a valid timestamp
+    """
+    if len(text) < 19 or text[10] not in 'T ':
+        raise ValueError(f"Invalid timestamp format '{text}'")
+    
+    seconds = timestamp_key(text[:10] + ' ' + text[11:19])
+    rest = text[19:]
+    fraction_ns = 0
+    
+    if rest[:1] in ('.', ','):
+        digits_end = 1
+        while digits_end < len(rest) and rest[digits_end].isdigit():
+            digits_end += 1
+        fraction = rest[1:digits_end]
+        if not fraction or len(fraction) > 9:
+            raise ValueError(f"Invalid fractional seconds in '{text}'")
+        fraction_ns = int(fraction.ljust(9, '0'))
+        rest = rest[digits_end:]
+    
+    if rest in ('', 'Z'):
+        offset_seconds = 0
+    elif rest[0] in '+-' and rest[1:].replace(':', '').isdigit() and len(rest[1:].replace(':', '')) == 4:
+        zone = rest[1:].replace(':', '')
+        offset_seconds = int(zone[:2]) * 3600 + int(zone[2:]) * 60
+        if rest[0] == '+':
+            offset_seconds = -offset_seconds
+    else:
+        raise ValueError(f"Invalid timezone in '{text}'")
+    
+    return (seconds + offset_seconds) * NS_PER_SECOND + fraction_ns
+
+
+def parse_epoch_ns(value: Any) -> int:
+    """
+    Convert an epoch number (seconds, milliseconds, microseconds or nanoseconds) to nanoseconds.
+    
+    Args:
+        value: Number or numeric string
+    
+    Returns:
+        Nanoseconds since the epoch
+    
+    Raises:
+        ValueError: If the value is not numeric
+    """
+    if isinstance(value, bool):
+        raise ValueError("Boolean is not an epoch timestamp")
+    
+    text = str(value)
+    whole, _, fraction = text.partition('.')
+    if not whole.isdigit() or (fraction and not fraction.isdigit()):
+        raise ValueError(f"Invalid epoch timestamp '{text}'")
+    
+    # Pick the unit from the magnitude of the integer part
+    digits = len(whole)
+    if digits <= 11:
+        scale = NS_PER_SECOND
+    elif digits <= 14:
+        scale = 1_000_000
+    elif digits <= 17:
+        scale = 1_000
+    else:
+        scale = 1
+    
+    fraction_ns = int(fraction[:9].ljust(9, '0')) * scale // NS_PER_SECOND if fraction else 0
+    return int(whole) * scale + fraction_ns
+
+
+class LogFormat:
+    """
+    Base class for a log line format.
+    
+    Subclasses implement parse_entry; parse derives the compact record from it
+    unless a format can produce the record more cheaply.
+    """
+    name = ""
+    description = ""
+    detect_pattern: Optional[Pattern] = None
+    
+    def parse_entry(self, line: str) -> Optional[ParsedEntry]:
+        """Parse a line into timestamp, level and message, or None if it does not match."""
+        raise NotImplementedError
+    
+    def parse(self, line: str) -> Optional[LogRecord]:
+        """Parse a line into a compact record, or None if it does not match."""
+        entry = self.parse_entry(line)
+        if entry is None:
+            return None
+        return LogRecord(entry.epoch_ns, level_code(entry.level), len(line) - len(entry.message))
+    
+    def matches(self, line: str) -> bool:
+        """Whether a sample line looks like this format (used for detection)."""
+        if self.detect_pattern is not None:
+            return bool(self.detect_pattern.match(line))
+        return self.parse_entry(line) is not None
+    
+    def describe(self) -> Dict[str, Any]:
+        """Return a JSON-friendly description of the format."""
+        return {"name": self.name, "description": self.description}
+
+
+class StandardLogFormat(LogFormat):
+    """``YYYY-MM-DD HH:MM:SS LEVEL message`` with the timestamp anywhere in the line."""
+    name = "standard"
+    description = "YYYY-MM-DD HH:MM:SS LEVEL message"
+    detect_pattern = re.compile(r'\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(?:\s|$)')
+    
+    def parse_entry(self, line: str) -> Optional[ParsedEntry]:
+        try:
+            key, start, end = scan_timestamp(line)
+        except ValueError:
+            return None
+        
+        parts = line[end:].strip().split(' ', 1)
+        return ParsedEntry(
+            key * NS_PER_SECOND,
+            parts[0].upper() if parts else "",
+            parts[1] if len(parts) > 1 else "",
+            line[start:end]
+        )
+    
+    def parse(self, line: str) -> Optional[LogRecord]:
+        try:
+            key, _, end = scan_timestamp(line)
+        except ValueError:
+            return None
+        
+        # Level is the first token after the timestamp, the message follows it
+        level_start = end
+        while level_start < len(line) and line[level_start].isspace():
+            level_start += 1
+        level_end = line.find(' ', level_start)
+        if level_end == -1:
+            return LogRecord(key * NS_PER_SECOND, level_code(line[level_start:].rstrip()), len(line))
+        return LogRecord(key * NS_PER_SECOND, level_code(line[level_start:level_end]), level_end + 1)
+
+
+class RegexLogFormat(LogFormat):
+    """
+    Format described by an anchored regex with ``timestamp``, ``level`` and
+    ``message`` named groups. ``level`` and ``message`` are optional.
+    """
+    
+    def __init__(self, name: str, pattern: str,
+                 timestamp_parser: Callable[[str], int],
+                 description: str = "",
+                 detect_pattern: Optional[str] = None):
+        self.name = name
+        self.description = description
+        self.pattern = re.compile(pattern)
+        self.timestamp_parser = timestamp_parser
+        if detect_pattern is not None:
+            self.detect_pattern = re.compile(detect_pattern)
+        self._has_level = "level" in self.pattern.groupindex
+        self._has_message = "message" in self.pattern.groupindex
+    
+    def _match(self, line: str):
+        match = self.pattern.match(line)
+        if not match:
+            return None, 0
+        try:
+            return match, self.timestamp_parser(match.group("timestamp"))
+        except ValueError:
+            return None, 0
+    
+    def parse(self, line: str) -> Optional[LogRecord]:
+        match, epoch_ns = self._match(line)
+        if match is None:
+            return None
+        level = (match.group("level") or "") if self._has_level else ""
+        offset = match.start("message") if self._has_message and match.group("message") is not None else len(line)
+        return LogRecord(epoch_ns, level_code(level), offset)
+    
+    def parse_entry(self, line: str) -> Optional[ParsedEntry]:
+        match, epoch_ns = self._match(line)
+        if match is None:
+            return None
+        level = (match.group("level") or "") if self._has_level else ""
+        message = (match.group("message") or "") if self._has_message else ""
+        return ParsedEntry(epoch_ns, level.upper(), message, match.group("timestamp"))
+
+
+def strptime_parser(timestamp_format: str) -> Callable[[str], int]:
+    """
+    Build a timestamp parser from a strptime format, for registering custom formats.
+    
+    Args:
+        timestamp_format: strptime format string
+    
+    Returns:
+        Callable converting timestamp text to nanoseconds since the epoch
+    """
+    epoch = datetime(1970, 1, 1)
+    
+    def parse(text: str) -> int:
+        parsed = datetime.strptime(text, timestamp_format)
+        if parsed.tzinfo is not None:
+            parsed = parsed.replace(tzinfo=None) - parsed.utcoffset()
+        delta = parsed - epoch
+        return (delta.days * 86400 + delta.seconds) * NS_PER_SECOND + delta.microseconds * 1000
+    
+    return parse
+
+
+class SyslogFormat(LogFormat):
+    """BSD syslog (RFC 3164) lines, optionally prefixed with a ``<PRI>`` field."""
+    name = "syslog"
+    description = "<PRI>Mmm dd HH:MM:SS host tag: message"
+    pattern = re.compile(
+        r'(?:<(?P<pri>\d{1,3})>)?(?P<timestamp>(?P<month>[A-Z][a-z]{2}) +(?P<day>\d{1,2}) '
+        r'(?P<clock>\d{2}:\d{2}:\d{2})) (?P<host>\S+) (?P<tag>[^:\s]+): ?(?P<message>.*)'
+    )
+    
+    def __init__(self, year: Optional[int] = None):
+        # Syslog timestamps carry no year
+        self.year = year
+    
+    def _parse(self, line: str):
+        match = self.pattern.match(line)
+        if not match or match.group("month") not in _MONTHS:
+            return None
+        
+        year = self.year or datetime.now().year
+        date_text = f"{year:04d}-{_MONTHS[match.group('month')]:02d}-{int(match.group('day')):02d}"
+        try:
+            seconds = timestamp_key(f"{date_text} {match.group('clock')}")
+        except ValueError:
+            return None
+        
+        message = match.group("message")
+        if match.group("pri") is not None:
+            level = SYSLOG_SEVERITIES[int(match.group("pri")) % 8]
+        else:
+            # Fall back to a leading level word such as "error:" or "[WARN]"
+            first_word = message.split(' ', 1)[0].strip('[]:').upper()
+            level = first_word if first_word in LEVEL_CODES else ""
+        
+        return match, seconds * NS_PER_SECOND, level
+    
+    def parse(self, line: str) -> Optional[LogRecord]:
+        parsed = self._parse(line)
+        if parsed is None:
+            return None
+        match, epoch_ns, level = parsed
+        return LogRecord(epoch_ns, level_code(level), match.start("message"))
+    
+    def parse_entry(self, line: str) -> Optional[ParsedEntry]:
+        parsed = self._parse(line)
+        if parsed is None:
+            return None
+        match, epoch_ns, level = parsed
+        return ParsedEntry(epoch_ns, level, match.group("message"), match.group("timestamp"))
+
+
+class JsonLinesFormat(LogFormat):
+    """One JSON object per line with timestamp, level and message fields."""
+    name = "jsonl"
+    description = '{"timestamp": ..., "level": ..., "message": ...} per line'
+    detect_pattern = re.compile(r'\s*\{')
+    
+    timestamp_keys = ("timestamp", "@timestamp", "time", "ts", "datetime", "date", "t")
+    level_keys = ("level", "severity", "lvl", "levelname", "log.level", "loglevel")
+    message_keys = ("message", "msg", "text", "log", "event")
+    
+    def parse_entry(self, line: str) -> Optional[ParsedEntry]:
+        if not self.detect_pattern.match(line):
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict):
+            return None
+        
+        raw_timestamp = next((record[key] for key in self.timestamp_keys if key in record), None)
+        if raw_timestamp is None:
+            return None
+        try:
+            if isinstance(raw_timestamp, (int, float)) or str(raw_timestamp).replace('.', '', 1).isdigit():
+                epoch_ns = parse_epoch_ns(raw_timestamp)
+            else:
+                epoch_ns = parse_iso8601_ns(str(raw_timestamp))
+        except ValueError:
+            return None
+        
+        raw_level = next((record[key] for key in self.level_keys if key in record), "")
+        if isinstance(raw_level, int) and not isinstance(raw_level, bool):
+            raw_level = NUMERIC_LEVELS.get(raw_level, str(raw_level))
+        
+        message = next((record[key] for key in self.message_keys if key in record), "")
+        if not isinstance(message, str):
+            message = json.dumps(message, ensure_ascii=False)
+        
+        return ParsedEntry(epoch_ns, str(raw_level).upper(), message, str(raw_timestamp))
+    
+    def parse(self, line: str) -> Optional[LogRecord]:
+        entry = self.parse_entry(line)
+        if entry is None:
+            return None
+        # The message is a decoded JSON value, not a slice of the line
+        return LogRecord(entry.epoch_ns, level_code(entry.level), -1)
+
+
+_FORMAT_REGISTRY: Dict[str, LogFormat] = {}
+
+# Bumped on every registration, so worker processes forked earlier can be replaced
+_REGISTRY_VERSION = 0
+
+
+def register_format(log_format: LogFormat, replace: bool = False) -> None:
+    """
+    Add a format to the registry used for lookup and auto-detection.
+    
+    Formats are tried in registration order, which also breaks detection ties.
+    
+    Args:
+        log_format: Format instance with a unique name
+        replace: Whether an existing format with the same name may be replaced
+    
+    Raises:
+        ValueError: If the name is already registered and replace is False
+    """
+    if log_format.name in _FORMAT_REGISTRY and not replace:
+        raise ValueError(f"Log format already registered: {log_format.name}")
+    global _REGISTRY_VERSION
+    _FORMAT_REGISTRY[log_format.name] = log_format
+    _REGISTRY_VERSION += 1
+
+
+def format_registry_version() -> int:
+    """Number of registrations so far; changes whenever the registry does."""
+    return _REGISTRY_VERSION
+
+
+def get_format(name: Optional[str] = None) -> LogFormat:
+    """
+    Look up a registered format by name.
+    
+    Args:
+        name: Format name, or None for the default format
+    
+    Returns:
+        The registered format
+    
+    Raises:
+        ValueError: If no format has that name
+    """
+    name = name or DEFAULT_FORMAT
+    if name not in _FORMAT_REGISTRY:
+        raise ValueError(f"Unknown log format: {name}. Available formats: {list(_FORMAT_REGISTRY.keys())}")
+    return _FORMAT_REGISTRY[name]
+
+
+def available_formats() -> List[Dict[str, Any]]:
+    """Describe every registered format."""
+    return [log_format.describe() for log_format in _FORMAT_REGISTRY.values()]
+
+
+def detect_format(sample_lines: List[str]) -> LogFormat:
+    """
+    Pick the registered format that matches the most lines of a sample.
+    
+    Args:
+        sample_lines: Lines taken from the start of a log
+    
+    Returns:
+        Best-matching format, the default format if nothing matches
+    """
+    lines = [line.strip() for line in sample_lines if line.strip()][:FORMAT_SAMPLE_LINES]
+    best_format = get_format(DEFAULT_FORMAT)
+    best_score = 0
+    
+    for log_format in _FORMAT_REGISTRY.values():
+        score = sum(1 for line in lines if log_format.matches(line))
+        if score > best_score:
+            best_format, best_score = log_format, score
+    
+    return best_format
+
+
+def detect_file_format(file_path: str) -> LogFormat:
+    """
+    Detect the format of a log file from a sample of its first lines.
+    
+    Args:
+        file_path: Path to the log file
+    
+    Returns:
+        Best-matching format
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(FORMAT_SAMPLE_BYTES)
+    
+    lines = sample.decode('utf-8', errors='replace').splitlines()
+    if len(sample) == FORMAT_SAMPLE_BYTES and len(lines) > 1:
+        # Drop the trailing partial line
+        lines = lines[:-1]
+    
+    return detect_format(lines)
+
+
+register_format(StandardLogFormat())
+register_format(RegexLogFormat(
+    "iso8601",
+    r'(?P<timestamp>' + _ISO_TIMESTAMP + r')(?:\s+\[?(?P<level>[A-Za-z]+)\]?:?)?(?:\s+(?P<message>.*))?$',
+    parse_iso8601_ns,
+    description="ISO8601 timestamp with optional fraction and zone, then LEVEL message",
+    detect_pattern=r'\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2}|[ ]\d{2}:\d{2}:\d{2}(?=[.,]\d|Z|[+-]\d{2}))'
+))
+register_format(RegexLogFormat(
+    "bracketed",
+    r'\[(?P<timestamp>' + _ISO_TIMESTAMP + r')\](?:\s*\[?(?P<level>[A-Za-z]+)\]?:?)?(?:\s+(?P<message>.*))?$',
+    parse_iso8601_ns,
+    description="[timestamp] [LEVEL] message",
+    detect_pattern=r'\[\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}'
+))
+register_format(SyslogFormat())
+register_format(RegexLogFormat(
+    "epoch",
+    r'(?P<timestamp>\d{10}(?:\d{3}|\d{6}|\d{9})?(?:\.\d{1,9})?)(?:\s+(?P<level>\S+))?(?:\s+(?P<message>.*))?$',
+    parse_epoch_ns,
+    description="Unix epoch seconds/ms/us/ns, then LEVEL message",
+    detect_pattern=r'\d{10}(?:\d{3}|\d{6}|\d{9})?(?:\.\d{1,9})?\s'
+))
+register_format(JsonLinesFormat())
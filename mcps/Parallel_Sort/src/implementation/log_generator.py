@@ -0,0 +1,233 @@
+"""
+Synthetic log generation for benchmarks and tests.
+Writes deterministic logs of a requested size with a configurable format,
+level mix, amount of timestamp disorder and share of lines without a
+timestamp. The same seed and settings always produce the same bytes.
+"""
+import json
+import os
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+
+# Formats generate_log can write, all detected by detect_file_format
+GENERATOR_FORMATS = ("standard", "iso8601", "jsonl", "syslog")
+
+# Default share of each level
+DEFAULT_LEVEL_MIX = {"INFO": 0.70, "DEBUG": 0.15, "WARNING": 0.10, "ERROR": 0.04, "CRITICAL": 0.01}
+
+# Message templates with the fields filling their placeholders
+MESSAGE_TEMPLATES = (
+    ("Request {} handled in {} ms", ("id", "ms")),
+    ("User user{} logged in from {}", ("user", "ip")),
+    ("Connection to {} failed after {} seconds", ("ip", "seconds")),
+    ("Cache miss for key session:{}", ("id",)),
+    ("Disk usage at {}% on /dev/sd{}", ("pct", "disk")),
+    ("Job job-{} finished with status {}", ("job", "status")),
+    ("Timeout waiting for rank {} after {} ms", ("rank", "ms")),
+    ("Checkpoint {} written to /scratch/run{}/ckpt.h5 ({} MB)", ("job", "rank", "mb")),
+)
+
+# Continuation lines standing in for stack traces and wrapped output
+CONTINUATION_TEMPLATE = "    at worker.step(worker.py:{line})"
+
+_STATUSES = ("ok", "failed", "cancelled", "timeout")
+
+_MONTH_NAMES = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Syslog severity of each level, for the <PRI> field (facility user)
+_SYSLOG_SEVERITY = {"CRITICAL": 2, "ERROR": 3, "WARNING": 4, "INFO": 6, "DEBUG": 7}
+
+# Lines generated per batch
+GENERATOR_BATCH_LINES = 100000
+
+
+def generate_log(file_path: str,
+                 size_bytes: int,
+                 log_format: str = "standard",
+                 disorder: float = 0.0,
+                 level_mix: Optional[Dict[str, float]] = None,
+                 invalid_ratio: float = 0.0,
+                 seed: int = 0,
+                 start: str = "2024-01-01T00:00:00",
+                 lines_per_second: float = 10.0,
+                 disorder_seconds: int = 3600) -> Dict[str, Any]:
+    """
+    Write a synthetic log of about size_bytes bytes.
+    
+    Timestamps advance by 1 / lines_per_second per line. A `disorder` share
+    of lines is moved by a random offset of up to disorder_seconds either
+    way, so 0.0 gives a sorted log and 1.0 a thoroughly shuffled one.
+    
+    Args:
+        file_path: Path of the log to write
+        size_bytes: Size to reach; the last batch may overshoot by one line
+        log_format: One of GENERATOR_FORMATS
+        disorder: Share of lines whose timestamp is displaced (0.0-1.0)
+        level_mix: Relative weight of each level (default: DEFAULT_LEVEL_MIX)
+        invalid_ratio: Share of lines followed by a continuation line without a timestamp
+        seed: Random seed; equal seeds and settings give identical files
+        start: ISO timestamp of the first line
+        lines_per_second: Log lines per second of log time
+        disorder_seconds: Largest displacement of a disordered line
+    
+    Returns:
+        Dictionary with the path, bytes and lines written and the settings used
+    
+    Raises:
+        ValueError: If the format or the level mix is invalid
+    """
+    if log_format not in GENERATOR_FORMATS:
+        raise ValueError(f"Unsupported generator format: {log_format}. Available formats: {list(GENERATOR_FORMATS)}")
+    if not 0.0 <= disorder <= 1.0 or not 0.0 <= invalid_ratio < 1.0:
+        raise ValueError("disorder must be within 0-1 and invalid_ratio within 0-1 (exclusive)")
+    
+    level_mix = level_mix or DEFAULT_LEVEL_MIX
+    levels = list(level_mix)
+    weights = np.asarray([level_mix[level] for level in levels], dtype=float)
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError(f"Invalid level mix: {level_mix}")
+    weights /= weights.sum()
+    
+    rng = np.random.default_rng(seed)
+    start_ms = np.datetime64(start, 'ms').astype(np.int64)
+    step_ms = 1000.0 / lines_per_second
+    batch_lines = min(GENERATOR_BATCH_LINES, size_bytes // 32 + 1)
+    
+    bytes_written = 0
+    lines_written = 0
+    invalid_lines = 0
+    with open(file_path, 'w', encoding='utf-8', newline='\n') as f:
+        while bytes_written < size_bytes:
+            positions = np.arange(lines_written, lines_written + batch_lines)
+            epoch_ms = start_ms + (positions * step_ms).astype(np.int64)
+            displaced = rng.random(len(positions)) < disorder
+            epoch_ms[displaced] += rng.integers(-disorder_seconds, disorder_seconds + 1,
+                                                int(displaced.sum())) * 1000
+            level_index = rng.choice(len(levels), size=len(positions), p=weights)
+            template_index = rng.integers(0, len(MESSAGE_TEMPLATES), len(positions))
+            values = rng.integers(0, 1 << 30, (len(positions), 4))
+            continued = rng.random(len(positions)) < invalid_ratio
+            
+            lines = format_lines(log_format, epoch_ms, [levels[i] for i in level_index], template_index, values)
+            texts = [
+                f"{line}\n{CONTINUATION_TEMPLATE.format(line=value % 2000)}\n" if has_continuation else f"{line}\n"
+                for line, has_continuation, value in zip(lines, continued.tolist(), values[:, 0].tolist())
+            ]
+            
+            # Stop at the first line that reaches the requested size
+            ends = np.cumsum([len(text) for text in texts])
+            keep = min(len(texts), int(np.searchsorted(ends, size_bytes - bytes_written)) + 1)
+            f.write("".join(texts[:keep]))
+            bytes_written += int(ends[keep - 1])
+            lines_written += keep
+            invalid_lines += int(continued[:keep].sum())
+    
+    return {
+        "file_path": file_path,
+        "bytes_written": os.path.getsize(file_path),
+        "lines_written": lines_written + invalid_lines,
+        "timestamped_lines": lines_written,
+        "invalid_lines": invalid_lines,
+        "log_format": log_format,
+        "disorder": disorder,
+        "level_mix": dict(level_mix),
+        "seed": seed
+    }
+
+
+def format_lines(log_format: str, epoch_ms: np.ndarray, levels: List[str],
+                 template_index: np.ndarray, values: np.ndarray) -> List[str]:
+    """
+    Render one batch of log lines.
+    
+    Args:
+        log_format: One of GENERATOR_FORMATS
+        epoch_ms: Timestamp of each line in epoch milliseconds
+        levels: Level of each line
+        template_index: Index into MESSAGE_TEMPLATES of each line
+        values: Four random integers per line for the template fields
+    
+    Returns:
+        Lines without line terminators
+    """
+    stamps = np.datetime_as_string(epoch_ms.astype('datetime64[ms]'), unit='ms').tolist()
+    messages = render_messages(template_index, values)
+    
+    if log_format == "standard":
+        return [f"{stamp[:10]} {stamp[11:19]} {level} {message}"
+                for stamp, level, message in zip(stamps, levels, messages)]
+    if log_format == "iso8601":
+        return [f"{stamp}Z {level} {message}" for stamp, level, message in zip(stamps, levels, messages)]
+    if log_format == "jsonl":
+        return [json.dumps({"timestamp": f"{stamp}Z", "level": level, "message": message})
+                for stamp, level, message in zip(stamps, levels, messages)]
+    return [
+        f"<{8 + _SYSLOG_SEVERITY.get(level, 6)}>{_MONTH_NAMES[int(stamp[5:7]) - 1]} {int(stamp[8:10]):2d} "
+        f"{stamp[11:19]} node{row[3] % 16:02d} app[{row[2] % 4096}]: {message}"
+        for stamp, level, message, row in zip(stamps, levels, messages, values.tolist())
+    ]
+
+
+def render_messages(template_index: np.ndarray, values: np.ndarray) -> List[str]:
+    """
+    Fill the message template of each line from its four random integers.
+    
+    Args:
+        template_index: Index into MESSAGE_TEMPLATES of each line
+        values: Four random integers per line
+    
+    Returns:
+        Message of each line
+    """
+    first, second, third, fourth = values.T
+    fields = {
+        "id": first % 1000000,
+        "ms": second % 5000,
+        "user": first % 500,
+        "seconds": third % 120,
+        "pct": second % 100,
+        "disk": np.array(list("abcd"))[third % 4],
+        "job": third % 10000,
+        "status": np.array(_STATUSES)[fourth % len(_STATUSES)],
+        "rank": fourth % 1024,
+        "mb": second % 4096
+    }
+    
+    messages = np.empty(len(template_index), dtype=object)
+    for index, (template, names) in enumerate(MESSAGE_TEMPLATES):
+        rows = np.flatnonzero(template_index == index)
+        if not len(rows):
+            continue
+        columns = []
+        for name in names:
+            if name == "ip":
+                columns.append([f"10.{b}.{c}.{d}" for b, c, d in
+                                zip((second[rows] % 256).tolist(), (third[rows] % 256).tolist(),
+                                    (fourth[rows] % 256).tolist())])
+            else:
+                columns.append(fields[name][rows].tolist())
+        messages[rows] = [template.format(*args) for args in zip(*columns)]
+    return messages.tolist()
+
+
+def generate_rank_logs(directory: str, ranks: int, size_bytes: int, **settings: Any) -> List[Dict[str, Any]]:
+    """
+    Write one synthetic log per rank, as an MPI job would.
+    
+    Args:
+        directory: Directory the rank_<n>.log files are written to
+        ranks: Number of logs
+        size_bytes: Size of each log
+        **settings: Further generate_log settings; rank n uses seed + n
+    
+    Returns:
+        generate_log result of each rank
+    """
+    os.makedirs(directory, exist_ok=True)
+    seed = settings.pop("seed", 0)
+    return [
+        generate_log(os.path.join(directory, f"rank_{rank}.log"), size_bytes, seed=seed + rank, **settings)
+        for rank in range(ranks)
+    ]
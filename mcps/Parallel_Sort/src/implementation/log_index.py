@@ -0,0 +1,685 @@
+"""
+Persistent parsed-log index for log processing.
+Stores one row per line (timestamp, level, byte offset, message template) as
+columnar NumPy files so repeated queries on the same log skip re-parsing it.
+The template miner is checkpointed with the columns, so appended lines are
+mined into the same templates.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .log_parser import INVALID_KEY, ns_to_datetime
+from .log_formats import LEVEL_NAMES, LogFormat, get_format, detect_file_format
+from .template_miner import TemplateMiner
+
+
+INDEX_VERSION = 3
+
+# Column name -> dtype; every column holds one value per line of the log
+INDEX_COLUMNS = {
+    "timestamp": np.int64,          # epoch ns, INVALID_KEY for unparseable lines
+    "level": np.uint16,             # id into the index level vocabulary
+    "template": np.int32,           # template id from the index miner, -1 if none
+    "offset": np.int64,             # byte offset of the line start
+    "message_offset": np.int32,     # character offset of the message in the stripped line, -1 if not a suffix
+    "timestamp_start": np.int32,    # character offset of the timestamp text, -1 if not found
+    "timestamp_width": np.uint16,   # length of the timestamp text
+}
+
+# Logs smaller than this are indexed in memory only
+INDEX_MIN_BYTES = 1024 * 1024
+
+# Bytes read per block while indexing
+INDEX_BLOCK_BYTES = 8 * 1024 * 1024
+
+# Bytes hashed at the start and end of the indexed range to detect rewrites
+FINGERPRINT_BYTES = 4096
+
+# Loaded indexes kept per process
+INDEX_CACHE_SIZE = 8
+
+# Rows inspected at a time when skipping lines without a timestamp during bisection
+BISECT_SCAN_ROWS = 256
+
+INVALID_ENTRY_ERROR = "No valid timestamp found"
+
+_LOADED: "OrderedDict[str, LogIndex]" = OrderedDict()
+
+
+def index_root() -> str:
+    """
+    Directory holding persisted indexes.
+    
+    Uses PARALLEL_SORT_INDEX_DIR when set, otherwise a per-user cache directory.
+    """
+    configured = os.environ.get("PARALLEL_SORT_INDEX_DIR")
+    if configured:
+        return configured
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "parallel-sort-mcp", "index")
+
+
+def index_dir_for(file_path: str) -> str:
+    """Sidecar directory of the index for a log file."""
+    absolute = os.path.abspath(file_path)
+    name = hashlib.sha1(absolute.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(index_root(), f"{os.path.basename(absolute)}.{name}")
+
+
+class LogIndex:
+    """
+    Columnar index of a log file.
+    
+    Columns are NumPy arrays (memory-mapped when loaded from disk) sharing one
+    row per line, in file order. Level ids index the ``levels`` vocabulary and
+    template ids the templates of ``miner`` (None when messages were not mined).
+    """
+    
+    def __init__(self, file_path: str, log_format: LogFormat, columns: Dict[str, np.ndarray],
+                 levels: List[str], miner: Optional[TemplateMiner], indexed_bytes: int,
+                 partial_tail: bool, index_dir: Optional[str] = None,
+                 time_sorted: Optional[bool] = None, max_timestamp: Optional[int] = None):
+        self.file_path = file_path
+        self.log_format = log_format
+        self.columns = columns
+        self.levels = levels
+        self.miner = miner
+        self.indexed_bytes = indexed_bytes
+        self.partial_tail = partial_tail
+        self.index_dir = index_dir
+        if time_sorted is None or max_timestamp is None:
+            time_sorted, max_timestamp = _time_order(columns["timestamp"])
+        self.time_sorted = time_sorted
+        self.max_timestamp = max_timestamp
+        self.appended_rows = 0
+        self.rebuilt = False
+    
+    @property
+    def rows(self) -> int:
+        return len(self.columns["offset"])
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.columns["timestamp"]
+    
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """Boolean mask of lines with a parsed timestamp."""
+        return self.columns["timestamp"] != INVALID_KEY
+    
+    def level_ids(self, levels: Sequence[str]) -> List[int]:
+        """Ids of the given level names that occur in this index."""
+        wanted = {level.upper() for level in levels}
+        return [level_id for level_id, name in enumerate(self.levels) if name in wanted]
+    
+    @property
+    def templates(self) -> List[str]:
+        """Template text of each template id, empty if messages were not mined."""
+        return self.miner.templates() if self.miner is not None else []
+    
+    def template_ids(self, rows: np.ndarray, messages: List[str],
+                     miner: Optional[TemplateMiner]) -> Tuple[TemplateMiner, np.ndarray]:
+        """
+        Template ids of valid rows in a caller's miner.
+        
+        The template column is used as is when the caller has no miner yet or
+        already uses the index miner; otherwise the messages are mined.
+        
+        Args:
+            rows: Valid row numbers
+            messages: Message of each row
+            miner: Miner of the caller, None before its first rows
+        
+        Returns:
+            Tuple of (miner, template ids) where miner is the one to keep using
+        """
+        if miner is None and self.miner is not None:
+            miner = self.miner
+        if miner is not None and miner is self.miner:
+            return miner, np.asarray(self.columns["template"][rows], dtype=np.int64)
+        if miner is None:
+            miner = TemplateMiner()
+        return miner, miner.add_messages(messages)
+    
+    def _next_valid_row(self, row: int, stop: int) -> int:
+        """First row in [row, stop) with a timestamp, or stop if there is none."""
+        timestamps = self.columns["timestamp"]
+        while row < stop:
+            window = timestamps[row:min(row + BISECT_SCAN_ROWS, stop)]
+            found = np.flatnonzero(window != INVALID_KEY)
+            if len(found):
+                return row + int(found[0])
+            row += len(window)
+        return stop
+    
+    def _bisect_time(self, epoch_ns: int, right: bool) -> int:
+        """
+        Bisect the rows of a time-sorted index, stepping over lines without a timestamp.
+        
+        Returns the first row whose next timestamped line is at or after
+        epoch_ns (strictly after it when right is set).
+        """
+        timestamps = self.columns["timestamp"]
+        low, high = 0, self.rows
+        while low < high:
+            middle = (low + high) // 2
+            row = self._next_valid_row(middle, high)
+            if row == high:
+                high = middle
+                continue
+            value = int(timestamps[row])
+            if value < epoch_ns or (right and value == epoch_ns):
+                low = row + 1
+            else:
+                high = middle
+        return low
+    
+    def time_range_rows(self, start_ns: int, end_ns: int) -> np.ndarray:
+        """
+        Rows with a timestamp inside [start_ns, end_ns].
+        
+        Time-sorted logs are answered with two binary searches over the
+        timestamp column; other logs with a vectorized scan of it.
+        
+        Args:
+            start_ns: Inclusive start, nanoseconds since the epoch
+            end_ns: Inclusive end, nanoseconds since the epoch
+        
+        Returns:
+            Ascending row numbers
+        """
+        timestamps = self.columns["timestamp"]
+        if not self.time_sorted:
+            return np.flatnonzero((timestamps >= start_ns) & (timestamps <= end_ns) & (timestamps != INVALID_KEY))
+        
+        first = self._bisect_time(start_ns, right=False)
+        stop = self._bisect_time(end_ns, right=True)
+        if first >= stop:
+            return np.empty(0, dtype=np.int64)
+        return first + np.flatnonzero(timestamps[first:stop] != INVALID_KEY)
+    
+    def line_end(self, row: int) -> int:
+        """Byte offset just past the given line (including its newline)."""
+        if row + 1 < self.rows:
+            return int(self.columns["offset"][row + 1])
+        return self.indexed_bytes
+    
+    def read_lines(self, rows: Optional[Sequence[int]] = None) -> List[str]:
+        """
+        Read lines back from the log, stripped like the parsing handlers strip them.
+        
+        Args:
+            rows: Row numbers in ascending order, every line if omitted
+        
+        Returns:
+            Decoded lines in the order of rows
+        """
+        if self.rows == 0:
+            return []
+        
+        offsets = self.columns["offset"]
+        with open(self.file_path, 'rb') as f:
+            if rows is None:
+                f.seek(int(offsets[0]))
+                data = f.read(self.indexed_bytes - int(offsets[0]))
+                pieces = data.split(b'\n')
+                if data.endswith(b'\n'):
+                    pieces.pop()
+                return [piece.decode('utf-8', errors='replace').strip() for piece in pieces]
+            
+            # Read runs of consecutive rows with a single seek each
+            lines = []
+            rows = np.asarray(rows, dtype=np.int64)
+            if len(rows) == 0:
+                return []
+            breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+            for run in np.split(rows, breaks):
+                first, last = int(run[0]), int(run[-1])
+                start = int(offsets[first])
+                f.seek(start)
+                data = f.read(self.line_end(last) - start)
+                pieces = data.split(b'\n')
+                lines.extend(piece.decode('utf-8', errors='replace').strip() for piece in pieces[:len(run)])
+            return lines
+    
+    def entries(self, lines: List[str], rows: Optional[Sequence[int]] = None,
+                include_invalid: bool = False, with_timestamps: bool = True) -> List[Dict[str, Any]]:
+        """
+        Build parsed entries from index columns instead of re-parsing lines.
+        
+        Args:
+            lines: Stripped lines for the rows, as returned by read_lines
+            rows: Row numbers matching lines, every row if omitted
+            include_invalid: Also return entries for lines without a timestamp
+            with_timestamps: Convert timestamps to datetimes; when False the
+                timestamp of every entry is None, for callers that do not use it
+        
+        Returns:
+            Entry dictionaries with line_number, timestamp, timestamp_str, level,
+            message, original_line and is_valid keys
+        """
+        if rows is None:
+            rows = np.arange(self.rows)
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+        
+        timestamps = self.columns["timestamp"][rows].tolist()
+        level_column = self.columns["level"][rows].tolist()
+        message_offsets = self.columns["message_offset"][rows].tolist()
+        timestamp_starts = self.columns["timestamp_start"][rows].tolist()
+        timestamp_widths = self.columns["timestamp_width"][rows].tolist()
+        levels = self.levels
+        
+        entries = []
+        for position, row in enumerate(rows.tolist()):
+            line = lines[position]
+            epoch_ns = timestamps[position]
+            
+            if epoch_ns == INVALID_KEY:
+                if include_invalid:
+                    entries.append({
+                        "line_number": row + 1,
+                        "timestamp": None,
+                        "level": "",
+                        "message": line,
+                        "original_line": line,
+                        "is_valid": False
+                    })
+                continue
+            
+            message_offset = message_offsets[position]
+            if message_offset >= 0:
+                message = line[message_offset:]
+            else:
+                # Message is not a suffix of the line (e.g. JSON); parse this line only
+                parsed = self.log_format.parse_entry(line)
+                message = parsed.message if parsed is not None else ""
+            
+            timestamp_start = timestamp_starts[position]
+            entries.append({
+                "line_number": row + 1,
+                "timestamp": ns_to_datetime(epoch_ns) if with_timestamps else None,
+                "timestamp_str": line[timestamp_start:timestamp_start + timestamp_widths[position]] if timestamp_start >= 0 else "",
+                "level": levels[level_column[position]],
+                "message": message,
+                "original_line": line,
+                "is_valid": True
+            })
+        
+        return entries
+
+
+def _time_order(timestamps: np.ndarray) -> Tuple[bool, int]:
+    """Whether the valid timestamps are non-decreasing, and their maximum."""
+    valid = timestamps[timestamps != INVALID_KEY]
+    if len(valid) == 0:
+        return True, int(INVALID_KEY)
+    return bool(np.all(valid[1:] >= valid[:-1])), int(valid.max())
+
+
+def _fingerprint(f, start: int, end: int) -> str:
+    """Digest of the bytes in [start, end) of an open file."""
+    f.seek(start)
+    return hashlib.blake2b(f.read(end - start), digest_size=16).hexdigest()
+
+
+def _index_range(file_path: str, start: int, end: int, log_format: LogFormat,
+                 levels: List[str], miner: Optional[TemplateMiner]) -> Tuple[Dict[str, np.ndarray], bool]:
+    """
+    Parse the lines in a byte range into index columns.
+    
+    The level vocabulary is extended and messages are mined into the miner in
+    place. When miner is None messages are not mined and every template id is -1.
+    
+    Returns:
+        Tuple of (columns, partial_tail) where partial_tail tells whether the
+        last line had no terminating newline
+    """
+    level_lookup = {name: level_id for level_id, name in enumerate(levels)}
+    values = {name: [] for name in INDEX_COLUMNS}
+    partial_tail = False
+    
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        position = start  # file offset of the first unconsumed byte
+        remaining = end - start
+        pending = b''
+        
+        while True:
+            block = f.read(min(INDEX_BLOCK_BYTES, remaining)) if remaining > 0 else b''
+            remaining -= len(block)
+            data = pending + block
+            
+            if remaining > 0 and block:
+                # Keep the trailing partial line for the next block
+                cut = data.rfind(b'\n') + 1
+                pending = data[cut:]
+                data = data[:cut]
+            else:
+                pending = b''
+                partial_tail = bool(data) and not data.endswith(b'\n')
+            
+            pieces = data.split(b'\n')
+            if not data or data.endswith(b'\n'):
+                pieces.pop()
+            
+            for piece in pieces:
+                line = piece.decode('utf-8', errors='replace').strip()
+                values["offset"].append(position)
+                position += len(piece) + 1
+                
+                parsed = log_format.parse_entry(line) if line else None
+                if parsed is None:
+                    values["timestamp"].append(INVALID_KEY)
+                    values["level"].append(0)
+                    values["template"].append(-1)
+                    values["message_offset"].append(-1)
+                    values["timestamp_start"].append(-1)
+                    values["timestamp_width"].append(0)
+                    continue
+                
+                level_id = level_lookup.get(parsed.level)
+                if level_id is None:
+                    level_id = level_lookup[parsed.level] = len(levels)
+                    levels.append(parsed.level)
+                
+                message = parsed.message
+                values["timestamp"].append(parsed.epoch_ns)
+                values["level"].append(level_id)
+                values["template"].append(miner.add(message) if miner is not None else -1)
+                values["message_offset"].append(len(line) - len(message) if line.endswith(message) else -1)
+                values["timestamp_start"].append(line.find(parsed.timestamp_text) if parsed.timestamp_text else -1)
+                values["timestamp_width"].append(min(len(parsed.timestamp_text), 65535))
+            
+            if remaining <= 0 or not block:
+                break
+    
+    columns = {name: np.asarray(values[name], dtype=dtype) for name, dtype in INDEX_COLUMNS.items()}
+    return columns, partial_tail
+
+
+def build_index(file_path: str, log_format: Optional[LogFormat] = None,
+                start: int = 0, end: Optional[int] = None,
+                with_templates: bool = True) -> LogIndex:
+    """
+    Index a log file, or a newline-aligned byte range of it, in memory.
+    
+    Args:
+        file_path: Path to the log file
+        log_format: Format of the log, detected from the file if omitted
+        start: Byte offset of the first line to index
+        end: Byte offset just past the last line to index, the file size if omitted
+        with_templates: Mine message templates into the template column
+    
+    Returns:
+        In-memory LogIndex
+    """
+    if end is None:
+        end = os.path.getsize(file_path)
+    if log_format is None:
+        log_format = detect_file_format(file_path)
+    
+    levels = list(LEVEL_NAMES)
+    miner = TemplateMiner() if with_templates else None
+    columns, partial_tail = _index_range(file_path, start, end, log_format, levels, miner)
+    
+    index = LogIndex(file_path, log_format, columns, levels, miner, end, partial_tail)
+    index.rebuilt = True
+    return index
+
+
+def _write_json(path: str, payload: Any) -> None:
+    """Write JSON atomically."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(temp_path, path)
+
+
+def _file_meta(file_path: str, index: LogIndex) -> Dict[str, Any]:
+    """Metadata identifying the indexed state of a log file."""
+    stat = os.stat(file_path)
+    with open(file_path, 'rb') as f:
+        head = _fingerprint(f, 0, min(FINGERPRINT_BYTES, index.indexed_bytes))
+        tail = _fingerprint(f, max(0, index.indexed_bytes - FINGERPRINT_BYTES), index.indexed_bytes)
+    
+    return {
+        "version": INDEX_VERSION,
+        "path": os.path.abspath(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino,
+        "indexed_bytes": index.indexed_bytes,
+        "rows": index.rows,
+        "partial_tail": index.partial_tail,
+        "time_sorted": index.time_sorted,
+        "max_timestamp": index.max_timestamp,
+        "format": index.log_format.name,
+        "levels": index.levels,
+        "head_digest": head,
+        "tail_digest": tail
+    }
+
+
+def save_index(index: LogIndex, index_dir: str) -> None:
+    """
+    Persist an index, replacing any previous index in the directory.
+    
+    Args:
+        index: Index to save
+        index_dir: Target directory
+    """
+    parent = os.path.dirname(index_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".building-", dir=parent)
+    
+    try:
+        for name, dtype in INDEX_COLUMNS.items():
+            np.ascontiguousarray(index.columns[name], dtype=dtype).tofile(os.path.join(staging, f"{name}.bin"))
+        _write_json(os.path.join(staging, "templates.json"), index.miner.to_dict() if index.miner is not None else None)
+        _write_json(os.path.join(staging, "meta.json"), _file_meta(index.file_path, index))
+        
+        if os.path.isdir(index_dir):
+            shutil.rmtree(index_dir, ignore_errors=True)
+        os.replace(staging, index_dir)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    index.index_dir = index_dir
+
+
+def _read_meta(index_dir: str) -> Optional[Dict[str, Any]]:
+    """Load index metadata, None if missing, unreadable or from another version."""
+    try:
+        with open(os.path.join(index_dir, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == INDEX_VERSION else None
+
+
+def _map_columns(index_dir: str, rows: int) -> Dict[str, np.ndarray]:
+    """Memory-map the first rows of every column file."""
+    columns = {}
+    for name, dtype in INDEX_COLUMNS.items():
+        if rows == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(os.path.join(index_dir, f"{name}.bin"), dtype=dtype, mode='r', shape=(rows,))
+    return columns
+
+
+def load_index(file_path: str, index_dir: str, meta: Dict[str, Any]) -> LogIndex:
+    """Open a persisted index without validating it against the log."""
+    with open(os.path.join(index_dir, "templates.json"), 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    
+    return LogIndex(
+        file_path, get_format(meta["format"]), _map_columns(index_dir, meta["rows"]),
+        meta["levels"], TemplateMiner.from_dict(checkpoint) if checkpoint is not None else None, meta["indexed_bytes"], meta["partial_tail"], index_dir,
+        meta["time_sorted"], meta["max_timestamp"]
+    )
+
+
+def _is_append(file_path: str, meta: Dict[str, Any], stat: os.stat_result) -> bool:
+    """Whether the log only grew since it was indexed."""
+    indexed_bytes = meta["indexed_bytes"]
+    if stat.st_ino != meta["inode"] or stat.st_size < indexed_bytes:
+        return False
+    
+    with open(file_path, 'rb') as f:
+        return (
+            _fingerprint(f, 0, min(FINGERPRINT_BYTES, indexed_bytes)) == meta["head_digest"]
+            and _fingerprint(f, max(0, indexed_bytes - FINGERPRINT_BYTES), indexed_bytes) == meta["tail_digest"]
+        )
+
+
+def update_index(index: LogIndex) -> int:
+    """
+    Extend a persisted index with lines appended to its log.
+    
+    A trailing line that had no newline when indexed is re-parsed, since the
+    append may have completed it.
+    
+    Args:
+        index: Index loaded from disk
+    
+    Returns:
+        Number of rows added (negative if the partial tail was dropped without replacement)
+    """
+    size = os.path.getsize(index.file_path)
+    keep_rows = index.rows - 1 if index.partial_tail and index.rows else index.rows
+    resume_at = int(index.columns["offset"][keep_rows]) if keep_rows < index.rows else index.indexed_bytes
+    
+    levels = list(index.levels)
+    # Appended lines are mined into a copy of the checkpointed miner, so ids stay stable
+    miner = index.miner.copy() if index.miner is not None else None
+    new_columns, partial_tail = _index_range(index.file_path, resume_at, size, index.log_format, levels, miner)
+    
+    for name, dtype in INDEX_COLUMNS.items():
+        column_path = os.path.join(index.index_dir, f"{name}.bin")
+        with open(column_path, 'r+b') as f:
+            # Also discards rows left behind by an interrupted update
+            f.truncate(keep_rows * np.dtype(dtype).itemsize)
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(new_columns[name], dtype=dtype).tobytes())
+    
+    # Sortedness extends if the new rows are sorted and start after the old maximum;
+    # a dropped partial tail only makes this check conservative
+    new_sorted, new_max = _time_order(new_columns["timestamp"])
+    new_valid = new_columns["timestamp"][new_columns["timestamp"] != INVALID_KEY]
+    index.time_sorted = index.time_sorted and new_sorted and (len(new_valid) == 0 or int(new_valid[0]) >= index.max_timestamp)
+    index.max_timestamp = max(index.max_timestamp, new_max)
+    
+    added = len(new_columns["offset"]) - (index.rows - keep_rows)
+    index.levels = levels
+    index.miner = miner
+    index.indexed_bytes = size
+    index.partial_tail = partial_tail
+    index.columns = _map_columns(index.index_dir, keep_rows + len(new_columns["offset"]))
+    index.appended_rows = added
+    
+    _write_json(os.path.join(index.index_dir, "templates.json"), miner.to_dict() if miner is not None else None)
+    _write_json(os.path.join(index.index_dir, "meta.json"), _file_meta(index.file_path, index))
+    return added
+
+
+def get_log_index(file_path: str, persist: Optional[bool] = None) -> LogIndex:
+    """
+    Return an up-to-date index for a log file, building or extending it as needed.
+    
+    Persisted indexes are keyed by (path, size, mtime): an unchanged log reuses
+    its index, an appended log is indexed from where the previous index
+    stopped, and a rewritten or truncated log is re-indexed from scratch.
+    
+    Args:
+        file_path: Path to the log file
+        persist: Store the index on disk; by default only for logs of at least
+            INDEX_MIN_BYTES
+    
+    Returns:
+        LogIndex for the current contents of the file
+    
+    Raises:
+        FileNotFoundError: If the log file does not exist
+    """
+    stat = os.stat(file_path)
+    if persist is None:
+        persist = stat.st_size >= INDEX_MIN_BYTES
+    if not persist:
+        return build_index(file_path)
+    
+    index_dir = index_dir_for(file_path)
+    cached = _LOADED.get(index_dir)
+    meta = _read_meta(index_dir)
+    
+    if meta is not None and meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns and meta["inode"] == stat.st_ino:
+        if cached is not None and cached.indexed_bytes == meta["indexed_bytes"] and cached.rows == meta["rows"]:
+            index = cached
+        else:
+            index = load_index(file_path, index_dir, meta)
+        index.appended_rows = 0
+        index.rebuilt = False
+    elif meta is not None and _is_append(file_path, meta, stat):
+        index = load_index(file_path, index_dir, meta)
+        update_index(index)
+        index.rebuilt = False
+    else:
+        index = build_index(file_path)
+        save_index(index, index_dir)
+        # Reopen memory-mapped so the in-memory build can be released
+        rebuilt = load_index(file_path, index_dir, _read_meta(index_dir))
+        rebuilt.rebuilt = True
+        index = rebuilt
+    
+    _LOADED[index_dir] = index
+    _LOADED.move_to_end(index_dir)
+    while len(_LOADED) > INDEX_CACHE_SIZE:
+        _LOADED.popitem(last=False)
+    
+    return index
+
+
+def has_log_index(file_path: str) -> bool:
+    """
+    Whether a log has a persisted index that is current or only behind by appends.
+    
+    Args:
+        file_path: Path to the log file
+    
+    Returns:
+        True if get_log_index would reuse the stored index instead of rebuilding it
+    """
+    meta = _read_meta(index_dir_for(file_path))
+    if meta is None:
+        return False
+    
+    stat = os.stat(file_path)
+    unchanged = meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns and meta["inode"] == stat.st_ino
+    return unchanged or _is_append(file_path, meta, stat)
+
+
+def clear_index(file_path: str) -> bool:
+    """
+    Delete the persisted index of a log file.
+    
+    Args:
+        file_path: Path to the log file
+    
+    Returns:
+        True if an index was removed
+    """
+    index_dir = index_dir_for(file_path)
+    _LOADED.pop(index_dir, None)
+    if os.path.isdir(index_dir):
+        shutil.rmtree(index_dir, ignore_errors=True)
+        return True
+    return False
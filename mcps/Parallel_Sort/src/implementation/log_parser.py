@@ -0,0 +1,337 @@
+"""
+Shared timestamp parsing kernel for log processing.
+Turns YYYY-MM-DD HH:MM:SS timestamps into integer epoch keys without strptime.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Sequence, Tuple
+
+import numpy as np
+
+
+TIMESTAMP_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})')
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIMESTAMP_LENGTH = 19
+
+# Key used in vectorized results for lines without a usable timestamp
+INVALID_KEY = np.iinfo(np.int64).min
+
+EPOCH = datetime(1970, 1, 1)
+
+# Variable message parts replaced when normalizing a message into a template,
+# in application order (IPs before numbers, URLs before file paths)
+MESSAGE_PLACEHOLDERS = (
+    (re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b'), 'IP_ADDRESS'),
+    (re.compile(r'\b\d+\b'), 'NUMBER'),
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b'), 'UUID'),
+    (re.compile(r'https?://[^\s]+'), 'URL'),
+    (re.compile(r'/[^\s]*'), 'FILE_PATH'),
+)
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Character positions of the digits and separators in YYYY-MM-DD HH:MM:SS
+_DIGIT_POSITIONS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+_DASH_POSITIONS = [4, 7]
+_COLON_POSITIONS = [13, 16]
+
+
+# Memoized conversions; logs repeat the same dates and clock values constantly
+_DATE_CACHE: Dict[str, int] = {}
+_CLOCK_CACHE: Dict[str, int] = {}
+_DATE_CACHE_LIMIT = 100000
+
+
+def _days_from_civil(year: int, month: int, day: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date."""
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _date_days(date_str: str) -> int:
+    """Days since the epoch for a validated YYYY-MM-DD string."""
+    days = _DATE_CACHE.get(date_str)
+    if days is not None:
+        return days
+    
+    digits = date_str[0:4] + date_str[5:7] + date_str[8:10]
+    if (len(date_str) != 10 or date_str[4] != '-' or date_str[7] != '-'
+            or not digits.isascii() or not digits.isdigit()):
+        raise ValueError("malformed date")
+    
+    year = int(digits[0:4])
+    month = int(digits[4:6])
+    day = int(digits[6:8])
+    
+    if not 1 <= month <= 12:
+        raise ValueError("month out of range")
+    
+    days_in_month = _DAYS_IN_MONTH[month]
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        days_in_month = 29
+    
+    if year < 1 or not 1 <= day <= days_in_month:
+        raise ValueError("day out of range")
+    
+    days = _days_from_civil(year, month, day)
+    if len(_DATE_CACHE) >= _DATE_CACHE_LIMIT:
+        _DATE_CACHE.clear()
+    _DATE_CACHE[date_str] = days
+    return days
+
+
+def _clock_seconds(clock_str: str) -> int:
+    """Seconds since midnight for a validated HH:MM:SS string."""
+    seconds = _CLOCK_CACHE.get(clock_str)
+    if seconds is not None:
+        return seconds
+    
+    digits = clock_str[0:2] + clock_str[3:5] + clock_str[6:8]
+    if (len(clock_str) != 8 or clock_str[2] != ':' or clock_str[5] != ':'
+            or not digits.isascii() or not digits.isdigit()):
+        raise ValueError("malformed time")
+    
+    hour = int(digits[0:2])
+    minute = int(digits[2:4])
+    second = int(digits[4:6])
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError("time out of range")
+    
+    seconds = hour * 3600 + minute * 60 + second
+    # At most 86400 valid clock values, so this cache is naturally bounded
+    _CLOCK_CACHE[clock_str] = seconds
+    return seconds
+
+
+def timestamp_key(timestamp_str: str) -> int:
+    """
+    Convert a YYYY-MM-DD HH:MM:SS string to seconds since the epoch.
+    
+    Fields are read at fixed offsets and validated the same way strptime would;
+    the date and time may be separated by a space or a tab.
+    
+    Args:
+        timestamp_str: 19-character timestamp string
+        
+    Returns:
+        Integer key preserving chronological order
+        
+    Raises:
+        ValueError: If the string is not a valid timestamp
+    """
+    if len(timestamp_str) != TIMESTAMP_LENGTH or timestamp_str[10] not in ' \t':
+        raise ValueError(f"Invalid timestamp format '{timestamp_str}'")
+    
+    try:
+        return _date_days(timestamp_str[:10]) * 86400 + _clock_seconds(timestamp_str[11:])
+    except ValueError as e:
+        raise ValueError(f"Invalid timestamp format '{timestamp_str}': {e}") from None
+
+
+def _has_timestamp_shape(text: str) -> bool:
+    """Whether text starts with digits and separators laid out as YYYY-MM-DD HH:MM:SS."""
+    if len(text) < TIMESTAMP_LENGTH:
+        return False
+    if (text[4] != '-' or text[7] != '-' or text[10] not in ' \t'
+            or text[13] != ':' or text[16] != ':'):
+        return False
+    digits = text[0:4] + text[5:7] + text[8:10] + text[11:13] + text[14:16] + text[17:19]
+    return digits.isascii() and digits.isdigit()
+
+
+def scan_timestamp(line: str) -> Tuple[int, int, int]:
+    """
+    Locate and parse the first timestamp in a log line.
+    
+    Lines that start with a previously seen date and clock value resolve with
+    two dictionary lookups on fixed-offset slices; other lines that start with
+    a timestamp are validated once, and anything else falls back to the
+    precompiled pattern.
+    
+    Args:
+        line: Log line to parse
+        
+    Returns:
+        Tuple of (epoch_seconds, start_offset, end_offset) of the timestamp
+        
+    Raises:
+        ValueError: If no valid timestamp is found
+    """
+    days = _DATE_CACHE.get(line[:10])
+    if days is not None:
+        seconds = _CLOCK_CACHE.get(line[11:19])
+        if seconds is not None and line[10:11] in (' ', '\t'):
+            return days * 86400 + seconds, 0, TIMESTAMP_LENGTH
+    
+    if _has_timestamp_shape(line):
+        return timestamp_key(line[:TIMESTAMP_LENGTH]), 0, TIMESTAMP_LENGTH
+    
+    match = TIMESTAMP_PATTERN.search(line)
+    if not match:
+        raise ValueError("No valid timestamp found")
+    
+    timestamp_str = match.group(1)
+    if len(timestamp_str) != TIMESTAMP_LENGTH:
+        # Collapse runs of whitespace between date and time
+        timestamp_str = timestamp_str[:10] + ' ' + timestamp_str[10:].lstrip()
+    
+    return timestamp_key(timestamp_str), match.start(1), match.end(1)
+
+
+def key_to_datetime(key: int) -> datetime:
+    """
+    Convert an epoch-seconds key back into a naive datetime.
+    
+    Args:
+        key: Seconds since the epoch
+    
+    Returns:
+        Corresponding datetime
+    """
+    return EPOCH + timedelta(seconds=key)
+
+
+def ns_to_datetime(epoch_ns: int) -> datetime:
+    """
+    Convert nanoseconds since the epoch into a naive (UTC) datetime.
+    
+    Args:
+        epoch_ns: Nanoseconds since the epoch
+        
+    Returns:
+        Corresponding datetime, truncated to microseconds
+    """
+    return EPOCH + timedelta(microseconds=epoch_ns // 1000)
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a message into a template by replacing its variable parts.
+    
+    Args:
+        message: Log message text
+    
+    Returns:
+        Message with IPs, numbers, UUIDs, URLs and paths replaced by placeholders
+    """
+    normalized = message
+    for pattern, placeholder in MESSAGE_PLACEHOLDERS:
+        normalized = pattern.sub(placeholder, normalized)
+    
+    return ' '.join(normalized.split())
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """
+    Convert a datetime into nanoseconds since the epoch.
+    
+    Naive datetimes are taken as UTC, matching ns_to_datetime.
+    
+    Args:
+        value: Datetime to convert
+        
+    Returns:
+        Nanoseconds since the epoch
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+def parse_log_line(line: str) -> Dict[str, Any]:
+    """
+    Parse a log line into timestamp key, level and message.
+    
+    Args:
+        line: Log line to parse (without trailing newline)
+    
+    Returns:
+        Dictionary with key, timestamp_str, level and message
+    
+    Raises:
+        ValueError: If the line has no valid timestamp
+    """
+    key, start, end = scan_timestamp(line)
+    
+    remainder = line[end:].strip()
+    parts = remainder.split(' ', 1)
+    
+    return {
+        "key": key,
+        "timestamp_str": line[start:end],
+        "level": parts[0].upper() if parts else "",
+        "message": parts[1] if len(parts) > 1 else ""
+    }
+
+
+def parse_timestamp_keys(lines: Sequence[str]) -> np.ndarray:
+    """
+    Vectorized timestamp parsing for a whole chunk of lines.
+    
+    The first 19 characters of every line are laid out as a fixed-width code
+    point matrix, validated and converted with NumPy integer arithmetic. Lines
+    that do not start with a timestamp fall back to scan_timestamp individually.
+    
+    Args:
+        lines: Log lines to parse
+        
+    Returns:
+        int64 array of epoch-second keys, INVALID_KEY where no valid timestamp exists
+    """
+    count = len(lines)
+    if count == 0:
+        return np.empty(0, dtype=np.int64)
+    
+    # Truncating cast to fixed-width unicode, viewed as one code point per column
+    codes = np.asarray(lines, dtype=f'U{TIMESTAMP_LENGTH}').view(np.uint32).reshape(count, TIMESTAMP_LENGTH)
+    
+    digits = codes[:, _DIGIT_POSITIONS].astype(np.int64) - ord('0')
+    shaped = (
+        ((digits >= 0) & (digits <= 9)).all(axis=1)
+        & (codes[:, _DASH_POSITIONS] == ord('-')).all(axis=1)
+        & (codes[:, _COLON_POSITIONS] == ord(':')).all(axis=1)
+        & ((codes[:, 10] == ord(' ')) | (codes[:, 10] == ord('\t')))
+    )
+    
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    hour = digits[:, 8] * 10 + digits[:, 9]
+    minute = digits[:, 10] * 10 + digits[:, 11]
+    second = digits[:, 12] * 10 + digits[:, 13]
+    
+    month_index = np.clip(month, 0, 12)
+    days_in_month = np.asarray(_DAYS_IN_MONTH, dtype=np.int64)[month_index]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days_in_month = days_in_month + ((month_index == 2) & leap)
+    
+    in_range = (
+        (year >= 1) & (month >= 1) & (month <= 12)
+        & (day >= 1) & (day <= days_in_month)
+        & (hour <= 23) & (minute <= 59) & (second <= 59)
+    )
+    
+    # Vectorized days-from-civil, mirroring _days_from_civil
+    shifted_year = year - (month <= 2)
+    era = shifted_year // 400
+    year_of_era = shifted_year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    days = era * 146097 + day_of_era - 719468
+    
+    keys = days * 86400 + hour * 3600 + minute * 60 + second
+    keys[shaped & ~in_range] = INVALID_KEY
+    
+    # Lines without a leading timestamp may still carry one further in
+    for index in np.flatnonzero(~shaped):
+        try:
+            keys[index] = scan_timestamp(lines[index])[0]
+        except ValueError:
+            keys[index] = INVALID_KEY
+    
+    return keys
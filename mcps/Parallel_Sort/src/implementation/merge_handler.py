@@ -0,0 +1,353 @@
+"""
+Merge handler capability for multi-file logs.
+Merges many per-rank or per-process logs into one timestamp-ordered file with a
+streaming k-way merge, sorting any input that is not already in time order.
+"""
+import glob
+import heapq
+import os
+import re
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import numpy as np
+from .log_formats import NS_PER_SECOND, DEFAULT_FORMAT, detect_file_format
+from .log_parser import INVALID_KEY
+from .parallel_processor import (
+    MERGE_BUFFER_BYTES, MAX_INVALID_ENTRIES, process_single_chunk, chunk_sort_keys,
+    describe_invalid_line, cleanup_temp_files, split_lines
+)
+from .sort_handler import write_sorted_output
+from .worker_pool import get_worker_pool
+
+
+# Input files kept open at once during the merge; past this, each reader
+# reopens its file at the saved offset whenever its buffer runs dry
+MAX_OPEN_FILES = 256
+
+# Read buffer budget shared by all inputs of one merge
+MERGE_MEMORY_BYTES = 128 * 1024 * 1024
+
+# Smallest read buffer per input, however many inputs there are
+MIN_MERGE_BUFFER_BYTES = 64 * 1024
+
+# Digit runs compare numerically when ordering inputs (rank_2 before rank_10)
+_DIGITS = re.compile(r'(\d+)')
+
+
+async def merge_logs(input_path: str,
+                     output_path: str,
+                     max_workers: Optional[int] = None,
+                     source_column: bool = True) -> Dict[str, Any]:
+    """
+    Merge many log files into one file ordered by timestamp.
+    
+    Every input is checked for time order in parallel worker processes, and
+    inputs that are out of order are sorted into a keyed run file by the same
+    workers. The sorted inputs are then merged in a single streaming pass with
+    a heap holding one buffered reader per input. Lines without a valid
+    timestamp are dropped, as when sorting a single file.
+    
+    Args:
+        input_path: Directory whose files are merged, or a glob pattern
+            (``**`` matches subdirectories)
+        output_path: Path of the file the merged lines are written to
+        max_workers: Most inputs prepared at once on the shared worker pool (default: every pool worker)
+        source_column: Prefix each output line with the input's source name and a tab
+    
+    Returns:
+        Dictionary with the output location, per-input counts and a head/tail sample
+    """
+    try:
+        if os.path.isdir(input_path):
+            candidates = [os.path.join(input_path, name) for name in os.listdir(input_path)
+                          if not name.startswith('.')]
+        else:
+            candidates = glob.glob(input_path, recursive=True)
+        
+        output_real = os.path.realpath(output_path)
+        files = sorted((path for path in candidates
+                        if os.path.isfile(path) and os.path.realpath(path) != output_real),
+                       key=natural_key)
+        if not files:
+            return {
+                "error": f"No log files found for: {input_path}",
+                "output_file": output_path
+            }
+        
+        max_workers = get_worker_pool().worker_limit(max_workers)
+        
+        start_time = datetime.now()
+        sources = source_names(files)
+        
+        # Step 1: Check every input's time order, sorting those out of order
+        inputs = await prepare_inputs_parallel(files, max_workers)
+        temp_files = [entry.get("temp_file") for entry in inputs]
+        failed = [entry for entry in inputs if "error" in entry]
+        if failed:
+            await cleanup_temp_files(temp_files)
+            return {
+                "error": f"Could not read {len(failed)} of {len(files)} inputs: {failed[0]['error']}",
+                "output_file": output_path
+            }
+        
+        # Step 2: Stream the k-way merge into the output file
+        result = merge_sorted_inputs(inputs, sources, output_path, source_column)
+        await cleanup_temp_files(temp_files)
+        
+        end_time = datetime.now()
+        processing_time = (end_time - start_time).total_seconds()
+        
+        total_valid = sum(entry["valid_lines"] for entry in inputs)
+        total_invalid = sum(entry["invalid_lines"] for entry in inputs)
+        unsorted_sources = [source for source, entry in zip(sources, inputs) if not entry["sorted"]]
+        
+        invalid_entries = []
+        for source, entry in zip(sources, inputs):
+            for invalid in entry["invalid_entries"]:
+                invalid_entries.append({"source": source, **invalid})
+        
+        result.update({
+            "input_files": len(files),
+            "unsorted_inputs": len(unsorted_sources),
+            "unsorted_sources": unsorted_sources[:MAX_INVALID_ENTRIES],
+            "total_lines": sum(entry["total_lines"] for entry in inputs),
+            "valid_lines": total_valid,
+            "invalid_lines": total_invalid,
+            "max_workers_used": max_workers,
+            "processing_time_seconds": round(processing_time, 2),
+            "merged_at": end_time.isoformat(),
+            "message": f"Merged {total_valid} lines from {len(files)} files "
+                       f"({len(unsorted_sources)} sorted first) in {processing_time:.2f} seconds"
+        })
+        if invalid_entries:
+            result["invalid_entries"] = invalid_entries[:MAX_INVALID_ENTRIES]
+            result["message"] += f". {total_invalid} lines had invalid timestamps."
+        
+        return result
+    
+    except Exception as e:
+        return {
+            "error": f"Log merge failed: {str(e)}",
+            "output_file": output_path
+        }
+
+
+def natural_key(path: str) -> List[Any]:
+    """Sort key of a path that orders embedded numbers numerically."""
+    return [int(part) if part.isdigit() else part for part in _DIGITS.split(path)]
+
+
+def source_names(files: List[str]) -> List[str]:
+    """
+    Name each input by its path relative to the inputs' common directory.
+    
+    The last extension is dropped, so ``logs/rank_0003.log`` becomes ``rank_0003``
+    while inputs in different subdirectories keep their distinguishing prefix.
+    
+    Args:
+        files: Paths of the inputs
+    
+    Returns:
+        Source name of each input, in order
+    """
+    if len(files) == 1:
+        root = os.path.dirname(os.path.abspath(files[0]))
+    else:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+    names = [os.path.splitext(os.path.relpath(os.path.abspath(path), root))[0] for path in files]
+    if len(set(names)) < len(names):
+        # Inputs differing only in extension keep it
+        names = [os.path.relpath(os.path.abspath(path), root) for path in files]
+    return names
+
+
+async def prepare_inputs_parallel(files: List[str], max_workers: int) -> List[Dict[str, Any]]:
+    """
+    Check and, where needed, sort every input on the shared worker pool.
+    
+    Args:
+        files: Paths of the inputs
+        max_workers: Most inputs prepared at once
+    
+    Returns:
+        List of prepare_merge_input results, in input order
+    """
+    return await get_worker_pool().map(prepare_merge_input, [(path,) for path in files], max_workers)
+
+
+def prepare_merge_input(file_path: str) -> Dict[str, Any]:
+    """
+    Check whether an input is in time order and sort it if not. This runs in a separate process.
+    
+    The input is streamed once in blocks to count lines and compare each valid
+    timestamp with the previous one. An input found out of order is sorted
+    with process_single_chunk into a run file of ``<epoch_ns>\\t<line>`` records.
+    
+    Args:
+        file_path: Path of the input
+    
+    Returns:
+        Dictionary with the input's format, order, line counts and the run
+        file path for inputs that were sorted
+    """
+    try:
+        log_format = detect_file_format(file_path)
+        key_scale = NS_PER_SECOND if log_format.name == DEFAULT_FORMAT else 1
+        
+        total_lines = 0
+        valid_lines = 0
+        invalid_entries = []
+        in_order = True
+        previous = INVALID_KEY
+        
+        for lines in read_line_blocks(file_path, MERGE_BUFFER_BYTES):
+            lines = [line.strip() for line in lines]
+            keys = chunk_sort_keys(lines, log_format.name)
+            valid_mask = keys != INVALID_KEY
+            valid_keys = keys[valid_mask]
+            
+            if in_order and len(valid_keys):
+                in_order = bool(valid_keys[0] >= previous and np.all(valid_keys[1:] >= valid_keys[:-1]))
+                previous = int(valid_keys[-1])
+            
+            for index in np.flatnonzero(~valid_mask)[:MAX_INVALID_ENTRIES - len(invalid_entries)]:
+                invalid_entries.append({
+                    "line_number": total_lines + int(index) + 1,
+                    "content": lines[index],
+                    "error": describe_invalid_line(lines[index], log_format.name)
+                })
+            
+            total_lines += len(lines)
+            valid_lines += len(valid_keys)
+        
+        result = {
+            "file": file_path,
+            "log_format": log_format.name,
+            "key_scale": key_scale,
+            "sorted": in_order,
+            "temp_file": None,
+            "total_lines": total_lines,
+            "valid_lines": valid_lines,
+            "invalid_lines": total_lines - valid_lines,
+            "invalid_entries": invalid_entries
+        }
+        
+        if not in_order:
+            run = process_single_chunk(file_path, 0, os.path.getsize(file_path), log_format.name)
+            if "error" in run:
+                return {"error": f"{file_path}: {run['error']}", "temp_file": None}
+            result["temp_file"] = run["temp_file"]
+        
+        return result
+    
+    except Exception as e:
+        return {
+            "error": f"{file_path}: {str(e)}",
+            "temp_file": None
+        }
+
+
+def read_line_blocks(file_path: str, block_bytes: int, keep_open: bool = True) -> Iterator[List[str]]:
+    """
+    Stream a file as blocks of whole lines.
+    
+    Each block is about block_bytes long, extended to the end of its last line.
+    With keep_open False the file is closed between blocks and reopened at the
+    saved offset, so any number of readers can be interleaved without holding
+    a file descriptor each.
+    
+    Args:
+        file_path: Path of the file
+        block_bytes: Bytes read per block before completing the last line
+        keep_open: Keep the file open between blocks
+    
+    Yields:
+        Lists of decoded lines without line terminators
+    """
+    offset = 0
+    f = open(file_path, 'rb')
+    try:
+        while True:
+            if f.closed:
+                f = open(file_path, 'rb')
+                f.seek(offset)
+            data = f.read(block_bytes)
+            if not data:
+                return
+            if not data.endswith(b'\n'):
+                data += f.readline()
+            offset += len(data)
+            if not keep_open:
+                f.close()
+            yield split_lines(data)
+    finally:
+        f.close()
+
+
+def read_merge_input(entry: Dict[str, Any], block_bytes: int, keep_open: bool) -> Iterator[Tuple[int, str]]:
+    """
+    Stream ``(epoch_ns, line)`` pairs of a prepared input in time order.
+    
+    Sorted inputs are read directly and their timestamps parsed a block at a
+    time; inputs that were sorted are read back from their run file.
+    
+    Args:
+        entry: Result of prepare_merge_input for the input
+        block_bytes: Read buffer size of the input
+        keep_open: Keep the file open between blocks
+    
+    Yields:
+        Tuples of nanosecond timestamp key and stripped log line
+    """
+    if entry["temp_file"]:
+        for records in read_line_blocks(entry["temp_file"], block_bytes, keep_open):
+            for record in records:
+                key, _, line = record.partition('\t')
+                yield int(key), line
+        return
+    
+    key_scale = entry["key_scale"]
+    for lines in read_line_blocks(entry["file"], block_bytes, keep_open):
+        lines = [line.strip() for line in lines]
+        keys = chunk_sort_keys(lines, entry["log_format"])
+        for index in np.flatnonzero(keys != INVALID_KEY):
+            yield int(keys[index]) * key_scale, lines[index]
+
+
+def merge_sorted_inputs(inputs: List[Dict[str, Any]], sources: List[str],
+                        output_path: str, source_column: bool = True) -> Dict[str, Any]:
+    """
+    K-way merge prepared inputs into a single output file.
+    
+    The heap holds one record per input, and each input's reader buffers one
+    block, whose size shrinks as the number of inputs grows so the buffers
+    together stay within MERGE_MEMORY_BYTES. Up to MAX_OPEN_FILES inputs keep
+    their file open; beyond that every reader reopens its file per block.
+    
+    Args:
+        inputs: Results of prepare_merge_input, in input order
+        sources: Source name of each input
+        output_path: Path of the file the merged lines are written to
+        source_column: Prefix each line with its source name and a tab
+    
+    Returns:
+        Dictionary with the output location, line count and head/tail samples
+    """
+    block_bytes = max(MIN_MERGE_BUFFER_BYTES, min(MERGE_BUFFER_BYTES, MERGE_MEMORY_BYTES // len(inputs)))
+    keep_open = len(inputs) <= MAX_OPEN_FILES
+    runs = [tag_records(read_merge_input(entry, block_bytes, keep_open), position)
+            for position, entry in enumerate(inputs)]
+    
+    # The input position breaks timestamp ties, so equal timestamps keep input order
+    merged = heapq.merge(*runs)
+    if source_column:
+        lines = (f"{sources[position]}\t{line}" for _, position, line in merged)
+    else:
+        lines = (line for _, _, line in merged)
+    return write_sorted_output(lines, output_path)
+
+
+def tag_records(records: Iterator[Tuple[int, str]], position: int) -> Iterator[Tuple[int, int, str]]:
+    """Extend each ``(key, line)`` record with the position of its input."""
+    for key, line in records:
+        yield key, position, line
@@ -3,27 +3,46 @@ Parallel processing capability for handling large log files.
 Implements true parallel processing using multiprocessing and chunked processing.
 """
 import os
-import re
-import asyncio
-import aiofiles
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from multiprocessing import cpu_count
+import heapq
+from functools import reduce
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Iterator
 import tempfile
 import math
+import numpy as np
+from .log_parser import INVALID_KEY, parse_timestamp_keys, scan_timestamp
+from .log_formats import NS_PER_SECOND, DEFAULT_FORMAT, get_format, detect_file_format
+from .sort_handler import sort_log_by_timestamp, write_sorted_output
+from .filter_engine import CompiledFilter, compile_filter
+from .filter_handler import filter_logs
+from .log_index import build_index, has_log_index
+from .record_batch import RecordBatch
+from .statistics_handler import LogStatistics, analyze_log_statistics, statistics_result
+from .worker_pool import get_worker_pool
+from .auto_tuner import plan_execution
+
+
+# Read/write buffer used for each run file during the k-way merge
+MERGE_BUFFER_BYTES = 1024 * 1024
+
+# Cap on invalid line details carried back from workers
+MAX_INVALID_ENTRIES = 50
 
 
 async def parallel_sort_large_file(file_path: str, 
-                                  chunk_size_mb: int = 100,
-                                  max_workers: int = None) -> Dict[str, Any]:
+                                  chunk_size_mb: int = None,
+                                  max_workers: int = None,
+                                  output_path: str = None) -> Dict[str, Any]:
     """
     Sort large log files using parallel processing with chunked approach.
     
     Args:
         file_path: Path to the log file to sort
-        chunk_size_mb: Size of each chunk in MB (default: 100MB)
-        max_workers: Maximum number of worker processes (default: CPU count)
+        chunk_size_mb: Size of each chunk in MB. By default plan_execution picks
+            serial or parallel sorting, the chunk size and the worker count.
+        max_workers: Most chunks sorted at once on the shared worker pool (default: every pool worker)
+        output_path: Optional path to stream the sorted lines to. When given, the
+            result carries only counts and a head/tail sample instead of every line.
         
     Returns:
         Dictionary containing sorted results and processing statistics
@@ -39,31 +58,58 @@ async def parallel_sort_large_file(file_path: str,
         file_size = os.path.getsize(file_path)
         file_size_mb = file_size / (1024 * 1024)
         
+        log_format = detect_file_format(file_path)
+        
         # Determine if parallel processing is needed
-        if file_size_mb < chunk_size_mb:
+        plan = None
+        if chunk_size_mb is None:
+            plan = plan_execution(
+                file_path, "sort",
+                lambda start, end: process_single_chunk(file_path, start, end, log_format.name),
+                max_workers, serial_loads_file=True
+            )
+            chunk_size_mb, max_workers = plan.chunk_size_mb, plan.workers
+        
+        if (plan is not None and not plan.parallel) or (plan is None and file_size_mb < chunk_size_mb):
             # Use regular sorting for small files
-            from .sort_handler import sort_log_by_timestamp
-            return await sort_log_by_timestamp(file_path)
+            result = await sort_log_by_timestamp(file_path, output_path)
+            if plan is not None:
+                result["execution_plan"] = plan.describe()
+            return result
         
         # Configure parallel processing
-        if max_workers is None:
-            max_workers = min(cpu_count(), 8)  # Cap at 8 to avoid overwhelming system
+        max_workers = get_worker_pool().worker_limit(max_workers)
         
         chunk_size_bytes = chunk_size_mb * 1024 * 1024
         
         start_time = datetime.now()
         
-        # Step 1: Split file into chunks
-        chunks = await split_file_into_chunks(file_path, chunk_size_bytes)
+        # Step 1: Split file into newline-aligned byte ranges
+        chunks = compute_chunk_ranges(file_path, chunk_size_bytes)
         
         # Step 2: Process chunks in parallel
-        sorted_chunks = await process_chunks_parallel(chunks, max_workers)
+        sorted_chunks = await process_chunks_parallel(file_path, chunks, max_workers, log_format.name)
         
-        # Step 3: Merge sorted chunks
-        final_result = await merge_sorted_chunks(sorted_chunks)
+        # Step 3: Stream-merge the sorted runs into the output file
+        if output_path:
+            merged_path = output_path
+        else:
+            temp_fd, merged_path = tempfile.mkstemp(suffix='_merged.log')
+            os.close(temp_fd)
+        final_result = await merge_sorted_chunks(sorted_chunks, merged_path)
+        
+        temp_files = [chunk.get('temp_file') for chunk in sorted_chunks]
+        if not output_path:
+            # Inline mode: return the lines in the response as before
+            if "error" not in final_result:
+                with open(merged_path, 'r', encoding='utf-8') as f:
+                    final_result["sorted_lines"] = [line.rstrip('\n') for line in f]
+                for key in ("output_file", "lines_written", "head_sample", "tail_sample"):
+                    final_result.pop(key, None)
+            temp_files.append(merged_path)
         
         # Step 4: Clean up temporary files
-        await cleanup_temp_files(chunks + [chunk['temp_file'] for chunk in sorted_chunks])
+        await cleanup_temp_files(temp_files)
         
         end_time = datetime.now()
         processing_time = (end_time - start_time).total_seconds()
@@ -75,6 +121,8 @@ async def parallel_sort_large_file(file_path: str,
             "max_workers_used": max_workers,
             "processing_time_seconds": round(processing_time, 2),
             "parallel_processing": True,
+            "log_format": log_format.name,
+            "execution_plan": plan.describe() if plan is not None else None,
             "processed_at": end_time.isoformat(),
             "message": f"Large file processed using {len(chunks)} chunks in {processing_time:.2f} seconds"
         })
@@ -88,212 +136,264 @@ async def parallel_sort_large_file(file_path: str,
         }
 
 
-async def split_file_into_chunks(file_path: str, chunk_size_bytes: int) -> List[str]:
+def compute_chunk_ranges(file_path: str, chunk_size_bytes: int) -> List[Tuple[int, int]]:
     """
-    Split a large file into smaller chunks for parallel processing.
+    Split a file into newline-aligned byte ranges for parallel processing.
+    
+    Seeks to each approximate boundary and advances to the next newline, so the
+    split costs one seek and one short read per chunk instead of a full pass
+    over the file. Workers read their own range directly.
     
     Args:
         file_path: Path to the file to split
-        chunk_size_bytes: Size of each chunk in bytes
+        chunk_size_bytes: Target size of each chunk in bytes
         
     Returns:
-        List of temporary file paths containing chunks
+        List of (start, end) byte offsets covering the file
     """
-    chunks = []
+    file_size = os.path.getsize(file_path)
+    chunk_size_bytes = max(1, chunk_size_bytes)
+    ranges = []
     
-    async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-        chunk_num = 0
-        
-        while True:
-            # Create temporary file for this chunk
-            temp_fd, temp_path = tempfile.mkstemp(suffix=f'_chunk_{chunk_num}.log')
-            os.close(temp_fd)
+    with open(file_path, 'rb') as f:
+        start = 0
+        while start < file_size:
+            boundary = start + chunk_size_bytes
+            if boundary >= file_size:
+                end = file_size
+            else:
+                # Align to the start of the next line
+                f.seek(boundary)
+                f.readline()
+                end = min(f.tell(), file_size)
             
-            bytes_read = 0
-            lines_in_chunk = []
-            
-            # Read lines until chunk size is reached
-            async for line in f:
-                line_bytes = len(line.encode('utf-8'))
-                
-                if bytes_read + line_bytes > chunk_size_bytes and lines_in_chunk:
-                    # Chunk is full, break here to avoid splitting in middle of line
-                    break
-                
-                lines_in_chunk.append(line)
-                bytes_read += line_bytes
-            
-            if not lines_in_chunk:
-                # No more data, remove empty temp file
-                os.unlink(temp_path)
-                break
-            
-            # Write chunk to temporary file
-            async with aiofiles.open(temp_path, 'w', encoding='utf-8') as chunk_file:
-                await chunk_file.writelines(lines_in_chunk)
-            
-            chunks.append(temp_path)
-            chunk_num += 1
+            ranges.append((start, end))
+            start = end
     
-    return chunks
+    return ranges
 
 
-async def process_chunks_parallel(chunk_paths: List[str], max_workers: int) -> List[Dict[str, Any]]:
+def read_chunk_lines(file_path: str, start: int, end: int) -> List[str]:
     """
-    Process chunks in parallel using ProcessPoolExecutor.
+    Read the lines inside a newline-aligned byte range of a file.
     
     Args:
-        chunk_paths: List of chunk file paths to process
-        max_workers: Maximum number of worker processes
+        file_path: Path to the file
+        start: Byte offset of the first line in the range
+        end: Byte offset just past the last line in the range
         
     Returns:
-        List of processing results for each chunk
+        List of decoded lines without line terminators
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    
+    return split_lines(data)
+
+
+def split_lines(data: bytes) -> List[str]:
     """
-    loop = asyncio.get_event_loop()
+    Decode a block of complete lines, breaking only at newlines.
     
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all chunk processing tasks
-        tasks = []
-        for chunk_path in chunk_paths:
-            task = loop.run_in_executor(executor, process_single_chunk, chunk_path)
-            tasks.append(task)
-        
-        # Wait for all chunks to be processed
-        results = await asyncio.gather(*tasks)
+    Unlike str.splitlines, form feeds, file/group/record separators, NEL and
+    the Unicode line separator inside a line are kept as part of it.
+    
+    Args:
+        data: Bytes of whole lines, the last one optionally without its newline
+        
+    Returns:
+        List of decoded lines without their LF or CRLF terminators
+    """
+    lines = data.split(b'\n')
+    if lines[-1] == b'':
+        lines.pop()
+    return [(line[:-1] if line.endswith(b'\r') else line).decode('utf-8') for line in lines]
+
+
+async def process_chunks_parallel(file_path: str,
+                                  chunk_ranges: List[Tuple[int, int]],
+                                  max_workers: int,
+                                  format_name: str = DEFAULT_FORMAT) -> List[Dict[str, Any]]:
+    """
+    Process chunks in parallel on the shared worker pool.
     
-    return results
+    Args:
+        file_path: Path to the file being processed
+        chunk_ranges: List of (start, end) byte ranges to process
+        max_workers: Most chunks processed at once
+        format_name: Registered log format of the file
+        
+    Returns:
+        List of processing results for each chunk
+    """
+    tasks = [(file_path, start, end, format_name) for start, end in chunk_ranges]
+    return await get_worker_pool().map(process_single_chunk, tasks, max_workers)
 
 
-def process_single_chunk(chunk_path: str) -> Dict[str, Any]:
+def process_single_chunk(file_path: str, start: int, end: int,
+                         format_name: str = DEFAULT_FORMAT) -> Dict[str, Any]:
     """
-    Process a single chunk (sort it). This runs in a separate process.
+    Sort a single chunk and spill it to a keyed run file. This runs in a separate process.
+    
+    Each line of the run file is written as ``<epoch_ns>\t<line>`` so the
+    merge phase can compare integer keys without re-parsing timestamps.
     
     Args:
-        chunk_path: Path to the chunk file to process
+        file_path: Path to the file being sorted
+        start: Byte offset where the chunk starts
+        end: Byte offset where the chunk ends
+        format_name: Registered log format of the file
         
     Returns:
         Dictionary containing processing results
     """
     try:
-        # Import here to avoid issues with multiprocessing
-        import re
-        from datetime import datetime
+        # Read this worker's byte range
+        lines = read_chunk_lines(file_path, start, end)
         
-        # Read chunk
-        with open(chunk_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        lines = [line.strip() for line in lines]
         
-        # Parse and sort lines
-        valid_entries = []
-        invalid_lines = []
+        # Parse every timestamp in the chunk at once
+        keys = chunk_sort_keys(lines, format_name)
+        valid_mask = keys != INVALID_KEY
         
-        for i, line in enumerate(lines, 1):
-            try:
-                timestamp_pattern = r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})'
-                match = re.search(timestamp_pattern, line.strip())
-                
-                if match:
-                    timestamp_str = match.group(1)
-                    parsed_dt = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                    valid_entries.append((parsed_dt, line.strip()))
-                else:
-                    invalid_lines.append({
-                        "line_number": i,
-                        "content": line.strip(),
-                        "error": "No valid timestamp found"
-                    })
-            except ValueError as e:
-                invalid_lines.append({
-                    "line_number": i,
-                    "content": line.strip(),
-                    "error": str(e)
-                })
-        
-        # Sort valid entries
-        valid_entries.sort(key=lambda x: x[0])
-        sorted_lines = [entry[1] for entry in valid_entries]
-        
-        # Create temporary file for sorted chunk
-        temp_fd, sorted_temp_path = tempfile.mkstemp(suffix='_sorted.log')
-        os.close(temp_fd)
-        
-        # Write sorted lines to temporary file
-        with open(sorted_temp_path, 'w', encoding='utf-8') as f:
-            for line in sorted_lines:
-                f.write(line + '\n')
+        invalid_lines = []
+        for index in np.flatnonzero(~valid_mask)[:MAX_INVALID_ENTRIES]:
+            invalid_lines.append({
+                "line_number": int(index) + 1,
+                "content": lines[index],
+                "error": describe_invalid_line(lines[index], format_name)
+            })
+        invalid_count = int(np.count_nonzero(~valid_mask))
+        
+        # Stable sort, so equal timestamps keep file order
+        valid_indices = np.flatnonzero(valid_mask)
+        order = valid_indices[np.argsort(keys[valid_indices], kind='stable')]
+        
+        # Spill the sorted run to disk with nanosecond keys
+        key_scale = NS_PER_SECOND if format_name == DEFAULT_FORMAT else 1
+        temp_fd, run_path = tempfile.mkstemp(suffix='_sorted.run')
+        with os.fdopen(temp_fd, 'w', encoding='utf-8', buffering=MERGE_BUFFER_BYTES) as f:
+            for index in order:
+                f.write(f"{int(keys[index]) * key_scale}\t{lines[index]}\n")
         
         return {
-            "temp_file": sorted_temp_path,
-            "original_chunk": chunk_path,
+            "temp_file": run_path,
+            "chunk_range": [start, end],
             "total_lines": len(lines),
-            "valid_lines": len(valid_entries),
-            "invalid_lines": len(invalid_lines),
-            "invalid_entries": invalid_lines,
-            "sorted_lines": sorted_lines  # Keep in memory for merging
+            "valid_lines": len(order),
+            "invalid_lines": invalid_count,
+            "invalid_entries": invalid_lines
         }
         
     except Exception as e:
         return {
             "error": f"Chunk processing failed: {str(e)}",
             "temp_file": None,
-            "original_chunk": chunk_path,
-            "sorted_lines": []
+            "chunk_range": [start, end]
         }
 
 
-async def merge_sorted_chunks(sorted_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+def chunk_sort_keys(lines: List[str], format_name: str) -> np.ndarray:
+    """
+    Compute sort keys for every line of a chunk.
+    
+    The standard format uses the vectorized kernel and yields epoch seconds;
+    other formats are parsed line by line and yield epoch nanoseconds.
+    
+    Args:
+        lines: Stripped lines of the chunk
+        format_name: Registered log format of the file
+        
+    Returns:
+        int64 array of keys, INVALID_KEY for lines that could not be parsed
+    """
+    if format_name == DEFAULT_FORMAT:
+        return parse_timestamp_keys(lines)
+    
+    log_format = get_format(format_name)
+    keys = np.full(len(lines), INVALID_KEY, dtype=np.int64)
+    for index, line in enumerate(lines):
+        record = log_format.parse(line)
+        if record is not None:
+            keys[index] = record.epoch_ns
+    return keys
+
+
+def describe_invalid_line(line: str, format_name: str) -> str:
+    """Explain why a line produced no sort key."""
+    if format_name != DEFAULT_FORMAT:
+        return f"Line does not match {format_name} format"
+    try:
+        scan_timestamp(line)
+    except ValueError as e:
+        return str(e)
+    return "No valid timestamp found"
+
+
+def read_sorted_run(run_path: str) -> Iterator[Tuple[int, str]]:
     """
-    Merge sorted chunks using k-way merge algorithm.
+    Stream ``(key, line)`` pairs back from a run file written by a chunk worker.
+    
+    Args:
+        run_path: Path to the sorted run file
+        
+    Yields:
+        Tuples of integer timestamp key and original log line
+    """
+    with open(run_path, 'r', encoding='utf-8', buffering=MERGE_BUFFER_BYTES) as f:
+        for record in f:
+            key, _, line = record.partition('\t')
+            yield int(key), line.rstrip('\n')
+
+
+async def merge_sorted_chunks(sorted_chunks: List[Dict[str, Any]], output_path: str) -> Dict[str, Any]:
+    """
+    Merge sorted chunk runs into a single output file using a streaming k-way merge.
+    
+    Only one buffered record per run is held in memory at a time, so memory use
+    is bounded by the number of runs rather than the size of the file.
     
     Args:
         sorted_chunks: List of sorted chunk results
+        output_path: Path of the file the merged lines are written to
         
     Returns:
         Dictionary containing final merged results
     """
     try:
-        # Collect all sorted lines with their timestamps for merging
-        all_entries = []
         total_lines = 0
         total_valid = 0
         total_invalid = 0
         all_invalid_entries = []
+        runs = []
         
         for chunk_result in sorted_chunks:
             if "error" in chunk_result:
                 continue
-                
-            # Parse lines from this chunk to get timestamps for merging
-            for line in chunk_result.get("sorted_lines", []):
-                try:
-                    timestamp_pattern = r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})'
-                    match = re.search(timestamp_pattern, line)
-                    if match:
-                        timestamp_str = match.group(1)
-                        timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                        all_entries.append((timestamp, line))
-                except ValueError:
-                    continue
+            
+            runs.append(read_sorted_run(chunk_result["temp_file"]))
             
             # Accumulate statistics
             total_lines += chunk_result.get("total_lines", 0)
             total_valid += chunk_result.get("valid_lines", 0)
             total_invalid += chunk_result.get("invalid_lines", 0)
-            all_invalid_entries.extend(chunk_result.get("invalid_entries", []))
+            if len(all_invalid_entries) < MAX_INVALID_ENTRIES:
+                all_invalid_entries.extend(chunk_result.get("invalid_entries", []))
         
-        # Sort all entries globally
-        all_entries.sort(key=lambda x: x[0])
-        final_sorted_lines = [entry[1] for entry in all_entries]
+        # heapq.merge is stable across inputs, so ties keep their chunk order
+        merged = heapq.merge(*runs, key=lambda record: record[0])
+        result = write_sorted_output((line for _, line in merged), output_path)
         
-        result = {
-            "sorted_lines": final_sorted_lines,
+        result.update({
             "total_lines": total_lines,
             "valid_lines": total_valid,
             "invalid_lines": total_invalid
-        }
+        })
         
         if all_invalid_entries:
-            result["invalid_entries"] = all_invalid_entries[:50]  # Limit for performance
+            result["invalid_entries"] = all_invalid_entries[:MAX_INVALID_ENTRIES]  # Limit for performance
             result["message"] = f"Successfully sorted {total_valid} lines from {len(sorted_chunks)} chunks. {total_invalid} lines had invalid timestamps."
         else:
             result["message"] = f"Successfully sorted all {total_valid} lines from {len(sorted_chunks)} chunks."
@@ -303,7 +403,7 @@ async def merge_sorted_chunks(sorted_chunks: List[Dict[str, Any]]) -> Dict[str,
     except Exception as e:
         return {
             "error": f"Chunk merging failed: {str(e)}",
-            "sorted_lines": []
+            "output_file": output_path
         }
 
 
@@ -323,16 +423,228 @@ async def cleanup_temp_files(temp_files: List[str]) -> None:
             pass
 
 
+async def parallel_filter_large_file(file_path: str,
+                                    filter_conditions: List[Dict[str, Any]],
+                                    logical_operator: str = "and",
+                                    output_path: str = None,
+                                    chunk_size_mb: int = None,
+                                    max_workers: int = None) -> Dict[str, Any]:
+    """
+    Filter large log files using parallel processing.
+    
+    The conditions are compiled once and shipped to every chunk worker. Each
+    worker spills its matches to a temporary file, and the files are
+    concatenated in chunk order so matches keep their original order.
+    
+    Args:
+        file_path: Path to the log file to filter
+        filter_conditions: List of filter condition dictionaries
+        logical_operator: How to combine conditions ("and", "or")
+        output_path: Optional path to stream the matching lines to. When given, the
+            result carries only counts and a head/tail sample instead of every line.
+        chunk_size_mb: Size of each chunk in MB. By default plan_execution picks
+            indexed serial filtering or parallel filtering, the chunk size and the worker count.
+        max_workers: Most chunks filtered at once on the shared worker pool
+        
+    Returns:
+        Dictionary containing filtered results and processing statistics
+    """
+    try:
+        if not os.path.exists(file_path):
+            return {
+                "error": f"File not found: {file_path}",
+                "filtered_lines": []
+            }
+        
+        file_size = os.path.getsize(file_path)
+        file_size_mb = file_size / (1024 * 1024)
+        log_format = detect_file_format(file_path)
+        
+        plan = None
+        if chunk_size_mb is None:
+            plan = plan_execution(
+                file_path, "filter",
+                lambda start, end: filter_single_chunk(file_path, start, end,
+                                                       compile_filter(filter_conditions, logical_operator),
+                                                       log_format.name),
+                max_workers, serial_is_indexed=has_log_index(file_path)
+            )
+            chunk_size_mb, max_workers = plan.chunk_size_mb, plan.workers
+        
+        if (plan is not None and not plan.parallel) or (plan is None and file_size_mb < chunk_size_mb):
+            # Use regular filtering for small files
+            result = await filter_logs(file_path, filter_conditions, logical_operator)
+            if output_path and "error" not in result:
+                result.update(write_sorted_output(result.pop("filtered_lines"), output_path))
+            if plan is not None:
+                result["execution_plan"] = plan.describe()
+            return result
+        
+        max_workers = get_worker_pool().worker_limit(max_workers)
+        
+        start_time = datetime.now()
+        
+        chunks = compute_chunk_ranges(file_path, chunk_size_mb * 1024 * 1024)
+        compiled_filter = compile_filter(filter_conditions, logical_operator)
+        
+        # Global line numbers are only needed when a condition looks at them
+        if "line_number" in compiled_filter.fields:
+            first_lines = chunk_first_line_numbers(file_path, chunks)
+        else:
+            first_lines = [1] * len(chunks)
+        
+        tasks = [
+            (file_path, start, end, compiled_filter, log_format.name, first_line)
+            for (start, end), first_line in zip(chunks, first_lines)
+        ]
+        chunk_results = await get_worker_pool().map(filter_single_chunk, tasks, max_workers)
+        
+        temp_files = [chunk.get("temp_file") for chunk in chunk_results]
+        errors = [chunk["error"] for chunk in chunk_results if "error" in chunk]
+        if errors:
+            await cleanup_temp_files(temp_files)
+            return {
+                "error": f"Parallel filtering failed: {errors[0]}",
+                "filtered_lines": []
+            }
+        
+        total_lines = sum(chunk["total_lines"] for chunk in chunk_results)
+        matched_lines = sum(chunk["matched_lines"] for chunk in chunk_results)
+        
+        # Concatenate the per-chunk matches in chunk order
+        matches = (line for chunk in chunk_results for line in read_match_file(chunk["temp_file"]))
+        if output_path:
+            result = write_sorted_output(matches, output_path)
+        else:
+            result = {"filtered_lines": list(matches)}
+        
+        await cleanup_temp_files(temp_files)
+        
+        end_time = datetime.now()
+        processing_time = (end_time - start_time).total_seconds()
+        
+        result.update({
+            "total_lines": total_lines,
+            "matched_lines": matched_lines,
+            "filter_conditions": filter_conditions,
+            "logical_operator": logical_operator,
+            "log_format": log_format.name,
+            "match_percentage": round((matched_lines / total_lines * 100), 2) if total_lines else 0,
+            "file_size_mb": round(file_size_mb, 2),
+            "chunks_processed": len(chunks),
+            "max_workers_used": max_workers,
+            "processing_time_seconds": round(processing_time, 2),
+            "parallel_processing": True,
+            "execution_plan": plan.describe() if plan is not None else None,
+            "filtered_at": end_time.isoformat(),
+            "message": f"Filtered {total_lines} lines using {len(chunks)} chunks in {processing_time:.2f} seconds, {matched_lines} matches found"
+        })
+        
+        return result
+        
+    except Exception as e:
+        return {
+            "error": f"Parallel filtering failed: {str(e)}",
+            "filtered_lines": []
+        }
+
+
+def chunk_first_line_numbers(file_path: str, chunk_ranges: List[Tuple[int, int]]) -> List[int]:
+    """
+    Line number of the first line of each newline-aligned chunk.
+    
+    Args:
+        file_path: Path to the file
+        chunk_ranges: List of (start, end) byte ranges covering the file
+        
+    Returns:
+        1-based line number where each chunk starts
+    """
+    first_lines = []
+    line_number = 1
+    with open(file_path, 'rb') as f:
+        for start, end in chunk_ranges:
+            first_lines.append(line_number)
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                block = f.read(min(MERGE_BUFFER_BYTES, remaining))
+                if not block:
+                    break
+                line_number += block.count(b'\n')
+                remaining -= len(block)
+    return first_lines
+
+
+def filter_single_chunk(file_path: str, start: int, end: int,
+                        compiled_filter: CompiledFilter,
+                        format_name: str = DEFAULT_FORMAT,
+                        first_line_number: int = 1) -> Dict[str, Any]:
+    """
+    Filter a single chunk and spill the matching lines to a temporary file. This runs in a separate process.
+    
+    Args:
+        file_path: Path to the file being filtered
+        start: Byte offset where the chunk starts
+        end: Byte offset where the chunk ends
+        compiled_filter: Filter to apply to every entry
+        format_name: Registered log format of the file
+        first_line_number: Line number of the first line in the chunk
+        
+    Returns:
+        Dictionary containing the match file and counts
+    """
+    try:
+        batch = RecordBatch.from_lines(read_chunk_lines(file_path, start, end), get_format(format_name),
+                                       first_line_number)
+        matches = np.flatnonzero(compiled_filter.batch_mask(batch))
+        
+        temp_fd, match_path = tempfile.mkstemp(suffix='_filtered.log')
+        with os.fdopen(temp_fd, 'w', encoding='utf-8', buffering=MERGE_BUFFER_BYTES) as f:
+            for line in batch.lines(matches):
+                f.write(line + "\n")
+        
+        return {
+            "temp_file": match_path,
+            "chunk_range": [start, end],
+            "total_lines": len(batch),
+            "matched_lines": len(matches)
+        }
+        
+    except Exception as e:
+        return {
+            "error": f"Chunk filtering failed: {str(e)}",
+            "temp_file": None,
+            "chunk_range": [start, end]
+        }
+
+
+def read_match_file(match_path: str) -> Iterator[str]:
+    """
+    Stream the lines written by a filter chunk worker.
+    
+    Args:
+        match_path: Path to the chunk's match file
+        
+    Yields:
+        Matching lines without line terminators
+    """
+    with open(match_path, 'r', encoding='utf-8', buffering=MERGE_BUFFER_BYTES) as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
 async def parallel_analyze_large_file(file_path: str,
-                                     chunk_size_mb: int = 50,
+                                     chunk_size_mb: int = None,
                                      max_workers: int = None) -> Dict[str, Any]:
     """
     Analyze large log files using parallel processing.
     
     Args:
         file_path: Path to the log file to analyze
-        chunk_size_mb: Size of each chunk in MB
-        max_workers: Maximum number of worker processes
+        chunk_size_mb: Size of each chunk in MB. By default plan_execution picks
+            indexed serial analysis or parallel analysis, the chunk size and the worker count.
+        max_workers: Most chunks analyzed at once on the shared worker pool
         
     Returns:
         Dictionary containing analysis results
@@ -346,29 +658,39 @@ async def parallel_analyze_large_file(file_path: str,
         
         file_size = os.path.getsize(file_path)
         file_size_mb = file_size / (1024 * 1024)
+        log_format = detect_file_format(file_path)
+        
+        plan = None
+        if chunk_size_mb is None:
+            plan = plan_execution(
+                file_path, "analyze",
+                lambda start, end: analyze_single_chunk(file_path, start, end, log_format.name),
+                max_workers, serial_is_indexed=has_log_index(file_path)
+            )
+            chunk_size_mb, max_workers = plan.chunk_size_mb, plan.workers
         
         # Use regular analysis for small files
-        if file_size_mb < chunk_size_mb:
-            from .statistics_handler import analyze_log_statistics
-            return await analyze_log_statistics(file_path)
+        if (plan is not None and not plan.parallel) or (plan is None and file_size_mb < chunk_size_mb):
+            result = await analyze_log_statistics(file_path)
+            if plan is not None:
+                result["execution_plan"] = plan.describe()
+            return result
         
-        if max_workers is None:
-            max_workers = min(cpu_count(), 6)
+        max_workers = get_worker_pool().worker_limit(max_workers)
         
         chunk_size_bytes = chunk_size_mb * 1024 * 1024
         start_time = datetime.now()
         
-        # Split into chunks
-        chunks = await split_file_into_chunks(file_path, chunk_size_bytes)
+        # Split into newline-aligned byte ranges
+        chunks = compute_chunk_ranges(file_path, chunk_size_bytes)
         
         # Analyze chunks in parallel
-        chunk_analyses = await analyze_chunks_parallel(chunks, max_workers)
+        chunk_analyses = await analyze_chunks_parallel(file_path, chunks, max_workers, log_format.name)
         
         # Merge analysis results
-        merged_analysis = merge_analysis_results(chunk_analyses)
-        
-        # Clean up
-        await cleanup_temp_files(chunks)
+        merged_analysis = merge_analysis_results(chunk_analyses, log_format.name)
+        if "error" in merged_analysis:
+            return merged_analysis
         
         end_time = datetime.now()
         processing_time = (end_time - start_time).total_seconds()
@@ -378,6 +700,8 @@ async def parallel_analyze_large_file(file_path: str,
             "chunks_analyzed": len(chunks),
             "processing_time_seconds": round(processing_time, 2),
             "parallel_analysis": True,
+            "log_format": log_format.name,
+            "execution_plan": plan.describe() if plan is not None else None,
             "analyzed_at": end_time.isoformat()
         })
         
@@ -390,178 +714,82 @@ async def parallel_analyze_large_file(file_path: str,
         }
 
 
-async def analyze_chunks_parallel(chunk_paths: List[str], max_workers: int) -> List[Dict[str, Any]]:
+async def analyze_chunks_parallel(file_path: str,
+                                  chunk_ranges: List[Tuple[int, int]],
+                                  max_workers: int,
+                                  format_name: str = DEFAULT_FORMAT) -> List[Any]:
     """
-    Analyze chunks in parallel.
+    Analyze chunks in parallel on the shared worker pool.
     
     Args:
-        chunk_paths: List of chunk file paths
-        max_workers: Maximum number of workers
+        file_path: Path to the file being analyzed
+        chunk_ranges: List of (start, end) byte ranges to analyze
+        max_workers: Most chunks analyzed at once
+        format_name: Registered log format of the file
         
     Returns:
-        List of analysis results for each chunk
+        LogStatistics (or error dictionary) of each chunk, in chunk order
     """
-    loop = asyncio.get_event_loop()
-    
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        tasks = []
-        for chunk_path in chunk_paths:
-            task = loop.run_in_executor(executor, analyze_single_chunk, chunk_path)
-            tasks.append(task)
-        
-        results = await asyncio.gather(*tasks)
-    
-    return results
+    tasks = [(file_path, start, end, format_name) for start, end in chunk_ranges]
+    return await get_worker_pool().map(analyze_single_chunk, tasks, max_workers)
 
 
-def analyze_single_chunk(chunk_path: str) -> Dict[str, Any]:
+def analyze_single_chunk(file_path: str, start: int, end: int,
+                         format_name: str = DEFAULT_FORMAT) -> Any:
     """
     Analyze a single chunk. Runs in separate process.
     
     Args:
-        chunk_path: Path to chunk file
+        file_path: Path to the file being analyzed
+        start: Byte offset where the chunk starts
+        end: Byte offset where the chunk ends
+        format_name: Registered log format of the file
         
     Returns:
-        Analysis results for the chunk
+        LogStatistics of the chunk, or an error dictionary
     """
     try:
-        import re
-        from datetime import datetime
-        from collections import defaultdict, Counter
-        
-        with open(chunk_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        parsed_entries = []
-        invalid_count = 0
-        
-        # Parse entries
-        for line in lines:
-            try:
-                timestamp_pattern = r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})'
-                match = re.search(timestamp_pattern, line.strip())
-                
-                if match:
-                    timestamp_str = match.group(1)
-                    timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                    
-                    remainder = line[match.end():].strip()
-                    parts = remainder.split(' ', 1)
-                    level = parts[0] if parts else ""
-                    message = parts[1] if len(parts) > 1 else ""
-                    
-                    parsed_entries.append({
-                        "timestamp": timestamp,
-                        "level": level.upper(),
-                        "message": message
-                    })
-                else:
-                    invalid_count += 1
-            except ValueError:
-                invalid_count += 1
-        
-        # Generate statistics for this chunk
-        level_counts = Counter(entry["level"] for entry in parsed_entries)
-        
-        # Time analysis
-        timestamps = [entry["timestamp"] for entry in parsed_entries]
-        time_stats = {}
-        if timestamps:
-            timestamps.sort()
-            time_stats = {
-                "earliest": timestamps[0],
-                "latest": timestamps[-1],
-                "count": len(timestamps)
-            }
-        
-        return {
-            "total_lines": len(lines),
-            "valid_entries": len(parsed_entries),
-            "invalid_entries": invalid_count,
-            "level_counts": dict(level_counts),
-            "time_stats": time_stats,
-            "chunk_file": chunk_path
-        }
+        index = build_index(file_path, get_format(format_name), start, end, with_templates=False)
+        statistics = LogStatistics()
+        statistics.add_index(index)
+        return statistics
         
     except Exception as e:
         return {
             "error": f"Chunk analysis failed: {str(e)}",
-            "chunk_file": chunk_path
+            "chunk_range": [start, end]
         }
 
 
-def merge_analysis_results(chunk_analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+def merge_analysis_results(chunk_analyses: List[Any], format_name: str = DEFAULT_FORMAT) -> Dict[str, Any]:
     """
     Merge analysis results from multiple chunks.
     
+    Chunk statistics are mergeable, so the merged result carries the same
+    statistics analyze_log_statistics reports for the whole file.
+    
     Args:
-        chunk_analyses: List of chunk analysis results
+        chunk_analyses: LogStatistics of each chunk, in file order
+        format_name: Registered log format of the file
         
     Returns:
         Merged analysis results
     """
     try:
-        total_lines = 0
-        total_valid = 0
-        total_invalid = 0
-        merged_level_counts = {}
-        all_timestamps = []
-        
         for analysis in chunk_analyses:
-            if "error" in analysis:
-                continue
-                
-            total_lines += analysis.get("total_lines", 0)
-            total_valid += analysis.get("valid_entries", 0)
-            total_invalid += analysis.get("invalid_entries", 0)
-            
-            # Merge level counts
-            for level, count in analysis.get("level_counts", {}).items():
-                merged_level_counts[level] = merged_level_counts.get(level, 0) + count
-            
-            # Collect timestamps
-            time_stats = analysis.get("time_stats", {})
-            if "earliest" in time_stats and "latest" in time_stats:
-                all_timestamps.extend([time_stats["earliest"], time_stats["latest"]])
-        
-        # Generate merged statistics
-        merged_stats = {
-            "basic_statistics": {
-                "total_lines": total_lines,
-                "valid_entries": total_valid,
-                "invalid_entries": total_invalid,
-                "success_rate": round((total_valid / total_lines * 100), 2) if total_lines > 0 else 0
-            },
-            "log_level_analysis": {
-                "level_distribution": {
-                    level: {
-                        "count": count,
-                        "percentage": round((count / total_valid * 100), 2) if total_valid > 0 else 0
-                    }
-                    for level, count in merged_level_counts.items()
+            if isinstance(analysis, dict) and "error" in analysis:
+                return {
+                    "error": analysis["error"],
+                    "statistics": {}
                 }
-            }
-        }
-        
-        if all_timestamps:
-            all_timestamps.sort()
-            merged_stats["temporal_analysis"] = {
-                "earliest_entry": all_timestamps[0].isoformat(),
-                "latest_entry": all_timestamps[-1].isoformat(),
-                "duration_seconds": (all_timestamps[-1] - all_timestamps[0]).total_seconds(),
-                "total_events": total_valid
-            }
         
-        return {
-            "total_lines": total_lines,
-            "valid_entries": total_valid,
-            "invalid_entries": total_invalid,
-            "statistics": merged_stats,
-            "message": f"Successfully analyzed {total_lines} lines from {len(chunk_analyses)} chunks"
-        }
+        merged = reduce(LogStatistics.merge, chunk_analyses, LogStatistics())
+        result = statistics_result(merged, format_name)
+        result["message"] = f"Successfully analyzed {merged.total_lines} lines from {len(chunk_analyses)} chunks"
+        return result
         
     except Exception as e:
         return {
             "error": f"Analysis merging failed: {str(e)}",
             "statistics": {}
-        }
\ No newline at end of file
+        }
@@ -4,19 +4,75 @@ Detects anomalies, repeated patterns, error clusters, and trending issues.
 """
 import re
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter, deque
+from collections import Counter, deque
 from typing import Dict, Any, List, Tuple, Pattern
-import statistics
+import numpy as np
+from .log_parser import ns_to_datetime, datetime_to_ns, normalize_message
+from .log_formats import NS_PER_SECOND, LogFormat, get_format
+from .log_index import LogIndex, get_log_index
+from .record_batch import RecordBatch
+from .template_miner import TEMPLATE_CACHE_SIZE, TemplateMiner, count_templates, mask_message
+from .follow_session import get_follow_session
+
+
+# Index rows summarized per batch
+PATTERN_BATCH_ROWS = 65536
+
+# Preceding hours an hour's volume is compared against
+ANOMALY_BASELINE_HOURS = 24
+
+# Fewest preceding hours for a rolling baseline; earlier hours use the whole log
+ANOMALY_MIN_BASELINE = 3
+
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+
+NS_PER_DAY = 24 * NS_PER_HOUR
+
+# Monday first, as datetime.weekday() numbers days
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+ERROR_LEVELS = ("ERROR", "FATAL", "CRITICAL")
+
+# Common log patterns, matched against lowercased masked messages
+# (case-sensitive matching is several times faster than (?i))
+MESSAGE_CATEGORIES = {
+    name: re.compile(pattern)
+    for name, pattern in {
+        "connection_issues": r'(connection|connect|disconnect|timeout|refused)',
+        "authentication": r'(auth|login|logout|credential|password|token)',
+        "performance": r'(slow|timeout|latency|response.*time|performance)',
+        "database": r'(database|db|sql|query|transaction)',
+        "memory_issues": r'(memory|heap|oom|out.*of.*memory)',
+        "file_operations": r'(file|read|write|open|close|permission)',
+        "network": r'(network|http|tcp|udp|socket|port)',
+        "security": r'(security|attack|breach|unauthorized|forbidden)'
+    }.items()
+}
+
+# Sample messages kept per message category
+CATEGORY_SAMPLES = 3
+
+# Sections of the detect_patterns response, selectable with the pattern_types setting
+PATTERN_TYPES = ("error_clusters", "anomalies", "repeated_patterns", "trending_issues",
+                 "temporal_patterns", "message_patterns")
+
+# Anomaly threshold, in standard deviations, of each sensitivity setting
+SENSITIVITY_THRESHOLDS = {"low": 4.0, "medium": 3.0, "high": 2.0}
 
 
 async def detect_patterns(file_path: str, 
-                         detection_config: Dict[str, Any] = None) -> Dict[str, Any]:
+                         detection_config: Dict[str, Any] = None,
+                         follow: bool = False) -> Dict[str, Any]:
     """
     Detect various patterns in log files including anomalies, trends, and clusters.
     
     Args:
         file_path: Path to the log file to analyze
-        detection_config: Configuration for pattern detection algorithms
+        detection_config: Configuration for pattern detection algorithms.
+            pattern_types limits the response to some of PATTERN_TYPES, and
+            sensitivity ("low", "medium", "high") sets anomaly_threshold
+        follow: Keep the pattern state between calls and only parse lines
+            appended since the previous call
         
     Returns:
         Dictionary containing detected patterns and analysis
@@ -28,55 +84,59 @@ async def detect_patterns(file_path: str,
             "anomaly_threshold": 3.0,     # Standard deviations
             "pattern_min_frequency": 3,   # Minimum occurrences to be considered a pattern
             "trending_window": 3600,      # 1 hour in seconds
+            "anomaly_baseline_hours": ANOMALY_BASELINE_HOURS,
             **(detection_config or {})
         }
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        if not lines:
+        unknown_types = [name for name in config.get("pattern_types") or () if name not in PATTERN_TYPES]
+        if unknown_types:
             return {
-                "message": "File is empty",
+                "error": f"Unknown pattern types: {unknown_types}. Use {', '.join(PATTERN_TYPES)}",
                 "patterns": {}
             }
+        sensitivity = config.get("sensitivity")
+        if sensitivity:
+            if sensitivity.lower() not in SENSITIVITY_THRESHOLDS:
+                return {
+                    "error": f"Unknown sensitivity: {sensitivity}. Use low, medium or high",
+                    "patterns": {}
+                }
+            config["anomaly_threshold"] = SENSITIVITY_THRESHOLDS[sensitivity.lower()]
         
-        # Parse log entries
-        parsed_entries = []
-        for i, line in enumerate(lines, 1):
-            try:
-                entry = parse_log_entry(line.strip())
-                entry["line_number"] = i
-                parsed_entries.append(entry)
-            except ValueError:
-                continue  # Skip invalid entries for pattern detection
+        if follow:
+            session = get_follow_session(file_path, "patterns", lambda: PatternState(config), config)
+            index, rows, rotated = session.poll()
+            if rows:
+                session.state.add_index(index, stop=rows)
+            state, log_format = session.state, session.log_format
+            details = {"follow": session.describe(rows, rotated)}
+            empty = session.lines == 0
+        else:
+            index = get_log_index(file_path)
+            # Only lines with a timestamp take part in pattern detection
+            state, log_format = PatternState(config), index.log_format
+            state.add_index(index)
+            details = {}
+            empty = index.rows == 0
         
-        if not parsed_entries:
+        if empty:
             return {
-                "message": "No valid log entries found for pattern detection",
-                "patterns": {}
+                "message": "File is empty",
+                "patterns": {},
+                **details
             }
         
-        # Run pattern detection algorithms
-        patterns = {
-            "error_clusters": detect_error_clusters(parsed_entries, config),
-            "anomalies": detect_anomalies(parsed_entries, config),
-            "repeated_patterns": detect_repeated_patterns(parsed_entries, config),
-            "trending_issues": detect_trending_issues(parsed_entries, config),
-            "temporal_patterns": detect_temporal_patterns(parsed_entries, config),
-            "message_patterns": detect_message_patterns(parsed_entries, config)
-        }
-        
-        # Generate summary
-        summary = generate_pattern_summary(patterns)
+        if not state.total_entries:
+            return {
+                "message": "No valid log entries found for pattern detection",
+                "patterns": {},
+                **details
+            }
         
-        return {
-            "total_entries_analyzed": len(parsed_entries),
-            "patterns": patterns,
-            "summary": summary,
-            "analyzed_at": datetime.now().isoformat(),
-            "detection_config": config,
-            "message": f"Successfully analyzed {len(parsed_entries)} entries for patterns"
-        }
+        result = pattern_result(state, log_format.name)
+        result.update(details)
+        result["analyzed_at"] = datetime.now().isoformat()
+        return result
         
     except FileNotFoundError:
         return {
@@ -90,296 +150,568 @@ async def detect_patterns(file_path: str,
         }
 
 
-def parse_log_entry(line: str) -> Dict[str, Any]:
-    """Parse a single log line into structured components."""
-    timestamp_pattern = r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})'
-    match = re.search(timestamp_pattern, line)
-    
-    if not match:
-        raise ValueError("No valid timestamp found")
+def pattern_result(state: "PatternState", format_name: str) -> Dict[str, Any]:
+    """
+    Build the detect_patterns response from accumulated pattern state.
     
-    timestamp_str = match.group(1)
-    timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
+    Args:
+        state: Pattern state of the analyzed entries
+        format_name: Registered log format of the file
+        
+    Returns:
+        Response dictionary without the analyzed_at timestamp
+    """
+    patterns = state.report()
     
-    remainder = line[match.end():].strip()
-    parts = remainder.split(' ', 1)
+    # Generate summary
+    summary = generate_pattern_summary(patterns)
     
-    level = parts[0] if parts else ""
-    message = parts[1] if len(parts) > 1 else ""
+    return {
+        "total_entries_analyzed": state.total_entries,
+        "log_format": format_name,
+        "patterns": patterns,
+        "summary": summary,
+        "detection_config": state.config,
+        "message": f"Successfully analyzed {state.total_entries} entries for patterns"
+    }
+
+
+def parse_log_entry(line: str, log_format: LogFormat = None) -> Dict[str, Any]:
+    """Parse a single log line into structured components."""
+    parsed = (log_format or get_format()).parse_entry(line)
+    if parsed is None:
+        raise ValueError("No valid timestamp found")
     
     return {
-        "timestamp": timestamp,
-        "level": level.upper(),
-        "message": message,
+        "timestamp": ns_to_datetime(parsed.epoch_ns),
+        "level": parsed.level,
+        "message": parsed.message,
         "original_line": line
     }
 
 
-def detect_error_clusters(parsed_entries: List[Dict], config: Dict) -> Dict[str, Any]:
+class PatternState:
     """
-    Detect clusters of errors occurring within a time window.
+    Incremental pattern detection state.
+    
+    Entries are added in file order, in any number of batches, as arrays of
+    int64 timestamps and level ids. Messages are grouped into templates by a
+    TemplateMiner (the index miner when entries come from a mined index).
+    Each detector keeps only fixed-size histograms, per-window and
+    per-template counts and a few samples, so memory depends on the number of
+    hours and templates rather than on the number of lines, and a log can be
+    followed by adding the entries appended since the previous batch.
     """
-    error_entries = [entry for entry in parsed_entries 
-                    if entry["level"] in ["ERROR", "FATAL", "CRITICAL"]]
     
-    if len(error_entries) < 2:
-        return {"clusters": [], "total_clusters": 0}
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.total_entries = 0
+        self.cluster_window_ns = int(config["error_cluster_window"] * NS_PER_SECOND)
+        self.trending_window_ns = max(1, int(config["trending_window"] * NS_PER_SECOND))
+        
+        # Error clusters: closed clusters and the one still accepting errors
+        self.error_count = 0
+        self.clusters: List[Dict[str, Any]] = []
+        self.open_cluster: Dict[str, Any] = None
+        
+        # Histograms
+        self.hourly_counts: Counter = Counter()
+        self.hour_of_day_counts = np.zeros(24, dtype=np.int64)
+        self.weekday_counts = np.zeros(7, dtype=np.int64)
+        self.level_by_hour: Dict[str, np.ndarray] = {}
+        
+        # Message patterns are template ids of the miner; examples are the
+        # first entry of each template, in first-seen order
+        self.miner: TemplateMiner = None
+        self.pattern_counts = np.zeros(0, dtype=np.int64)
+        self.pattern_examples: Dict[int, Dict[str, Any]] = {}
+        self.window_counts: Counter = Counter()
+        
+        # Message categories: category bits of recently seen masked messages,
+        # and the entries, levels and first samples of each category
+        self.category_bits: Dict[str, int] = {}
+        self.category_counts = np.zeros(len(MESSAGE_CATEGORIES), dtype=np.int64)
+        self.category_levels: List[Counter] = [Counter() for _ in MESSAGE_CATEGORIES]
+        self.category_samples: List[List[Dict[str, Any]]] = [[] for _ in MESSAGE_CATEGORIES]
+    
+    def add_index(self, index: LogIndex, stop: int = None, batch_rows: int = PATTERN_BATCH_ROWS) -> None:
+        """
+        Add the valid rows of an index, in batches.
+        
+        Message patterns come from the index template column when the index
+        has a miner and this state has not mined messages of its own.
+        
+        Args:
+            index: Index of the lines to add, in file order
+            stop: Add rows before this one only, every row if omitted
+            batch_rows: Rows read back from the log per batch
+        """
+        stop = index.rows if stop is None else stop
+        for start in range(0, stop, batch_rows):
+            rows = start + np.flatnonzero(index.valid_mask[start:min(start + batch_rows, stop)])
+            if len(rows) == 0:
+                continue
+            
+            batch = RecordBatch.from_index(index, rows, index.read_lines(rows))
+            messages = batch.messages()
+            self.miner, pattern_ids = index.template_ids(rows, messages, self.miner)
+            self.add_batch(batch.timestamps, batch.level_codes, batch.levels, messages, pattern_ids)
+    
+    def add_entries(self, parsed_entries: List[Dict]) -> None:
+        """Add parsed entries that follow the entries already added."""
+        if not parsed_entries:
+            return
+        level_names = sorted({entry["level"] for entry in parsed_entries})
+        level_lookup = {name: level_id for level_id, name in enumerate(level_names)}
+        self.add_batch(
+            np.array([datetime_to_ns(entry["timestamp"]) for entry in parsed_entries], dtype=np.int64),
+            np.array([level_lookup[entry["level"]] for entry in parsed_entries], dtype=np.int64),
+            level_names,
+            [entry["message"] for entry in parsed_entries]
+        )
     
-    clusters = []
-    window_seconds = config["error_cluster_window"]
+    def add_batch(self, timestamps: np.ndarray, level_ids: np.ndarray, level_names: List[str],
+                  messages: List[str], pattern_ids: np.ndarray = None) -> None:
+        """
+        Add entries that follow the entries already added.
+        
+        Args:
+            timestamps: Nanoseconds since the epoch of each entry
+            level_ids: Level of each entry, as ids into level_names
+            level_names: Level vocabulary
+            messages: Message of each entry
+            pattern_ids: Template id of each message in this state's miner,
+                mined from messages if omitted
+        """
+        if len(timestamps) == 0:
+            return
+        masked = [mask_message(message) for message in messages]
+        if pattern_ids is None:
+            if self.miner is None:
+                self.miner = TemplateMiner()
+            pattern_ids = np.fromiter(map(self.miner.add_masked, masked), dtype=np.int64)
+        level_ids = np.asarray(level_ids, dtype=np.int64)
+        
+        self.total_entries += len(timestamps)
+        hours = timestamps // NS_PER_HOUR
+        
+        # Histograms
+        unique_hours, counts = np.unique(hours, return_counts=True)
+        self.hourly_counts.update(dict(zip(unique_hours.tolist(), counts.tolist())))
+        hour_of_day = hours % 24
+        self.hour_of_day_counts += np.bincount(hour_of_day, minlength=24)
+        self.weekday_counts += np.bincount((timestamps // NS_PER_DAY + 3) % 7, minlength=7)  # 1970-01-01 was a Thursday
+        by_level = np.bincount(level_ids * 24 + hour_of_day, minlength=24 * len(level_names)).reshape(-1, 24)
+        for level_id in np.flatnonzero(by_level.sum(axis=1)).tolist():
+            name = level_names[level_id]
+            if name not in self.level_by_hour:
+                self.level_by_hour[name] = np.zeros(24, dtype=np.int64)
+            self.level_by_hour[name] += by_level[level_id]
+        
+        # Pattern frequencies, first examples and per-window counts
+        self.pattern_counts = count_templates(self.pattern_counts, pattern_ids)
+        unique_ids, first_rows = np.unique(pattern_ids, return_index=True)
+        for row in np.sort(first_rows[~np.isin(unique_ids, list(self.pattern_examples))]).tolist():
+            self.pattern_examples[int(pattern_ids[row])] = {
+                "timestamp": ns_to_datetime(int(timestamps[row])).isoformat(),
+                "level": level_names[level_ids[row]],
+                "message": messages[row]
+            }
+        windows = timestamps // self.trending_window_ns
+        keys, counts = np.unique(np.stack([windows, pattern_ids]), axis=1, return_counts=True)
+        self.window_counts.update(dict(zip(zip(keys[0].tolist(), keys[1].tolist()), counts.tolist())))
+        
+        error_ids = [level_id for level_id, name in enumerate(level_names) if name in ERROR_LEVELS]
+        errors = np.flatnonzero(np.isin(level_ids, error_ids))
+        self.add_errors(timestamps[errors], level_ids[errors], level_names, [messages[row] for row in errors.tolist()])
+        self.add_categories(timestamps, level_ids, level_names, messages, masked)
+    
+    def add_categories(self, timestamps: np.ndarray, level_ids: np.ndarray, level_names: List[str],
+                       messages: List[str], masked: List[str]) -> None:
+        """
+        Count the message categories of entries.
+        
+        Categories are matched once per distinct masked message, so entries
+        that differ only in numbers, ids or addresses share one regex pass.
+        
+        Args:
+            timestamps: Nanoseconds since the epoch of each entry
+            level_ids: Level of each entry, as ids into level_names
+            level_names: Level vocabulary
+            messages: Message of each entry
+            masked: Each message passed through mask_message
+        """
+        cache = self.category_bits
+        bits = np.empty(len(messages), dtype=np.int64)
+        for row, key in enumerate(masked):
+            found = cache.get(key)
+            if found is None:
+                if len(cache) >= TEMPLATE_CACHE_SIZE:
+                    cache.clear()
+                lowered = key.lower()
+                found = cache[key] = sum(1 << bit for bit, regex in enumerate(MESSAGE_CATEGORIES.values())
+                                         if regex.search(lowered))
+            bits[row] = found
+        
+        for bit in range(len(MESSAGE_CATEGORIES)):
+            rows = np.flatnonzero(bits & (1 << bit))
+            if len(rows) == 0:
+                continue
+            self.category_counts[bit] += len(rows)
+            by_level = np.bincount(level_ids[rows], minlength=len(level_names))
+            self.category_levels[bit].update({level_names[level_id]: int(by_level[level_id])
+                                              for level_id in np.flatnonzero(by_level).tolist()})
+            samples = self.category_samples[bit]
+            for row in rows[:CATEGORY_SAMPLES - len(samples)].tolist():
+                samples.append({
+                    "timestamp": ns_to_datetime(int(timestamps[row])).isoformat(),
+                    "level": level_names[level_ids[row]],
+                    "message": messages[row][:100]  # Truncate for brevity
+                })
     
-    i = 0
-    while i < len(error_entries):
-        cluster_start = error_entries[i]["timestamp"]
-        cluster_entries = [error_entries[i]]
-        
-        # Find all errors within the time window
-        j = i + 1
-        while j < len(error_entries):
-            time_diff = (error_entries[j]["timestamp"] - cluster_start).total_seconds()
-            if time_diff <= window_seconds:
-                cluster_entries.append(error_entries[j])
-                j += 1
-            else:
-                break
+    def add_errors(self, timestamps: np.ndarray, level_ids: np.ndarray, level_names: List[str],
+                   messages: List[str]) -> None:
+        """
+        Cluster error entries with a two-pointer scan.
         
+        A cluster opens at an error and takes every following error up to the
+        first one more than error_cluster_window after the opening error.
+        """
+        self.error_count += len(timestamps)
+        position = 0
+        while position < len(timestamps):
+            cluster = self.open_cluster
+            if cluster is None:
+                cluster = self.open_cluster = {
+                    "start": int(timestamps[position]),
+                    "end": int(timestamps[position]),
+                    "count": 0,
+                    "levels": set(),
+                    "samples": []
+                }
+            
+            stop = first_beyond(timestamps, position, cluster["start"] + self.cluster_window_ns)
+            if stop > position:
+                cluster["end"] = int(timestamps[stop - 1])
+                cluster["count"] += stop - position
+                cluster["levels"].update(level_names[level_id] for level_id in np.unique(level_ids[position:stop]).tolist())
+                cluster["samples"].extend(message[:100] for message in messages[position:min(stop, position + 3 - len(cluster["samples"]))])
+            if stop < len(timestamps):
+                self._close_cluster()
+            position = stop
+    
+    def _close_cluster(self) -> None:
+        cluster = self.open_cluster
         # Only consider it a cluster if there are multiple errors
-        if len(cluster_entries) >= 2:
-            cluster_end = cluster_entries[-1]["timestamp"]
-            clusters.append({
-                "start_time": cluster_start.isoformat(),
-                "end_time": cluster_end.isoformat(),
-                "duration_seconds": (cluster_end - cluster_start).total_seconds(),
-                "error_count": len(cluster_entries),
-                "error_types": list(set(entry["level"] for entry in cluster_entries)),
-                "sample_messages": [entry["message"][:100] for entry in cluster_entries[:3]]
+        if cluster is not None and cluster["count"] >= 2:
+            self.clusters.append(cluster_summary(cluster))
+        self.open_cluster = None
+    
+    def report(self) -> Dict[str, Any]:
+        """Pattern sections of the detect_patterns response, those of the pattern_types setting if given."""
+        detectors = {
+            "error_clusters": self.error_clusters,
+            "anomalies": self.anomalies,
+            "repeated_patterns": self.repeated_patterns,
+            "trending_issues": self.trending_issues,
+            "temporal_patterns": self.temporal_patterns,
+            "message_patterns": self.message_patterns
+        }
+        pattern_types = self.config.get("pattern_types") or PATTERN_TYPES
+        return {name: detector() for name, detector in detectors.items() if name in pattern_types}
+    
+    def error_clusters(self) -> Dict[str, Any]:
+        """
+        Detect clusters of errors occurring within a time window.
+        """
+        if self.error_count < 2:
+            return {"clusters": [], "total_clusters": 0}
+        
+        clusters = list(self.clusters)
+        if self.open_cluster is not None and self.open_cluster["count"] >= 2:
+            clusters.append(cluster_summary(self.open_cluster))
+        
+        return {
+            "clusters": clusters,
+            "total_clusters": len(clusters),
+            "total_errors_in_clusters": sum(cluster["error_count"] for cluster in clusters)
+        }
+    
+    def anomalies(self) -> Dict[str, Any]:
+        """
+        Detect temporal anomalies in log entry frequency.
+        
+        Each hour's volume is scored against a rolling baseline of the
+        preceding anomaly_baseline_hours hours with entries (the whole log for
+        the first few hours). The deviation floor is the Poisson noise of the
+        baseline mean, so a spike after perfectly steady hours still stands out.
+        """
+        if self.total_entries < 10 or len(self.hourly_counts) < 3:
+            return {"anomalies": [], "total_anomalies": 0}
+        
+        hours = np.array(sorted(self.hourly_counts), dtype=np.int64)
+        counts = np.array([self.hourly_counts[hour] for hour in hours.tolist()], dtype=np.float64)
+        mean_count = float(counts.mean())
+        stdev_count = float(counts.std(ddof=1))
+        threshold = self.config["anomaly_threshold"]
+        window = int(self.config.get("anomaly_baseline_hours", ANOMALY_BASELINE_HOURS))
+        
+        # Rolling mean and deviation of the preceding hours from prefix sums
+        sums = np.concatenate(([0.0], np.cumsum(counts)))
+        squares = np.concatenate(([0.0], np.cumsum(counts * counts)))
+        positions = np.arange(len(counts))
+        first = np.maximum(0, positions - window)
+        sizes = positions - first
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = (sums[positions] - sums[first]) / sizes
+            variances = ((squares[positions] - squares[first]) - sizes * means * means) / (sizes - 1)
+        stdevs = np.sqrt(np.maximum(variances, 0))
+        
+        global_baseline = sizes < ANOMALY_MIN_BASELINE
+        means[global_baseline] = mean_count
+        stdevs[global_baseline] = stdev_count
+        stdevs = np.maximum(stdevs, np.sqrt(means))
+        
+        upper_bounds = means + threshold * stdevs
+        lower_bounds = np.maximum(0, means - threshold * stdevs)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deviations = np.where(stdevs > 0, (counts - means) / stdevs, 0.0)
+        high = counts > upper_bounds
+        low = (counts < lower_bounds) & (lower_bounds > 0)
+        
+        # Find anomalous hours
+        anomalies = []
+        for position in np.flatnonzero(high | low).tolist():
+            anomalies.append({
+                "hour": ns_to_datetime(int(hours[position]) * NS_PER_HOUR).strftime('%Y-%m-%d %H'),
+                "count": int(counts[position]),
+                "type": "high_volume" if high[position] else "low_volume",
+                "deviation": round(float(deviations[position]), 2),
+                "expected_range": f"{round(float(lower_bounds[position]))}-{round(float(upper_bounds[position]))}"
             })
         
-        i = max(i + 1, j)
+        return {
+            "anomalies": sorted(anomalies, key=lambda x: abs(x["deviation"]), reverse=True),
+            "total_anomalies": len(anomalies),
+            "baseline_stats": {
+                "mean_hourly_count": round(mean_count, 2),
+                "std_deviation": round(stdev_count, 2),
+                "detection_threshold": threshold,
+                "baseline_window_hours": window
+            }
+        }
     
+    def repeated_patterns(self) -> Dict[str, Any]:
+        """
+        Detect frequently repeated message patterns.
+        """
+        min_frequency = self.config["pattern_min_frequency"]
+        
+        # Most frequent first, first-seen first among equals
+        frequent = np.flatnonzero(self.pattern_counts >= min_frequency)
+        frequent = frequent[np.argsort(-self.pattern_counts[frequent], kind='stable')]
+        
+        patterns = []
+        for pattern_id in frequent[:20].tolist():  # Top 20 patterns
+            count = int(self.pattern_counts[pattern_id])
+            patterns.append({
+                "pattern": self.miner.template(pattern_id),
+                "original_example": self.pattern_examples[pattern_id]["message"],
+                "frequency": count,
+                "percentage": round((count / self.total_entries * 100), 2)
+            })
+        
+        return {
+            "patterns": patterns,
+            "total_patterns": len(frequent),
+            "total_unique_messages": len(self.pattern_examples)
+        }
+    
+    def trending_issues(self) -> Dict[str, Any]:
+        """
+        Detect issues that are trending upward over time.
+        
+        The windows with entries are split into an early and a recent half;
+        a pattern trends when its recent average per window is over 1.5 times
+        its early average.
+        """
+        if not self.window_counts:
+            return {"trending_issues": [], "total_trending": 0}
+        
+        keys = np.array(list(self.window_counts), dtype=np.int64).reshape(-1, 2)
+        counts = np.array(list(self.window_counts.values()), dtype=np.float64)
+        windows = np.unique(keys[:, 0])
+        if len(windows) < 3:  # Need at least 3 data points
+            return {"trending_issues": [], "total_trending": 0}
+        
+        # Compare first half with second half
+        mid_point = len(windows) // 2
+        recent = np.searchsorted(windows, keys[:, 0]) >= mid_point
+        first_half_avg = np.bincount(keys[:, 1], weights=counts * ~recent, minlength=len(self.pattern_counts)) / mid_point
+        second_half_avg = np.bincount(keys[:, 1], weights=counts * recent, minlength=len(self.pattern_counts)) / (len(windows) - mid_point)
+        
+        trending = np.flatnonzero(second_half_avg > first_half_avg * 1.5)  # 50% increase
+        trend_factors = second_half_avg[trending] / np.maximum(first_half_avg[trending], 1)
+        order = np.argsort(-np.round(trend_factors, 2), kind='stable')
+        
+        trending_issues = []
+        for pattern_id in trending[order][:10].tolist():  # Top 10 trending issues
+            series = {window: 0 for window in windows.tolist()}
+            for window, count in zip(keys[keys[:, 1] == pattern_id, 0].tolist(), counts[keys[:, 1] == pattern_id].tolist()):
+                series[window] = int(count)
+            trending_issues.append({
+                "pattern": self.miner.template(pattern_id),
+                "trend_factor": round(float(second_half_avg[pattern_id] / max(first_half_avg[pattern_id], 1)), 2),
+                "early_average": round(float(first_half_avg[pattern_id]), 2),
+                "recent_average": round(float(second_half_avg[pattern_id]), 2),
+                "time_series": [(ns_to_datetime(window * self.trending_window_ns).isoformat(), count)
+                                for window, count in series.items()]
+            })
+        
+        return {
+            "trending_issues": trending_issues,
+            "total_trending": len(trending)
+        }
+    
+    def temporal_patterns(self) -> Dict[str, Any]:
+        """
+        Detect patterns based on time of day, day of week, etc.
+        """
+        hour_counts = {hour: int(count) for hour, count in enumerate(self.hour_of_day_counts.tolist()) if count}
+        day_counts = {WEEKDAY_NAMES[day]: int(count) for day, count in enumerate(self.weekday_counts.tolist()) if count}
+        
+        # Find peak hours and days
+        peak_hour = max(hour_counts.items(), key=lambda x: x[1]) if hour_counts else (0, 0)
+        peak_day = max(day_counts.items(), key=lambda x: x[1]) if day_counts else ("", 0)
+        
+        # Find error-prone hours
+        no_entries = np.zeros(24, dtype=np.int64)
+        errors_by_hour = self.level_by_hour.get("ERROR", no_entries) + self.level_by_hour.get("FATAL", no_entries)
+        error_hours = []
+        for hour, total_hour in hour_counts.items():
+            errors_hour = int(errors_by_hour[hour])
+            error_rate = errors_hour / total_hour
+            if error_rate > 0.1:  # More than 10% errors
+                error_hours.append({
+                    "hour": hour,
+                    "error_rate": round(error_rate * 100, 2),
+                    "total_entries": total_hour,
+                    "error_count": errors_hour
+                })
+        
+        return {
+            "hourly_distribution": hour_counts,
+            "daily_distribution": day_counts,
+            "peak_hour": {"hour": peak_hour[0], "count": peak_hour[1]},
+            "peak_day": {"day": peak_day[0], "count": peak_day[1]},
+            "error_prone_hours": sorted(error_hours, key=lambda x: x["error_rate"], reverse=True),
+            "business_hours_vs_off_hours": analyze_business_hours(hour_counts)
+        }
+    
+    def message_patterns(self) -> Dict[str, Any]:
+        """
+        Detect patterns in message content using regex patterns.
+        
+        Messages are matched with their variable tokens (tokens containing a
+        digit) masked, once per distinct masked message.
+        """
+        pattern_stats = {}
+        for bit, pattern_name in enumerate(MESSAGE_CATEGORIES):
+            total_matches = int(self.category_counts[bit])
+            if not total_matches:
+                continue
+            pattern_stats[pattern_name] = {
+                "total_matches": total_matches,
+                "percentage": round((total_matches / self.total_entries * 100), 2),
+                "level_distribution": dict(self.category_levels[bit]),
+                "sample_messages": list(self.category_samples[bit])
+            }
+        
+        return {
+            "detected_patterns": pattern_stats,
+            "total_pattern_types": len(pattern_stats)
+        }
+
+
+def first_beyond(values: np.ndarray, start: int, limit: int) -> int:
+    """
+    Index of the first value after limit at or after start, or len(values).
+    
+    Gallops over doubling windows, so finding a position k places past start
+    costs O(k) rather than a scan of the rest of the array.
+    """
+    span = 16
+    while start < len(values):
+        window = values[start:start + span]
+        beyond = np.flatnonzero(window > limit)
+        if len(beyond):
+            return start + int(beyond[0])
+        start += len(window)
+        span *= 2
+    return len(values)
+
+
+def cluster_summary(cluster: Dict[str, Any]) -> Dict[str, Any]:
+    """Report form of an error cluster."""
+    start = ns_to_datetime(cluster["start"])
+    end = ns_to_datetime(cluster["end"])
     return {
-        "clusters": clusters,
-        "total_clusters": len(clusters),
-        "total_errors_in_clusters": sum(cluster["error_count"] for cluster in clusters)
+        "start_time": start.isoformat(),
+        "end_time": end.isoformat(),
+        "duration_seconds": (end - start).total_seconds(),
+        "error_count": cluster["count"],
+        "error_types": sorted(cluster["levels"]),
+        "sample_messages": list(cluster["samples"])
     }
 
 
+def entry_state(parsed_entries: List[Dict], config: Dict) -> PatternState:
+    """Pattern state of a list of parsed entries."""
+    state = PatternState(config)
+    state.add_entries(parsed_entries)
+    return state
+
+
+def detect_error_clusters(parsed_entries: List[Dict], config: Dict) -> Dict[str, Any]:
+    """
+    Detect clusters of errors occurring within a time window.
+    """
+    return entry_state(parsed_entries, config).error_clusters()
+
+
 def detect_anomalies(parsed_entries: List[Dict], config: Dict) -> Dict[str, Any]:
     """
     Detect temporal anomalies in log entry frequency.
     """
-    if len(parsed_entries) < 10:
-        return {"anomalies": [], "total_anomalies": 0}
-    
-    # Group entries by hour
-    hourly_counts = defaultdict(int)
-    for entry in parsed_entries:
-        hour_key = entry["timestamp"].strftime('%Y-%m-%d %H')
-        hourly_counts[hour_key] += 1
-    
-    counts = list(hourly_counts.values())
-    if len(counts) < 3:
-        return {"anomalies": [], "total_anomalies": 0}
-    
-    # Calculate statistical thresholds
-    mean_count = statistics.mean(counts)
-    stdev_count = statistics.stdev(counts) if len(counts) > 1 else 0
-    threshold = config["anomaly_threshold"]
-    
-    upper_bound = mean_count + (threshold * stdev_count)
-    lower_bound = max(0, mean_count - (threshold * stdev_count))
-    
-    # Find anomalous hours
-    anomalies = []
-    for hour, count in hourly_counts.items():
-        if count > upper_bound:
-            anomalies.append({
-                "hour": hour,
-                "count": count,
-                "type": "high_volume",
-                "deviation": round((count - mean_count) / stdev_count, 2) if stdev_count > 0 else 0,
-                "expected_range": f"{round(lower_bound)}-{round(upper_bound)}"
-            })
-        elif count < lower_bound and lower_bound > 0:
-            anomalies.append({
-                "hour": hour,
-                "count": count,
-                "type": "low_volume",
-                "deviation": round((count - mean_count) / stdev_count, 2) if stdev_count > 0 else 0,
-                "expected_range": f"{round(lower_bound)}-{round(upper_bound)}"
-            })
-    
-    return {
-        "anomalies": sorted(anomalies, key=lambda x: abs(x["deviation"]), reverse=True),
-        "total_anomalies": len(anomalies),
-        "baseline_stats": {
-            "mean_hourly_count": round(mean_count, 2),
-            "std_deviation": round(stdev_count, 2),
-            "detection_threshold": threshold
-        }
-    }
+    return entry_state(parsed_entries, config).anomalies()
 
 
 def detect_repeated_patterns(parsed_entries: List[Dict], config: Dict) -> Dict[str, Any]:
     """
     Detect frequently repeated message patterns.
     """
-    min_frequency = config["pattern_min_frequency"]
-    
-    # Extract message patterns (simplified)
-    message_counts = Counter()
-    normalized_messages = {}
-    
-    for entry in parsed_entries:
-        message = entry["message"]
-        # Normalize message (remove numbers, IPs, timestamps for pattern matching)
-        normalized = normalize_message_for_pattern(message)
-        message_counts[normalized] += 1
-        if normalized not in normalized_messages:
-            normalized_messages[normalized] = message
-    
-    # Find patterns that occur frequently
-    patterns = []
-    for normalized_msg, count in message_counts.items():
-        if count >= min_frequency:
-            patterns.append({
-                "pattern": normalized_msg,
-                "original_example": normalized_messages[normalized_msg],
-                "frequency": count,
-                "percentage": round((count / len(parsed_entries) * 100), 2)
-            })
-    
-    # Sort by frequency
-    patterns.sort(key=lambda x: x["frequency"], reverse=True)
-    
-    return {
-        "patterns": patterns[:20],  # Top 20 patterns
-        "total_patterns": len(patterns),
-        "total_unique_messages": len(message_counts)
-    }
+    return entry_state(parsed_entries, config).repeated_patterns()
 
 
 def normalize_message_for_pattern(message: str) -> str:
     """
     Normalize a message for pattern detection by removing variable parts.
     """
-    # Remove common variable patterns
-    normalized = message
-    
-    # Remove IP addresses (must come before general number replacement)
-    normalized = re.sub(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', 'IP_ADDRESS', normalized)
-    
-    # Remove numbers
-    normalized = re.sub(r'\b\d+\b', 'NUMBER', normalized)
-    
-    # Remove UUIDs
-    normalized = re.sub(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', 'UUID', normalized)
-    
-    # Remove URLs (must come before file paths since URLs contain /)
-    normalized = re.sub(r'https?://[^\s]+', 'URL', normalized)
-    
-    # Remove file paths
-    normalized = re.sub(r'/[^\s]*', 'FILE_PATH', normalized)
-    
-    # Normalize whitespace
-    normalized = ' '.join(normalized.split())
-    
-    return normalized
+    return normalize_message(message)
 
 
 def detect_trending_issues(parsed_entries: List[Dict], config: Dict) -> Dict[str, Any]:
     """
     Detect issues that are trending upward over time.
     """
-    window_seconds = config["trending_window"]
-    
-    # Group entries by time windows
-    time_windows = defaultdict(lambda: defaultdict(int))
-    
-    for entry in parsed_entries:
-        # Create time window key (rounded to hour)
-        window_start = entry["timestamp"].replace(minute=0, second=0, microsecond=0)
-        normalized_msg = normalize_message_for_pattern(entry["message"])
-        time_windows[window_start][normalized_msg] += 1
-    
-    # Find trending patterns
-    trending_issues = []
-    
-    for pattern in set().union(*[window.keys() for window in time_windows.values()]):
-        # Get counts over time for this pattern
-        time_series = []
-        for window_time in sorted(time_windows.keys()):
-            count = time_windows[window_time].get(pattern, 0)
-            time_series.append((window_time, count))
-        
-        if len(time_series) >= 3:  # Need at least 3 data points
-            # Simple trend detection: compare first half with second half
-            mid_point = len(time_series) // 2
-            first_half_avg = sum(count for _, count in time_series[:mid_point]) / mid_point
-            second_half_avg = sum(count for _, count in time_series[mid_point:]) / (len(time_series) - mid_point)
-            
-            if second_half_avg > first_half_avg * 1.5:  # 50% increase
-                trending_issues.append({
-                    "pattern": pattern,
-                    "trend_factor": round(second_half_avg / max(first_half_avg, 1), 2),
-                    "early_average": round(first_half_avg, 2),
-                    "recent_average": round(second_half_avg, 2),
-                    "time_series": [(ts.isoformat(), count) for ts, count in time_series]
-                })
-    
-    # Sort by trend factor
-    trending_issues.sort(key=lambda x: x["trend_factor"], reverse=True)
-    
-    return {
-        "trending_issues": trending_issues[:10],  # Top 10 trending issues
-        "total_trending": len(trending_issues)
-    }
+    return entry_state(parsed_entries, config).trending_issues()
 
 
 def detect_temporal_patterns(parsed_entries: List[Dict], config: Dict) -> Dict[str, Any]:
     """
     Detect patterns based on time of day, day of week, etc.
     """
-    hour_counts = defaultdict(int)
-    day_counts = defaultdict(int)
-    level_by_hour = defaultdict(lambda: defaultdict(int))
-    
-    for entry in parsed_entries:
-        hour = entry["timestamp"].hour
-        day = entry["timestamp"].strftime('%A')
-        level = entry["level"]
-        
-        hour_counts[hour] += 1
-        day_counts[day] += 1
-        level_by_hour[hour][level] += 1
-    
-    # Find peak hours and days
-    peak_hour = max(hour_counts.items(), key=lambda x: x[1]) if hour_counts else (0, 0)
-    peak_day = max(day_counts.items(), key=lambda x: x[1]) if day_counts else ("", 0)
-    
-    # Find error-prone hours
-    error_hours = []
-    for hour in range(24):
-        total_hour = hour_counts.get(hour, 0)
-        errors_hour = level_by_hour[hour].get("ERROR", 0) + level_by_hour[hour].get("FATAL", 0)
-        if total_hour > 0:
-            error_rate = errors_hour / total_hour
-            if error_rate > 0.1:  # More than 10% errors
-                error_hours.append({
-                    "hour": hour,
-                    "error_rate": round(error_rate * 100, 2),
-                    "total_entries": total_hour,
-                    "error_count": errors_hour
-                })
-    
-    return {
-        "hourly_distribution": dict(hour_counts),
-        "daily_distribution": dict(day_counts),
-        "peak_hour": {"hour": peak_hour[0], "count": peak_hour[1]},
-        "peak_day": {"day": peak_day[0], "count": peak_day[1]},
-        "error_prone_hours": sorted(error_hours, key=lambda x: x["error_rate"], reverse=True),
-        "business_hours_vs_off_hours": analyze_business_hours(hour_counts)
-    }
+    return entry_state(parsed_entries, config).temporal_patterns()
 
 
 def analyze_business_hours(hour_counts: Dict[int, int]) -> Dict[str, Any]:
@@ -403,48 +735,7 @@ def detect_message_patterns(parsed_entries: List[Dict], config: Dict) -> Dict[st
     """
     Detect patterns in message content using regex patterns.
     """
-    # Common log patterns
-    patterns = {
-        "connection_issues": r'(?i)(connection|connect|disconnect|timeout|refused)',
-        "authentication": r'(?i)(auth|login|logout|credential|password|token)',
-        "performance": r'(?i)(slow|timeout|latency|response.*time|performance)',
-        "database": r'(?i)(database|db|sql|query|transaction)',
-        "memory_issues": r'(?i)(memory|heap|oom|out.*of.*memory)',
-        "file_operations": r'(?i)(file|read|write|open|close|permission)',
-        "network": r'(?i)(network|http|tcp|udp|socket|port)',
-        "security": r'(?i)(security|attack|breach|unauthorized|forbidden)'
-    }
-    
-    pattern_matches = defaultdict(list)
-    
-    for entry in parsed_entries:
-        message = entry["message"]
-        for pattern_name, regex in patterns.items():
-            if re.search(regex, message):
-                pattern_matches[pattern_name].append({
-                    "timestamp": entry["timestamp"].isoformat(),
-                    "level": entry["level"],
-                    "message": message[:100]  # Truncate for brevity
-                })
-    
-    # Calculate statistics for each pattern
-    pattern_stats = {}
-    for pattern_name, matches in pattern_matches.items():
-        if matches:
-            levels = [match["level"] for match in matches]
-            level_counts = Counter(levels)
-            
-            pattern_stats[pattern_name] = {
-                "total_matches": len(matches),
-                "percentage": round((len(matches) / len(parsed_entries) * 100), 2),
-                "level_distribution": dict(level_counts),
-                "sample_messages": matches[:3]  # First 3 examples
-            }
-    
-    return {
-        "detected_patterns": pattern_stats,
-        "total_pattern_types": len(pattern_stats)
-    }
+    return entry_state(parsed_entries, config).message_patterns()
 
 
 def generate_pattern_summary(patterns: Dict[str, Any]) -> Dict[str, Any]:
@@ -457,26 +748,26 @@ def generate_pattern_summary(patterns: Dict[str, Any]) -> Dict[str, Any]:
     }
     
     # Analyze error clusters
-    if patterns["error_clusters"]["total_clusters"] > 0:
+    if patterns.get("error_clusters", {}).get("total_clusters", 0) > 0:
         summary["high_priority_findings"].append(
             f"{patterns['error_clusters']['total_clusters']} error clusters detected"
         )
         summary["overall_assessment"] = "concerning"
     
     # Analyze anomalies
-    if patterns["anomalies"]["total_anomalies"] > 0:
+    if patterns.get("anomalies", {}).get("total_anomalies", 0) > 0:
         summary["medium_priority_findings"].append(
             f"{patterns['anomalies']['total_anomalies']} temporal anomalies detected"
         )
     
     # Analyze trending issues
-    if patterns["trending_issues"]["total_trending"] > 0:
+    if patterns.get("trending_issues", {}).get("total_trending", 0) > 0:
         summary["medium_priority_findings"].append(
             f"{patterns['trending_issues']['total_trending']} trending issues detected"
         )
     
     # Analyze repeated patterns
-    if patterns["repeated_patterns"]["total_patterns"] > 10:
+    if patterns.get("repeated_patterns", {}).get("total_patterns", 0) > 10:
         summary["low_priority_findings"].append(
             f"{patterns['repeated_patterns']['total_patterns']} repeated message patterns found"
         )
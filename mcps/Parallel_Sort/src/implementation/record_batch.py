@@ -0,0 +1,288 @@
+"""
+Compact columnar representation of parsed log lines.
+A RecordBatch holds a run of lines as an int64 epoch column, a small level
+code column and byte offsets into one UTF-8 buffer holding the lines and
+their messages, instead of one dictionary per line. Filters evaluate level,
+timestamp and substring conditions over the columns at once.
+"""
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .log_parser import INVALID_KEY, ns_to_datetime
+from .log_formats import LEVEL_NAMES, LogFormat
+
+
+# Substring tests text_mask evaluates on the buffer
+TEXT_MATCHES = ("equals", "contains", "starts_with", "ends_with")
+
+
+class RecordBatch:
+    """
+    Parsed log lines stored column-wise.
+    
+    Row i's stripped line is ``buffer[line_offsets[i]:line_offsets[i + 1]]``
+    and its message ``buffer[message_starts[i]:message_ends[i]]``. Messages
+    that are a suffix of their line share the line's bytes; others (e.g. JSON
+    logs) are stored after the last line. Lines without a timestamp have the
+    timestamp INVALID_KEY, level code 0 (no level) and the whole line as
+    their message, as the entries built by the filter handlers.
+    """
+    
+    def __init__(self, timestamps: np.ndarray, level_codes: np.ndarray, levels: List[str],
+                 buffer: bytes, line_offsets: np.ndarray, message_starts: np.ndarray,
+                 message_ends: np.ndarray, line_numbers: np.ndarray):
+        self.timestamps = timestamps
+        self.level_codes = level_codes
+        self.levels = levels
+        self.buffer = buffer
+        self.line_offsets = line_offsets
+        self.message_starts = message_starts
+        self.message_ends = message_ends
+        self.line_numbers = line_numbers
+        self.ascii = buffer.isascii()
+        self._folded: Optional[bytes] = None
+    
+    @classmethod
+    def from_lines(cls, lines: Sequence[str], log_format: LogFormat, first_line_number: int = 1) -> "RecordBatch":
+        """
+        Parse lines into a batch.
+        
+        Args:
+            lines: Lines of the log; surrounding whitespace is stripped
+            log_format: Format the lines are parsed with
+            first_line_number: Line number of the first line
+        
+        Returns:
+            RecordBatch of the lines, in order
+        """
+        levels = list(LEVEL_NAMES)
+        level_lookup = {name: code for code, name in enumerate(levels)}
+        stripped = []
+        timestamps = []
+        level_codes = []
+        message_offsets = []
+        detached = {}
+        
+        for row, line in enumerate(lines):
+            line = line.strip()
+            stripped.append(line)
+            parsed = log_format.parse_entry(line) if line else None
+            if parsed is None:
+                timestamps.append(INVALID_KEY)
+                level_codes.append(0)
+                message_offsets.append(0)
+                continue
+            
+            code = level_lookup.get(parsed.level)
+            if code is None:
+                code = level_lookup[parsed.level] = len(levels)
+                levels.append(parsed.level)
+            timestamps.append(parsed.epoch_ns)
+            level_codes.append(code)
+            if line.endswith(parsed.message):
+                message_offsets.append(len(line) - len(parsed.message))
+            else:
+                message_offsets.append(-1)
+                detached[row] = parsed.message
+        
+        line_numbers = np.arange(first_line_number, first_line_number + len(stripped), dtype=np.int64)
+        return cls.assemble(stripped, np.asarray(timestamps, dtype=np.int64), level_codes, levels,
+                            message_offsets, detached, line_numbers)
+    
+    @classmethod
+    def from_index(cls, index, rows: np.ndarray, lines: List[str]) -> "RecordBatch":
+        """
+        Build a batch from log index columns without re-parsing the lines.
+        
+        Args:
+            index: LogIndex of the file
+            rows: Ascending index rows
+            lines: Stripped lines of the rows, as returned by index.read_lines
+        
+        Returns:
+            RecordBatch of the rows
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        timestamps = index.columns["timestamp"][rows]
+        message_offsets = index.columns["message_offset"][rows].astype(np.int64)
+        message_offsets[timestamps == INVALID_KEY] = 0
+        
+        detached = {}
+        for position in np.flatnonzero(message_offsets < 0).tolist():
+            # Message is not a suffix of the line (e.g. JSON); parse this line only
+            parsed = index.log_format.parse_entry(lines[position])
+            detached[position] = parsed.message if parsed is not None else ""
+        
+        return cls.assemble(lines, np.asarray(timestamps, dtype=np.int64), index.columns["level"][rows],
+                            list(index.levels), message_offsets.tolist(), detached, rows + 1)
+    
+    @classmethod
+    def assemble(cls, lines: List[str], timestamps: np.ndarray, level_codes: Sequence[int], levels: List[str],
+                 message_offsets: Sequence[int], detached: Dict[int, str],
+                 line_numbers: np.ndarray) -> "RecordBatch":
+        """
+        Pack stripped lines and message positions into one buffer.
+        
+        Args:
+            lines: Stripped lines
+            timestamps: Epoch ns of each line, INVALID_KEY where none was parsed
+            level_codes: Index into levels of each line's level
+            levels: Level vocabulary
+            message_offsets: Character offset of each message in its line, -1 for detached messages
+            detached: Row -> message for messages that are not a suffix of their line
+            line_numbers: Line number of each row
+        """
+        text = "".join(lines)
+        buffer = text.encode('utf-8')
+        if len(buffer) == len(text):
+            lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+            offsets = np.asarray(message_offsets, dtype=np.int64)
+        else:
+            lengths = np.fromiter((len(line.encode('utf-8')) for line in lines), dtype=np.int64, count=len(lines))
+            offsets = np.fromiter((len(line[:offset].encode('utf-8')) if offset > 0 else offset
+                                   for line, offset in zip(lines, message_offsets)),
+                                  dtype=np.int64, count=len(lines))
+        
+        line_offsets = np.zeros(len(lines) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=line_offsets[1:])
+        message_starts = line_offsets[:-1] + offsets
+        message_ends = line_offsets[1:].copy()
+        
+        if detached:
+            tail = []
+            position = len(buffer)
+            for row, message in detached.items():
+                encoded = message.encode('utf-8')
+                tail.append(encoded)
+                message_starts[row] = position
+                position += len(encoded)
+                message_ends[row] = position
+            buffer += b"".join(tail)
+        
+        dtype = np.uint8 if len(levels) <= 256 else np.uint16
+        return cls(timestamps, np.asarray(level_codes, dtype=dtype), levels, buffer,
+                   line_offsets, message_starts, message_ends, line_numbers)
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns and the buffer."""
+        arrays = (self.timestamps, self.level_codes, self.line_offsets, self.message_starts,
+                  self.message_ends, self.line_numbers)
+        return len(self.buffer) + sum(array.nbytes for array in arrays)
+    
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """Boolean mask of lines with a parsed timestamp."""
+        return self.timestamps != INVALID_KEY
+    
+    def line(self, row: int) -> str:
+        """Stripped line of a row."""
+        return self.buffer[self.line_offsets[row]:self.line_offsets[row + 1]].decode('utf-8')
+    
+    def message(self, row: int) -> str:
+        """Message of a row."""
+        return self.buffer[self.message_starts[row]:self.message_ends[row]].decode('utf-8')
+    
+    def lines(self, rows: Optional[Sequence[int]] = None) -> List[str]:
+        """Stripped lines of the given rows, every row if omitted."""
+        rows = range(len(self)) if rows is None else rows
+        offsets = self.line_offsets.tolist()
+        return [self.buffer[offsets[row]:offsets[row + 1]].decode('utf-8') for row in rows]
+    
+    def messages(self, rows: Optional[Sequence[int]] = None) -> List[str]:
+        """Messages of the given rows, every row if omitted."""
+        rows = range(len(self)) if rows is None else rows
+        starts = self.message_starts.tolist()
+        ends = self.message_ends.tolist()
+        return [self.buffer[starts[row]:ends[row]].decode('utf-8') for row in rows]
+    
+    def entry(self, row: int, with_timestamp: bool = True) -> Dict[str, Any]:
+        """
+        Entry dictionary of one row, as evaluated by compiled filter predicates.
+        
+        Args:
+            row: Row of the batch
+            with_timestamp: Convert the timestamp to a datetime; None otherwise
+        """
+        epoch_ns = int(self.timestamps[row])
+        valid = epoch_ns != INVALID_KEY
+        return {
+            "line_number": int(self.line_numbers[row]),
+            "timestamp": ns_to_datetime(epoch_ns) if valid and with_timestamp else None,
+            "level": self.levels[self.level_codes[row]] if valid else "",
+            "message": self.message(row),
+            "original_line": self.line(row),
+            "is_valid": valid
+        }
+    
+    def spans(self, field: str, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Buffer start and end of the message or line of the given rows."""
+        if field == "message":
+            return self.message_starts[rows], self.message_ends[rows]
+        return self.line_offsets[rows], self.line_offsets[rows + 1]
+    
+    def text_mask(self, field: str, needle: str, match: str, rows: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Case-insensitive substring test on the message or line of many rows at once.
+        
+        Every occurrence of the needle in the case-folded buffer is found with
+        bytes.find and mapped to the row whose text contains it.
+        
+        Args:
+            field: "message" or "line"
+            needle: Lower-case text to look for
+            match: One of TEXT_MATCHES
+            rows: Rows of the batch to test
+        
+        Returns:
+            Boolean result per row, or None when the buffer is not ASCII and
+            case folding must be done per row
+        """
+        if not self.ascii:
+            return None
+        if self._folded is None:
+            self._folded = self.buffer.lower()
+        
+        starts, ends = self.spans(field, rows)
+        lengths = ends - starts
+        try:
+            pattern = needle.encode('ascii')
+        except UnicodeEncodeError:
+            # ASCII text cannot contain a non-ASCII needle
+            return np.zeros(len(rows), dtype=bool)
+        
+        size = len(pattern)
+        if size == 0:
+            return lengths == 0 if match == "equals" else np.ones(len(rows), dtype=bool)
+        
+        positions = []
+        position = self._folded.find(pattern)
+        while position >= 0:
+            positions.append(position)
+            position = self._folded.find(pattern, position + 1)
+        result = np.zeros(len(rows), dtype=bool)
+        if not positions:
+            return result
+        
+        # Spans do not overlap, so each occurrence lies in at most one span
+        order = np.argsort(starts, kind='stable')
+        positions = np.asarray(positions, dtype=np.int64)
+        owner = np.searchsorted(starts[order], positions, side='right') - 1
+        inside = owner >= 0
+        positions = positions[inside]
+        owner = order[owner[inside]]
+        
+        if match == "contains":
+            hit = positions + size <= ends[owner]
+        elif match == "starts_with":
+            hit = (positions == starts[owner]) & (lengths[owner] >= size)
+        elif match == "ends_with":
+            hit = (positions == ends[owner] - size) & (lengths[owner] >= size)
+        else:
+            hit = (positions == starts[owner]) & (lengths[owner] == size)
+        result[owner[hit]] = True
+        return result
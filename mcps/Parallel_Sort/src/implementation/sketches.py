@@ -0,0 +1,205 @@
+"""
+Mergeable summaries for log statistics.
+Each sketch can be built over separate chunks of a log and merged, so parallel
+analysis reports the same statistics as a single pass over the file.
+"""
+import hashlib
+import math
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# Distinct values counted exactly before switching to HyperLogLog registers
+DISTINCT_EXACT_LIMIT = 16384
+
+# HyperLogLog precision (2**14 registers, ~0.8% standard error)
+HLL_PRECISION = 14
+
+# Relative accuracy of quantile estimates
+QUANTILE_ACCURACY = 0.01
+
+# Counters kept by heavy-hitter summaries
+HEAVY_HITTER_CAPACITY = 65536
+
+
+def stable_hash(value: str) -> int:
+    """64-bit hash of a string that is identical in every process."""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class DistinctCounter:
+    """
+    Distinct-value counter.
+    
+    Values are counted exactly (as 64-bit hashes) up to DISTINCT_EXACT_LIMIT,
+    then folded into HyperLogLog registers. Registers depend only on the set of
+    values seen, so merged chunks estimate exactly what one pass would.
+    """
+    
+    def __init__(self, precision: int = HLL_PRECISION, exact_limit: int = DISTINCT_EXACT_LIMIT):
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self.hashes: Optional[set] = set()
+        self.registers: Optional[np.ndarray] = None
+    
+    def update(self, values: Iterable[str]) -> None:
+        """Add string values."""
+        hashes = [stable_hash(value) for value in values]
+        if self.hashes is not None:
+            self.hashes.update(hashes)
+            if len(self.hashes) > self.exact_limit:
+                self._to_registers()
+        else:
+            self._add_hashes(hashes)
+    
+    def _to_registers(self) -> None:
+        """Switch from exact counting to HyperLogLog registers."""
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        self._add_hashes(list(self.hashes))
+        self.hashes = None
+    
+    def _add_hashes(self, hashes: List[int]) -> None:
+        if not hashes:
+            return
+        values = np.asarray(hashes, dtype=np.uint64)
+        width = 64 - self.precision
+        buckets = (values >> np.uint64(width)).astype(np.int64)
+        remainder = values & np.uint64((1 << width) - 1)
+        # Rank is the position of the leftmost set bit in the remaining bits;
+        # the remainder has fewer than 53 bits, so frexp is exact
+        _, bit_length = np.frexp(remainder.astype(np.float64))
+        ranks = (width - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+    
+    def merge(self, other: "DistinctCounter") -> "DistinctCounter":
+        """Fold another counter into this one."""
+        if self.hashes is not None and other.hashes is not None:
+            self.hashes |= other.hashes
+            if len(self.hashes) > self.exact_limit:
+                self._to_registers()
+            return self
+        
+        if self.hashes is not None:
+            self._to_registers()
+        if other.hashes is not None:
+            self._add_hashes(list(other.hashes))
+        else:
+            np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+    
+    def count(self) -> int:
+        """Number of distinct values, estimated once past the exact limit."""
+        if self.hashes is not None:
+            return len(self.hashes)
+        
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class QuantileSketch:
+    """
+    Quantiles of non-negative values with bounded relative error.
+    
+    Values fall into logarithmically spaced buckets (as in DDSketch); merging
+    adds bucket counts, so the result does not depend on how values were split.
+    """
+    
+    def __init__(self, relative_accuracy: float = QUANTILE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Counter = Counter()
+        self.zero_count = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def update(self, values: np.ndarray) -> None:
+        """Add an array of non-negative values."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        
+        self.count += len(values)
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        keys, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype(np.int64), return_counts=True)
+        self.buckets.update(dict(zip(keys.tolist(), counts.tolist())))
+    
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold another sketch into this one."""
+        self.buckets.update(other.buckets)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q in [0, 1], or None when the sketch is empty."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class HeavyHitters:
+    """
+    Most frequent values (Misra-Gries summary).
+    
+    Counts are exact while at most `capacity` distinct values are seen; past
+    that, every count is low by at most total / (capacity + 1).
+    """
+    
+    def __init__(self, capacity: int = HEAVY_HITTER_CAPACITY):
+        self.capacity = capacity
+        self.counts: Counter = Counter()
+    
+    def update(self, values: Iterable[str]) -> None:
+        """Add values."""
+        self.counts.update(values)
+        self._prune()
+    
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        """Fold another summary into this one."""
+        self.counts.update(other.counts)
+        self._prune()
+        return self
+    
+    def _prune(self) -> None:
+        """Subtract the (capacity + 1)-th largest count and drop counters that reach zero."""
+        if len(self.counts) <= self.capacity:
+            return
+        threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = Counter({value: count - threshold for value, count in self.counts.items() if count > threshold})
+    
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        """The n most frequent values, ties broken by value."""
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
@@ -2,10 +2,19 @@
 Sort handler capability for processing log files.
 Sorts log entries by timestamps in YYYY-MM-DD HH:MM:SS format.
 """
-import re
 import os
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
+from .log_parser import TIMESTAMP_PATTERN, scan_timestamp, key_to_datetime
+from .log_formats import DEFAULT_FORMAT, detect_format
+
+
+# Number of lines returned from each end of the output when writing to a file
+SAMPLE_LINES = 5
+
+# Cap on invalid line details included when writing to a file
+MAX_INVALID_ENTRIES = 50
 
 
 def parse_timestamp(line: str) -> tuple[datetime, str]:
@@ -21,27 +30,27 @@ def parse_timestamp(line: str) -> tuple[datetime, str]:
     Raises:
         ValueError: If timestamp format is invalid
     """
-    # Match YYYY-MM-DD HH:MM:SS pattern
-    timestamp_pattern = r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})'
-    match = re.search(timestamp_pattern, line)
-    
-    if not match:
-        raise ValueError(f"No valid timestamp found in line: {line.strip()}")
-    
-    timestamp_str = match.group(1)
     try:
-        parsed_dt = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-        return parsed_dt, line
+        key, _, _ = scan_timestamp(line)
     except ValueError as e:
-        raise ValueError(f"Invalid timestamp format '{timestamp_str}': {e}")
+        if TIMESTAMP_PATTERN.search(line):
+            raise
+        raise ValueError(f"No valid timestamp found in line: {line.strip()}") from e
+    
+    return key_to_datetime(key), line
 
 
-async def sort_log_by_timestamp(file_path: str) -> Dict[str, Any]:
+async def sort_log_by_timestamp(file_path: str,
+                                output_path: Optional[str] = None,
+                                reverse: bool = False) -> Dict[str, Any]:
     """
     Sort log file lines by timestamps in YYYY-MM-DD HH:MM:SS format.
     
     Args:
         file_path: Path to the log file to sort
+        output_path: Optional path to write the sorted lines to. When given, the
+            result carries only counts and a head/tail sample instead of every line.
+        reverse: Sort in descending order
         
     Returns:
         Dictionary containing sorted lines or error information
@@ -73,33 +82,54 @@ async def sort_log_by_timestamp(file_path: str) -> Dict[str, Any]:
         
         valid_entries = []
         invalid_lines = []
+        log_format = detect_format(lines)
         
-        # Parse and collect valid timestamp entries
+        # Parse and collect valid timestamp entries as (epoch key, line)
         for i, line in enumerate(lines, 1):
-            try:
-                parsed_dt, original_line = parse_timestamp(line.strip())
-                valid_entries.append((parsed_dt, original_line.strip()))
-            except ValueError as e:
+            line = line.strip()
+            if log_format.name == DEFAULT_FORMAT:
+                try:
+                    key, _, _ = scan_timestamp(line)
+                    valid_entries.append((key, line))
+                except ValueError as e:
+                    invalid_lines.append({
+                        "line_number": i,
+                        "content": line,
+                        "error": str(e)
+                    })
+                continue
+            
+            record = log_format.parse(line)
+            if record is None:
                 invalid_lines.append({
                     "line_number": i,
-                    "content": line.strip(),
-                    "error": str(e)
+                    "content": line,
+                    "error": f"Line does not match {log_format.name} format"
                 })
+            else:
+                valid_entries.append((record.epoch_ns, line))
         
         # Sort valid entries by timestamp
-        valid_entries.sort(key=lambda x: x[0])
+        valid_entries.sort(key=lambda x: x[0], reverse=reverse)
         sorted_lines = [entry[1] for entry in valid_entries]
         
-        result = {
-            "sorted_lines": sorted_lines,
+        if output_path:
+            result = write_sorted_output(sorted_lines, output_path)
+            invalid_lines_details = invalid_lines[:MAX_INVALID_ENTRIES]
+        else:
+            result = {"sorted_lines": sorted_lines}
+            invalid_lines_details = invalid_lines
+        
+        result.update({
             "total_lines": len(lines),
             "valid_lines": len(valid_entries),
-            "invalid_lines": len(invalid_lines)
-        }
+            "invalid_lines": len(invalid_lines),
+            "log_format": log_format.name
+        })
         
         # Include invalid lines info if any
         if invalid_lines:
-            result["invalid_entries"] = invalid_lines
+            result["invalid_entries"] = invalid_lines_details
             result["message"] = f"Successfully sorted {len(valid_entries)} lines. {len(invalid_lines)} lines had invalid timestamps."
         else:
             result["message"] = f"Successfully sorted all {len(valid_entries)} lines."
@@ -129,4 +159,35 @@ async def sort_log_by_timestamp(file_path: str) -> Dict[str, Any]:
             "total_lines": 0,
             "valid_lines": 0,
             "invalid_lines": 0
-        }
\ No newline at end of file
+        }
+
+
+def write_sorted_output(sorted_lines: Iterable[str], output_path: str) -> Dict[str, Any]:
+    """
+    Stream sorted lines to a file and summarize them for the response.
+    
+    Args:
+        sorted_lines: Sorted log lines (without trailing newlines)
+        output_path: Path of the file to write
+        
+    Returns:
+        Dictionary with the output location, line count and head/tail samples
+    """
+    head: List[str] = []
+    tail = deque(maxlen=SAMPLE_LINES)
+    lines_written = 0
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for line in sorted_lines:
+            f.write(line + '\n')
+            if lines_written < SAMPLE_LINES:
+                head.append(line)
+            tail.append(line)
+            lines_written += 1
+    
+    return {
+        "output_file": output_path,
+        "lines_written": lines_written,
+        "head_sample": head,
+        "tail_sample": list(tail)
+    }
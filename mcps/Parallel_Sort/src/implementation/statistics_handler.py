@@ -4,66 +4,72 @@ Provides comprehensive log analysis, statistics, and summaries.
 """
 import re
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-from typing import Dict, Any, List, Tuple
-import pandas as pd
+from collections import Counter
+from typing import Dict, Any, List, Optional
+import numpy as np
+from .log_parser import INVALID_KEY, ns_to_datetime
+from .log_formats import NS_PER_SECOND, LogFormat, get_format
+from .log_index import INVALID_ENTRY_ERROR, LogIndex, get_log_index
+from .record_batch import RecordBatch
+from .sketches import DistinctCounter, HeavyHitters, QuantileSketch
+from .template_miner import TemplateMiner, count_templates
+from .follow_session import get_follow_session
 
 
-async def analyze_log_statistics(file_path: str) -> Dict[str, Any]:
+# Index rows summarized per batch
+STATISTICS_BATCH_ROWS = 65536
+
+# Invalid lines reported in invalid_entry_details
+INVALID_SAMPLE_SIZE = 10
+
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+SEVERITY_MAPPING = {
+    "ERROR": "high",
+    "FATAL": "high",
+    "CRITICAL": "high",
+    "WARN": "medium",
+    "WARNING": "medium",
+    "INFO": "low",
+    "DEBUG": "low",
+    "TRACE": "low"
+}
+
+
+async def analyze_log_statistics(file_path: str, follow: bool = False) -> Dict[str, Any]:
     """
     Analyze log file and generate comprehensive statistics.
     
     Args:
         file_path: Path to the log file to analyze
+        follow: Keep the statistics between calls and only parse lines
+            appended since the previous call
         
     Returns:
         Dictionary containing detailed log statistics
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        if follow:
+            return follow_log_statistics(file_path)
         
-        if not lines:
+        index = get_log_index(file_path)
+        
+        if index.rows == 0:
             return {
                 "message": "File is empty",
                 "total_lines": 0,
                 "statistics": {}
             }
         
-        # Parse log entries
-        parsed_entries = []
-        invalid_entries = []
-        
-        for i, line in enumerate(lines, 1):
-            try:
-                entry = parse_log_entry(line.strip())
-                entry["line_number"] = i
-                parsed_entries.append(entry)
-            except ValueError as e:
-                invalid_entries.append({
-                    "line_number": i,
-                    "content": line.strip(),
-                    "error": str(e)
-                })
-        
-        # Generate statistics
-        stats = {
-            "basic_statistics": generate_basic_statistics(lines, parsed_entries, invalid_entries),
-            "temporal_analysis": generate_temporal_analysis(parsed_entries),
-            "log_level_analysis": generate_log_level_analysis(parsed_entries),
-            "message_analysis": generate_message_analysis(parsed_entries),
-            "quality_metrics": generate_quality_metrics(lines, parsed_entries, invalid_entries)
-        }
+        # Statistics are summarized from the index columns instead of re-parsing every line
+        statistics = LogStatistics()
+        statistics.add_index(index)
         
-        return {
-            "total_lines": len(lines),
-            "valid_entries": len(parsed_entries),
-            "invalid_entries": len(invalid_entries),
-            "statistics": stats,
-            "invalid_entry_details": invalid_entries[:10],  # Limit to first 10 for brevity
-            "analyzed_at": datetime.now().isoformat(),
-            "message": f"Successfully analyzed {len(lines)} lines with {len(parsed_entries)} valid entries"
-        }
+        result = statistics_result(statistics, index.log_format.name)
+        result["analyzed_at"] = datetime.now().isoformat()
+        return result
         
     except FileNotFoundError:
         return {
@@ -77,239 +83,449 @@ async def analyze_log_statistics(file_path: str) -> Dict[str, Any]:
         }
 
 
-def parse_log_entry(line: str) -> Dict[str, Any]:
+def follow_log_statistics(file_path: str) -> Dict[str, Any]:
     """
-    Parse a single log line into structured components.
+    Update the followed statistics of a log with its appended lines.
     
     Args:
-        line: Log line to parse
+        file_path: Path to the followed log
         
     Returns:
-        Dictionary with parsed components
-        
-    Raises:
-        ValueError: If line cannot be parsed
+        Statistics of every line followed so far, with follow details
     """
-    # Match YYYY-MM-DD HH:MM:SS pattern
-    timestamp_pattern = r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})'
-    match = re.search(timestamp_pattern, line)
-    
-    if not match:
-        raise ValueError(f"No valid timestamp found")
-    
-    timestamp_str = match.group(1)
-    try:
-        timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-    except ValueError as e:
-        raise ValueError(f"Invalid timestamp format: {e}")
+    session = get_follow_session(file_path, "statistics", LogStatistics)
+    index, rows, rotated = session.poll()
+    if rows:
+        session.state.add_index(index, stop=rows)
     
-    # Extract remaining parts
-    remainder = line[match.end():].strip()
-    parts = remainder.split(' ', 1)
+    statistics = session.state
+    if statistics.total_lines == 0:
+        return {
+            "message": "File is empty",
+            "total_lines": 0,
+            "statistics": {},
+            "follow": session.describe(rows, rotated)
+        }
     
-    level = parts[0] if parts else ""
-    message = parts[1] if len(parts) > 1 else ""
+    result = statistics_result(statistics, session.log_format.name)
+    result["follow"] = session.describe(rows, rotated)
+    result["analyzed_at"] = datetime.now().isoformat()
+    return result
+
+
+def statistics_result(statistics: "LogStatistics", format_name: str) -> Dict[str, Any]:
+    """
+    Build the analyze_log_statistics response from accumulated statistics.
     
+    Args:
+        statistics: Statistics of the whole file
+        format_name: Registered log format of the file
+        
+    Returns:
+        Response dictionary without the analyzed_at timestamp
+    """
     return {
-        "timestamp": timestamp,
-        "timestamp_str": timestamp_str,
-        "level": level.upper(),
-        "message": message,
-        "original_line": line
+        "total_lines": statistics.total_lines,
+        "valid_entries": statistics.valid_entries,
+        "invalid_entries": statistics.invalid_entries,
+        "log_format": format_name,
+        "statistics": statistics.report(),
+        "invalid_entry_details": [
+            {"line_number": line_number, "content": content, "error": INVALID_ENTRY_ERROR}
+            for line_number, content in statistics.invalid_samples
+        ],
+        "message": f"Successfully analyzed {statistics.total_lines} lines with {statistics.valid_entries} valid entries"
     }
 
 
-def generate_basic_statistics(lines: List[str], parsed_entries: List[Dict], invalid_entries: List[Dict]) -> Dict[str, Any]:
-    """Generate basic statistics about the log file."""
-    total_lines = len(lines)
-    valid_lines = len(parsed_entries)
-    invalid_lines = len(invalid_entries)
+def parse_log_entry(line: str, log_format: LogFormat = None) -> Dict[str, Any]:
+    """
+    Parse a single log line into structured components.
     
-    # File size estimation
-    total_chars = sum(len(line) for line in lines)
-    avg_line_length = total_chars / total_lines if total_lines > 0 else 0
+    Args:
+        line: Log line to parse
+        log_format: Format of the log, the standard format if omitted
+        
+    Returns:
+        Dictionary with parsed components
+        
+    Raises:
+        ValueError: If line cannot be parsed
+    """
+    parsed = (log_format or get_format()).parse_entry(line)
+    if parsed is None:
+        raise ValueError("No valid timestamp found")
     
     return {
-        "total_lines": total_lines,
-        "valid_entries": valid_lines,
-        "invalid_entries": invalid_lines,
-        "success_rate": round((valid_lines / total_lines * 100), 2) if total_lines > 0 else 0,
-        "average_line_length": round(avg_line_length, 2),
-        "total_characters": total_chars,
-        "estimated_size_bytes": total_chars  # Rough estimate
+        "timestamp": ns_to_datetime(parsed.epoch_ns),
+        "timestamp_str": parsed.timestamp_text,
+        "level": parsed.level,
+        "message": parsed.message,
+        "original_line": line
     }
 
 
-def generate_temporal_analysis(parsed_entries: List[Dict]) -> Dict[str, Any]:
-    """Generate temporal analysis of log entries."""
-    if not parsed_entries:
-        return {}
+class LogStatistics:
+    """
+    Mergeable statistics of a log.
     
-    timestamps = [entry["timestamp"] for entry in parsed_entries]
-    timestamps.sort()
+    Every statistic is kept as a count, a min/max or a sketch, so statistics of
+    consecutive chunks merged in file order equal the statistics of one pass.
+    Distinct messages use a DistinctCounter, inter-arrival gaps a QuantileSketch
+    and common words a HeavyHitters summary. Repeated messages are counted per
+    mined template; merging mines the other chunk's templates into this one's.
+    """
     
-    # Basic time range
-    earliest = timestamps[0]
-    latest = timestamps[-1]
-    duration = latest - earliest
+    def __init__(self):
+        self.total_lines = 0
+        self.valid_entries = 0
+        self.total_characters = 0
+        self.invalid_samples: List[tuple] = []
+        self.level_counts: Counter = Counter()
+        self.hourly_counts: Counter = Counter()
+        self.earliest: Optional[int] = None
+        self.latest: Optional[int] = None
+        self.first_timestamp: Optional[int] = None
+        self.last_timestamp: Optional[int] = None
+        self.inter_arrival = QuantileSketch()
+        self.out_of_order = 0
+        self.timestamp_widths: set = set()
+        self.total_messages = 0
+        self.empty_messages = 0
+        self.message_characters = 0
+        self.min_message_length: Optional[int] = None
+        self.max_message_length: Optional[int] = None
+        self.distinct_messages = DistinctCounter()
+        self.miner: Optional[TemplateMiner] = None
+        self.template_counts = np.zeros(0, dtype=np.int64)
+        self.word_counts = HeavyHitters()
+    
+    @property
+    def invalid_entries(self) -> int:
+        return self.total_lines - self.valid_entries
+    
+    def add_index(self, index: LogIndex, stop: Optional[int] = None,
+                  batch_rows: int = STATISTICS_BATCH_ROWS) -> None:
+        """
+        Add the rows of an index, in batches.
+        
+        Args:
+            index: Index of the lines to add, in file order
+            stop: Add rows before this one only, every row if omitted
+            batch_rows: Rows read back from the log per batch
+        """
+        stop = index.rows if stop is None else stop
+        for start in range(0, stop, batch_rows):
+            rows = np.arange(start, min(start + batch_rows, stop))
+            self.add_rows(index, rows, index.read_lines(rows))
+    
+    def add_rows(self, index: LogIndex, rows: np.ndarray, lines: List[str]) -> None:
+        """
+        Add consecutive index rows.
+        
+        Args:
+            index: Index holding the rows
+            rows: Row numbers following the rows already added
+            lines: Stripped lines of the rows, as returned by read_lines
+        """
+        timestamps = np.asarray(index.timestamps[rows])
+        valid = timestamps != INVALID_KEY
+        
+        for position in np.flatnonzero(~valid)[:INVALID_SAMPLE_SIZE - len(self.invalid_samples)].tolist():
+            self.invalid_samples.append((self.total_lines + position + 1, lines[position]))
+        self.total_lines += len(rows)
+        # Characters of the lines as stored, newlines and surrounding whitespace
+        # included: the byte span of the rows less the extra bytes of multibyte characters
+        span = index.line_end(int(rows[-1])) - int(index.columns["offset"][rows[0]])
+        self.total_characters += span - sum(len(line.encode('utf-8')) - len(line) for line in lines if not line.isascii())
+        
+        valid_rows = rows[valid]
+        if len(valid_rows) == 0:
+            return
+        valid_timestamps = timestamps[valid]
+        self.valid_entries += len(valid_rows)
+        
+        # Time range, hourly histogram and gaps between consecutive entries
+        self.earliest = min_optional(self.earliest, int(valid_timestamps.min()))
+        self.latest = max_optional(self.latest, int(valid_timestamps.max()))
+        hours, counts = np.unique(valid_timestamps // NS_PER_HOUR, return_counts=True)
+        self.hourly_counts.update(dict(zip(hours.tolist(), counts.tolist())))
+        if self.first_timestamp is None:
+            self.first_timestamp = int(valid_timestamps[0])
+        else:
+            valid_timestamps = np.concatenate(([self.last_timestamp], valid_timestamps))
+        self.add_gaps(np.diff(valid_timestamps))
+        self.last_timestamp = int(valid_timestamps[-1])
+        
+        level_ids, counts = np.unique(index.columns["level"][valid_rows], return_counts=True)
+        self.level_counts.update({index.levels[level_id]: count for level_id, count in zip(level_ids.tolist(), counts.tolist())})
+        self.timestamp_widths.update(np.unique(index.columns["timestamp_width"][valid_rows]).tolist())
+        
+        valid_lines = [lines[position] for position in np.flatnonzero(valid).tolist()]
+        messages = RecordBatch.from_index(index, valid_rows, valid_lines).messages()
+        self.miner, template_ids = index.template_ids(valid_rows, messages, self.miner)
+        self.add_messages(messages, template_ids)
+    
+    def add_gaps(self, gaps_ns: np.ndarray) -> None:
+        """Add gaps between consecutive timestamps; negative gaps count as out of order."""
+        in_order = gaps_ns >= 0
+        self.out_of_order += int(len(gaps_ns) - np.count_nonzero(in_order))
+        self.inter_arrival.update(gaps_ns[in_order] / NS_PER_SECOND)
+    
+    def add_messages(self, messages: List[str], template_ids: Optional[np.ndarray] = None) -> None:
+        """
+        Add the messages of valid entries.
+        
+        Args:
+            messages: Message of each entry
+            template_ids: Template id of each message in this object's miner,
+                mined from the messages if omitted
+        """
+        if template_ids is None:
+            if self.miner is None:
+                self.miner = TemplateMiner()
+            template_ids = self.miner.add_messages(messages)
+        
+        non_empty = [message for message in messages if message]
+        self.empty_messages += len(messages) - len(non_empty)
+        if len(non_empty) < len(messages):
+            template_ids = template_ids[[bool(message) for message in messages]]
+        messages = non_empty
+        if not messages:
+            return
+        
+        lengths = [len(message) for message in messages]
+        self.total_messages += len(messages)
+        self.message_characters += sum(lengths)
+        self.min_message_length = min_optional(self.min_message_length, min(lengths))
+        self.max_message_length = max_optional(self.max_message_length, max(lengths))
+        self.distinct_messages.update(messages)
+        self.template_counts = count_templates(self.template_counts, template_ids)
+        self.word_counts.update(WORD_PATTERN.findall("\n".join(messages).lower()))
+    
+    def merge(self, other: "LogStatistics") -> "LogStatistics":
+        """
+        Append the statistics of the chunk that follows this one in the file.
+        
+        Args:
+            other: Statistics of the next chunk
+            
+        Returns:
+            This object, updated
+        """
+        for line_number, content in other.invalid_samples[:INVALID_SAMPLE_SIZE - len(self.invalid_samples)]:
+            self.invalid_samples.append((self.total_lines + line_number, content))
+        self.total_lines += other.total_lines
+        self.valid_entries += other.valid_entries
+        self.total_characters += other.total_characters
+        self.level_counts.update(other.level_counts)
+        self.hourly_counts.update(other.hourly_counts)
+        self.earliest = min_optional(self.earliest, other.earliest)
+        self.latest = max_optional(self.latest, other.latest)
+        
+        if other.first_timestamp is not None:
+            if self.last_timestamp is None:
+                self.first_timestamp = other.first_timestamp
+            else:
+                self.add_gaps(np.array([other.first_timestamp - self.last_timestamp], dtype=np.int64))
+            self.last_timestamp = other.last_timestamp
+        self.inter_arrival.merge(other.inter_arrival)
+        self.out_of_order += other.out_of_order
+        
+        self.timestamp_widths |= other.timestamp_widths
+        self.total_messages += other.total_messages
+        self.empty_messages += other.empty_messages
+        self.message_characters += other.message_characters
+        self.min_message_length = min_optional(self.min_message_length, other.min_message_length)
+        self.max_message_length = max_optional(self.max_message_length, other.max_message_length)
+        self.distinct_messages.merge(other.distinct_messages)
+        if other.miner is not None:
+            if self.miner is None:
+                self.miner = other.miner.copy()
+                self.template_counts = other.template_counts.copy()
+            else:
+                mapping = self.miner.merge(other.miner)
+                self.template_counts = count_templates(self.template_counts, mapping[:len(other.template_counts)],
+                                                       other.template_counts)
+        self.word_counts.merge(other.word_counts)
+        return self
+    
+    def report(self) -> Dict[str, Any]:
+        """Statistics sections of the analyze_log_statistics response."""
+        return {
+            "basic_statistics": self.basic_statistics(),
+            "temporal_analysis": self.temporal_analysis(),
+            "log_level_analysis": self.log_level_analysis(),
+            "message_analysis": self.message_analysis(),
+            "quality_metrics": self.quality_metrics()
+        }
     
-    # Entries per hour analysis
-    hourly_counts = defaultdict(int)
-    daily_counts = defaultdict(int)
+    def basic_statistics(self) -> Dict[str, Any]:
+        """Generate basic statistics about the log file."""
+        total_lines = self.total_lines
+        avg_line_length = self.total_characters / total_lines if total_lines > 0 else 0
+        
+        return {
+            "total_lines": total_lines,
+            "valid_entries": self.valid_entries,
+            "invalid_entries": self.invalid_entries,
+            "success_rate": round((self.valid_entries / total_lines * 100), 2) if total_lines > 0 else 0,
+            "average_line_length": round(avg_line_length, 2),
+            "total_characters": self.total_characters,
+            "estimated_size_bytes": self.total_characters  # Rough estimate
+        }
     
-    for ts in timestamps:
-        hour_key = ts.strftime('%Y-%m-%d %H:00')
-        day_key = ts.strftime('%Y-%m-%d')
-        hourly_counts[hour_key] += 1
-        daily_counts[day_key] += 1
+    def temporal_analysis(self) -> Dict[str, Any]:
+        """Generate temporal analysis of log entries."""
+        if not self.valid_entries:
+            return {}
+        
+        earliest = ns_to_datetime(self.earliest)
+        latest = ns_to_datetime(self.latest)
+        duration = latest - earliest
+        
+        daily_counts = Counter()
+        for hour, count in self.hourly_counts.items():
+            daily_counts[hour // 24] += count
+        
+        # Earliest hour and day win ties
+        peak_hour = min(self.hourly_counts.items(), key=lambda item: (-item[1], item[0]))
+        peak_day = min(daily_counts.items(), key=lambda item: (-item[1], item[0]))
+        
+        hours_span = max(1, duration.total_seconds() / 3600)
+        days_span = max(1, duration.days + 1)
+        
+        temporal = {
+            "earliest_entry": earliest.isoformat(),
+            "latest_entry": latest.isoformat(),
+            "duration_seconds": duration.total_seconds(),
+            "duration_human": str(duration),
+            "total_events": self.valid_entries,
+            "average_events_per_hour": round(self.valid_entries / hours_span, 2),
+            "average_events_per_day": round(self.valid_entries / days_span, 2),
+            "peak_hour": {
+                "time": ns_to_datetime(peak_hour[0] * NS_PER_HOUR).strftime('%Y-%m-%d %H:00'),
+                "count": peak_hour[1]
+            },
+            "peak_day": {
+                "date": ns_to_datetime(peak_day[0] * 24 * NS_PER_HOUR).strftime('%Y-%m-%d'),
+                "count": peak_day[1]
+            },
+            "unique_hours": len(self.hourly_counts),
+            "unique_days": len(daily_counts)
+        }
+        
+        if self.inter_arrival.count or self.out_of_order:
+            temporal["inter_arrival_seconds"] = {
+                name: round_optional(self.inter_arrival.quantile(q))
+                for name, q in (("median", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+            }
+            temporal["inter_arrival_seconds"]["out_of_order"] = self.out_of_order
+        
+        return temporal
     
-    # Find peak hours and days
-    peak_hour = max(hourly_counts.items(), key=lambda x: x[1]) if hourly_counts else ("", 0)
-    peak_day = max(daily_counts.items(), key=lambda x: x[1]) if daily_counts else ("", 0)
+    def log_level_analysis(self) -> Dict[str, Any]:
+        """Generate analysis of log levels."""
+        if not self.valid_entries:
+            return {}
+        
+        total_entries = self.valid_entries
+        ordered = sorted(self.level_counts.items(), key=lambda item: (-item[1], item[0]))
+        
+        # Calculate percentages, most frequent first
+        level_stats = {}
+        for level, count in ordered:
+            level_stats[level] = {
+                "count": count,
+                "percentage": round((count / total_entries * 100), 2)
+            }
+        
+        severity_counts = Counter()
+        for level, count in ordered:
+            severity_counts[SEVERITY_MAPPING.get(level, "unknown")] += count
+        
+        return {
+            "level_distribution": level_stats,
+            "total_unique_levels": len(self.level_counts),
+            "most_common_level": ordered[0] if ordered else ("", 0),
+            "severity_distribution": dict(severity_counts),
+            "error_rate": round((self.level_counts.get("ERROR", 0) / total_entries * 100), 2)
+        }
     
-    # Calculate average entries per hour/day
-    hours_span = max(1, duration.total_seconds() / 3600)
-    days_span = max(1, duration.days + 1)
+    def message_analysis(self) -> Dict[str, Any]:
+        """Generate analysis of log messages."""
+        if not self.valid_entries:
+            return {}
+        
+        total_messages = self.total_messages
+        unique_messages = self.distinct_messages.count()
+        
+        # Most frequent templates first, first-seen first among equals
+        repeated = np.flatnonzero(self.template_counts > 1)
+        repeated = repeated[np.argsort(-self.template_counts[repeated], kind='stable')][:5]
+        avg_length = self.message_characters / total_messages if total_messages else 0
+        
+        return {
+            "total_messages": total_messages,
+            "unique_messages": unique_messages,
+            "uniqueness_ratio": round((unique_messages / total_messages * 100), 2) if total_messages > 0 else 0,
+            "message_length_stats": {
+                "average": round(avg_length, 2),
+                "maximum": self.max_message_length or 0,
+                "minimum": self.min_message_length or 0
+            },
+            "unique_templates": int(np.count_nonzero(self.template_counts)),
+            "common_words": self.word_counts.most_common(10),
+            "repeated_messages": [(self.miner.template(template_id), int(self.template_counts[template_id]))
+                                  for template_id in repeated.tolist()]
+        }
     
-    return {
-        "earliest_entry": earliest.isoformat(),
-        "latest_entry": latest.isoformat(),
-        "duration_seconds": duration.total_seconds(),
-        "duration_human": str(duration),
-        "total_events": len(timestamps),
-        "average_events_per_hour": round(len(timestamps) / hours_span, 2),
-        "average_events_per_day": round(len(timestamps) / days_span, 2),
-        "peak_hour": {
-            "time": peak_hour[0],
-            "count": peak_hour[1]
-        },
-        "peak_day": {
-            "date": peak_day[0],
-            "count": peak_day[1]
-        },
-        "unique_hours": len(hourly_counts),
-        "unique_days": len(daily_counts)
-    }
+    def quality_metrics(self) -> Dict[str, Any]:
+        """Generate data quality metrics."""
+        total_lines = self.total_lines
+        
+        # Completeness metrics
+        completeness_score = (self.valid_entries / total_lines * 100) if total_lines > 0 else 0
+        
+        # Consistency metrics (timestamp format consistency)
+        consistency_score = 100 if len(self.timestamp_widths) <= 1 else 90
+        
+        # Overall quality score
+        quality_score = (completeness_score + consistency_score) / 2
+        
+        return {
+            "completeness_score": round(completeness_score, 2),
+            "consistency_score": consistency_score,
+            "overall_quality_score": round(quality_score, 2),
+            "data_issues": {
+                "invalid_entries": self.invalid_entries,
+                "multiple_timestamp_formats": len(self.timestamp_widths) > 1,
+                "empty_messages": self.empty_messages
+            },
+            "recommendations": generate_quality_recommendations(completeness_score, consistency_score, self.invalid_entries)
+        }
 
 
-def generate_log_level_analysis(parsed_entries: List[Dict]) -> Dict[str, Any]:
-    """Generate analysis of log levels."""
-    if not parsed_entries:
-        return {}
-    
-    level_counts = Counter(entry["level"] for entry in parsed_entries)
-    total_entries = len(parsed_entries)
-    
-    # Calculate percentages and sort by frequency
-    level_stats = {}
-    for level, count in level_counts.most_common():
-        percentage = round((count / total_entries * 100), 2)
-        level_stats[level] = {
-            "count": count,
-            "percentage": percentage
-        }
-    
-    # Identify severity distribution
-    severity_mapping = {
-        "ERROR": "high",
-        "FATAL": "high",
-        "CRITICAL": "high",
-        "WARN": "medium",
-        "WARNING": "medium",
-        "INFO": "low",
-        "DEBUG": "low",
-        "TRACE": "low"
-    }
-    
-    severity_counts = defaultdict(int)
-    for level, count in level_counts.items():
-        severity = severity_mapping.get(level, "unknown")
-        severity_counts[severity] += count
-    
-    return {
-        "level_distribution": level_stats,
-        "total_unique_levels": len(level_counts),
-        "most_common_level": level_counts.most_common(1)[0] if level_counts else ("", 0),
-        "severity_distribution": dict(severity_counts),
-        "error_rate": round((level_counts.get("ERROR", 0) / total_entries * 100), 2) if total_entries > 0 else 0
-    }
+def min_optional(left: Optional[int], right: Optional[int]) -> Optional[int]:
+    """Minimum of two values where None means no value."""
+    if left is None:
+        return right
+    return left if right is None else min(left, right)
 
 
-def generate_message_analysis(parsed_entries: List[Dict]) -> Dict[str, Any]:
-    """Generate analysis of log messages."""
-    if not parsed_entries:
-        return {}
-    
-    messages = [entry["message"] for entry in parsed_entries if entry["message"]]
-    
-    # Basic message statistics
-    total_messages = len(messages)
-    unique_messages = len(set(messages))
-    
-    # Message length analysis
-    message_lengths = [len(msg) for msg in messages]
-    avg_length = sum(message_lengths) / len(message_lengths) if message_lengths else 0
-    max_length = max(message_lengths) if message_lengths else 0
-    min_length = min(message_lengths) if message_lengths else 0
-    
-    # Find common patterns (simple word frequency)
-    all_words = []
-    for message in messages:
-        words = re.findall(r'\b\w+\b', message.lower())
-        all_words.extend(words)
-    
-    common_words = Counter(all_words).most_common(10)
-    
-    # Find repeated messages
-    message_counts = Counter(messages)
-    repeated_messages = [(msg, count) for msg, count in message_counts.most_common(5) if count > 1]
-    
-    return {
-        "total_messages": total_messages,
-        "unique_messages": unique_messages,
-        "uniqueness_ratio": round((unique_messages / total_messages * 100), 2) if total_messages > 0 else 0,
-        "message_length_stats": {
-            "average": round(avg_length, 2),
-            "maximum": max_length,
-            "minimum": min_length
-        },
-        "common_words": common_words,
-        "repeated_messages": repeated_messages
-    }
+def max_optional(left: Optional[int], right: Optional[int]) -> Optional[int]:
+    """Maximum of two values where None means no value."""
+    if left is None:
+        return right
+    return left if right is None else max(left, right)
 
 
-def generate_quality_metrics(lines: List[str], parsed_entries: List[Dict], invalid_entries: List[Dict]) -> Dict[str, Any]:
-    """Generate data quality metrics."""
-    total_lines = len(lines)
-    valid_lines = len(parsed_entries)
-    
-    # Completeness metrics
-    completeness_score = (valid_lines / total_lines * 100) if total_lines > 0 else 0
-    
-    # Consistency metrics (timestamp format consistency)
-    timestamp_formats = set()
-    for entry in parsed_entries:
-        timestamp_formats.add(len(entry["timestamp_str"]))
-    
-    consistency_score = 100 if len(timestamp_formats) <= 1 else 90
-    
-    # Overall quality score
-    quality_score = (completeness_score + consistency_score) / 2
-    
-    return {
-        "completeness_score": round(completeness_score, 2),
-        "consistency_score": consistency_score,
-        "overall_quality_score": round(quality_score, 2),
-        "data_issues": {
-            "invalid_entries": len(invalid_entries),
-            "multiple_timestamp_formats": len(timestamp_formats) > 1,
-            "empty_messages": sum(1 for entry in parsed_entries if not entry["message"])
-        },
-        "recommendations": generate_quality_recommendations(completeness_score, consistency_score, invalid_entries)
-    }
+def round_optional(value: Optional[float]) -> Optional[float]:
+    """Round a sketch estimate for reporting."""
+    return None if value is None else round(value, 6)
 
 
-def generate_quality_recommendations(completeness: float, consistency: float, invalid_entries: List) -> List[str]:
+def generate_quality_recommendations(completeness: float, consistency: float, invalid_entries: int) -> List[str]:
     """Generate recommendations based on quality metrics."""
     recommendations = []
     
@@ -319,8 +535,8 @@ def generate_quality_recommendations(completeness: float, consistency: float, in
     if consistency < 100:
         recommendations.append("Multiple timestamp formats detected - consider standardizing")
     
-    if len(invalid_entries) > 0:
-        recommendations.append(f"{len(invalid_entries)} invalid entries found - review log generation process")
+    if invalid_entries > 0:
+        recommendations.append(f"{invalid_entries} invalid entries found - review log generation process")
     
     if not recommendations:
         recommendations.append("Log quality is excellent - no issues detected")
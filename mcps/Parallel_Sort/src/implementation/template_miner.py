@@ -0,0 +1,242 @@
+"""
+Online log template mining for log processing.
+Groups messages into templates with a fixed-depth parse tree and token
+similarity (the Drain algorithm), assigning each message a template id in a
+single pass. The miner state can be checkpointed to JSON and restored.
+"""
+import re
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+TEMPLATE_VERSION = 1
+
+# Placeholder for the variable tokens of a template
+WILDCARD = "<*>"
+
+# Tree depth counting the root and leaf levels; depth - 2 leading tokens route a message
+TEMPLATE_TREE_DEPTH = 4
+
+# Fraction of a template's tokens a message must share to join it
+TEMPLATE_SIMILARITY = 0.5
+
+# Children per tree node; further tokens route through the wildcard child
+TEMPLATE_MAX_CHILDREN = 100
+
+# Templates mined per miner; past this, unmatched messages join the closest or the overflow template
+MAX_TEMPLATES = 100000
+
+# Masked messages remembered with their template id
+TEMPLATE_CACHE_SIZE = 65536
+
+# Tokens containing a digit (numbers, IPs, ids, paths with versions) are variable
+VARIABLE_TOKEN = re.compile(r'\S*\d\S*')
+
+
+class TemplateMiner:
+    """
+    Drain-style online template miner.
+    
+    A message is masked (tokens with digits become WILDCARD) and split on
+    whitespace, then routed by its token count and first depth - 2 tokens to
+    a leaf of candidate templates. It joins the most similar candidate when
+    at least `similarity` of the template's tokens match, turning differing
+    positions into wildcards; otherwise it starts a new template. Template
+    ids are assigned in first-seen order and never change, while template
+    text only gets more general.
+    """
+    
+    def __init__(self, depth: int = TEMPLATE_TREE_DEPTH, similarity: float = TEMPLATE_SIMILARITY,
+                 max_children: int = TEMPLATE_MAX_CHILDREN, max_templates: int = MAX_TEMPLATES):
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_templates = max_templates
+        self.clusters: List[List[str]] = []
+        self.paths: List[tuple] = []
+        self.overflow: Optional[int] = None
+        self.children: Dict[tuple, set] = {}
+        self.leaves: Dict[tuple, List[int]] = {}
+        self.cache: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.clusters)
+    
+    def add(self, message: str) -> int:
+        """Template id of a message, mining it into the tree."""
+        return self.add_masked(mask_message(message))
+    
+    def add_masked(self, masked: str) -> int:
+        """Template id of a message already passed through mask_message."""
+        template_id = self.cache.get(masked)
+        if template_id is None:
+            if len(self.cache) >= TEMPLATE_CACHE_SIZE:
+                self.cache.clear()
+            template_id = self.cache[masked] = self.add_tokens(masked.split())
+        return template_id
+    
+    def add_messages(self, messages: Iterable[str]) -> np.ndarray:
+        """Template ids of messages, in order."""
+        add = self.add
+        return np.fromiter((add(message) for message in messages), dtype=np.int64)
+    
+    def add_tokens(self, tokens: List[str]) -> int:
+        """Template id of a masked token sequence, mining it into the tree."""
+        path = self._route(tokens)
+        leaf = self.leaves.setdefault(path, [])
+        
+        best, best_similarity, best_params = -1, -1.0, -1
+        for template_id in leaf:
+            similarity, params = token_similarity(self.clusters[template_id], tokens)
+            if similarity > best_similarity or (similarity == best_similarity and params > best_params):
+                best, best_similarity, best_params = template_id, similarity, params
+        
+        if best >= 0 and (best_similarity >= self.similarity or len(self.clusters) >= self.max_templates):
+            template = self.clusters[best]
+            if template != tokens:
+                self.clusters[best] = [expected if expected == token else WILDCARD
+                                       for expected, token in zip(template, tokens)]
+            return best
+        
+        if len(self.clusters) >= self.max_templates:
+            return self._overflow_id()
+        
+        template_id = len(self.clusters)
+        self.clusters.append(list(tokens))
+        self.paths.append(path)
+        leaf.append(template_id)
+        return template_id
+    
+    def _route(self, tokens: List[str]) -> tuple:
+        """Tree path of a token sequence: its length and leading tokens."""
+        path = (len(tokens),)
+        for token in tokens[:self.depth - 2]:
+            children = self.children.setdefault(path, set())
+            if token not in children:
+                if len(children) >= self.max_children:
+                    token = WILDCARD
+                children.add(token)
+            path += (token,)
+        return path
+    
+    def _overflow_id(self) -> int:
+        """Id of the catch-all template used once max_templates is reached."""
+        if self.overflow is None:
+            self.overflow = len(self.clusters)
+            self.clusters.append([WILDCARD])
+            self.paths.append(())
+        return self.overflow
+    
+    def template(self, template_id: int) -> str:
+        """Current text of a template."""
+        return " ".join(self.clusters[template_id])
+    
+    def templates(self) -> List[str]:
+        """Current text of every template, by id."""
+        return [" ".join(tokens) for tokens in self.clusters]
+    
+    def merge(self, other: "TemplateMiner") -> np.ndarray:
+        """
+        Mine the templates of another miner into this one.
+        
+        Args:
+            other: Miner whose templates are added, in id order
+        
+        Returns:
+            Array mapping each template id of other to a template id of this miner
+        """
+        mapping = np.empty(len(other.clusters), dtype=np.int64)
+        for template_id, tokens in enumerate(other.clusters):
+            if template_id == other.overflow:
+                mapping[template_id] = self._overflow_id()
+            else:
+                mapping[template_id] = self.add_tokens(list(tokens))
+        return mapping
+    
+    def copy(self) -> "TemplateMiner":
+        """Independent copy of the miner."""
+        return TemplateMiner.from_dict(self.to_dict())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Checkpoint of the miner as a JSON-serializable dictionary."""
+        return {
+            "version": TEMPLATE_VERSION,
+            "depth": self.depth,
+            "similarity": self.similarity,
+            "max_children": self.max_children,
+            "max_templates": self.max_templates,
+            "clusters": self.clusters,
+            "paths": [list(path) for path in self.paths],
+            "overflow": self.overflow
+        }
+    
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "TemplateMiner":
+        """
+        Restore a miner from a checkpoint.
+        
+        Args:
+            payload: Dictionary produced by to_dict
+        
+        Returns:
+            TemplateMiner that assigns the same ids as the checkpointed one
+        
+        Raises:
+            ValueError: If the checkpoint is from another miner version
+        """
+        if payload.get("version") != TEMPLATE_VERSION:
+            raise ValueError(f"Unsupported template miner checkpoint version: {payload.get('version')}")
+        
+        miner = cls(payload["depth"], payload["similarity"], payload["max_children"], payload["max_templates"])
+        miner.clusters = [list(tokens) for tokens in payload["clusters"]]
+        miner.paths = [tuple(path) for path in payload["paths"]]
+        miner.overflow = payload["overflow"]
+        for template_id, path in enumerate(miner.paths):
+            if template_id == miner.overflow:
+                continue
+            for level in range(1, len(path)):
+                miner.children.setdefault(path[:level], set()).add(path[level])
+            miner.leaves.setdefault(path, []).append(template_id)
+        return miner
+
+
+def mask_message(message: str) -> str:
+    """Message with its variable tokens replaced by WILDCARD."""
+    return VARIABLE_TOKEN.sub(WILDCARD, message)
+
+
+def token_similarity(template: List[str], tokens: List[str]) -> Tuple[float, int]:
+    """
+    Similarity of a token sequence to a template of the same length.
+    
+    Returns:
+        Tuple of (fraction of template tokens equal to the message token,
+        number of wildcard positions); wildcards never count as equal
+    """
+    if not template:
+        return 1.0, 0
+    same = params = 0
+    for expected, token in zip(template, tokens):
+        if expected == WILDCARD:
+            params += 1
+        elif expected == token:
+            same += 1
+    return same / len(template), params
+
+
+def count_templates(counts: np.ndarray, template_ids: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Add template occurrences to a per-template count array.
+    
+    Args:
+        counts: Count of each template id so far
+        template_ids: Template id of each occurrence
+        weights: Occurrences behind each id, one each if omitted
+    
+    Returns:
+        Count array grown to cover every template id seen
+    """
+    added = np.bincount(template_ids, weights=weights, minlength=len(counts)).astype(np.int64)
+    added[:len(counts)] += counts
+    return added
@@ -0,0 +1,326 @@
+"""
+Shared worker process pool for parallel log processing.
+One server-wide pool, created on first use and sized from the CPUs this
+process may actually run on, executes the chunk tasks of every parallel
+tool call. An admission queue hands free workers to waiting calls in
+round-robin order, so concurrent calls share the cores instead of each
+starting its own set of processes.
+"""
+import asyncio
+import atexit
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Dict, Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+from .log_formats import format_registry_version
+
+
+_POOL: Optional["WorkerPool"] = None
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """
+    CPU quota of this process's cgroup, in CPUs.
+    
+    Reads cgroup v2 ``cpu.max`` and falls back to the cgroup v1 CFS quota.
+    
+    Returns:
+        Quota divided by period, or None when no quota is set
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """
+    Number of worker processes the pool should run.
+    
+    Uses PARALLEL_SORT_WORKERS when set. Otherwise takes the CPUs in this
+    process's affinity mask, lowered to the cgroup CPU quota rounded down, so
+    a container limited to 2 CPUs on a 64-core node runs 2 workers.
+    
+    Returns:
+        Worker count, at least 1
+    """
+    configured = os.environ.get("PARALLEL_SORT_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.floor(limit))
+    return max(1, cpus)
+
+
+class PoolJob:
+    """Tasks submitted by one call, with their results in submission order."""
+    
+    def __init__(self, fn: Callable[..., Any], arg_lists: List[Tuple], limit: int,
+                 loop: asyncio.AbstractEventLoop):
+        self.fn = fn
+        self.pending: Deque[Tuple[int, Tuple]] = deque(enumerate(arg_lists))
+        self.results: List[Any] = [None] * len(arg_lists)
+        self.remaining = len(arg_lists)
+        self.running = 0
+        self.limit = limit
+        self.loop = loop
+        self.done = loop.create_future()
+        self.queued_at = time.monotonic()
+        self.admitted = False
+
+
+class WorkerPool:
+    """
+    Process pool with a round-robin admission queue.
+    
+    Each call to map becomes a job. Whenever a worker is free, the queue
+    advances to the next job that has pending tasks and is below its own
+    worker limit and submits one of its tasks, so a call that queued a
+    thousand chunks cannot hold back a later call with two. The process
+    pool itself is started on the first task and reused by every later call.
+    """
+    
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or available_cpus())
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._format_version: Optional[int] = None
+        self._queue: Deque[PoolJob] = deque()
+        self.running = 0
+        self.active_jobs = 0
+        self.jobs_completed = 0
+        self.tasks_completed = 0
+        self.busy_seconds = 0.0
+        self.admission_wait_seconds = 0.0
+        self.jobs_admitted = 0
+        self.peak_queue_depth = 0
+        self.started_at: Optional[float] = None
+    
+    def worker_limit(self, max_workers: Optional[int] = None) -> int:
+        """Workers a call may occupy at once: its request capped at the pool size."""
+        if max_workers is None:
+            return self.workers
+        return max(1, min(max_workers, self.workers))
+    
+    async def map(self, fn: Callable[..., Any], arg_lists: Iterable[Tuple],
+                  max_workers: Optional[int] = None) -> List[Any]:
+        """
+        Run a function over argument tuples on the pool.
+        
+        Args:
+            fn: Picklable module-level function executed in a worker process
+            arg_lists: Positional arguments of each task
+            max_workers: Most tasks of this call running at once (default: pool size)
+        
+        Returns:
+            Result of each task, in the order of arg_lists
+        
+        Raises:
+            Exception: The first exception raised by a task; the call's
+                remaining tasks are not started
+        """
+        arg_lists = list(arg_lists)
+        if not arg_lists:
+            return []
+        
+        job = PoolJob(fn, arg_lists, self.worker_limit(max_workers), asyncio.get_running_loop())
+        self._queue.append(job)
+        self.active_jobs += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        self._dispatch()
+        try:
+            return await job.done
+        finally:
+            # Failed or cancelled calls give up the tasks not yet started
+            self.active_jobs -= 1
+            self._withdraw(job)
+    
+    @property
+    def started(self) -> bool:
+        """Whether the worker processes are running."""
+        return self._executor is not None
+    
+    @property
+    def queue_depth(self) -> int:
+        """Tasks waiting for a worker across all calls."""
+        return sum(len(job.pending) for job in self._queue)
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """The process pool, started on first use and replaced after format registrations."""
+        version = format_registry_version()
+        if self._executor is None or version != self._format_version:
+            if self._executor is not None:
+                # Running tasks finish on the old processes
+                self._executor.shutdown(wait=False)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._format_version = version
+            if self.started_at is None:
+                self.started_at = time.monotonic()
+        return self._executor
+    
+    def _next_job(self) -> Optional[PoolJob]:
+        """Next queued job below its worker limit, in round-robin order."""
+        for _ in range(len(self._queue)):
+            job = self._queue[0]
+            self._queue.rotate(-1)
+            if job.running < job.limit:
+                return job
+        return None
+    
+    def _dispatch(self) -> None:
+        """Submit queued tasks while workers are free."""
+        while self.running < self.workers:
+            job = self._next_job()
+            if job is None:
+                return
+            
+            index, args = job.pending.popleft()
+            if not job.pending:
+                self._queue.remove(job)
+            if not job.admitted:
+                job.admitted = True
+                self.jobs_admitted += 1
+                self.admission_wait_seconds += time.monotonic() - job.queued_at
+            
+            try:
+                future = job.loop.run_in_executor(self._get_executor(), job.fn, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                self._executor = None
+                self._fail(job, e)
+                continue
+            
+            job.running += 1
+            self.running += 1
+            future.add_done_callback(partial(self._task_done, job, index, time.monotonic()))
+    
+    def _task_done(self, job: PoolJob, index: int, started: float, future: asyncio.Future) -> None:
+        """Record a finished task and hand its worker to the next queued task."""
+        job.running -= 1
+        self.running -= 1
+        self.tasks_completed += 1
+        self.busy_seconds += time.monotonic() - started
+        
+        if future.cancelled():
+            self._fail(job, asyncio.CancelledError())
+        elif future.exception() is not None:
+            if isinstance(future.exception(), BrokenProcessPool):
+                # A worker died; start fresh processes for later tasks
+                self._executor = None
+            self._fail(job, future.exception())
+        elif not job.done.done():
+            job.results[index] = future.result()
+            job.remaining -= 1
+            if job.remaining == 0:
+                self.jobs_completed += 1
+                job.done.set_result(job.results)
+        
+        self._dispatch()
+    
+    def _fail(self, job: PoolJob, error: BaseException) -> None:
+        """Finish a job with an error and drop its pending tasks."""
+        self._withdraw(job)
+        if not job.done.done():
+            if isinstance(error, asyncio.CancelledError):
+                job.done.cancel()
+            else:
+                job.done.set_exception(error)
+    
+    def _withdraw(self, job: PoolJob) -> None:
+        """Remove a job's pending tasks from the queue."""
+        job.pending.clear()
+        if job in self._queue:
+            self._queue.remove(job)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth and utilization of the pool.
+        
+        Returns:
+            Dictionary with the pool size, running and queued tasks, completed
+            work and the busy fraction of worker time since the pool started
+        """
+        uptime = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        return {
+            "workers": self.workers,
+            "cgroup_cpu_limit": cgroup_cpu_limit(),
+            "started": self.started,
+            "running_tasks": self.running,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "active_jobs": self.active_jobs,
+            "jobs_completed": self.jobs_completed,
+            "tasks_completed": self.tasks_completed,
+            "busy_worker_seconds": round(self.busy_seconds, 3),
+            "utilization": round(self.busy_seconds / (self.workers * uptime), 3) if uptime else 0.0,
+            "average_admission_wait_seconds": round(self.admission_wait_seconds / self.jobs_admitted, 4)
+            if self.jobs_admitted else 0.0,
+            "uptime_seconds": round(uptime, 2)
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes; the next task starts new ones."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def get_worker_pool() -> WorkerPool:
+    """Return the server-wide worker pool, creating it on first use."""
+    global _POOL
+    if _POOL is None:
+        _POOL = WorkerPool()
+    return _POOL
+
+
+def configure_worker_pool(workers: Optional[int] = None) -> WorkerPool:
+    """
+    Replace the server-wide pool with one of the given size.
+    
+    The current pool's processes are stopped once their running tasks finish.
+    
+    Args:
+        workers: Worker processes of the new pool (default: available_cpus())
+    
+    Returns:
+        The new server-wide pool
+    """
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown()
+    _POOL = WorkerPool(workers)
+    return _POOL
+
+
+def shutdown_worker_pool(wait: bool = True) -> None:
+    """Stop the server-wide pool's worker processes, if any were started."""
+    if _POOL is not None:
+        _POOL.shutdown(wait)
+
+
+atexit.register(shutdown_worker_pool)
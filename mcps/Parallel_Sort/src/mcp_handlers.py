@@ -8,21 +8,31 @@ from implementation.sort_handler import sort_log_by_timestamp
 from implementation.statistics_handler import analyze_log_statistics
 from implementation.pattern_detection import detect_patterns
 from implementation.filter_handler import (
-    filter_logs, filter_by_time_range, filter_by_log_level, 
+    filter_by_time_range, filter_by_log_level, 
     filter_by_keyword, apply_filter_preset
 )
 from implementation.export_handler import (
-    export_to_json, export_to_csv, export_to_text, export_summary_report
+    export_to_json, export_to_csv, export_to_text, export_summary_report, export_log_file
 )
-from implementation.parallel_processor import parallel_sort_large_file
+from implementation.parallel_processor import (
+    parallel_sort_large_file, parallel_filter_large_file, parallel_analyze_large_file
+)
+from implementation.merge_handler import merge_logs
+from implementation.worker_pool import get_worker_pool
 
 
-async def sort_log_handler(file_path: str) -> Dict[str, Any]:
+async def sort_log_handler(file_path: str, output_path: str = None, reverse: bool = False) -> Dict[str, Any]:
     """
     Handler wrapping the log sorting capability for MCP.
+    
+    Ascending sorts go through parallel_sort_large_file, which picks serial or
+    parallel sorting for the file.
     """
     try:
-        result = await sort_log_by_timestamp(file_path)
+        if reverse:
+            result = await sort_log_by_timestamp(file_path, output_path, reverse)
+        else:
+            result = await parallel_sort_large_file(file_path, None, None, output_path)
         return result
     except Exception as e:
         return {
@@ -32,12 +42,12 @@ async def sort_log_handler(file_path: str) -> Dict[str, Any]:
         }
 
 
-async def parallel_sort_handler(file_path: str, chunk_size_mb: int = 100, max_workers: int = None) -> Dict[str, Any]:
+async def parallel_sort_handler(file_path: str, output_path: str = None, chunk_size_mb: int = None, max_workers: int = None) -> Dict[str, Any]:
     """
     Handler wrapping the parallel sort capability for MCP.
     """
     try:
-        result = await parallel_sort_large_file(file_path, chunk_size_mb, max_workers)
+        result = await parallel_sort_large_file(file_path, chunk_size_mb, max_workers, output_path)
         return result
     except Exception as e:
         return {
@@ -47,12 +57,38 @@ async def parallel_sort_handler(file_path: str, chunk_size_mb: int = 100, max_wo
         }
 
 
-async def analyze_statistics_handler(file_path: str) -> Dict[str, Any]:
+async def merge_logs_handler(input_path: str, output_path: str, max_workers: int = None,
+                             source_column: bool = True) -> Dict[str, Any]:
+    """
+    Handler wrapping the multi-file log merge capability for MCP.
+    """
+    try:
+        result = await merge_logs(input_path, output_path, max_workers, source_column)
+        return result
+    except Exception as e:
+        return {
+            "content": [{"text": json.dumps({"error": str(e)})}],
+            "_meta": {"tool": "merge_logs", "error": type(e).__name__},
+            "isError": True
+        }
+
+
+async def analyze_statistics_handler(file_path: str, include_patterns: bool = True,
+                                     follow: bool = False) -> Dict[str, Any]:
     """
     Handler wrapping the statistics analysis capability for MCP.
+    
+    One-off analyses go through parallel_analyze_large_file, which picks
+    indexed serial or parallel analysis for the file. Without
+    include_patterns the message_analysis section is left out.
     """
     try:
-        result = await analyze_log_statistics(file_path)
+        if follow:
+            result = await analyze_log_statistics(file_path, follow)
+        else:
+            result = await parallel_analyze_large_file(file_path)
+        if not include_patterns:
+            result.get("statistics", {}).pop("message_analysis", None)
         return result
     except Exception as e:
         return {
@@ -62,12 +98,13 @@ async def analyze_statistics_handler(file_path: str) -> Dict[str, Any]:
         }
 
 
-async def detect_patterns_handler(file_path: str, detection_config: Dict[str, Any] = None) -> Dict[str, Any]:
+async def detect_patterns_handler(file_path: str, detection_config: Dict[str, Any] = None,
+                                  follow: bool = False) -> Dict[str, Any]:
     """
     Handler wrapping the pattern detection capability for MCP.
     """
     try:
-        result = await detect_patterns(file_path, detection_config)
+        result = await detect_patterns(file_path, detection_config, follow)
         return result
     except Exception as e:
         return {
@@ -77,12 +114,16 @@ async def detect_patterns_handler(file_path: str, detection_config: Dict[str, An
         }
 
 
-async def filter_logs_handler(file_path: str, filter_conditions: List[Dict[str, Any]], logical_operator: str = "and") -> Dict[str, Any]:
+async def filter_logs_handler(file_path: str, filter_conditions: List[Dict[str, Any]], logical_operator: str = "and",
+                              output_path: str = None) -> Dict[str, Any]:
     """
     Handler wrapping the log filtering capability for MCP.
+    
+    Filtering goes through parallel_filter_large_file, which picks indexed
+    serial or parallel filtering for the file.
     """
     try:
-        result = await filter_logs(file_path, filter_conditions, logical_operator)
+        result = await parallel_filter_large_file(file_path, filter_conditions, logical_operator or "and", output_path)
         return result
     except Exception as e:
         return {
@@ -92,6 +133,23 @@ async def filter_logs_handler(file_path: str, filter_conditions: List[Dict[str,
         }
 
 
+async def parallel_filter_handler(file_path: str, filter_conditions: List[Dict[str, Any]], logical_operator: str = "and",
+                                  output_path: str = None, chunk_size_mb: int = None, max_workers: int = None) -> Dict[str, Any]:
+    """
+    Handler wrapping the parallel filtering capability for MCP.
+    """
+    try:
+        result = await parallel_filter_large_file(file_path, filter_conditions, logical_operator or "and",
+                                                  output_path, chunk_size_mb, max_workers)
+        return result
+    except Exception as e:
+        return {
+            "content": [{"text": json.dumps({"error": str(e)})}],
+            "_meta": {"tool": "parallel_filter", "error": type(e).__name__},
+            "isError": True
+        }
+
+
 async def filter_time_range_handler(file_path: str, start_time: str, end_time: str) -> Dict[str, Any]:
     """
     Handler wrapping the time range filtering capability for MCP.
@@ -197,6 +255,25 @@ async def export_text_handler(data: Dict[str, Any], include_summary: bool = True
         }
 
 
+async def export_log_file_handler(file_path: str, output_path: str, export_format: str = "jsonl",
+                                  filters: List[Dict[str, Any]] = None, logical_operator: str = "and",
+                                  compression: str = None, include_headers: bool = True,
+                                  row_group_seconds: int = 3600) -> Dict[str, Any]:
+    """
+    Handler wrapping the streaming log export capability for MCP.
+    """
+    try:
+        result = await export_log_file(file_path, output_path, export_format, filters, logical_operator,
+                                       compression, include_headers, row_group_seconds)
+        return result
+    except Exception as e:
+        return {
+            "content": [{"text": json.dumps({"error": str(e)})}],
+            "_meta": {"tool": "export_log_file", "error": type(e).__name__},
+            "isError": True
+        }
+
+
 async def summary_report_handler(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handler wrapping the summary report capability for MCP.
@@ -209,4 +286,18 @@ async def summary_report_handler(data: Dict[str, Any]) -> Dict[str, Any]:
             "content": [{"text": json.dumps({"error": str(e)})}],
             "_meta": {"tool": "summary_report", "error": type(e).__name__},
             "isError": True
-        }
\ No newline at end of file
+        }
+
+
+async def worker_pool_status_handler() -> Dict[str, Any]:
+    """
+    Handler reporting the shared worker pool's queue depth and utilization for MCP.
+    """
+    try:
+        return get_worker_pool().stats()
+    except Exception as e:
+        return {
+            "content": [{"text": json.dumps({"error": str(e)})}],
+            "_meta": {"tool": "worker_pool_status", "error": type(e).__name__},
+            "isError": True
+        }
@@ -27,7 +27,7 @@ mcp = FastMCP("ParallelSortMCP")
 
 @mcp.tool(
     name="sort_log_by_timestamp",
-    description="Sort log file lines by timestamps in YYYY-MM-DD HH:MM:SS format. Handles edge cases like empty files and invalid timestamps."
+    description="Sort log file lines by timestamps in YYYY-MM-DD HH:MM:SS format. Handles edge cases like empty files and invalid timestamps. Large files are sorted in parallel automatically when that is estimated to be faster or the file does not fit in memory. When output_file is given, sorted lines are written there and only counts and a head/tail sample are returned."
 )
 async def sort_log_tool(log_file: str, output_file: str = None, reverse: bool = False) -> dict:
     """
@@ -46,17 +46,17 @@ async def sort_log_tool(log_file: str, output_file: str = None, reverse: bool =
 
 @mcp.tool(
     name="parallel_sort_large_file",
-    description="Sort large log files using parallel processing with chunked approach for improved performance."
+    description="Sort large log files using parallel processing with chunked approach for improved performance. Without chunk_size_mb, serial or parallel sorting, the chunk size and the worker count are chosen from file size, available memory, CPU limits and a timed sample. Sorted lines are streamed to output_file and only counts and a head/tail sample are returned."
 )
-async def parallel_sort_tool(log_file: str, output_file: str, chunk_size_mb: int = 100, num_workers: int = None) -> dict:
+async def parallel_sort_tool(log_file: str, output_file: str, chunk_size_mb: int = None, num_workers: int = None) -> dict:
     """
     Sort large log files using parallel processing with chunked approach for memory efficiency.
 
     Args:
         log_file (str): Path to large log file
         output_file (str): Path for sorted output file
-        chunk_size_mb (int, optional): Chunk size in MB (default: 100)
-        num_workers (int, optional): Number of worker processes (default: CPU count)
+        chunk_size_mb (int, optional): Chunk size in MB (default: chosen automatically)
+        num_workers (int, optional): Most worker processes used at once (default: the whole shared pool)
 
     Returns:
         dict: Dictionary with sorting results, performance metrics, and memory usage.
@@ -64,46 +64,72 @@ async def parallel_sort_tool(log_file: str, output_file: str, chunk_size_mb: int
     logger.info(f"Parallel sorting large file: {log_file}")
     return await mcp_handlers.parallel_sort_handler(log_file, output_file, chunk_size_mb, num_workers)
 
+@mcp.tool(
+    name="merge_logs",
+    description="Merge many per-rank or per-process log files from a directory or glob into one file ordered by timestamp. Inputs that are out of order are sorted in parallel first, then all inputs are k-way merged in one streaming pass; each output line is prefixed with its source (file name) and a tab. Returns only counts and a head/tail sample."
+)
+async def merge_logs_tool(input_path: str, output_file: str, num_workers: int = None,
+                          source_column: bool = True) -> dict:
+    """
+    Merge many log files into one timestamp-ordered file.
+
+    Args:
+        input_path (str): Directory whose files are merged, or a glob pattern such as 'logs/rank_*.log'
+        output_file (str): Path for the merged output file
+        num_workers (int, optional): Most worker processes used at once for sorting inputs (default: the whole shared pool)
+        source_column (bool, optional): Prefix each line with its source name and a tab (default: True)
+
+    Returns:
+        dict: Dictionary with merge results, per-input counts and a head/tail sample.
+    """
+    logger.info(f"Merging log files: {input_path}")
+    return await mcp_handlers.merge_logs_handler(input_path, output_file, num_workers, source_column)
+
 @mcp.tool(
     name="analyze_log_statistics",
-    description="Generate comprehensive statistics and analysis for log files including temporal patterns, log levels, and quality metrics."
+    description="Generate comprehensive statistics and analysis for log files including temporal patterns, log levels, and quality metrics. Large files without a current index are analyzed in parallel automatically when that is estimated to be faster. With follow, statistics are kept between calls and only lines appended since the previous call are read; rotated or truncated logs are detected and re-read."
 )
-async def analyze_statistics_tool(log_file: str, include_patterns: bool = True) -> dict:
+async def analyze_statistics_tool(log_file: str, include_patterns: bool = True, follow: bool = False) -> dict:
     """
     Perform comprehensive statistical analysis of log files including temporal patterns and log levels.
 
     Args:
         log_file (str): Path to log file
-        include_patterns (bool, optional): Include pattern analysis (default: True)
+        include_patterns (bool, optional): Include the message pattern analysis (message_analysis) (default: True)
+        follow (bool, optional): Keep statistics between calls and only read newly appended lines (default: False)
 
     Returns:
         dict: Dictionary with statistics, temporal analysis, log level distribution, and quality metrics.
     """
     logger.info(f"Analyzing log statistics: {log_file}")
-    return await mcp_handlers.analyze_statistics_handler(log_file, include_patterns)
+    return await mcp_handlers.analyze_statistics_handler(log_file, include_patterns, follow)
 
 @mcp.tool(
     name="detect_log_patterns",
-    description="Detect patterns in log files including anomalies, error clusters, trending issues, and repeated patterns."
+    description="Detect patterns in log files including anomalies, error clusters, trending issues, and repeated patterns. With follow, pattern state is kept between calls and only lines appended since the previous call are read."
 )
-async def detect_patterns_tool(log_file: str, pattern_types: list = None, sensitivity: str = None) -> dict:
+async def detect_patterns_tool(log_file: str, pattern_types: list = None, sensitivity: str = None, follow: bool = False) -> dict:
     """
     Detect patterns, anomalies, and trends in log files for proactive issue identification.
 
     Args:
         log_file (str): Path to log file
-        pattern_types (list, optional): Types of patterns to detect
-        sensitivity (str, optional): Detection sensitivity ('low', 'medium', 'high')
+        pattern_types (list, optional): Types of patterns to detect ('error_clusters', 'anomalies', 'repeated_patterns',
+            'trending_issues', 'temporal_patterns', 'message_patterns'; default: all)
+        sensitivity (str, optional): Detection sensitivity ('low', 'medium', 'high'); sets the anomaly threshold
+            to 4, 3 or 2 standard deviations (default: 'medium')
+        follow (bool, optional): Keep pattern state between calls and only read newly appended lines (default: False)
 
     Returns:
         dict: Dictionary with detected patterns, anomalies, error clusters, and trend analysis.
     """
     logger.info(f"Detecting patterns in: {log_file}")
-    return await mcp_handlers.detect_patterns_handler(log_file, pattern_types, sensitivity)
+    detection_config = {"pattern_types": pattern_types, "sensitivity": sensitivity}
+    return await mcp_handlers.detect_patterns_handler(log_file, detection_config, follow)
 
 @mcp.tool(
     name="filter_logs",
-    description="Filter log entries based on multiple conditions with support for complex logical operations."
+    description="Filter log entries based on multiple conditions with support for complex logical operations. Large files without a current index are filtered in parallel automatically when that is estimated to be faster."
 )
 async def filter_logs_tool(log_file: str, filters: list, logical_operator: str = None, output_file: str = None) -> dict:
     """
@@ -121,6 +147,29 @@ async def filter_logs_tool(log_file: str, filters: list, logical_operator: str =
     logger.info(f"Filtering logs: {log_file}")
     return await mcp_handlers.filter_logs_handler(log_file, filters, logical_operator, output_file)
 
+@mcp.tool(
+    name="parallel_filter_large_file",
+    description="Filter large log files in parallel across chunks using the same conditions as filter_logs. Matching lines keep their original order; with output_file they are streamed to disk and only counts and a head/tail sample are returned."
+)
+async def parallel_filter_tool(log_file: str, filters: list, logical_operator: str = "and", output_file: str = None,
+                               chunk_size_mb: int = None, num_workers: int = None) -> dict:
+    """
+    Filter large log files using parallel processing with chunked approach.
+
+    Args:
+        log_file (str): Path to large log file
+        filters (list): List of filter conditions
+        logical_operator (str, optional): Logical operator between filters ('AND', 'OR')
+        output_file (str, optional): Path for filtered output file
+        chunk_size_mb (int, optional): Chunk size in MB (default: chosen automatically)
+        num_workers (int, optional): Most worker processes used at once (default: the whole shared pool)
+
+    Returns:
+        dict: Dictionary with filtered results, match counts and performance metrics.
+    """
+    logger.info(f"Parallel filtering large file: {log_file}")
+    return await mcp_handlers.parallel_filter_handler(log_file, filters, logical_operator, output_file, chunk_size_mb, num_workers)
+
 @mcp.tool(
     name="filter_by_time_range",
     description="Filter log entries by time range using start and end timestamps."
@@ -258,6 +307,49 @@ async def export_text_tool(data: dict, include_summary: bool = True) -> dict:
     return await mcp_handlers.export_text_handler(data, include_summary)
 
 
+@mcp.tool(
+    name="export_log_file",
+    description="Stream a log file, optionally filtered with filter_logs conditions, to JSON-lines, CSV, Parquet or (gzip/bz2/xz compressed) text on disk in constant memory. Returns only the output path and export statistics; Parquet files of time-sorted logs get one row group per time window."
+)
+async def export_log_file_tool(log_file: str, output_file: str, export_format: str = "jsonl", filters: list = None,
+                               logical_operator: str = "and", compression: str = None,
+                               include_headers: bool = True, row_group_seconds: int = 3600) -> dict:
+    """
+    Stream log entries to an export file.
+
+    Args:
+        log_file (str): Path to the log file (e.g. a sorted or filtered output file)
+        output_file (str): Path of the export file to write
+        export_format (str, optional): 'jsonl', 'csv', 'parquet' or 'text' (default: 'jsonl')
+        filters (list, optional): Filter conditions, every line if omitted
+        logical_operator (str, optional): Logical operator between filters ('AND', 'OR')
+        compression (str, optional): 'gzip', 'bz2' or 'xz'; a Parquet codec for parquet (default: snappy)
+        include_headers (bool, optional): Whether to write the CSV header row (default: True)
+        row_group_seconds (int, optional): Time window of each Parquet row group (default: 3600)
+
+    Returns:
+        dict: Dictionary with the output path, rows exported and file size.
+    """
+    logger.info(f"Exporting {log_file} to {export_format}: {output_file}")
+    return await mcp_handlers.export_log_file_handler(log_file, output_file, export_format, filters, logical_operator,
+                                                      compression, include_headers, row_group_seconds)
+
+
+@mcp.tool(
+    name="worker_pool_status",
+    description="Report the shared worker process pool used by the parallel tools: pool size (from CPU affinity and cgroup limits), running and queued chunk tasks, active calls, completed work and worker utilization."
+)
+async def worker_pool_status_tool() -> dict:
+    """
+    Report the shared worker pool's queue depth and utilization.
+
+    Returns:
+        dict: Dictionary with pool size, running and queued tasks, and utilization.
+    """
+    logger.info("Reporting worker pool status")
+    return await mcp_handlers.worker_pool_status_handler()
+
+
 @mcp.tool(
     name="generate_summary_report",
     description="Generate a comprehensive summary report of log processing results with statistics and analysis."
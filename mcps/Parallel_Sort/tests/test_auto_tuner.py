@@ -0,0 +1,103 @@
+"""
+Tests for automatic parallelism selection.
+"""
+import os
+import time
+import pytest
+from implementation import auto_tuner
+from implementation.auto_tuner import MB, plan_execution, measure_throughput
+from implementation.parallel_processor import parallel_sort_large_file, process_single_chunk
+from implementation.worker_pool import WorkerPool
+
+
+def write_log(path, lines):
+    with open(path, 'w') as f:
+        for i in range(lines):
+            f.write(f"2024-01-15 10:{(i // 60) % 60:02d}:{i % 60:02d} INFO Request {i} handled\n")
+
+
+def unused_sample(start, end):
+    raise AssertionError("the sample should not be timed")
+
+
+@pytest.fixture
+def four_workers(monkeypatch):
+    """Plan against a four-worker pool that has not started its processes."""
+    pool = WorkerPool(workers=4)
+    monkeypatch.setattr(auto_tuner, "get_worker_pool", lambda: pool)
+    return pool
+
+
+class TestPlanExecution:
+    """Test suite for the serial/parallel cost model."""
+    
+    def test_small_file_is_serial_without_sampling(self, tmp_path, four_workers):
+        """Test that files below MIN_PARALLEL_BYTES skip the sample."""
+        path = str(tmp_path / "small.log")
+        write_log(path, 100)
+        
+        plan = plan_execution(path, "sort", unused_sample)
+        
+        assert not plan.parallel
+        assert plan.describe()["mode"] == "serial"
+    
+    def test_indexed_log_and_single_worker_are_serial(self, tmp_path, four_workers, monkeypatch):
+        """Test that a current index or a single worker keeps processing serial."""
+        monkeypatch.setattr(auto_tuner, "MIN_PARALLEL_BYTES", 0)
+        path = str(tmp_path / "app.log")
+        write_log(path, 100)
+        
+        assert not plan_execution(path, "filter", unused_sample, serial_is_indexed=True).parallel
+        assert not plan_execution(path, "filter", unused_sample, max_workers=1).parallel
+    
+    def test_slow_operation_goes_parallel(self, tmp_path, four_workers, monkeypatch):
+        """Test that a slow measured throughput makes parallel mode pay off."""
+        monkeypatch.setattr(auto_tuner, "MIN_PARALLEL_BYTES", 0)
+        monkeypatch.setattr(auto_tuner, "SAMPLE_BYTES", 64 * 1024)
+        path = str(tmp_path / "app.log")
+        write_log(path, 60000)
+        
+        slow = plan_execution(path, "analyze", lambda start, end: time.sleep(0.1))
+        fast = plan_execution(path, "analyze", lambda start, end: None)
+        
+        assert slow.parallel
+        assert slow.workers == 4
+        assert slow.serial_seconds > slow.parallel_seconds
+        assert not fast.parallel
+        assert fast.reason.startswith("parallel speedup would not cover")
+    
+    def test_memory_limit_forces_chunked_sort(self, tmp_path, four_workers, monkeypatch):
+        """Test that a sort that would not fit in memory is chunked to fit."""
+        monkeypatch.setattr(auto_tuner, "available_memory", lambda: 32 * MB)
+        path = str(tmp_path / "app.log")
+        write_log(path, 100000)
+        
+        plan = plan_execution(path, "sort", unused_sample, serial_loads_file=True)
+        
+        assert plan.parallel
+        assert plan.chunk_size_mb * MB * 4 * auto_tuner.LINE_MEMORY_FACTOR <= 16 * MB
+    
+    def test_sample_run_file_is_removed(self, tmp_path):
+        """Test that timing a sort chunk leaves no run file behind."""
+        path = str(tmp_path / "app.log")
+        write_log(path, 1000)
+        runs = []
+        
+        def sample(start, end):
+            result = process_single_chunk(path, start, end)
+            runs.append(result["temp_file"])
+            return result
+        
+        assert measure_throughput(path, sample) > 0
+        assert not os.path.exists(runs[0])
+    
+    @pytest.mark.asyncio
+    async def test_sort_reports_execution_plan(self, tmp_path):
+        """Test that an automatically planned sort reports its plan."""
+        path = str(tmp_path / "app.log")
+        write_log(path, 100)
+        
+        result = await parallel_sort_large_file(path, output_path=str(tmp_path / "sorted.log"))
+        
+        assert result["lines_written"] == 100
+        assert result["execution_plan"]["mode"] == "serial"
@@ -0,0 +1,75 @@
+"""
+Tests for the benchmark suite.
+"""
+import json
+import pytest
+import benchmark
+from benchmark import run_benchmark, parse_size, format_size, compare_runs, main
+
+
+class TestBenchmark:
+    """Test suite for the benchmark runner and its history."""
+    
+    def test_sizes(self):
+        """Test size parsing and formatting."""
+        assert parse_size("10MB") == 10 * 1024 * 1024
+        assert parse_size("1.5gb") == int(1.5 * 1024 ** 3)
+        assert parse_size("4096") == 4096
+        assert format_size(10 * 1024 ** 3) == "10GB"
+        assert format_size(1500) == "1500B"
+    
+    @pytest.mark.asyncio
+    async def test_run_records_history(self, tmp_path):
+        """Test that every case and worker count is timed and appended to the history."""
+        history = str(tmp_path / "history.json")
+        settings = dict(sizes=[64 * 1024], workers=[1, 2], cases=["sort", "time_range", "parallel_sort", "merge"],
+                        ranks=4, data_dir=str(tmp_path / "data"), history_path=history)
+        
+        run = await run_benchmark(**settings)
+        
+        cases = [(result["case"], result["workers"]) for result in run["results"]]
+        assert cases == [("sort", 1), ("time_range", 1), ("parallel_sort", 1), ("parallel_sort", 2),
+                         ("merge", 1), ("merge", 2)]
+        for result in run["results"]:
+            assert result["error"] is None
+            assert result["lines_per_second"] > 0
+            assert result["peak_rss_bytes"] > 0
+        sort_result = run["results"][0]
+        assert sort_result["output_bytes"] > 0
+        assert run["comparison"]["compared"] == 0
+        
+        # A second run reuses the generated logs and is compared with the first
+        run = await run_benchmark(**settings, threshold=-1.0)
+        saved = json.load(open(history))
+        assert len(saved["runs"]) == 2
+        assert run["comparison"]["compared"] == 6
+        assert len(run["comparison"]["regressions"]) == 6
+        assert len(list((tmp_path / "data").glob("*.log"))) == 1
+    
+    @pytest.mark.asyncio
+    async def test_memory_bound_cases_are_skipped(self, tmp_path, monkeypatch):
+        """Test that serial cases loading the whole file are skipped when it does not fit."""
+        monkeypatch.setattr(benchmark, "available_memory", lambda: 1024)
+        
+        run = await run_benchmark([16 * 1024], [1], cases=["sort", "filter"], data_dir=str(tmp_path))
+        
+        assert run["results"][0]["skipped"] == "log does not fit in memory"
+        assert run["results"][1]["error"] is None
+    
+    def test_comparison_ignores_other_settings(self):
+        """Test that runs on logs generated differently are not compared."""
+        result = {"case": "sort", "size_bytes": 1, "workers": 1, "seconds": 2.0}
+        previous = {"config": {"seed": 1}, "results": [dict(result, seconds=1.0)]}
+        
+        assert compare_runs({"config": {"seed": 2}, "results": [result]}, [previous], 0.1)["compared"] == 0
+        comparison = compare_runs({"config": {"seed": 1}, "results": [result]}, [previous], 0.1)
+        assert comparison["regressions"][0]["ratio"] == 2.0
+    
+    def test_command_line_fails_on_regression(self, tmp_path, capsys):
+        """Test the command line entry point and its regression exit status."""
+        args = ["--sizes", "16KB", "--workers", "1", "--cases", "filter", "--data-dir", str(tmp_path),
+                "--history", str(tmp_path / "history.json")]
+        
+        assert main(args) == 0
+        assert main(args + ["--threshold", "-1", "--fail-on-regression"]) == 1
+        assert "filter" in capsys.readouterr().out
@@ -4,10 +4,13 @@ Tests for the export handler capability.
 import pytest
 import json
 import csv
+import gzip
 import io
+import lzma
 from implementation.export_handler import (
-    export_to_json, export_to_csv, export_to_text, export_summary_report
+    export_to_json, export_to_csv, export_to_text, export_summary_report, export_log_file
 )
+from implementation.filter_handler import filter_logs
 
 
 class TestExportHandler:
@@ -267,4 +270,98 @@ class TestExportHandler:
         
         # Test with list instead of dict
         text_result = await export_to_text([])
-        assert "error" in text_result
\ No newline at end of file
+        assert "error" in text_result
+
+
+def write_hours_log(path, hours, per_hour=40):
+    """Write a time-sorted log with per_hour entries in each hour and a continuation line."""
+    levels = ["INFO", "ERROR", "WARN", "DEBUG"]
+    lines = []
+    for hour in range(hours):
+        for i in range(per_hour):
+            lines.append(f"2024-01-01 {hour:02d}:{i:02d}:00 {levels[i % 4]} Request {hour * per_hour + i} done")
+        lines.append("    continuation line")
+    path.write_text("\n".join(lines) + "\n")
+    return lines
+
+
+class TestExportLogFile:
+    """Test suite for streaming log exports."""
+
+    @pytest.mark.asyncio
+    async def test_jsonl_export_matches_filter(self, tmp_path):
+        """Test that a filtered JSON-lines export holds exactly the filter matches."""
+        log_path = tmp_path / "app.log"
+        write_hours_log(log_path, 3)
+        conditions = [{"field": "level", "operator": "equals", "value": "ERROR"}]
+        output = tmp_path / "errors.jsonl"
+        
+        result = await export_log_file(str(log_path), str(output), "jsonl", conditions)
+        expected = await filter_logs(str(log_path), conditions)
+        
+        assert "error" not in result
+        assert "content" not in result
+        assert result["rows_exported"] == expected["matched_lines"] == 30
+        assert result["size_bytes"] == output.stat().st_size
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [record["original_line"] for record in records] == expected["filtered_lines"]
+        assert records[0] == {
+            "line_number": 2,
+            "timestamp": "2024-01-01T00:01:00",
+            "level": "ERROR",
+            "message": "Request 1 done",
+            "original_line": "2024-01-01 00:01:00 ERROR Request 1 done"
+        }
+
+    @pytest.mark.asyncio
+    async def test_compressed_csv_and_text(self, tmp_path):
+        """Test CSV and text exports through gzip and xz compression."""
+        log_path = tmp_path / "app.log"
+        lines = write_hours_log(log_path, 2)
+        
+        csv_result = await export_log_file(str(log_path), str(tmp_path / "out.csv.gz"), "csv", compression="gzip")
+        text_result = await export_log_file(str(log_path), str(tmp_path / "out.log.xz"), "text", compression="xz")
+        
+        assert csv_result["rows_exported"] == text_result["rows_exported"] == len(lines)
+        with gzip.open(tmp_path / "out.csv.gz", 'rt', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["line_number", "timestamp", "level", "message", "original_line"]
+        assert rows[41] == ["41", "", "", "continuation line", "continuation line"]
+        with lzma.open(tmp_path / "out.log.xz", 'rt', encoding='utf-8') as f:
+            assert f.read().splitlines() == [line.strip() for line in lines]
+
+    @pytest.mark.asyncio
+    async def test_parquet_row_groups_by_time(self, tmp_path):
+        """Test that a sorted log is written with one Parquet row group per window."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        log_path = tmp_path / "app.log"
+        write_hours_log(log_path, 5)
+        output = tmp_path / "app.parquet"
+        
+        result = await export_log_file(str(log_path), str(output), "parquet", row_group_seconds=3600)
+        
+        assert "error" not in result
+        assert result["time_sorted"]
+        assert result["row_groups"] == 5
+        metadata = pq.ParquetFile(output).metadata
+        for group in range(5):
+            # Each hour holds its 40 entries and the continuation line after them
+            assert metadata.row_group(group).num_rows == 41
+            statistics = metadata.row_group(group).column(1).statistics
+            assert statistics.min.hour == statistics.max.hour == group
+        table = pq.read_table(output)
+        assert table.num_rows == 205
+        assert table.column("level").to_pylist()[:2] == ["INFO", "ERROR"]
+        assert table.column("level").to_pylist()[40] is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_export_requests(self, tmp_path):
+        """Test that unsupported formats and overwriting the source are rejected."""
+        log_path = tmp_path / "app.log"
+        write_hours_log(log_path, 1)
+        
+        assert "error" in await export_log_file(str(log_path), str(tmp_path / "out.xml"), "xml")
+        assert "error" in await export_log_file(str(log_path), str(tmp_path / "out.csv"), "csv", compression="zip")
+        assert "error" in await export_log_file(str(log_path), str(log_path), "text")
+        missing = await export_log_file(str(tmp_path / "missing.log"), str(tmp_path / "out.csv"), "csv")
+        assert "not found" in missing["error"].lower()
@@ -0,0 +1,121 @@
+"""
+Tests for compiled filter expressions.
+"""
+import pytest
+import pickle
+import tempfile
+import os
+from datetime import datetime
+from implementation.filter_engine import compile_filter, compile_condition, ConstantPredicate
+from implementation.filter_handler import parse_log_entry
+from implementation.log_index import build_index
+
+
+LOG_LINES = [
+    "2024-01-01 08:30:00 DEBUG User authentication started",
+    "2024-01-01 09:15:00 ERROR User authentication failed for 10.0.0.1",
+    "not a log line",
+    "2024-01-01 10:00:00 INFO Database connection successful",
+    "2024-01-01 11:45:00 WARN Connection timeout after 30 seconds",
+    "2024-01-01 12:00:00 CUSTOM Something else",
+]
+
+
+def make_entry(line, line_number=1):
+    try:
+        entry = parse_log_entry(line)
+    except ValueError:
+        entry = {"timestamp": None, "level": "", "message": line, "original_line": line, "is_valid": False}
+    entry["line_number"] = line_number
+    return entry
+
+
+class TestFilterEngine:
+    """Test suite for compiled filters."""
+
+    @pytest.mark.parametrize("condition,expected", [
+        ({"field": "level", "operator": "equals", "value": "error"}, True),
+        ({"field": "level", "operator": "not_equals", "value": "ERROR"}, False),
+        ({"field": "message", "operator": "contains", "value": "FAILED"}, True),
+        ({"field": "message", "operator": "not_contains", "value": "failed"}, False),
+        ({"field": "message", "operator": "starts_with", "value": "user"}, True),
+        ({"field": "message", "operator": "ends_with", "value": "10.0.0.1"}, True),
+        ({"field": "line", "operator": "regex", "value": r"\d+\.\d+\.\d+\.\d+"}, True),
+        ({"field": "message", "operator": "regex", "value": "(unclosed"}, False),
+        ({"field": "level", "operator": "in", "value": ["error", "fatal"]}, True),
+        ({"field": "level", "operator": "in", "value": "ERROR"}, False),
+        ({"field": "level", "operator": "not_in", "value": "ERROR"}, True),
+        ({"field": "timestamp", "operator": "greater_than", "value": "2024-01-01 09:00:00"}, True),
+        ({"field": "timestamp", "operator": "less_than", "value": datetime(2024, 1, 1, 9, 0)}, False),
+        ({"field": "timestamp", "operator": "between", "value": ["2024-01-01 09:00:00", "2024-01-01 09:30:00"]}, True),
+        ({"field": "timestamp", "operator": "between", "value": ["2024-01-01 09:00:00"]}, False),
+        ({"field": "line_number", "operator": "greater_than", "value": 1}, True),
+        ({"field": "line_number", "operator": "less_than", "value": "abc"}, True),
+        ({"field": "unknown", "operator": "equals", "value": ""}, True),
+        ({"field": "level", "operator": "unknown", "value": "ERROR"}, False),
+    ])
+    def test_operator_semantics(self, condition, expected):
+        """Test each operator against a single entry."""
+        entry = make_entry(LOG_LINES[1], line_number=2)
+        
+        assert compile_condition(condition)(entry) is expected
+
+    def test_malformed_condition_never_matches(self):
+        """Test that conditions that are not dictionaries compile to a non-match."""
+        predicate = compile_condition("level == ERROR")
+        
+        assert isinstance(predicate, ConstantPredicate)
+        assert not predicate(make_entry(LOG_LINES[1]))
+
+    def test_cheap_predicates_run_first(self):
+        """Test that predicates are ordered by cost."""
+        compiled = compile_filter([
+            {"field": "message", "operator": "regex", "value": "fail"},
+            {"field": "message", "operator": "contains", "value": "user"},
+            {"field": "level", "operator": "in", "value": ["ERROR"]},
+        ])
+        costs = [predicate.cost for predicate in compiled.predicates]
+        
+        assert costs == sorted(costs)
+
+    def test_compiled_filter_is_picklable(self):
+        """Test that compiled filters survive a round trip to a worker process."""
+        compiled = compile_filter([
+            {"field": "message", "operator": "regex", "value": "connection"},
+            {"field": "timestamp", "operator": "between", "value": ["2024-01-01 09:00:00", "2024-01-01 12:00:00"]},
+        ], "and")
+        restored = pickle.loads(pickle.dumps(compiled))
+        entries = [make_entry(line, number) for number, line in enumerate(LOG_LINES, 1)]
+        
+        assert [entry["original_line"] for entry in restored.filter(entries)] == [LOG_LINES[3], LOG_LINES[4]]
+
+    @pytest.mark.parametrize("conditions,logical_operator", [
+        ([{"field": "level", "operator": "in", "value": ["ERROR", "WARN"]}], "and"),
+        ([{"field": "level", "operator": "not_in", "value": ["DEBUG"]}], "and"),
+        ([{"field": "level", "operator": "regex", "value": "^(err|cust)"}], "and"),
+        ([{"field": "timestamp", "operator": "less_than", "value": "2024-01-01 10:00:00"}], "and"),
+        ([{"field": "timestamp", "operator": "between", "value": ["2024-01-01 09:00:00", "2024-01-01 11:45:00"]},
+          {"field": "message", "operator": "contains", "value": "connection"}], "and"),
+        ([{"field": "level", "operator": "equals", "value": "DEBUG"},
+          {"field": "message", "operator": "contains", "value": "timeout"}], "or"),
+        ([{"field": "line", "operator": "contains", "value": "log"},
+          {"field": "level", "operator": "equals", "value": "INFO"}], "or"),
+        ([], "or"),
+    ])
+    def test_index_selection_matches_entry_evaluation(self, conditions, logical_operator):
+        """Test that column masks give the same matches as per-entry evaluation."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            f.write("\n".join(LOG_LINES) + "\n")
+            temp_path = f.name
+        
+        try:
+            compiled = compile_filter(conditions, logical_operator)
+            rows, lines = compiled.select(build_index(temp_path))
+            entries = [make_entry(line, number) for number, line in enumerate(LOG_LINES, 1)]
+            expected = [entry["original_line"] for entry in compiled.filter(entries)]
+            
+            assert lines == expected
+            assert [LOG_LINES[row] for row in rows] == expected
+            
+        finally:
+            os.unlink(temp_path)
@@ -0,0 +1,103 @@
+"""
+Tests for following live logs.
+"""
+import os
+import pytest
+from implementation.follow_session import end_follow_sessions
+from implementation.statistics_handler import analyze_log_statistics
+from implementation.pattern_detection import detect_patterns
+
+
+def log_lines(start: int, count: int) -> str:
+    """Log lines numbered from start, one minute apart, with a trailing newline."""
+    levels = ["INFO", "ERROR", "WARN"]
+    return "".join(
+        f"2024-01-01 {i // 60 % 24:02d}:{i % 60:02d}:00 {levels[i % 3]} Request {i % 5} failed on db\n"
+        for i in range(start, start + count)
+    )
+
+
+@pytest.fixture
+def live_log(tmp_path):
+    path = tmp_path / "live.log"
+    path.write_text(log_lines(0, 40))
+    yield str(path)
+    end_follow_sessions(str(path))
+
+
+class TestFollowSession:
+    """Test suite for follow mode."""
+
+    @pytest.mark.asyncio
+    async def test_statistics_follow_appends(self, live_log):
+        """Test that followed statistics match a full analysis after appends."""
+        first = await analyze_log_statistics(live_log, follow=True)
+        assert first["follow"]["new_lines"] == 40
+        assert first["total_lines"] == 40
+        
+        with open(live_log, 'a') as f:
+            f.write(log_lines(40, 25))
+            f.write("garbage line\n")
+        
+        second = await analyze_log_statistics(live_log, follow=True)
+        full = await analyze_log_statistics(live_log)
+        
+        assert second["follow"]["new_lines"] == 26
+        assert second["follow"]["offset"] == os.path.getsize(live_log)
+        assert second["statistics"] == full["statistics"]
+        assert second["invalid_entry_details"] == full["invalid_entry_details"]
+        
+        third = await analyze_log_statistics(live_log, follow=True)
+        assert third["follow"]["new_lines"] == 0
+        assert third["statistics"] == full["statistics"]
+
+    @pytest.mark.asyncio
+    async def test_partial_line_waits_for_newline(self, live_log):
+        """Test that a line still being written is read once it is complete."""
+        await analyze_log_statistics(live_log, follow=True)
+        
+        line = log_lines(40, 1)
+        with open(live_log, 'a') as f:
+            f.write(line[:15])
+        pending = await analyze_log_statistics(live_log, follow=True)
+        assert pending["follow"]["new_lines"] == 0
+        assert pending["total_lines"] == 40
+        
+        with open(live_log, 'a') as f:
+            f.write(line[15:])
+        completed = await analyze_log_statistics(live_log, follow=True)
+        assert completed["follow"]["new_lines"] == 1
+        assert completed["valid_entries"] == 41
+
+    @pytest.mark.asyncio
+    async def test_rotation_restarts(self, live_log):
+        """Test that a rotated or truncated log is re-read from the start."""
+        await analyze_log_statistics(live_log, follow=True)
+        
+        os.rename(live_log, live_log + ".1")
+        with open(live_log, 'w') as f:
+            f.write(log_lines(100, 10))
+        rotated = await analyze_log_statistics(live_log, follow=True)
+        assert rotated["follow"]["rotated"] is True
+        assert rotated["total_lines"] == 10
+        
+        with open(live_log, 'w') as f:
+            f.write(log_lines(200, 3))
+        truncated = await analyze_log_statistics(live_log, follow=True)
+        assert truncated["follow"]["rotated"] is True
+        assert truncated["follow"]["rotations"] == 2
+        assert truncated["total_lines"] == 3
+
+    @pytest.mark.asyncio
+    async def test_patterns_follow_appends(self, live_log):
+        """Test that followed pattern detection matches a full detection after appends."""
+        await detect_patterns(live_log, follow=True)
+        with open(live_log, 'a') as f:
+            f.write(log_lines(40, 200))
+        
+        followed = await detect_patterns(live_log, follow=True)
+        full = await detect_patterns(live_log)
+        
+        assert followed["follow"]["new_lines"] == 200
+        assert followed["total_entries_analyzed"] == 240
+        assert followed["patterns"] == full["patterns"]
@@ -0,0 +1,120 @@
+"""
+Tests for the log format registry.
+"""
+import pytest
+import tempfile
+import os
+from implementation.log_formats import (
+    detect_format, detect_file_format, get_format, register_format, available_formats,
+    RegexLogFormat, strptime_parser, LEVEL_CODES, LEVEL_OTHER, NS_PER_SECOND
+)
+from implementation.sort_handler import sort_log_by_timestamp
+from implementation.statistics_handler import analyze_log_statistics
+from implementation.filter_handler import filter_by_log_level
+
+
+BASE_NS = 1705329025 * NS_PER_SECOND  # 2024-01-15 14:30:25 UTC
+
+
+class TestLogFormats:
+    """Test suite for log format detection and parsing."""
+
+    @pytest.mark.parametrize("format_name,lines", [
+        ("standard", ["2024-01-15 14:30:25 ERROR Disk full", "2024-01-15 14:31:00 INFO Recovered"]),
+        ("iso8601", ["2024-01-15T14:30:25.123Z ERROR Disk full", "2024-01-15T16:31:00+02:00 INFO Recovered"]),
+        ("bracketed", ["[2024-01-15 14:30:25] [ERROR] Disk full", "[2024-01-15 14:31:00,250] INFO Recovered"]),
+        ("syslog", ["<11>Jan 15 14:30:25 node01 kernel: Disk full", "Jan 15 14:31:00 node01 cron[42]: Recovered"]),
+        ("epoch", ["1705329025 ERROR Disk full", "1705329060.5 INFO Recovered"]),
+        ("jsonl", ['{"timestamp": "2024-01-15T14:30:25Z", "level": "error", "message": "Disk full"}',
+                   '{"ts": 1705329060000, "level": 30, "msg": "Recovered"}']),
+    ])
+    def test_detect_and_parse(self, format_name, lines):
+        """Test that each built-in format is detected and parsed into records."""
+        log_format = detect_format(lines)
+        assert log_format.name == format_name
+        
+        first = log_format.parse(lines[0])
+        assert first is not None
+        assert first.level_code == LEVEL_CODES["ERROR"]
+        
+        entry = log_format.parse_entry(lines[0])
+        assert entry.level == "ERROR"
+        assert entry.message == "Disk full"
+        assert log_format.parse_entry(lines[1]).message == "Recovered"
+        if format_name != "syslog":
+            assert first.epoch_ns // NS_PER_SECOND == BASE_NS // NS_PER_SECOND
+
+    def test_iso8601_zone_and_fraction(self):
+        """Test that zone offsets are normalized to UTC and fractions kept."""
+        record = get_format("iso8601").parse("2024-01-15T16:30:25.5+02:00 WARN Slow")
+        
+        assert record.epoch_ns == BASE_NS + NS_PER_SECOND // 2
+        assert record.level_code == LEVEL_CODES["WARN"]
+
+    def test_message_offset_points_into_line(self):
+        """Test that the compact record's offset slices out the message."""
+        line = "2024-01-15 14:30:25 CUSTOM Something happened"
+        record = get_format("standard").parse(line)
+        
+        assert record.level_code == LEVEL_OTHER
+        assert line[record.message_offset:] == "Something happened"
+
+    def test_undetectable_sample_falls_back_to_standard(self):
+        """Test that unknown content uses the default format."""
+        assert detect_format(["no timestamps", "at all"]).name == "standard"
+
+    def test_register_custom_format(self):
+        """Test registering a custom regex format and detecting it."""
+        custom = RegexLogFormat(
+            "test_slash_dates",
+            r'(?P<timestamp>\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}) (?P<level>\w+) (?P<message>.*)$',
+            strptime_parser('%d/%m/%Y %H:%M:%S'),
+            description="dd/mm/yyyy HH:MM:SS LEVEL message"
+        )
+        register_format(custom, replace=True)
+        
+        with pytest.raises(ValueError):
+            register_format(custom)
+        
+        log_format = detect_format(["15/01/2024 14:30:25 ERROR Disk full"])
+        assert log_format.name == "test_slash_dates"
+        assert log_format.parse("15/01/2024 14:30:25 ERROR Disk full").epoch_ns == BASE_NS
+        assert any(item["name"] == "test_slash_dates" for item in available_formats())
+
+    def test_get_unknown_format(self):
+        """Test that unknown names raise a descriptive error."""
+        with pytest.raises(ValueError):
+            get_format("not_a_format")
+
+    @pytest.mark.asyncio
+    async def test_handlers_accept_json_lines(self):
+        """Test that sort, statistics and filter handle JSON-lines logs."""
+        test_content = """{"time": "2024-01-15T14:32:00Z", "level": "info", "message": "Third"}
+{"time": "2024-01-15T14:30:00Z", "level": "error", "message": "First"}
+{"time": "2024-01-15T14:31:00Z", "level": "warn", "message": "Second"}
+not json at all"""
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            f.write(test_content)
+            temp_path = f.name
+        
+        try:
+            assert detect_file_format(temp_path).name == "jsonl"
+            
+            sort_result = await sort_log_by_timestamp(temp_path)
+            assert sort_result["log_format"] == "jsonl"
+            assert sort_result["valid_lines"] == 3
+            assert sort_result["invalid_lines"] == 1
+            assert [line.split('"message": ')[1] for line in sort_result["sorted_lines"]] == [
+                '"First"}', '"Second"}', '"Third"}'
+            ]
+            
+            stats_result = await analyze_log_statistics(temp_path)
+            assert stats_result["valid_entries"] == 3
+            assert stats_result["statistics"]["log_level_analysis"]["level_distribution"]["ERROR"]["count"] == 1
+            
+            filter_result = await filter_by_log_level(temp_path, ["ERROR"])
+            assert filter_result["matched_lines"] == 1
+            
+        finally:
+            os.unlink(temp_path)
@@ -0,0 +1,76 @@
+"""
+Tests for the synthetic log generator.
+"""
+import json
+import os
+import pytest
+from implementation.log_generator import generate_log, generate_rank_logs
+from implementation.log_formats import detect_file_format
+from implementation.parallel_processor import chunk_sort_keys, read_chunk_lines
+from implementation.log_parser import INVALID_KEY
+
+
+class TestLogGenerator:
+    """Test suite for generate_log and generate_rank_logs."""
+    
+    def test_same_seed_gives_same_file(self, tmp_path):
+        """Test that generation is deterministic and reaches the requested size."""
+        first = generate_log(str(tmp_path / "a.log"), 50000, disorder=0.2, seed=7)
+        second = generate_log(str(tmp_path / "b.log"), 50000, disorder=0.2, seed=7)
+        other = generate_log(str(tmp_path / "c.log"), 50000, disorder=0.2, seed=8)
+        
+        content = (tmp_path / "a.log").read_bytes()
+        assert content == (tmp_path / "b.log").read_bytes()
+        assert content != (tmp_path / "c.log").read_bytes()
+        assert 50000 <= first["bytes_written"] < 50000 + 200
+        assert first["lines_written"] == second["lines_written"] == content.count(b"\n")
+        assert other["seed"] == 8
+    
+    @pytest.mark.parametrize("log_format", ["standard", "iso8601", "jsonl", "syslog"])
+    def test_formats_are_detected(self, tmp_path, log_format):
+        """Test that each generated format is recognised and fully parsed."""
+        path = str(tmp_path / "app.log")
+        result = generate_log(path, 20000, log_format=log_format, seed=1)
+        
+        assert detect_file_format(path).name == log_format
+        keys = chunk_sort_keys(read_chunk_lines(path, 0, os.path.getsize(path)), log_format)
+        assert len(keys) == result["lines_written"]
+        assert (keys != INVALID_KEY).all()
+        if log_format == "jsonl":
+            assert set(json.loads(open(path).readline())) == {"timestamp", "level", "message"}
+    
+    def test_disorder_and_invalid_lines(self, tmp_path):
+        """Test that disorder=0 is sorted, disorder shuffles and continuation lines are counted."""
+        path = str(tmp_path / "app.log")
+        generate_log(path, 30000, seed=2)
+        keys = chunk_sort_keys(read_chunk_lines(path, 0, os.path.getsize(path)), "standard")
+        assert (keys[1:] >= keys[:-1]).all()
+        
+        result = generate_log(path, 30000, disorder=0.5, invalid_ratio=0.1, seed=2)
+        keys = chunk_sort_keys(read_chunk_lines(path, 0, os.path.getsize(path)), "standard")
+        valid = keys[keys != INVALID_KEY]
+        assert (valid[1:] < valid[:-1]).any()
+        assert int((keys == INVALID_KEY).sum()) == result["invalid_lines"] > 0
+        assert len(valid) == result["timestamped_lines"]
+    
+    def test_level_mix(self, tmp_path):
+        """Test that only levels in the mix are generated, in about its proportions."""
+        path = str(tmp_path / "app.log")
+        result = generate_log(path, 100000, level_mix={"ERROR": 1, "INFO": 3}, seed=3)
+        levels = [line.split()[2] for line in open(path)]
+        
+        assert set(levels) == {"ERROR", "INFO"}
+        assert 0.2 < levels.count("ERROR") / len(levels) < 0.3
+        assert result["level_mix"] == {"ERROR": 1, "INFO": 3}
+        
+        with pytest.raises(ValueError):
+            generate_log(path, 1000, level_mix={"INFO": 0})
+        with pytest.raises(ValueError):
+            generate_log(path, 1000, log_format="unknown")
+    
+    def test_rank_logs(self, tmp_path):
+        """Test that rank logs use consecutive seeds."""
+        results = generate_rank_logs(str(tmp_path / "ranks"), 3, 5000, seed=10)
+        
+        assert sorted(os.listdir(tmp_path / "ranks")) == ["rank_0.log", "rank_1.log", "rank_2.log"]
+        assert [result["seed"] for result in results] == [10, 11, 12]
@@ -0,0 +1,245 @@
+"""
+Tests for the persistent parsed-log index.
+"""
+import pytest
+import os
+import numpy as np
+from implementation import log_index
+from implementation.log_index import get_log_index, build_index, clear_index, index_dir_for
+from implementation.log_parser import INVALID_KEY
+from implementation.filter_handler import parse_log_entry, filter_by_log_level, filter_by_time_range
+from implementation.statistics_handler import analyze_log_statistics
+
+
+LOG_CONTENT = """2024-01-15 14:30:25 ERROR Connection to 10.0.0.1 failed after 30 seconds
+2024-01-15 14:31:00 INFO User 42 logged in
+invalid line without timestamp
+2024-01-15 14:32:15 WARNING Disk usage at 85%
+2024-01-15 14:33:00 ERROR Connection to 10.0.0.2 failed after 12 seconds
+"""
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    """Keep persisted indexes inside the test's temporary directory."""
+    monkeypatch.setenv("PARALLEL_SORT_INDEX_DIR", str(tmp_path / "index"))
+    return tmp_path / "index"
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Small log file in the test's temporary directory."""
+    path = tmp_path / "app.log"
+    path.write_text(LOG_CONTENT)
+    return str(path)
+
+
+def append(path, text):
+    with open(path, 'a') as f:
+        f.write(text)
+
+
+class TestLogIndex:
+    """Test suite for the columnar log index."""
+
+    def test_columns_match_parsed_entries(self, log_file):
+        """Test that entries built from the index equal parsed entries."""
+        index = build_index(log_file)
+        lines = index.read_lines()
+        
+        assert index.rows == 5
+        assert index.log_format.name == "standard"
+        assert index.timestamps[2] == INVALID_KEY
+        assert list(index.valid_mask) == [True, True, False, True, True]
+        
+        entries = index.entries(lines, include_invalid=True)
+        for entry, line in zip(entries, LOG_CONTENT.splitlines()):
+            if not entry["is_valid"]:
+                assert entry["original_line"] == line
+                continue
+            expected = parse_log_entry(line)
+            for key in ("timestamp", "level", "message", "original_line"):
+                assert entry[key] == expected[key]
+            assert entry["timestamp_str"] == line[:19]
+
+    def test_templates_group_variable_messages(self, log_file):
+        """Test that messages differing only in variable parts share a template."""
+        index = build_index(log_file)
+        templates = index.columns["template"]
+        
+        assert templates[0] == templates[4]
+        assert templates[0] != templates[1]
+        assert templates[2] == -1
+        assert index.templates[templates[0]] == "Connection to <*> failed after <*> seconds"
+
+    def test_read_selected_rows(self, log_file):
+        """Test reading non-contiguous rows by byte offset."""
+        index = build_index(log_file)
+        
+        assert index.read_lines([0, 3, 4]) == [LOG_CONTENT.splitlines()[i] for i in (0, 3, 4)]
+
+    def test_persisted_index_is_reused(self, log_file, index_dir):
+        """Test that an unchanged log reuses its stored index."""
+        first = get_log_index(log_file, persist=True)
+        assert first.rebuilt
+        assert os.path.isfile(os.path.join(index_dir_for(log_file), "meta.json"))
+        
+        second = get_log_index(log_file, persist=True)
+        assert not second.rebuilt
+        assert second.appended_rows == 0
+        assert np.array_equal(second.timestamps, first.timestamps)
+
+    def test_append_is_indexed_incrementally(self, log_file, index_dir):
+        """Test that appended lines are indexed without a rebuild."""
+        get_log_index(log_file, persist=True)
+        append(log_file, "2024-01-15 14:34:00 INFO Recovered\n")
+        
+        index = get_log_index(log_file, persist=True)
+        assert not index.rebuilt
+        assert index.appended_rows == 1
+        assert index.rows == 6
+        assert index.entries(index.read_lines([5]), [5])[0]["message"] == "Recovered"
+
+    def test_appended_lines_reuse_checkpointed_templates(self, log_file, index_dir):
+        """Test that appended lines are mined into the persisted templates."""
+        first = get_log_index(log_file, persist=True)
+        connection_template = int(first.columns["template"][0])
+        log_index._LOADED.clear()
+        append(log_file, "2024-01-15 14:34:00 ERROR Connection to 10.0.0.3 failed after 5 seconds\n")
+        
+        index = get_log_index(log_file, persist=True)
+        assert not index.rebuilt
+        assert int(index.columns["template"][5]) == connection_template
+        assert len(index.templates) == len(first.templates)
+
+    def test_partial_tail_is_completed_by_append(self, log_file, index_dir):
+        """Test that a line without a newline is re-indexed once completed."""
+        append(log_file, "2024-01-15 14:34:00 INF")
+        index = get_log_index(log_file, persist=True)
+        assert index.partial_tail
+        assert index.entries(index.read_lines([5]), [5])[0]["level"] == "INF"
+        
+        append(log_file, "O Recovered\n2024-01-15 14:35:00 DEBUG Next\n")
+        index = get_log_index(log_file, persist=True)
+        assert not index.rebuilt
+        assert not index.partial_tail
+        assert index.rows == 7
+        entries = index.entries(index.read_lines([5, 6]), [5, 6])
+        assert [entry["level"] for entry in entries] == ["INFO", "DEBUG"]
+
+    def test_rewritten_log_is_rebuilt(self, log_file, index_dir):
+        """Test that a truncated or rewritten log is re-indexed from scratch."""
+        get_log_index(log_file, persist=True)
+        with open(log_file, 'w') as f:
+            f.write("2024-02-01 00:00:00 INFO Fresh start\n")
+        
+        index = get_log_index(log_file, persist=True)
+        assert index.rebuilt
+        assert index.rows == 1
+        
+        assert clear_index(log_file)
+        assert not os.path.exists(index_dir_for(log_file))
+
+    @pytest.mark.asyncio
+    async def test_handlers_share_the_index(self, log_file, index_dir, monkeypatch):
+        """Test that handlers give the same results through a persisted index."""
+        monkeypatch.setattr(log_index, "INDEX_MIN_BYTES", 0)
+        
+        filter_result = await filter_by_log_level(log_file, ["ERROR"])
+        assert filter_result["matched_lines"] == 2
+        
+        stats_result = await analyze_log_statistics(log_file)
+        assert stats_result["valid_entries"] == 4
+        assert stats_result["invalid_entries"] == 1
+        assert stats_result["invalid_entry_details"][0]["line_number"] == 3
+        assert os.path.isdir(index_dir_for(log_file))
+
+
+def write_minutes(path, minutes, every_invalid=0):
+    """Write one line per minute offset, optionally with invalid lines interleaved."""
+    with open(path, 'w') as f:
+        for position, minute in enumerate(minutes):
+            f.write(f"2024-01-15 {minute // 60:02d}:{minute % 60:02d}:00 INFO Event at minute {minute}\n")
+            if every_invalid and position % every_invalid == 0:
+                f.write("    continuation line\n")
+
+
+class TestTimeRangeQueries:
+    """Test suite for time-range queries over the index."""
+
+    def brute_force(self, path, start_minute, end_minute):
+        lines = []
+        for line in open(path):
+            if line.startswith("2024"):
+                minute = int(line[11:13]) * 60 + int(line[14:16])
+                if start_minute <= minute <= end_minute:
+                    lines.append(line.strip())
+        return lines
+
+    @pytest.mark.asyncio
+    async def test_sorted_log_uses_bisect(self, tmp_path):
+        """Test bisection on a sorted log with duplicates and invalid lines."""
+        path = str(tmp_path / "sorted.log")
+        write_minutes(path, sorted(list(range(0, 600)) + list(range(100, 200))), every_invalid=7)
+        
+        result = await filter_by_time_range(path, "2024-01-15 01:40:00", "2024-01-15 03:20:00")
+        
+        assert result["search_method"] == "index_bisect"
+        assert result["filtered_lines"] == self.brute_force(path, 100, 200)
+
+    @pytest.mark.asyncio
+    async def test_range_outside_log(self, tmp_path):
+        """Test ranges before, after and between entries."""
+        path = str(tmp_path / "sorted.log")
+        write_minutes(path, [10, 20, 30])
+        
+        for start, end in (("00:00:00", "00:05:00"), ("00:40:00", "01:00:00"), ("00:11:00", "00:19:00")):
+            result = await filter_by_time_range(path, f"2024-01-15 {start}", f"2024-01-15 {end}")
+            assert result["matched_lines"] == 0
+        
+        result = await filter_by_time_range(path, "2024-01-15 00:20:00", "2024-01-15 00:20:00")
+        assert result["matched_lines"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unsorted_log_scans_index(self, tmp_path):
+        """Test that unsorted logs fall back to a scan of the timestamp column."""
+        path = str(tmp_path / "unsorted.log")
+        write_minutes(path, [300, 5, 120, 45, 500, 130])
+        
+        result = await filter_by_time_range(path, "2024-01-15 02:00:00", "2024-01-15 05:00:00")
+        
+        assert result["search_method"] == "index_scan"
+        assert result["filtered_lines"] == self.brute_force(path, 120, 300)
+
+    @pytest.mark.asyncio
+    async def test_large_log_out_of_order_between_samples(self, tmp_path, index_dir, monkeypatch):
+        """Test that a mostly sorted large log keeps lines that are out of order between sampled offsets."""
+        monkeypatch.setattr(log_index, "INDEX_MIN_BYTES", 0)
+        path = str(tmp_path / "large.log")
+        minutes = list(range(0, 1440))
+        minutes[900] = 610
+        minutes[1200] = 615
+        write_minutes(path, minutes, every_invalid=11)
+        
+        result = await filter_by_time_range(path, "2024-01-15 10:00:00", "2024-01-15 10:30:00")
+        
+        assert result["search_method"] == "index_scan"
+        assert result["filtered_lines"] == self.brute_force(path, 600, 630)
+        assert result["matched_lines"] == 33
+        assert result["total_lines"] == 1440 + 131
+        assert result["match_percentage"] == round(33 / 1571 * 100, 2)
+        assert os.path.isdir(index_dir_for(path))
+
+    @pytest.mark.asyncio
+    async def test_unsorted_large_log_builds_index(self, tmp_path, index_dir, monkeypatch):
+        """Test that an unsorted large log is answered from a persisted index."""
+        monkeypatch.setattr(log_index, "INDEX_MIN_BYTES", 0)
+        path = str(tmp_path / "large.log")
+        write_minutes(path, list(range(1439, -1, -1)))
+        
+        result = await filter_by_time_range(path, "2024-01-15 10:00:00", "2024-01-15 10:30:00")
+        
+        assert result["search_method"] == "index_scan"
+        assert result["matched_lines"] == 31
+        assert result["total_lines"] == 1440
+        assert os.path.isdir(index_dir_for(path))
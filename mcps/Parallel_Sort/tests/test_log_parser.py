@@ -0,0 +1,71 @@
+"""
+Tests for the shared log parsing kernel.
+"""
+import calendar
+import pytest
+from datetime import datetime
+from implementation.log_parser import (
+    timestamp_key, scan_timestamp, key_to_datetime, parse_log_line,
+    parse_timestamp_keys, INVALID_KEY
+)
+
+
+class TestLogParser:
+    """Test suite for log parser functionality."""
+
+    def test_timestamp_key_matches_epoch_seconds(self):
+        """Test that keys equal seconds since the epoch."""
+        for dt in [datetime(2024, 1, 15, 14, 30, 25), datetime(2024, 2, 29, 23, 59, 59),
+                   datetime(1969, 12, 31, 0, 0, 1), datetime(2000, 3, 1, 0, 0, 0)]:
+            key = timestamp_key(dt.strftime('%Y-%m-%d %H:%M:%S'))
+            assert key == calendar.timegm(dt.timetuple())
+            assert key_to_datetime(key) == dt
+
+    def test_timestamp_key_rejects_invalid_values(self):
+        """Test that out-of-range fields are rejected like strptime."""
+        for value in ["2024-13-15 14:30:25", "2024-01-32 14:30:25", "2023-02-29 00:00:00",
+                      "2024-01-15 24:00:00", "2024-01-15 14:60:00", "2024-1-15 14:30:25"]:
+            with pytest.raises(ValueError):
+                timestamp_key(value)
+
+    def test_scan_timestamp_fast_and_fallback_paths(self):
+        """Test leading timestamps and timestamps found later in the line."""
+        assert scan_timestamp("2024-01-15 14:30:25 INFO Test") == (1705329025, 0, 19)
+        assert scan_timestamp("[2024-01-15 14:30:25] INFO Test") == (1705329025, 1, 20)
+        assert scan_timestamp("2024-01-15   14:30:25 INFO Test")[0] == 1705329025
+        
+        with pytest.raises(ValueError):
+            scan_timestamp("No timestamp here")
+        with pytest.raises(ValueError):
+            scan_timestamp("2024/01/15 14:30:25 Wrong format")
+
+    def test_parse_log_line(self):
+        """Test splitting a line into key, level and message."""
+        parsed = parse_log_line("2024-01-15 14:30:25 error Disk full on /dev/sda")
+        
+        assert parsed["key"] == 1705329025
+        assert parsed["timestamp_str"] == "2024-01-15 14:30:25"
+        assert parsed["level"] == "ERROR"
+        assert parsed["message"] == "Disk full on /dev/sda"
+
+    def test_parse_timestamp_keys_matches_scalar_path(self):
+        """Test that the vectorized path agrees with scan_timestamp on every line."""
+        lines = [
+            "2024-01-15 14:30:25 INFO Fast path",
+            "[2024-01-15 14:30:26] INFO Fallback path",
+            "2024-13-15 14:30:25 ERROR Invalid month",
+            "Invalid line",
+            "",
+            "2024-01-15\t14:30:27 DEBUG Tab separated",
+            "é" * 25
+        ]
+        
+        keys = parse_timestamp_keys(lines)
+        
+        for line, key in zip(lines, keys):
+            try:
+                expected = scan_timestamp(line)[0]
+            except ValueError:
+                expected = INVALID_KEY
+            assert key == expected
+        assert len(parse_timestamp_keys([])) == 0
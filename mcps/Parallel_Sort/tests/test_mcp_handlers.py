@@ -4,7 +4,7 @@ Tests for MCP handlers.
 import pytest
 import tempfile
 import os
-from mcp_handlers import sort_log_handler
+from mcp_handlers import sort_log_handler, filter_logs_handler, analyze_statistics_handler
 
 
 class TestMCPHandlers:
@@ -56,4 +56,47 @@ class TestMCPHandlers:
             assert "empty" in result["message"].lower()
             
         finally:
-            os.unlink(temp_path)
\ No newline at end of file
+            os.unlink(temp_path)
+
+    @pytest.mark.asyncio
+    async def test_filter_logs_handler_output_file(self):
+        """Test filter_logs handler streams matches to the requested output file."""
+        test_content = """2024-01-01 08:30:00 ERROR Disk full
+2024-01-01 08:31:00 INFO Retrying
+2024-01-01 08:32:00 ERROR Disk still full"""
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, "app.log")
+            output_path = os.path.join(temp_dir, "errors.log")
+            with open(temp_path, 'w') as f:
+                f.write(test_content)
+            
+            result = await filter_logs_handler(temp_path, [{"field": "level", "operator": "equals", "value": "ERROR"}], "and", output_path)
+            
+            assert result["output_file"] == output_path
+            with open(output_path) as f:
+                assert f.read().splitlines() == [
+                    "2024-01-01 08:30:00 ERROR Disk full",
+                    "2024-01-01 08:32:00 ERROR Disk still full"
+                ]
+
+    @pytest.mark.asyncio
+    async def test_analyze_statistics_handler_without_patterns(self):
+        """Test include_patterns=False leaves out the message analysis."""
+        test_content = """2024-01-01 08:30:00 INFO User login
+2024-01-01 08:31:00 INFO User login"""
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            f.write(test_content)
+            temp_path = f.name
+        
+        try:
+            with_patterns = await analyze_statistics_handler(temp_path)
+            without_patterns = await analyze_statistics_handler(temp_path, include_patterns=False)
+            
+            assert "message_analysis" in with_patterns["statistics"]
+            assert "message_analysis" not in without_patterns["statistics"]
+            assert "basic_statistics" in without_patterns["statistics"]
+            
+        finally:
+            os.unlink(temp_path)
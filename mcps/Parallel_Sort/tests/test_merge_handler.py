@@ -0,0 +1,109 @@
+"""
+Tests for the multi-file log merge capability.
+"""
+import pytest
+from implementation import merge_handler
+from implementation.merge_handler import merge_logs, source_names
+
+
+def write_rank(path, seconds, rank, reverse=False, invalid_after=None):
+    """Write one line per second offset for a rank, optionally in reverse order."""
+    lines = []
+    for second in sorted(seconds, reverse=reverse):
+        lines.append(f"2024-01-15 10:{second // 60:02d}:{second % 60:02d} INFO rank {rank} step {second}")
+        if invalid_after == second:
+            lines.append("    continuation line")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def merged_lines(path):
+    with open(path) as f:
+        return [line.rstrip('\n') for line in f]
+
+
+class TestMergeLogs:
+    """Test suite for merging per-rank logs."""
+    
+    @pytest.mark.asyncio
+    async def test_ranks_merge_by_timestamp(self, tmp_path):
+        """Test that sorted and unsorted ranks merge in time order with a source column."""
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        write_rank(logs / "rank_10.log", [0, 5, 9], 10)
+        write_rank(logs / "rank_2.log", [1, 5, 8], 2, reverse=True)
+        write_rank(logs / "rank_1.log", [3, 4, 5], 1, invalid_after=4)
+        output = tmp_path / "merged.log"
+        
+        result = await merge_logs(str(logs), str(output))
+        
+        assert "error" not in result
+        assert result["input_files"] == 3
+        assert result["unsorted_sources"] == ["rank_2"]
+        assert result["valid_lines"] == 9
+        assert result["invalid_lines"] == 1
+        assert result["invalid_entries"][0]["source"] == "rank_1"
+        
+        lines = merged_lines(output)
+        assert result["lines_written"] == len(lines) == 9
+        assert [line.split('\t')[0] for line in lines] == [
+            "rank_10", "rank_2", "rank_1", "rank_1", "rank_1", "rank_2", "rank_10", "rank_2", "rank_10"
+        ]
+        assert lines[1] == "rank_2\t2024-01-15 10:00:01 INFO rank 2 step 1"
+    
+    @pytest.mark.asyncio
+    async def test_readers_reopen_past_open_file_limit(self, tmp_path, monkeypatch):
+        """Test that readers past MAX_OPEN_FILES give the same merge in small blocks."""
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        for rank in range(6):
+            write_rank(logs / f"rank_{rank}.log", range(rank, 600, 6), rank, reverse=rank == 3)
+        
+        expected = await merge_logs(str(logs), str(tmp_path / "expected.log"), source_column=False)
+        monkeypatch.setattr(merge_handler, "MAX_OPEN_FILES", 2)
+        monkeypatch.setattr(merge_handler, "MIN_MERGE_BUFFER_BYTES", 64)
+        monkeypatch.setattr(merge_handler, "MERGE_MEMORY_BYTES", 64)
+        result = await merge_logs(str(logs), str(tmp_path / "merged.log"), source_column=False)
+        
+        lines = merged_lines(tmp_path / "merged.log")
+        assert result["lines_written"] == expected["lines_written"] == 600
+        assert lines == merged_lines(tmp_path / "expected.log")
+        assert lines == sorted(lines)
+    
+    @pytest.mark.asyncio
+    async def test_separator_characters_stay_in_their_line(self, tmp_path):
+        """Test that form feeds, separators and U+2028 in messages do not split merged lines."""
+        (tmp_path / "a.log").write_text("2024-01-15 10:00:00 INFO page\x0cbreak\r\n2024-01-15 10:00:02 INFO a\x1eb\n")
+        (tmp_path / "b.log").write_text("2024-01-15 10:00:03 INFO next\u2028line\n2024-01-15 10:00:01 INFO x\x85y\n")
+        output = tmp_path / "merged.log"
+        
+        result = await merge_logs(str(tmp_path / "*.log"), str(output), source_column=False)
+        
+        assert result["valid_lines"] == 4
+        assert result["invalid_lines"] == 0
+        with open(output, newline='') as f:
+            assert f.read().split('\n')[:-1] == [
+                "2024-01-15 10:00:00 INFO page\x0cbreak", "2024-01-15 10:00:01 INFO x\x85y",
+                "2024-01-15 10:00:02 INFO a\x1eb", "2024-01-15 10:00:03 INFO next\u2028line"
+            ]
+    
+    @pytest.mark.asyncio
+    async def test_glob_input_skips_output(self, tmp_path):
+        """Test glob inputs, and that an output file matching the glob is not merged."""
+        write_rank(tmp_path / "a.log", [0, 2], 0)
+        write_rank(tmp_path / "b.log", [1], 1)
+        output = tmp_path / "merged.log"
+        output.write_text("2024-01-15 09:00:00 INFO stale output\n")
+        
+        result = await merge_logs(str(tmp_path / "*.log"), str(output))
+        
+        assert result["input_files"] == 2
+        assert [line.split('\t')[0] for line in merged_lines(output)] == ["a", "b", "a"]
+        
+        missing = await merge_logs(str(tmp_path / "*.txt"), str(tmp_path / "out.log"))
+        assert "error" in missing
+    
+    def test_source_names_keep_subdirectories(self, tmp_path):
+        """Test that inputs in different directories keep their distinguishing path."""
+        names = source_names([str(tmp_path / "node1" / "rank_0.log"), str(tmp_path / "node2" / "rank_0.log")])
+        
+        assert names == ["node1/rank_0", "node2/rank_0"]
@@ -0,0 +1,298 @@
+"""
+Tests for the parallel processor capability.
+"""
+import pytest
+import tempfile
+import os
+from implementation.parallel_processor import (
+    parallel_sort_large_file, parallel_analyze_large_file, process_single_chunk,
+    merge_sorted_chunks, read_sorted_run, compute_chunk_ranges, read_chunk_lines,
+    parallel_filter_large_file
+)
+from implementation.filter_handler import filter_logs
+from implementation.statistics_handler import analyze_log_statistics
+
+
+def write_temp_log(content: str) -> str:
+    """Write content to a temporary log file and return its path."""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+        f.write(content)
+        return f.name
+
+
+class TestParallelProcessor:
+    """Test suite for parallel processor functionality."""
+
+    def test_compute_chunk_ranges_aligns_to_lines(self):
+        """Test that byte ranges cover the file and never split a line."""
+        lines = [f"2024-01-01 10:00:{i % 60:02d} INFO Line {i} " + "z" * (i % 7) for i in range(200)]
+        temp_path = write_temp_log("\n".join(lines))
+        
+        try:
+            ranges = compute_chunk_ranges(temp_path, 500)
+            
+            assert len(ranges) > 1
+            assert ranges[0][0] == 0
+            assert ranges[-1][1] == os.path.getsize(temp_path)
+            for (_, prev_end), (next_start, _) in zip(ranges, ranges[1:]):
+                assert prev_end == next_start
+            
+            collected = []
+            for start, end in ranges:
+                collected.extend(read_chunk_lines(temp_path, start, end))
+            assert collected == lines
+            
+        finally:
+            os.unlink(temp_path)
+
+    def test_read_chunk_lines_splits_only_on_newlines(self):
+        """Test that separator characters inside a line do not split it."""
+        lines = ["2024-01-01 10:00:00 INFO page\x0cbreak", "2024-01-01 10:00:01 INFO a\x1cb\x1dc\x1ed",
+                 "2024-01-01 10:00:02 INFO next\x85line\u2028here", ""]
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.log') as f:
+            f.write("\r\n".join(lines).encode('utf-8') + b"\n2024-01-01 10:00:03 INFO last")
+            temp_path = f.name
+        
+        try:
+            assert read_chunk_lines(temp_path, 0, os.path.getsize(temp_path)) == lines + ["2024-01-01 10:00:03 INFO last"]
+            
+        finally:
+            os.unlink(temp_path)
+
+    def test_process_single_chunk_writes_keyed_run(self):
+        """Test that a chunk worker spills a sorted run with integer keys."""
+        chunk_path = write_temp_log("""2024-01-01 10:00:00 INFO Later
+not a log line
+2024-01-01 09:00:00 ERROR Earlier
+""")
+        
+        try:
+            result = process_single_chunk(chunk_path, 0, os.path.getsize(chunk_path))
+            
+            assert "error" not in result
+            assert "sorted_lines" not in result
+            assert result["valid_lines"] == 2
+            assert result["invalid_lines"] == 1
+            
+            run = list(read_sorted_run(result["temp_file"]))
+            assert [line for _, line in run] == [
+                "2024-01-01 09:00:00 ERROR Earlier",
+                "2024-01-01 10:00:00 INFO Later"
+            ]
+            assert run[1][0] - run[0][0] == 3600 * 10**9
+            os.unlink(result["temp_file"])
+            
+        finally:
+            os.unlink(chunk_path)
+
+    @pytest.mark.asyncio
+    async def test_merge_sorted_chunks_streams_to_file(self):
+        """Test k-way merge of several runs into one output file."""
+        chunk_paths = [
+            write_temp_log("2024-01-01 10:00:00 INFO A\n2024-01-01 08:00:00 INFO B\n"),
+            write_temp_log("2024-01-01 09:00:00 INFO C\n2024-01-01 10:00:00 WARN D\n"),
+            write_temp_log("2024-01-01 07:00:00 INFO E\n")
+        ]
+        sorted_chunks = [process_single_chunk(path, 0, os.path.getsize(path)) for path in chunk_paths]
+        output_fd, output_path = tempfile.mkstemp(suffix='.log')
+        os.close(output_fd)
+        
+        try:
+            result = await merge_sorted_chunks(sorted_chunks, output_path)
+            
+            assert "error" not in result
+            assert result["lines_written"] == 5
+            assert result["valid_lines"] == 5
+            
+            with open(output_path, 'r', encoding='utf-8') as f:
+                merged = f.read().splitlines()
+            
+            # Equal timestamps keep their chunk order
+            assert merged == [
+                "2024-01-01 07:00:00 INFO E",
+                "2024-01-01 08:00:00 INFO B",
+                "2024-01-01 09:00:00 INFO C",
+                "2024-01-01 10:00:00 INFO A",
+                "2024-01-01 10:00:00 WARN D"
+            ]
+            
+        finally:
+            for path in chunk_paths + [chunk["temp_file"] for chunk in sorted_chunks] + [output_path]:
+                os.unlink(path)
+
+    @pytest.mark.asyncio
+    async def test_parallel_sort_large_file_multiple_chunks(self):
+        """Test that a file spanning several chunks sorts like the serial path."""
+        lines = [
+            f"2024-01-01 {hour:02d}:{minute:02d}:{second:02d} INFO Message {hour}-{minute}-{second} " + "x" * 120
+            for second in range(60) for minute in range(60) for hour in (3, 1, 2)
+        ]
+        temp_path = write_temp_log("\n".join(lines) + "\n")
+        
+        try:
+            result = await parallel_sort_large_file(temp_path, chunk_size_mb=1, max_workers=2)
+            
+            assert "error" not in result
+            assert result["parallel_processing"] is True
+            assert result["chunks_processed"] > 1
+            assert result["valid_lines"] == len(lines)
+            assert result["sorted_lines"] == sorted(lines, key=lambda line: line[:19])
+            
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.asyncio
+    async def test_parallel_sort_to_output_file(self):
+        """Test that output_path mode streams the merge to disk without inline lines."""
+        lines = [
+            f"2024-01-01 {hour:02d}:{minute:02d}:{second:02d} INFO Message " + "y" * 120
+            for second in range(60) for minute in range(60) for hour in (2, 1, 0)
+        ]
+        temp_path = write_temp_log("\n".join(lines) + "\n")
+        output_path = temp_path + ".sorted"
+        
+        try:
+            result = await parallel_sort_large_file(
+                temp_path, chunk_size_mb=1, max_workers=2, output_path=output_path
+            )
+            
+            expected = sorted(lines, key=lambda line: line[:19])
+            assert "error" not in result
+            assert "sorted_lines" not in result
+            assert result["output_file"] == output_path
+            assert result["lines_written"] == len(lines)
+            assert result["head_sample"] == expected[:5]
+            assert result["tail_sample"] == expected[-5:]
+            
+            with open(output_path, 'r', encoding='utf-8') as f:
+                assert f.read().splitlines() == expected
+            
+        finally:
+            os.unlink(temp_path)
+            if os.path.exists(output_path):
+                os.unlink(output_path)
+
+    @pytest.mark.asyncio
+    async def test_parallel_analyze_large_file_counts(self):
+        """Test that parallel analysis counts every line across byte ranges."""
+        levels = ["INFO", "ERROR", "WARN"]
+        lines = [
+            f"2024-01-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d} {levels[i % 3]} Event {i} " + "w" * 120
+            for i in range(9000)
+        ]
+        temp_path = write_temp_log("\n".join(lines) + "\nnot a log line\n")
+        
+        try:
+            result = await parallel_analyze_large_file(temp_path, chunk_size_mb=1, max_workers=2)
+            
+            assert "error" not in result
+            assert result["chunks_analyzed"] > 1
+            assert result["total_lines"] == 9001
+            assert result["valid_entries"] == 9000
+            assert result["invalid_entries"] == 1
+            
+            level_dist = result["statistics"]["log_level_analysis"]["level_distribution"]
+            assert level_dist["ERROR"]["count"] == 3000
+            
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.asyncio
+    async def test_parallel_analyze_matches_serial_statistics(self, tmp_path, monkeypatch):
+        """Test that merged chunk statistics equal the single-pass statistics."""
+        monkeypatch.setenv("PARALLEL_SORT_INDEX_DIR", str(tmp_path / "index"))
+        levels = ["INFO", "ERROR", "WARN", "DEBUG"]
+        lines = []
+        for i in range(9000):
+            # Every 50th entry is logged late, and every 997th line is garbage
+            second = i - 30 if i % 50 == 0 and i >= 30 else i
+            lines.append(
+                f"2024-01-{1 + second // 86400:02d} {second // 3600 % 24:02d}:{second // 60 % 60:02d}:{second % 60:02d} "
+                f"{levels[i % 4]} Request {i % 400} handled by worker {i % 7} " + "u" * 100
+            )
+            if i % 997 == 0:
+                lines.append("stack frame without timestamp")
+        temp_path = write_temp_log("\n".join(lines) + "\n")
+        
+        try:
+            serial = await analyze_log_statistics(temp_path)
+            parallel = await parallel_analyze_large_file(temp_path, chunk_size_mb=1, max_workers=2)
+            
+            assert "error" not in parallel
+            assert parallel["chunks_analyzed"] > 1
+            assert parallel["statistics"] == serial["statistics"]
+            assert parallel["invalid_entry_details"] == serial["invalid_entry_details"]
+            
+            temporal = parallel["statistics"]["temporal_analysis"]
+            assert temporal["inter_arrival_seconds"]["out_of_order"] == 179
+            assert temporal["inter_arrival_seconds"]["median"] == pytest.approx(1.0, rel=0.01)
+            assert parallel["statistics"]["message_analysis"]["unique_messages"] == 2800
+            assert parallel["statistics"]["message_analysis"]["unique_templates"] == 1
+            
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.asyncio
+    async def test_parallel_filter_matches_serial_filter(self, tmp_path, monkeypatch):
+        """Test that parallel filtering returns the serial matches in file order."""
+        monkeypatch.setenv("PARALLEL_SORT_INDEX_DIR", str(tmp_path / "index"))
+        levels = ["INFO", "ERROR", "WARN", "DEBUG"]
+        lines = [
+            f"2024-01-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d} {levels[i % 4]} Request {i} "
+            + ("timeout " if i % 7 == 0 else "") + "v" * 120
+            for i in range(9000)
+        ]
+        temp_path = write_temp_log("\n".join(lines) + "\n")
+        conditions = [
+            {"field": "level", "operator": "equals", "value": "ERROR"},
+            {"field": "message", "operator": "contains", "value": "TIMEOUT"},
+        ]
+        
+        try:
+            serial = await filter_logs(temp_path, conditions, "or")
+            result = await parallel_filter_large_file(temp_path, conditions, "or", chunk_size_mb=1, max_workers=2)
+            
+            assert "error" not in result
+            assert result["chunks_processed"] > 1
+            assert result["total_lines"] == 9000
+            assert result["filtered_lines"] == serial["filtered_lines"]
+            assert result["matched_lines"] == serial["matched_lines"]
+            
+            # Line numbers stay global across chunks
+            by_line = await parallel_filter_large_file(
+                temp_path, [{"field": "line_number", "operator": "between", "value": [4500, 4502]}],
+                chunk_size_mb=1, max_workers=2
+            )
+            assert by_line["filtered_lines"] == lines[4499:4502]
+            
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.asyncio
+    async def test_parallel_filter_to_output_file(self):
+        """Test that output_path mode streams matches to disk in original order."""
+        lines = [
+            f"2024-01-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d} INFO Job {i} " + "u" * 120
+            for i in range(9000)
+        ]
+        temp_path = write_temp_log("\n".join(lines) + "\n")
+        output_path = temp_path + ".filtered"
+        
+        try:
+            result = await parallel_filter_large_file(
+                temp_path, [{"field": "message", "operator": "regex", "value": r"Job \d*5 "}],
+                output_path=output_path, chunk_size_mb=1, max_workers=2
+            )
+            
+            expected = [line for line in lines if line.split()[4].endswith("5")]
+            assert "filtered_lines" not in result
+            assert result["lines_written"] == len(expected)
+            assert result["head_sample"] == expected[:5]
+            
+            with open(output_path, 'r', encoding='utf-8') as f:
+                assert f.read().splitlines() == expected
+            
+        finally:
+            os.unlink(temp_path)
+            if os.path.exists(output_path):
+                os.unlink(output_path)
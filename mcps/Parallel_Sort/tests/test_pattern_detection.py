@@ -4,9 +4,12 @@ Tests for the pattern detection capability.
 import pytest
 import tempfile
 import os
+import numpy as np
 from implementation.pattern_detection import (
-    detect_patterns, detect_error_clusters, normalize_message_for_pattern
+    detect_patterns, detect_error_clusters, normalize_message_for_pattern,
+    PatternState, first_beyond
 )
+from implementation.log_index import build_index
 
 
 class TestPatternDetection:
@@ -165,6 +168,61 @@ class TestPatternDetection:
         finally:
             os.unlink(temp_path)
 
+    @pytest.mark.asyncio
+    async def test_message_patterns_keep_category_words(self):
+        """Test categories come from each message, not from its generalized template."""
+        words = ["fast", "slow", "fast", "unauthorized", "fast", "slow", "fast", "fast", "fast", "fast", "fast"]
+        levels = {"slow": "WARN", "unauthorized": "ERROR"}
+        test_content = "\n".join(
+            f"2024-01-01 08:{minute:02d}:00 {levels.get(word, 'INFO')} Request handled {word}"
+            for minute, word in enumerate(words)
+        )
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            f.write(test_content)
+            temp_path = f.name
+        
+        try:
+            result = await detect_patterns(temp_path)
+            
+            patterns = result["patterns"]["message_patterns"]["detected_patterns"]
+            assert {name: stats["total_matches"] for name, stats in patterns.items()} == {
+                "performance": 2, "authentication": 1, "security": 1
+            }
+            assert patterns["performance"]["level_distribution"] == {"WARN": 2}
+            assert patterns["security"]["sample_messages"] == [{
+                "timestamp": "2024-01-01T08:03:00",
+                "level": "ERROR",
+                "message": "Request handled unauthorized"
+            }]
+            
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.asyncio
+    async def test_pattern_types_and_sensitivity(self):
+        """Test pattern_types limits the sections and sensitivity sets the anomaly threshold."""
+        test_content = """2024-01-01 08:30:00 ERROR Database connection failed
+2024-01-01 08:31:00 ERROR Query timeout
+2024-01-01 09:00:00 INFO System recovered"""
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            f.write(test_content)
+            temp_path = f.name
+        
+        try:
+            result = await detect_patterns(temp_path, {"pattern_types": ["error_clusters", "anomalies"], "sensitivity": "high"})
+            
+            assert list(result["patterns"]) == ["error_clusters", "anomalies"]
+            assert result["detection_config"]["anomaly_threshold"] == 2.0
+            assert result["summary"]["high_priority_findings"] == ["1 error clusters detected"]
+            
+            assert "error" in await detect_patterns(temp_path, {"pattern_types": ["clusters"]})
+            assert "error" in await detect_patterns(temp_path, {"sensitivity": "extreme"})
+            
+        finally:
+            os.unlink(temp_path)
+
     def test_normalize_message_for_pattern(self):
         """Test message normalization for pattern matching."""
         test_cases = [
@@ -235,4 +293,54 @@ class TestPatternDetection:
             assert total_findings > 0
             
         finally:
-            os.unlink(temp_path)
\ No newline at end of file
+            os.unlink(temp_path)
+
+    def test_batches_match_single_pass(self, tmp_path):
+        """Test that adding an index in small batches gives the single-pass patterns."""
+        levels = ["ERROR", "INFO", "ERROR", "WARN", "FATAL"]
+        lines = [
+            f"2024-01-01 {i * 37 // 3600 % 24:02d}:{i * 37 // 60 % 60:02d}:{i * 37 % 60:02d} "
+            f"{levels[i % 5]} Connection {i % 11} to db timeout"
+            for i in range(2000)
+        ]
+        path = tmp_path / "batches.log"
+        path.write_text("\n".join(lines) + "\n")
+        config = {"error_cluster_window": 120, "anomaly_threshold": 3.0,
+                  "pattern_min_frequency": 3, "trending_window": 3600}
+        index = build_index(str(path))
+        
+        single = PatternState(config)
+        single.add_index(index)
+        batched = PatternState(config)
+        batched.add_index(index, batch_rows=7)
+        
+        assert batched.report() == single.report()
+        assert single.error_clusters()["total_clusters"] > 100
+
+    def test_rolling_baseline_flags_spike(self):
+        """Test that a spike after steady hours is flagged and steady growth is not."""
+        config = {"error_cluster_window": 300, "anomaly_threshold": 3.0,
+                  "pattern_min_frequency": 3, "trending_window": 3600}
+        hour_ns = 3600 * 10**9
+        # Volume grows by 5 entries per hour, with one spike at hour 30
+        counts = [20 + 5 * hour for hour in range(48)]
+        counts[30] *= 3
+        timestamps = np.concatenate([hour * hour_ns + np.arange(count) for hour, count in enumerate(counts)])
+        
+        state = PatternState(config)
+        state.add_batch(timestamps, np.zeros(len(timestamps), dtype=np.int64), ["INFO"], ["steady"] * len(timestamps))
+        anomalies = state.anomalies()
+        
+        assert [anomaly["hour"] for anomaly in anomalies["anomalies"]] == ["1970-01-02 06"]
+        assert anomalies["anomalies"][0]["type"] == "high_volume"
+        assert anomalies["baseline_stats"]["baseline_window_hours"] == 24
+
+    def test_first_beyond(self):
+        """Test the galloping search used by the two-pointer cluster scan."""
+        values = np.arange(0, 1000, dtype=np.int64)
+        
+        assert first_beyond(values, 0, 0) == 1
+        assert first_beyond(values, 500, 700) == 701
+        assert first_beyond(values, 10, 5000) == 1000
+        assert first_beyond(np.array([5, 1, 9, 2], dtype=np.int64), 1, 4) == 2
+
@@ -0,0 +1,123 @@
+"""
+Performance tests for the Parallel Sort MCP server.
+
+These microbenchmarks compare the shared parsing kernel against the
+per-line regex + strptime approach the handlers used before, and the
+parallel filter against the single-threaded filter_logs.
+
+Set PARALLEL_SORT_BENCH_MB to benchmark filtering on a larger generated
+log (e.g. 2048 for a multi-GB run).
+"""
+import os
+import re
+import time
+from datetime import datetime
+import pytest
+from implementation.log_parser import scan_timestamp, parse_timestamp_keys
+from implementation.filter_handler import filter_logs
+from implementation.parallel_processor import parallel_filter_large_file
+
+
+BENCH_LOG_MB = int(os.environ.get("PARALLEL_SORT_BENCH_MB", "16"))
+
+
+def generate_lines(count: int) -> list:
+    """Generate deterministic log lines spread over several days."""
+    levels = ["INFO", "DEBUG", "WARN", "ERROR"]
+    return [
+        f"2024-01-{1 + (i // 86400) % 28:02d} {(i // 3600) % 24:02d}:{(i // 60) % 60:02d}:{i % 60:02d} "
+        f"{levels[i % 4]} Request {i} handled in {i % 250} ms"
+        for i in range(0, count * 7, 7)
+    ]
+
+
+def legacy_parse(lines: list) -> list:
+    """Baseline: compile-per-line regex search followed by strptime."""
+    parsed = []
+    for line in lines:
+        match = re.search(r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})', line)
+        parsed.append(datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S'))
+    return parsed
+
+
+def best_of(func, *args, repeat: int = 3) -> float:
+    """Return the fastest of several timed runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.fixture(scope="module")
+def lines():
+    """Shared benchmark input."""
+    return generate_lines(50000)
+
+
+@pytest.fixture(scope="module")
+def large_log(tmp_path_factory):
+    """Generated log of BENCH_LOG_MB megabytes."""
+    path = tmp_path_factory.mktemp("bench") / "large.log"
+    block = "\n".join(generate_lines(20000)) + "\n"
+    target = BENCH_LOG_MB * 1024 * 1024
+    with open(path, 'w') as f:
+        written = 0
+        while written < target:
+            f.write(block)
+            written += len(block)
+    return str(path)
+
+
+class TestParsingPerformance:
+    """Microbenchmarks for timestamp parsing."""
+
+    def test_scalar_kernel_speedup(self, lines):
+        """Test that the scalar fast path beats regex + strptime per line."""
+        baseline = best_of(legacy_parse, lines)
+        kernel = best_of(lambda items: [scan_timestamp(line) for line in items], lines)
+        
+        speedup = baseline / kernel
+        print(f"\nScalar kernel: {len(lines) / kernel:,.0f} lines/s ({speedup:.1f}x vs strptime)")
+        assert speedup > 2
+
+    def test_vectorized_kernel_speedup(self, lines):
+        """Test that chunk-at-a-time parsing beats regex + strptime per line."""
+        baseline = best_of(legacy_parse, lines)
+        kernel = best_of(parse_timestamp_keys, lines)
+        
+        speedup = baseline / kernel
+        print(f"\nVectorized kernel: {len(lines) / kernel:,.0f} lines/s ({speedup:.1f}x vs strptime)")
+        assert speedup > 2
+
+
+class TestFilterPerformance:
+    """Benchmark parallel filtering against the single-threaded filter."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_filter_benchmark(self, large_log, tmp_path, monkeypatch):
+        """Test that the parallel filter returns the serial matches and report both timings."""
+        monkeypatch.setenv("PARALLEL_SORT_INDEX_DIR", str(tmp_path / "index"))
+        conditions = [
+            {"field": "level", "operator": "equals", "value": "ERROR"},
+            {"field": "message", "operator": "contains", "value": "in 24"},
+        ]
+        chunk_size_mb = max(1, BENCH_LOG_MB // 8)
+        
+        start = time.perf_counter()
+        serial = await filter_logs(large_log, conditions, "and")
+        serial_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        parallel = await parallel_filter_large_file(
+            large_log, conditions, "and", output_path=str(tmp_path / "matches.log"), chunk_size_mb=chunk_size_mb
+        )
+        parallel_time = time.perf_counter() - start
+        
+        print(f"\nFilter {BENCH_LOG_MB} MB: serial {serial_time:.2f}s, "
+              f"parallel {parallel_time:.2f}s with {parallel['max_workers_used']} workers "
+              f"({serial_time / parallel_time:.1f}x)")
+        assert parallel["matched_lines"] == serial["matched_lines"]
+        with open(tmp_path / "matches.log", 'r', encoding='utf-8') as f:
+            assert f.read().splitlines() == serial["filtered_lines"]
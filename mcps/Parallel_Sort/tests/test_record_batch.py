@@ -0,0 +1,119 @@
+"""
+Tests for the columnar record batch.
+"""
+import numpy as np
+import pytest
+from implementation.record_batch import RecordBatch
+from implementation.log_formats import get_format
+from implementation.log_index import build_index
+from implementation.log_parser import INVALID_KEY
+from implementation.filter_engine import compile_filter
+
+
+LINES = [
+    "2024-01-15 14:30:25 ERROR Connection to 10.0.0.1 failed",
+    "invalid line without timestamp",
+    "  2024-01-15 14:31:00 INFO User 42 logged in  ",
+    "",
+    "2024-01-15 14:32:15 WARNING",
+    "2024-01-15 14:33:00 CUSTOM Café reopened",
+]
+
+JSON_LINES = [
+    '{"timestamp": "2024-01-15T14:30:25Z", "level": "error", "message": "Disk \\"sda\\" full"}',
+    '{"timestamp": "2024-01-15T14:31:00Z", "level": "info", "message": "ok"}',
+]
+
+CONDITIONS = [
+    [{"field": "message", "operator": "contains", "value": "IN"}],
+    [{"field": "message", "operator": "starts_with", "value": "user"}],
+    [{"field": "message", "operator": "ends_with", "value": "Failed"}],
+    [{"field": "message", "operator": "equals", "value": ""}],
+    [{"field": "line", "operator": "not_contains", "value": "2024"}],
+    [{"field": "level", "operator": "in", "value": ["error", "custom"]}],
+    [{"field": "message", "operator": "regex", "value": "caf."}],
+    [{"field": "line_number", "operator": "between", "value": [2, 4]}],
+    [{"field": "timestamp", "operator": "greater_than", "value": "2024-01-15 14:31:00"}],
+]
+
+
+def entries_match(batch, compiled):
+    return np.array([compiled(batch.entry(row)) for row in range(len(batch))], dtype=bool)
+
+
+class TestRecordBatch:
+    """Test suite for RecordBatch construction and vectorized filtering."""
+    
+    def test_columns(self):
+        """Test that lines are parsed into columns over one buffer."""
+        batch = RecordBatch.from_lines(LINES, get_format("standard"), first_line_number=10)
+        
+        assert len(batch) == 6
+        assert batch.level_codes.dtype == np.uint8
+        assert list(batch.valid_mask) == [True, False, True, False, True, True]
+        assert batch.timestamps[1] == INVALID_KEY
+        assert batch.lines() == [line.strip() for line in LINES]
+        assert batch.messages() == ["Connection to 10.0.0.1 failed", "invalid line without timestamp",
+                                    "User 42 logged in", "", "", "Café reopened"]
+        assert not batch.ascii
+        
+        entry = batch.entry(5)
+        assert entry["line_number"] == 15
+        assert entry["level"] == "CUSTOM"
+        assert entry["timestamp"].minute == 33
+        assert batch.entry(1)["level"] == "" and batch.entry(1)["timestamp"] is None
+    
+    def test_detached_messages(self):
+        """Test that messages that are not a suffix of their line are stored after the lines."""
+        batch = RecordBatch.from_lines(JSON_LINES, get_format("jsonl"))
+        
+        assert batch.messages() == ['Disk "sda" full', "ok"]
+        assert batch.lines() == JSON_LINES
+        assert batch.message_starts[0] >= batch.line_offsets[-1]
+    
+    def test_from_index_matches_from_lines(self, tmp_path):
+        """Test that a batch built from index columns equals a parsed one."""
+        path = tmp_path / "app.log"
+        path.write_text("\n".join(LINES) + "\n")
+        index = build_index(str(path), get_format("standard"))
+        rows = np.array([0, 1, 2, 5])
+        
+        from_index = RecordBatch.from_index(index, rows, index.read_lines(rows))
+        parsed = RecordBatch.from_lines([LINES[row] for row in rows], get_format("standard"))
+        
+        assert from_index.messages() == parsed.messages()
+        assert list(from_index.line_numbers) == [1, 2, 3, 6]
+        assert [from_index.entry(row)["level"] for row in range(4)] == [parsed.entry(row)["level"] for row in range(4)]
+        assert np.array_equal(from_index.timestamps, parsed.timestamps)
+    
+    @pytest.mark.parametrize("conditions", CONDITIONS)
+    @pytest.mark.parametrize("ascii_only", [True, False])
+    def test_batch_mask_matches_entries(self, conditions, ascii_only):
+        """Test that vectorized evaluation agrees with per-entry evaluation."""
+        lines = LINES[:5] if ascii_only else LINES
+        batch = RecordBatch.from_lines(lines, get_format("standard"))
+        assert batch.ascii == ascii_only
+        
+        for logical_operator in ("and", "or"):
+            compiled = compile_filter(conditions + [{"field": "level", "operator": "not_equals", "value": "info"}],
+                                      logical_operator)
+            assert np.array_equal(compiled.batch_mask(batch), entries_match(batch, compiled))
+    
+    def test_overlapping_occurrences(self):
+        """Test substring tests where occurrences overlap or cross line boundaries."""
+        lines = ["2024-01-15 14:30:25 INFO aaa", "2024-01-15 14:30:26 INFO a", "2024-01-15 14:30:27 INFO ab"]
+        batch = RecordBatch.from_lines(lines, get_format("standard"))
+        rows = np.arange(3)
+        
+        assert list(batch.text_mask("message", "aa", "ends_with", rows)) == [True, False, False]
+        assert list(batch.text_mask("message", "a2", "contains", rows)) == [False, False, False]
+        assert list(batch.text_mask("message", "a", "equals", rows)) == [False, True, False]
+        assert list(batch.text_mask("message", "é", "contains", rows)) == [False, False, False]
+    
+    def test_smaller_than_entry_dictionaries(self):
+        """Test that the batch holds far less than a dictionary per line."""
+        lines = [f"2024-01-15 14:{i // 60 % 60:02d}:{i % 60:02d} INFO Request {i} handled" for i in range(10000)]
+        batch = RecordBatch.from_lines(lines, get_format("standard"))
+        
+        text_bytes = sum(map(len, lines))
+        assert batch.nbytes - text_bytes < 50 * len(lines)
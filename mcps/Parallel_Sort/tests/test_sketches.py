@@ -0,0 +1,99 @@
+"""
+Tests for the mergeable statistics sketches.
+"""
+import numpy as np
+import pytest
+from implementation.sketches import DistinctCounter, QuantileSketch, HeavyHitters
+
+
+class TestDistinctCounter:
+    """Test suite for distinct counting."""
+
+    def test_exact_below_limit(self):
+        """Test that small cardinalities are counted exactly."""
+        counter = DistinctCounter()
+        counter.update(f"message {i % 500}" for i in range(5000))
+        
+        assert counter.count() == 500
+
+    def test_estimate_above_limit(self):
+        """Test that large cardinalities are estimated within a few percent."""
+        counter = DistinctCounter(exact_limit=1000)
+        counter.update(f"message {i}" for i in range(100000))
+        
+        assert counter.hashes is None
+        assert counter.count() == pytest.approx(100000, rel=0.03)
+
+    def test_merge_matches_single_pass(self):
+        """Test that merged chunk counters equal one counter over all values."""
+        values = [f"value {i % 30000}" for i in range(60000)]
+        single = DistinctCounter(exact_limit=5000)
+        single.update(values)
+        
+        merged = DistinctCounter(exact_limit=5000)
+        for start in range(0, len(values), 7000):
+            chunk = DistinctCounter(exact_limit=5000)
+            chunk.update(values[start:start + 7000])
+            merged.merge(chunk)
+        
+        assert np.array_equal(merged.registers, single.registers)
+        assert merged.count() == single.count()
+
+
+class TestQuantileSketch:
+    """Test suite for quantile estimation."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test that quantiles are within the configured relative error."""
+        values = np.random.default_rng(7).exponential(2.0, 50000)
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        sketch.update(values)
+        
+        for q in (0.5, 0.9, 0.99):
+            assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.03)
+        assert sketch.quantile(1.0) == values.max()
+
+    def test_merge_matches_single_pass(self):
+        """Test that merging chunk sketches gives the single-pass quantiles."""
+        values = np.concatenate([np.zeros(100), np.random.default_rng(3).lognormal(0, 2, 20000)])
+        single = QuantileSketch()
+        single.update(values)
+        
+        merged = QuantileSketch()
+        for chunk in np.array_split(values, 6):
+            part = QuantileSketch()
+            part.update(chunk)
+            merged.merge(part)
+        
+        assert merged.count == single.count
+        for q in (0.0, 0.001, 0.25, 0.5, 0.75, 0.999):
+            assert merged.quantile(q) == single.quantile(q)
+
+    def test_empty_sketch(self):
+        """Test that an empty sketch has no quantiles."""
+        assert QuantileSketch().quantile(0.5) is None
+
+
+class TestHeavyHitters:
+    """Test suite for heavy-hitter summaries."""
+
+    def test_exact_under_capacity(self):
+        """Test that counts are exact while distinct values fit the capacity."""
+        summary = HeavyHitters(capacity=10)
+        summary.update(["a", "b", "a", "c", "a", "b"])
+        
+        assert summary.most_common(2) == [("a", 3), ("b", 2)]
+
+    def test_frequent_values_survive_pruning(self):
+        """Test that frequent values are kept with bounded undercount."""
+        values = ["hot"] * 3000 + ["warm"] * 1000 + [f"cold {i}" for i in range(5000)]
+        summary = HeavyHitters(capacity=100)
+        for start in range(0, len(values), 500):
+            part = HeavyHitters(capacity=100)
+            part.update(values[start:start + 500])
+            summary.merge(part)
+        
+        top = dict(summary.most_common(2))
+        bound = len(values) / 101
+        assert 3000 - bound <= top["hot"] <= 3000
+        assert 1000 - bound <= top["warm"] <= 1000
@@ -163,4 +163,56 @@ Invalid line without timestamp
                     assert line in result["sorted_lines"]
                     
         finally:
-            os.unlink(temp_path)
\ No newline at end of file
+            os.unlink(temp_path)
+    @pytest.mark.asyncio
+    async def test_sort_to_output_file(self):
+        """Test that output_path mode writes lines to disk and returns only a summary."""
+        lines = [f"2024-01-01 10:{minute:02d}:00 INFO Message {minute}" for minute in range(20)]
+        test_content = "\n".join(reversed(lines))
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            f.write(test_content)
+            temp_path = f.name
+        output_path = temp_path + ".sorted"
+        
+        try:
+            result = await sort_log_by_timestamp(temp_path, output_path)
+            
+            assert "error" not in result
+            assert "sorted_lines" not in result
+            assert result["output_file"] == output_path
+            assert result["lines_written"] == 20
+            assert result["valid_lines"] == 20
+            assert result["head_sample"] == lines[:5]
+            assert result["tail_sample"] == lines[-5:]
+            
+            with open(output_path, 'r', encoding='utf-8') as f:
+                assert f.read().splitlines() == lines
+                
+        finally:
+            os.unlink(temp_path)
+            if os.path.exists(output_path):
+                os.unlink(output_path)
+
+    @pytest.mark.asyncio
+    async def test_sort_reverse(self):
+        """Test sorting in descending order."""
+        test_content = """2024-01-01 08:30:00 DEBUG First
+2024-01-03 10:00:00 INFO Third
+2024-01-02 14:45:00 ERROR Second"""
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log') as f:
+            f.write(test_content)
+            temp_path = f.name
+        
+        try:
+            result = await sort_log_by_timestamp(temp_path, reverse=True)
+            
+            assert result["sorted_lines"] == [
+                "2024-01-03 10:00:00 INFO Third",
+                "2024-01-02 14:45:00 ERROR Second",
+                "2024-01-01 08:30:00 DEBUG First"
+            ]
+            
+        finally:
+            os.unlink(temp_path)
@@ -122,6 +122,28 @@ Invalid line without timestamp"""
         assert "error" in result
         assert "not found" in result["error"].lower()
 
+    @pytest.mark.asyncio
+    async def test_character_counts_include_line_endings(self):
+        """Test character counts cover whole lines, as read from the file."""
+        test_content = """2024-01-01 08:30:00 INFO Café opened  
+   2024-01-01 09:15:00 WARN Queue depth 12
+Invalid line without timestamp
+"""
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.log', encoding='utf-8') as f:
+            f.write(test_content)
+            temp_path = f.name
+        
+        try:
+            result = await analyze_log_statistics(temp_path)
+            
+            stats = result["statistics"]["basic_statistics"]
+            assert stats["total_characters"] == len(test_content)
+            assert stats["average_line_length"] == round(len(test_content) / 3, 2)
+            
+        finally:
+            os.unlink(temp_path)
+
     def test_parse_log_entry_valid(self):
         """Test parsing valid log entries."""
         test_line = "2024-01-15 14:30:25 ERROR Test error message"
@@ -0,0 +1,80 @@
+"""
+Tests for the Drain-style log template miner.
+"""
+import json
+import numpy as np
+import pytest
+from implementation.template_miner import TemplateMiner, WILDCARD
+
+
+class TestTemplateMiner:
+    """Test suite for online template mining."""
+    
+    def test_variable_tokens_share_a_template(self):
+        """Test that messages differing in variable tokens get one template id."""
+        miner = TemplateMiner()
+        ids = miner.add_messages([
+            "Session opened for alice from 10.0.0.1",
+            "Session opened for 42 from 10.0.0.2",
+            "Disk usage at 85%",
+            "Session opened for bob from 10.0.0.3",
+        ])
+        
+        assert ids.tolist() == [0, 0, 1, 0]
+        assert miner.template(0) == f"Session opened for {WILDCARD} from {WILDCARD}"
+        assert miner.template(1) == f"Disk usage at {WILDCARD}"
+    
+    def test_dissimilar_messages_stay_apart(self):
+        """Test that messages sharing a route but few tokens start new templates."""
+        miner = TemplateMiner()
+        ids = miner.add_messages([
+            "Cache entry expired for session alpha",
+            "Cache entry written to disk by writer",
+            "Cache entry expired for session beta",
+        ])
+        
+        assert ids.tolist() == [0, 1, 0]
+        assert miner.template(0) == f"Cache entry expired for session {WILDCARD}"
+        assert miner.template(1) == "Cache entry written to disk by writer"
+    
+    def test_checkpoint_restores_ids(self):
+        """Test that a restored checkpoint keeps assigning the same ids."""
+        messages = [f"Request {i} handled by worker {chr(97 + i % 5)}" for i in range(50)]
+        messages += [f"Job {name} finished" for name in ("build", "test", "deploy")]
+        miner = TemplateMiner()
+        first = miner.add_messages(messages)
+        
+        restored = TemplateMiner.from_dict(json.loads(json.dumps(miner.to_dict())))
+        
+        assert restored.templates() == miner.templates()
+        assert np.array_equal(restored.add_messages(messages), first)
+        assert restored.add("Job cleanup finished") == miner.add("Job cleanup finished")
+    
+    def test_checkpoint_version_is_checked(self):
+        """Test that checkpoints of another version are rejected."""
+        payload = TemplateMiner().to_dict()
+        payload["version"] = -1
+        
+        with pytest.raises(ValueError):
+            TemplateMiner.from_dict(payload)
+    
+    def test_merge_maps_chunk_templates(self):
+        """Test that merging chunk miners maps their ids onto shared templates."""
+        first, second = TemplateMiner(), TemplateMiner()
+        first.add_messages(["Connection to 10.0.0.1 failed", "Job build finished"])
+        second.add_messages(["Worker stopped", "Connection to 10.0.0.9 failed"])
+        
+        mapping = first.merge(second)
+        
+        assert mapping.tolist() == [2, 0]
+        assert len(first) == 3
+    
+    def test_template_limit_uses_overflow(self):
+        """Test that messages past max_templates fall into the overflow template."""
+        miner = TemplateMiner(max_templates=2)
+        ids = miner.add_messages(["alpha beta", "gamma delta epsilon", "zeta"])
+        
+        assert ids.tolist() == [0, 1, 2]
+        assert miner.overflow == 2
+        assert miner.template(2) == WILDCARD
+        assert miner.copy().add("eta") == 2
@@ -0,0 +1,75 @@
+"""
+Tests for the shared worker process pool.
+"""
+import asyncio
+import time
+import pytest
+from implementation import worker_pool
+from implementation.worker_pool import WorkerPool, available_cpus
+
+
+@pytest.fixture
+def pool():
+    """Single-worker pool stopped after the test."""
+    pool = WorkerPool(workers=1)
+    yield pool
+    pool.shutdown()
+
+
+class TestWorkerPool:
+    """Test suite for the admission-queued worker pool."""
+    
+    @pytest.mark.asyncio
+    async def test_map_keeps_task_order(self, pool):
+        """Test that results come back in submission order from reused processes."""
+        assert await pool.map(pow, [(2, n) for n in range(8)]) == [2 ** n for n in range(8)]
+        assert await pool.map(pow, [(3, 2)]) == [9]
+        
+        stats = pool.stats()
+        assert stats["started"]
+        assert stats["tasks_completed"] == 9
+        assert stats["jobs_completed"] == 2
+        assert stats["queue_depth"] == 0
+        assert stats["running_tasks"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_later_call_is_not_starved(self, pool):
+        """Test that a small call is admitted between the tasks of a large one."""
+        large = asyncio.ensure_future(pool.map(time.sleep, [(0.05,)] * 10))
+        await asyncio.sleep(0)
+        small = asyncio.ensure_future(pool.map(time.sleep, [(0.05,)]))
+        await asyncio.sleep(0)
+        assert pool.stats()["queue_depth"] == 10
+        
+        await small
+        assert not large.done()
+        assert pool.stats()["peak_queue_depth"] == 10
+        await large
+    
+    @pytest.mark.asyncio
+    async def test_task_error_drops_pending_tasks(self, pool):
+        """Test that a failing task fails the call and its queued tasks are dropped."""
+        with pytest.raises(ValueError):
+            await pool.map(int, [("1",), ("x",), ("3",), ("4",)])
+        
+        assert pool.stats()["queue_depth"] == 0
+        assert pool.stats()["active_jobs"] == 0
+        assert await pool.map(int, [("5",)]) == [5]
+    
+    def test_worker_limit_is_capped_by_pool_size(self):
+        """Test that per-call worker requests never exceed the pool."""
+        pool = WorkerPool(workers=4)
+        
+        assert pool.worker_limit() == 4
+        assert pool.worker_limit(16) == 4
+        assert pool.worker_limit(2) == 2
+        assert pool.worker_limit(0) == 1
+    
+    def test_size_follows_cgroup_quota(self, monkeypatch):
+        """Test that the pool is sized from the cgroup quota and the override."""
+        monkeypatch.delenv("PARALLEL_SORT_WORKERS", raising=False)
+        monkeypatch.setattr(worker_pool, "cgroup_cpu_limit", lambda: 1.5)
+        assert available_cpus() == 1
+        
+        monkeypatch.setenv("PARALLEL_SORT_WORKERS", "3")
+        assert available_cpus() == 3